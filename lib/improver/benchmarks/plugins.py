@@ -0,0 +1,617 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Benchmarks of the core IMPROVER plugins applied to synthetic data.
+
+Each benchmark builds synthetic cubes of a configurable size, times the
+plugin and records the peak resident memory of the process in which it ran.
+Every benchmark is run in its own process, so that the memory used by one
+benchmark does not hide the memory used by the next. The results are
+written as JSON, so that they can be compared with those of an earlier run
+to detect regressions.
+
+This can be run as a script::
+
+    python -m improver.benchmarks.plugins --output results.json
+    python -m improver.benchmarks.plugins --compare results.json
+
+or using ``improver tests benchmark``. The default sizes are small enough
+to run quickly on a desktop; operational sizes, e.g. a 1000x1000 grid with
+12 realizations, 36 lead times and 20 thresholds, can be requested with
+``--size full`` or the individual size options.
+
+"""
+
+import argparse
+from collections import OrderedDict
+import datetime
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import time
+import warnings
+
+import cf_units
+import iris
+from iris.coords import AuxCoord, DimCoord
+from iris.cube import Cube, CubeList
+import numpy as np
+
+from improver.blending.weighted_blend import (
+    WeightedBlendAcrossWholeDimension)
+from improver.ensemble_copula_coupling.ensemble_copula_coupling import (
+    EnsembleReordering)
+from improver.grids import STANDARD_GRID_CCRS
+from improver.nbhood.nbhood import NeighbourhoodProcessing
+from improver.nbhood.recursive_filter import RecursiveFilter
+from improver.psychrometric_calculations.psychrometric_calculations import (
+    WetBulbTemperature)
+from improver.spotdata.main import run_spotdata
+from improver.threshold import BasicThreshold
+from improver.utilities.instrumentation import peak_rss_mb
+from improver.wxcode.weather_symbols import WeatherSymbols
+from improver.wxcode.wxcode_utilities import expand_nested_lists
+
+
+#: Sizes of the synthetic data used by the benchmarks.
+SIZES = {
+    "small": OrderedDict([
+        ("grid_size", 100), ("realizations", 12), ("lead_times", 6),
+        ("thresholds", 20), ("levels", 10), ("sites", 1000)]),
+    "full": OrderedDict([
+        ("grid_size", 1000), ("realizations", 12), ("lead_times", 36),
+        ("thresholds", 20), ("levels", 10), ("sites", 10000)]),
+}
+
+#: Grid spacing of the synthetic equal area grids, in metres.
+GRID_SPACING = 2000.
+
+#: Validity time of the first lead time, in hours since 1970-01-01.
+FIRST_VALIDITY_TIME = 402192
+
+TIME_UNIT = cf_units.Unit("hours since 1970-01-01 00:00:00",
+                          calendar="gregorian")
+
+
+def _random_field(shape, low=0., high=1., seed=0):
+    """
+    Return an array of random float32 values, which vary smoothly enough
+    between neighbouring points to resemble a meteorological field.
+
+    Args:
+        shape (tuple):
+            Shape of the array, with the y and x dimensions last.
+
+    Keyword Args:
+        low (float):
+            Smallest value in the field.
+        high (float):
+            Largest value in the field.
+        seed (integer):
+            Seed for the random number generator.
+
+    Returns:
+        data (numpy.ndarray):
+            Array of the requested shape.
+    """
+    random_state = np.random.RandomState(seed)
+    y_wave = np.sin(np.linspace(0, 4 * np.pi, shape[-2]))[:, np.newaxis]
+    x_wave = np.cos(np.linspace(0, 6 * np.pi, shape[-1]))[np.newaxis, :]
+    data = random_state.random_sample(shape).astype(np.float32)
+    data = 0.5 * data + 0.125 * (y_wave + x_wave + 2.)
+    return (low + (high - low) * data).astype(np.float32)
+
+
+def _time_coords(lead_times):
+    """
+    Return time and forecast period coordinates for a run with validity
+    times an hour apart, along with a scalar forecast reference time.
+
+    Args:
+        lead_times (integer):
+            The number of hourly lead times.
+
+    Returns:
+        (tuple): tuple containing:
+            **time** (iris.coords.DimCoord)
+            **forecast_period** (iris.coords.AuxCoord)
+            **forecast_reference_time** (iris.coords.AuxCoord)
+    """
+    periods = np.arange(1, lead_times + 1)
+    time_coord = DimCoord(FIRST_VALIDITY_TIME - 1 + periods,
+                          standard_name="time", units=TIME_UNIT)
+    fp_coord = AuxCoord(periods, standard_name="forecast_period",
+                        units="hours")
+    frt_coord = AuxCoord(FIRST_VALIDITY_TIME - 1,
+                         standard_name="forecast_reference_time",
+                         units=TIME_UNIT)
+    return time_coord, fp_coord, frt_coord
+
+
+def set_up_grid_cube(data, name, units, leading_coords=None):
+    """
+    Wrap an array in a cube on an equal area grid, with the last two
+    dimensions of the array along the projection y and x axes.
+
+    Args:
+        data (numpy.ndarray):
+            Data for the cube.
+        name (string):
+            Name of the cube.
+        units (string):
+            Units of the data.
+
+    Keyword Args:
+        leading_coords (list or None):
+            Coordinates describing the leading dimensions of the array, in
+            order. A coordinate given as a (coord, dim) tuple is added as an
+            auxiliary coordinate; scalar coordinates are given with a dim
+            of None.
+
+    Returns:
+        cube (iris.cube.Cube):
+            Cube containing the data.
+    """
+    cube = Cube(data, units=units)
+    cube.rename(name)
+    n_leading = data.ndim - 2
+    for offset, axis in enumerate(["y", "x"]):
+        points = GRID_SPACING * np.arange(data.shape[n_leading + offset],
+                                          dtype=np.float32)
+        cube.add_dim_coord(
+            DimCoord(points, "projection_{}_coordinate".format(axis),
+                     units="m", coord_system=STANDARD_GRID_CCRS),
+            n_leading + offset)
+    dim = 0
+    for coord in leading_coords or []:
+        if isinstance(coord, tuple):
+            coord, coord_dim = coord
+            cube.add_aux_coord(coord, coord_dim)
+        else:
+            cube.add_dim_coord(coord, dim)
+            dim += 1
+    return cube
+
+
+def _realization_coord(realizations):
+    """Return a realization coordinate with the given number of points."""
+    return DimCoord(np.arange(realizations, dtype=np.int32),
+                    standard_name="realization", units="1")
+
+
+def set_up_neighbourhood(sizes):
+    """Set up square neighbourhood processing of probabilities at each
+    realization and lead time, with the radius increasing with lead time."""
+    time_coord, fp_coord, frt_coord = _time_coords(sizes["lead_times"])
+    shape = (sizes["realizations"], sizes["lead_times"],
+             sizes["grid_size"], sizes["grid_size"])
+    cube = set_up_grid_cube(
+        _random_field(shape), "probability_of_air_temperature", "1",
+        [_realization_coord(sizes["realizations"]), time_coord,
+         (fp_coord, 1), (frt_coord, None)])
+    lead_times = [0, sizes["lead_times"]]
+    radii = [10 * GRID_SPACING, 30 * GRID_SPACING]
+    plugin = NeighbourhoodProcessing("square", radii, lead_times=lead_times)
+    return plugin.process, (cube,)
+
+
+def set_up_recursive_filter(sizes):
+    """Set up recursive filtering of probabilities at each realization."""
+    shape = (sizes["realizations"], sizes["grid_size"], sizes["grid_size"])
+    cube = set_up_grid_cube(
+        _random_field(shape), "probability_of_air_temperature", "1",
+        [_realization_coord(sizes["realizations"])])
+    plugin = RecursiveFilter(alpha_x=0.5, alpha_y=0.5, iterations=4)
+    return plugin.process, (cube,)
+
+
+def set_up_threshold(sizes):
+    """Set up fuzzy thresholding of temperatures at each realization."""
+    shape = (sizes["realizations"], sizes["grid_size"], sizes["grid_size"])
+    cube = set_up_grid_cube(
+        _random_field(shape, low=263., high=303.), "air_temperature", "K",
+        [_realization_coord(sizes["realizations"])])
+    thresholds = np.linspace(268., 298., sizes["thresholds"]).tolist()
+    plugin = BasicThreshold(thresholds, fuzzy_factor=0.99)
+    return plugin.process, (cube,)
+
+
+def set_up_weighted_blend(sizes):
+    """Set up a weighted mean across the lead times of probabilities at
+    each threshold."""
+    time_coord, fp_coord, frt_coord = _time_coords(sizes["lead_times"])
+    threshold_coord = DimCoord(
+        np.linspace(268., 298., sizes["thresholds"], dtype=np.float32),
+        long_name="threshold", units="K")
+    shape = (sizes["lead_times"], sizes["thresholds"],
+             sizes["grid_size"], sizes["grid_size"])
+    cube = set_up_grid_cube(
+        _random_field(shape), "probability_of_air_temperature", "1",
+        [time_coord, threshold_coord, (fp_coord, 0), (frt_coord, None)])
+    weights = np.linspace(1., 2., sizes["lead_times"])
+    weights /= weights.sum()
+    plugin = WeightedBlendAcrossWholeDimension("time", "weighted_mean")
+    return plugin.process, (cube, weights)
+
+
+def set_up_ensemble_reordering(sizes):
+    """Set up ensemble copula coupling of calibrated percentiles using the
+    ordering of the raw realizations."""
+    time_coord, fp_coord, frt_coord = _time_coords(1)
+    scalar_coords = [(time_coord, None), (fp_coord, None), (frt_coord, None)]
+    shape = (sizes["realizations"], sizes["grid_size"], sizes["grid_size"])
+    raw = set_up_grid_cube(
+        _random_field(shape, low=263., high=303.), "air_temperature", "K",
+        [_realization_coord(sizes["realizations"])] + scalar_coords)
+    percentiles = np.linspace(
+        0., 100., sizes["realizations"] + 2)[1:-1].astype(np.float32)
+    percentile_data = np.sort(
+        _random_field(shape, low=263., high=303., seed=1), axis=0)
+    post_processed = set_up_grid_cube(
+        percentile_data, "air_temperature", "K",
+        [DimCoord(percentiles, long_name="percentile_over_realization",
+                  units="%")] + scalar_coords)
+    return EnsembleReordering().process, (post_processed, raw)
+
+
+def set_up_weather_symbols(sizes):
+    """Set up weather symbol generation from probabilities of each of the
+    diagnostics and thresholds used in the decision tree."""
+    plugin = WeatherSymbols()
+    required = OrderedDict()
+    for query in plugin.queries.values():
+        for diagnostic, threshold, condition in zip(
+                expand_nested_lists(query, "diagnostic_fields"),
+                expand_nested_lists(query, "diagnostic_thresholds"),
+                expand_nested_lists(query, "diagnostic_conditions")):
+            units, condition, points = required.setdefault(
+                diagnostic, (threshold.units, condition, set()))
+            threshold = threshold.copy()
+            threshold.convert_units(units)
+            points.add(float(threshold.points.item()))
+
+    time_coord, fp_coord, frt_coord = _time_coords(1)
+    cubes = CubeList()
+    for seed, (diagnostic, (units, condition, points)) in enumerate(
+            required.items()):
+        threshold_coord = DimCoord(
+            np.array(sorted(points), dtype=np.float32),
+            long_name="threshold", units=units)
+        shape = (len(points), sizes["grid_size"], sizes["grid_size"])
+        cube = set_up_grid_cube(
+            _random_field(shape, seed=seed), diagnostic, "1",
+            [threshold_coord, (time_coord, None), (fp_coord, None),
+             (frt_coord, None)])
+        cube.attributes["relative_to_threshold"] = condition
+        cubes.append(cube)
+    return plugin.process, (cubes,)
+
+
+def set_up_wet_bulb_temperature(sizes):
+    """Set up the calculation of wet bulb temperatures on height levels."""
+    heights = DimCoord(np.arange(sizes["levels"], dtype=np.float32) * 100.,
+                       standard_name="height", units="m")
+    shape = (sizes["levels"], sizes["grid_size"], sizes["grid_size"])
+    temperature = set_up_grid_cube(
+        _random_field(shape, low=263., high=303.), "air_temperature", "K",
+        [heights])
+    relative_humidity = set_up_grid_cube(
+        _random_field(shape, low=40., high=100., seed=1),
+        "relative_humidity", "%", [heights])
+    pressure = set_up_grid_cube(
+        _random_field(shape, low=85000., high=102000., seed=2),
+        "air_pressure", "Pa", [heights])
+    return (WetBulbTemperature().process,
+            (temperature, relative_humidity, pressure))
+
+
+def set_up_spotdata(sizes):
+    """Set up the extraction of temperatures at each lead time at a set of
+    randomly placed sites on a global latitude-longitude grid."""
+    n_points = sizes["grid_size"]
+    latitude = DimCoord(np.linspace(-89.5, 89.5, n_points),
+                        standard_name="latitude", units="degrees")
+    longitude = DimCoord(np.linspace(-179.5, 179.5, n_points),
+                         standard_name="longitude", units="degrees")
+    time_coord, fp_coord, frt_coord = _time_coords(sizes["lead_times"])
+    shape = (sizes["lead_times"], n_points, n_points)
+    cube = Cube(_random_field(shape, low=263., high=303.),
+                long_name="air_temperature", units="K",
+                dim_coords_and_dims=[(time_coord, 0), (latitude, 1),
+                                     (longitude, 2)])
+    cube.add_aux_coord(fp_coord, 0)
+    cube.add_aux_coord(frt_coord)
+    orography = Cube(_random_field(shape[1:], high=1000., seed=1),
+                     long_name="surface_altitude", units="m",
+                     dim_coords_and_dims=[(latitude, 0), (longitude, 1)])
+
+    random_state = np.random.RandomState(0)
+    sites = OrderedDict()
+    for site_id in range(sizes["sites"]):
+        sites[str(site_id)] = {
+            "latitude": random_state.uniform(-60., 60.),
+            "longitude": random_state.uniform(-170., 170.),
+            "altitude": random_state.uniform(0., 1000.),
+            "utc_offset": 0,
+            "wmo_site": 0}
+    diagnostics = {
+        "temperature": {
+            "diagnostic_name": "air_temperature",
+            "extrema": False,
+            "filepath": "temperature_at_screen_level",
+            "interpolation_method": "use_nearest",
+            "neighbour_finding": {
+                "land_constraint": False,
+                "method": "fast_nearest_neighbour",
+                "vertical_bias": None},
+            "data": CubeList([cube]),
+            "additional_data": None}}
+    return run_spotdata, (diagnostics, {"orography": orography}, sites, {})
+
+
+#: The benchmarks, each mapping a name to a function that takes the sizes
+#: of the synthetic data and returns the callable to be timed and its
+#: arguments.
+BENCHMARKS = OrderedDict([
+    ("NeighbourhoodProcessing", set_up_neighbourhood),
+    ("RecursiveFilter", set_up_recursive_filter),
+    ("BasicThreshold", set_up_threshold),
+    ("WeightedBlendAcrossWholeDimension", set_up_weighted_blend),
+    ("EnsembleReordering", set_up_ensemble_reordering),
+    ("WeatherSymbols", set_up_weather_symbols),
+    ("WetBulbTemperature", set_up_wet_bulb_temperature),
+    ("run_spotdata", set_up_spotdata),
+])
+
+
+def _run_benchmark(name, sizes, repeats):
+    """
+    Set up and time a single benchmark. This is run in a separate process
+    by :func:`run_benchmarks`.
+
+    Args:
+        name (string):
+            Name of the benchmark in BENCHMARKS.
+        sizes (dict):
+            Sizes of the synthetic data.
+        repeats (integer):
+            The number of times the benchmark is timed.
+
+    Returns:
+        result (dict):
+            The fastest time, in seconds, and the peak memory of the process
+            after setting up the inputs and after running the benchmark, in
+            MB.
+    """
+    function, args = BENCHMARKS[name](sizes)
+    # Realise any lazy data so that it is not counted in the timings.
+    for arg in args:
+        if isinstance(arg, Cube):
+            arg.data
+    setup_memory = peak_rss_mb()
+    times = []
+    for _ in range(repeats):
+        start = time.time()
+        function(*args)
+        times.append(time.time() - start)
+    return OrderedDict([
+        ("name", name),
+        ("seconds", min(times)),
+        ("setup_peak_memory_mb", setup_memory),
+        ("peak_memory_mb", peak_rss_mb())])
+
+
+def run_benchmarks(names=None, sizes=None, repeats=1):
+    """
+    Run the benchmarks, each in a new process.
+
+    Keyword Args:
+        names (list or None):
+            Names of the benchmarks to run. If None, all benchmarks are run.
+        sizes (dict or None):
+            Sizes of the synthetic data. If None, the "small" sizes are used.
+        repeats (integer):
+            The number of times each benchmark is timed. The fastest time is
+            reported.
+
+    Returns:
+        results (collections.OrderedDict):
+            The sizes of the synthetic data, details of the machine and
+            version of IMPROVER, and a list of the results of each benchmark.
+
+    Raises:
+        ValueError: If an unknown benchmark is requested.
+    """
+    if names is None:
+        names = list(BENCHMARKS.keys())
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError("Unknown benchmarks: {}. Available benchmarks "
+                         "are: {}".format(unknown, list(BENCHMARKS.keys())))
+    if sizes is None:
+        sizes = SIZES["small"]
+
+    benchmark_results = []
+    for name in names:
+        pool = mp.Pool(processes=1, maxtasksperchild=1)
+        try:
+            benchmark_results.append(
+                pool.apply(_run_benchmark, (name, sizes, repeats)))
+        finally:
+            pool.close()
+            pool.join()
+
+    return OrderedDict([
+        ("version", _improver_version()),
+        ("created", datetime.datetime.utcnow().strftime("%Y%m%dT%H%MZ")),
+        ("host", platform.node()),
+        ("python", platform.python_version()),
+        ("numpy", np.__version__),
+        ("iris", iris.__version__),
+        ("sizes", OrderedDict(sizes)),
+        ("repeats", repeats),
+        ("benchmarks", benchmark_results)])
+
+
+def _improver_version():
+    """Return the version of IMPROVER recorded in etc/VERSION, if any."""
+    version_file = os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "etc", "VERSION")
+    try:
+        with open(version_file) as version:
+            return version.read().strip()
+    except IOError:
+        return None
+
+
+def compare_results(results, reference, tolerance=0.2):
+    """
+    Compare benchmark results with those of an earlier run, to find
+    regressions in the time taken or memory used.
+
+    Args:
+        results (dict):
+            Results as returned by :func:`run_benchmarks`.
+        reference (dict):
+            Results of an earlier run, with which to compare.
+
+    Keyword Args:
+        tolerance (float):
+            The fractional increase in time or memory, relative to the
+            reference results, that is reported as a regression.
+
+    Returns:
+        regressions (list of str or None):
+            A description of each regression found, or None if the results
+            were run with different sizes to the reference results, so could
+            not be compared. Benchmarks that are not in the reference results
+            are not compared.
+
+    Warns:
+        UserWarning:
+            If the results were run with different sizes to the reference
+            results.
+    """
+    if results["sizes"] != reference["sizes"]:
+        warnings.warn(
+            "The benchmarks were run with sizes {} which differ from the "
+            "sizes {} of the reference results, so they have not been "
+            "compared.".format(dict(results["sizes"]),
+                               dict(reference["sizes"])))
+        return None
+    reference_results = {
+        benchmark["name"]: benchmark for benchmark in reference["benchmarks"]}
+    regressions = []
+    for benchmark in results["benchmarks"]:
+        previous = reference_results.get(benchmark["name"])
+        if previous is None:
+            continue
+        for key in ["seconds", "peak_memory_mb"]:
+            if benchmark[key] > previous[key] * (1. + tolerance):
+                regressions.append(
+                    "{}: {} increased from {:.3f} to {:.3f}".format(
+                        benchmark["name"], key, previous[key],
+                        benchmark[key]))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Run the benchmarks, print a summary and optionally save the results or
+    compare them with an earlier run.
+
+    Keyword Args:
+        argv (list or None):
+            Command line arguments. If None, sys.argv is used.
+
+    Returns:
+        status (integer):
+            1 if any regressions were found, 2 if the results could not be
+            compared with the reference results, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the core IMPROVER plugins using synthetic "
+                    "data.")
+    parser.add_argument("benchmarks", metavar="BENCHMARK", nargs="*",
+                        help="Names of benchmarks to run. The default is to "
+                        "run all of: {}.".format(", ".join(BENCHMARKS)))
+    parser.add_argument("--size", choices=sorted(SIZES), default="small",
+                        help="Preset sizes of the synthetic data.")
+    for key, value in SIZES["small"].items():
+        parser.add_argument("--" + key, type=int,
+                            help="Override the {} of the preset size, "
+                            "e.g. {}.".format(key.replace("_", " "), value))
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="Number of times to time each benchmark.")
+    parser.add_argument("--output", metavar="OUTPUT_FILE",
+                        help="Save the results as JSON to this file.")
+    parser.add_argument("--compare", metavar="REFERENCE_FILE",
+                        help="Compare the results with those in this JSON "
+                        "file and report regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Fractional increase in time or memory "
+                        "reported as a regression.")
+    args = parser.parse_args(argv)
+
+    sizes = OrderedDict(SIZES[args.size])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+
+    results = run_benchmarks(names=args.benchmarks or None, sizes=sizes,
+                             repeats=args.repeats)
+    for benchmark in results["benchmarks"]:
+        print("{:>34}: {:8.3f} s {:10.1f} MB".format(
+            benchmark["name"], benchmark["seconds"],
+            benchmark["peak_memory_mb"]))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as reference_file:
+            reference = json.load(reference_file)
+        regressions = compare_results(results, reference,
+                                      tolerance=args.tolerance)
+        if regressions is None:
+            return 2
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
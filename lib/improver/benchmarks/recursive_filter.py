@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Benchmark comparing the engines available for applying the recursive filter.
+
+This can be run as a script::
+
+    python -m improver.benchmarks.recursive_filter
+
+"""
+
+import time
+
+import numpy as np
+
+from improver.nbhood.recursive_filter import FILTER_ENGINES, RecursiveFilter
+
+
+def benchmark_recursive_filter_engines(
+        shape=(12, 1000, 1000), alpha=0.5, iterations=4, repeats=3,
+        engines=None):
+    """
+    Time the application of the recursive filter to a stack of 2D slices
+    filled with random data, using each of the requested engines.
+
+    Keyword Args:
+        shape (tuple):
+            Shape of the (slices, rows, columns) array to be filtered.
+        alpha (float):
+            The alpha value used in both the x and y directions.
+        iterations (integer):
+            The number of iterations of the recursive filter.
+        repeats (integer):
+            The number of times each engine is timed. The fastest time is
+            reported.
+        engines (list or None):
+            The engines to be timed. If None, all available engines are
+            timed.
+
+    Returns:
+        timings (dict):
+            Dictionary mapping each engine to the fastest time taken, in
+            seconds, to filter the whole stack.
+    """
+    if engines is None:
+        engines = FILTER_ENGINES
+    data = np.random.RandomState(0).random_sample(shape)
+    alphas = np.full(shape[1:], alpha)
+
+    timings = {}
+    for engine in engines:
+        engine = RecursiveFilter(engine=engine).engine
+        if engine == "compiled":
+            # Exclude the one-off compilation cost from the timings.
+            RecursiveFilter.run_stacked_recursion(
+                data[:1, :3, :3].copy(), alphas[:3, :3], alphas[:3, :3], 1,
+                engine=engine)
+        times = []
+        for _ in range(repeats):
+            stack = data.copy()
+            start = time.time()
+            RecursiveFilter.run_stacked_recursion(
+                stack, alphas, alphas, iterations, engine=engine)
+            times.append(time.time() - start)
+        timings[engine] = min(times)
+    return timings
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    timings = benchmark_recursive_filter_engines()
+    reference = timings.get("python")
+    for engine, seconds in sorted(timings.items()):
+        line = "{:>12}: {:8.3f} s".format(engine, seconds)
+        if reference:
+            line += "  (x{:.1f})".format(reference / seconds)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
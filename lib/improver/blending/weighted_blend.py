@@ -39,9 +39,15 @@ from iris.exceptions import CoordinateNotFoundError
 
 from improver.utilities.cube_manipulation import add_renamed_cell_method
 from improver.utilities.cube_checker import find_percentile_coordinate
+from improver.utilities.mathematical_operations import (
+    interpolate_multiple_rows)
 from improver.utilities.temporal import (
     cycletime_to_number, forecast_period_coord)
 
+# Maximum number of grid points blended at once by the vectorised percentile
+# blending, in order to bound the memory used.
+PERCENTILE_BLENDING_CHUNK_SIZE = 10000
+
 
 def conform_metadata(
         cube, cube_orig, coord, cycletime=None,
@@ -180,10 +186,15 @@ class PercentileBlendingAggregator(object):
         return result
 
     @staticmethod
-    def aggregate(data, axis, arr_percent, arr_weights, perc_dim):
+    def aggregate(data, axis, arr_percent, arr_weights, perc_dim,
+                  chunk_size=PERCENTILE_BLENDING_CHUNK_SIZE):
         """ Blend percentile aggregate function to blend percentile data
             along a given axis of a cube.
 
+            The blending is done for chunks of grid points at once using
+            blend_percentiles_vectorised, which gives the same result as
+            calling blend_percentiles for each grid point in turn.
+
         Args:
             data (np.array):
                    Array containing the data to blend
@@ -201,6 +212,10 @@ class PercentileBlendingAggregator(object):
             (Note percent and weights have special meaning in Aggregator
              hence the rename.)
 
+        Keyword Args:
+            chunk_size (int):
+                     The maximum number of grid points blended at once.
+
         Returns:
             result (np.array):
                      containing the weighted percentile blend data across
@@ -224,13 +239,15 @@ class PercentileBlendingAggregator(object):
         # Create the resulting data array, which is the shape of the original
         # data without dimension we are collapsing over
         result = np.zeros(input_shape[1:])
-        # Loop over the flattened data, i.e. across all the data points in
-        # each slice of the coordinate we are collapsing over, finding the
-        # blended percentile values at each point.
-        for i in range(data.shape[-1]):
-            result[:, i] = (
-                PercentileBlendingAggregator.blend_percentiles(
-                    data[:, :, i], arr_percent, arr_weights))
+        # Loop over chunks of the flattened data, i.e. across all the data
+        # points in each slice of the coordinate we are collapsing over,
+        # finding the blended percentile values at every point in the chunk.
+        for start in range(0, data.shape[-1], chunk_size):
+            stop = start + chunk_size
+            result[:, start:stop] = (
+                PercentileBlendingAggregator.blend_percentiles_vectorised(
+                    np.moveaxis(data[:, :, start:stop], -1, 0),
+                    arr_percent, arr_weights).T)
         # Reshape the data and put the percentile dimension
         # back in the right place
         shape = arr_percent.shape + shape
@@ -310,6 +327,58 @@ class PercentileBlendingAggregator(object):
                                       combined_perc_thres_data)
         return new_combined_perc
 
+    @staticmethod
+    def blend_percentiles_vectorised(perc_values, percentiles, weights):
+        """ Blend percentiles function, to calculate the weighted blend across
+            a given axis of percentile data for many grid points at once.
+            This implements the same algorithm as blend_percentiles, with
+            the interpolation and sorting done for all grid points at once.
+
+        Args:
+            perc_values (np.array):
+                    Array containing the percentile values to blend, with
+                    shape: (num of grid points, length of coord to blend,
+                    num of percentiles)
+            percentiles (np.array):
+                    Array of percentile values e.g
+                    [0, 20.0, 50.0, 70.0, 100.0],
+                    same size as the percentile dimension of data.
+            weights (np.array):
+                    Array of weights, same size as the axis dimension of data,
+                    that we will blend over.
+
+        Returns:
+            result (np.array):
+                    containing the weighted percentile blend data
+                    across the chosen coord, with shape:
+                    (num of grid points, num of percentiles)
+        """
+        num_points, num, num_percentiles = perc_values.shape
+        percentiles = np.asarray(percentiles, dtype=float)
+        # Create an array to store the weighted blending pdf at each point.
+        combined_pdf = np.zeros((num_points, num, num_percentiles))
+        for i in range(0, num):
+            for j in range(0, num):
+                if i == j:
+                    recalc_values_in_pdf = percentiles
+                else:
+                    recalc_values_in_pdf = interpolate_multiple_rows(
+                        perc_values[:, i], perc_values[:, j], percentiles)
+                combined_pdf[:, i] += recalc_values_in_pdf*weights[j]
+
+        # Combine and sort the threshold values and the blended probability
+        # values for each of the grid points.
+        combined_perc_thres_data = np.sort(
+            perc_values.reshape(num_points, -1), axis=-1)
+        combined_perc_values = np.sort(
+            combined_pdf.reshape(num_points, -1), axis=-1)
+
+        # Find the percentile values from this combined data by interpolating
+        # back from probability values to the original percentiles.
+        new_combined_perc = interpolate_multiple_rows(
+            percentiles, combined_perc_values, combined_perc_thres_data)
+        return new_combined_perc
+
 
 class MaxProbabilityAggregator(object):
     """Class for the Aggregator used to calculate the maximum weighted
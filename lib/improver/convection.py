@@ -36,6 +36,7 @@ import numpy as np
 from improver.utilities.spatial import DifferenceBetweenAdjacentGridSquares
 from improver.threshold import BasicThreshold
 from improver.nbhood.nbhood import NeighbourhoodProcessing
+from improver.utilities.instrumentation import instrumented
 
 
 class DiagnoseConvectivePrecipitation(object):
@@ -121,6 +122,8 @@ class DiagnoseConvectivePrecipitation(object):
             self.below_thresh_ok, self.lead_times, self.weighted_mode,
             self.ens_factor, self.use_adjacent_grid_square_differences)
 
+    @instrumented(
+        "DiagnoseConvectivePrecipitation._calculate_convective_ratio")
     def _calculate_convective_ratio(self, cubelist, threshold_list):
         """
         Calculate the convective ratio by:
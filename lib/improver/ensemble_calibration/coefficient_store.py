@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+File-backed store of the optimised coefficients from ensemble calibration,
+so that each cycle can be warm-started from the coefficients of the
+previous cycle.
+
+"""
+import json
+import os
+
+import numpy as np
+
+from improver.utilities.save import atomic_write
+
+
+class CoefficientStore(object):
+    """
+    Store and retrieve the most recent optimised EMOS coefficients in a
+    directory. Coefficients are keyed by the diagnostic, distribution,
+    predictor_of_mean_flag and forecast period, and are stored with the
+    validity time of the forecast that they were estimated for.
+
+    """
+
+    def __init__(self, store_dir):
+        """
+        Args:
+            store_dir (string):
+                Path to the directory in which the coefficients are stored.
+                This is created if it does not already exist when
+                coefficients are first saved.
+
+        """
+        self.store_dir = store_dir
+
+    def __repr__(self):
+        """Represent the configured plugin instance as a string."""
+        return '<CoefficientStore: store_dir: {}>'.format(self.store_dir)
+
+    @staticmethod
+    def key(diagnostic, distribution, predictor_of_mean_flag,
+            forecast_period):
+        """
+        Construct the key identifying a set of coefficients.
+
+        Args:
+            diagnostic (string):
+                Name of the diagnostic being calibrated.
+            distribution (string):
+                Name of the distribution used for calibration.
+            predictor_of_mean_flag (string):
+                String to specify the input to calculate the calibrated mean.
+            forecast_period (int or float):
+                Forecast period in seconds.
+
+        Returns:
+            string:
+                Key for the coefficients, which is safe to use as a filename.
+
+        """
+        key = '{}-{}-{}-PT{}S'.format(
+            diagnostic, distribution, predictor_of_mean_flag,
+            int(round(forecast_period)))
+        return key.lower().replace(' ', '_').replace(os.sep, '_')
+
+    def filepath(self, key):
+        """
+        Args:
+            key (string):
+                Key from the key method.
+
+        Returns:
+            string:
+                Path to the file storing the coefficients for the given key.
+
+        """
+        return os.path.join(self.store_dir, 'coefficients_{}.json'.format(key))
+
+    def load(self, key):
+        """
+        Load the stored coefficients for the given key.
+
+        Args:
+            key (string):
+                Key from the key method.
+
+        Returns:
+            (tuple or None): tuple containing:
+                **coefficients** (numpy.ndarray):
+                    The stored coefficients.
+                **validity_time** (float):
+                    Validity time of the forecast that the coefficients were
+                    estimated for, in seconds since 1970-01-01 00:00:00.
+            None is returned if no coefficients are stored for the key.
+
+        """
+        filepath = self.filepath(key)
+        if not os.path.isfile(filepath):
+            return None
+        with open(filepath, 'r') as store_file:
+            stored = json.load(store_file)
+        return (np.array(stored['coefficients'], dtype=np.float64),
+                stored['validity_time'])
+
+    def save(self, key, coefficients, validity_time):
+        """
+        Save the coefficients for the given key, replacing any coefficients
+        already stored.
+
+        Args:
+            key (string):
+                Key from the key method.
+            coefficients (numpy.ndarray or list):
+                The optimised coefficients.
+            validity_time (float):
+                Validity time of the forecast that the coefficients were
+                estimated for, in seconds since 1970-01-01 00:00:00.
+
+        """
+        if not os.path.isdir(self.store_dir):
+            os.makedirs(self.store_dir)
+        filepath = self.filepath(key)
+        stored = {
+            'coefficients': np.asarray(
+                coefficients, dtype=np.float64).tolist(),
+            'validity_time': float(validity_time)}
+        with atomic_write(filepath) as store_file:
+            json.dump(stored, store_file)
@@ -32,6 +32,10 @@
 This module defines all the "plugins" specific for ensemble calibration.
 
 """
+from functools import partial
+import multiprocessing as mp
+import os
+
 import numpy as np
 from scipy import stats
 from scipy.optimize import minimize
@@ -41,6 +45,10 @@ import warnings
 import cf_units as unit
 import iris
 
+from improver.ensemble_calibration.coefficient_store import (
+    CoefficientStore)
+from improver.ensemble_calibration.training_accumulator import (
+    TrainingDataAccumulator)
 from improver.ensemble_calibration.ensemble_calibration_utilities import (
     convert_cube_data_to_2d, rename_coordinate, check_predictor_of_mean_flag)
 from improver.utilities.cube_manipulation import (
@@ -58,10 +66,13 @@ class ContinuousRankedProbabilityScoreMinimisers(object):
     The number of coefficients that will be optimised depend upon the initial
     guess.
 
-    Minimisation is performed using the Nelder-Mead algorithm for 200
-    iterations to limit the computational expense.
+    By default, minimisation is performed using the Nelder-Mead algorithm for
+    200 iterations to limit the computational expense.
     Note that the BFGS algorithm was initially trialled but had a bug
     in comparison to comparative results generated in R.
+    Alternatively, the L-BFGS-B algorithm can be used with the analytic
+    gradient of the CRPS, which requires far fewer evaluations of the CRPS
+    over the training data.
 
     """
 
@@ -76,12 +87,73 @@ class ContinuousRankedProbabilityScoreMinimisers(object):
     # as part of the minimisation.
     BAD_VALUE = np.float64(999999)
 
-    def __init__(self):
+    # Minimisation methods supported, mapped to the name used by scipy.
+    MINIMISATION_METHODS = {"nelder-mead": "Nelder-Mead",
+                            "l-bfgs-b": "L-BFGS-B"}
+
+    def __init__(self, minimisation_method="nelder-mead"):
+        """
+        Initialise the class.
+
+        Args:
+            minimisation_method (String):
+                Name of the scipy minimisation method. Either "nelder-mead",
+                which only requires the CRPS, or "l-bfgs-b", which also uses
+                the analytic gradient of the CRPS. Default is "nelder-mead".
+
+        Raises:
+            ValueError: If the minimisation method is not supported.
+
+        """
+        if minimisation_method.lower() not in self.MINIMISATION_METHODS:
+            msg = ("Minimisation method requested {} is not supported. "
+                   "Supported methods are {}".format(
+                       minimisation_method,
+                       sorted(self.MINIMISATION_METHODS.keys())))
+            raise ValueError(msg)
+        self.minimisation_method = minimisation_method.lower()
         # Dictionary containing the minimisation functions, which will
         # be used, depending upon the distribution, which is requested.
         self.minimisation_dict = {
             "gaussian": self.normal_crps_minimiser,
             "truncated gaussian": self.truncated_normal_crps_minimiser}
+        # Dictionary containing the functions that calculate the gradient
+        # of the CRPS with respect to the coefficients.
+        self.gradient_dict = {
+            "gaussian": self.normal_crps_gradient,
+            "truncated gaussian": self.truncated_normal_crps_gradient}
+
+    def __repr__(self):
+        """Represent the configured plugin instance as a string."""
+        result = ('<ContinuousRankedProbabilityScoreMinimisers: '
+                  'minimisation_method: {}>')
+        return result.format(self.minimisation_method)
+
+    def _get_minimisation_function(self, distribution):
+        """
+        Look up the minimisation function for the requested distribution.
+
+        Args:
+            distribution (String):
+                String used to access the appropriate minimisation function
+                within self.minimisation_dict.
+
+        Returns:
+            minimisation_function (function):
+                Function that calculates the CRPS for the distribution.
+
+        Raises:
+            KeyError: If the distribution is not supported.
+
+        """
+        try:
+            minimisation_function = self.minimisation_dict[distribution]
+        except KeyError as err:
+            msg = ("Distribution requested {} is not supported in {}"
+                   "Error message is {}".format(
+                       distribution, self.minimisation_dict, err))
+            raise KeyError(msg)
+        return minimisation_function
 
     def crps_minimiser_wrapper(
             self, initial_guess, forecast_predictor, truth, forecast_var,
@@ -114,6 +186,60 @@ class ContinuousRankedProbabilityScoreMinimisers(object):
                 List of optimised coefficients.
                 Order of coefficients is [c, d, a, b].
 
+        """
+        # Ensure the distribution and predictor_of_mean_flag are valid.
+        self._get_minimisation_function(distribution)
+        check_predictor_of_mean_flag(predictor_of_mean_flag)
+
+        if predictor_of_mean_flag.lower() in ["mean"]:
+            forecast_predictor_data = forecast_predictor.data.flatten()
+            truth_data = truth.data.flatten()
+            forecast_var_data = forecast_var.data.flatten()
+        elif predictor_of_mean_flag.lower() in ["members"]:
+            truth_data = truth.data.flatten()
+            forecast_predictor = (
+                enforce_coordinate_ordering(
+                    forecast_predictor, "realization"))
+            forecast_predictor_data = convert_cube_data_to_2d(
+                forecast_predictor)
+            forecast_var_data = forecast_var.data.flatten()
+
+        return self.minimise_crps(
+            initial_guess, forecast_predictor_data, truth_data,
+            forecast_var_data, predictor_of_mean_flag, distribution)
+
+    def minimise_crps(
+            self, initial_guess, forecast_predictor_data, truth_data,
+            forecast_var_data, predictor_of_mean_flag, distribution):
+        """
+        Function to pass flattened training data to the scipy minimize
+        function to estimate optimised values for the coefficients.
+
+        Args:
+            initial_guess (List):
+                List of optimised coefficients.
+                Order of coefficients is [c, d, a, b].
+            forecast_predictor_data (Numpy array):
+                Data to be used as the predictor, either the flattened
+                ensemble mean or a 2d array of the ensemble members with
+                shape (points, members).
+            truth_data (Numpy array):
+                Flattened data to be used as truth.
+            forecast_var_data (Numpy array):
+                Flattened ensemble variance data.
+            predictor_of_mean_flag (String):
+                String to specify the input to calculate the calibrated mean.
+                Currently the ensemble mean ("mean") and the ensemble members
+                ("members") are supported as the predictors.
+            distribution (String):
+                String used to access the appropriate minimisation function
+                within self.minimisation_dict.
+
+        Returns:
+            optimised_coeffs (List):
+                List of optimised coefficients.
+                Order of coefficients is [c, d, a, b].
+
         """
         def calculate_percentage_change_in_last_iteration(allvecs):
             """
@@ -143,48 +269,39 @@ class ContinuousRankedProbabilityScoreMinimisers(object):
                            allvecs[-2], np.absolute(allvecs[-2]-allvecs[-1]))
                 warnings.warn(msg)
 
-        try:
-            minimisation_function = self.minimisation_dict[distribution]
-        except KeyError as err:
-            msg = ("Distribution requested {} is not supported in {}"
-                   "Error message is {}".format(
-                       distribution, self.minimisation_dict, err))
-            raise KeyError(msg)
-
-        # Ensure predictor_of_mean_flag is valid.
-        check_predictor_of_mean_flag(predictor_of_mean_flag)
-
-        if predictor_of_mean_flag.lower() in ["mean"]:
-            forecast_predictor_data = forecast_predictor.data.flatten()
-            truth_data = truth.data.flatten()
-            forecast_var_data = forecast_var.data.flatten()
-        elif predictor_of_mean_flag.lower() in ["members"]:
-            truth_data = truth.data.flatten()
-            forecast_predictor = (
-                enforce_coordinate_ordering(
-                    forecast_predictor, "realization"))
-            forecast_predictor_data = convert_cube_data_to_2d(
-                forecast_predictor)
-            forecast_var_data = forecast_var.data.flatten()
+        minimisation_function = self._get_minimisation_function(
+            distribution)
 
         initial_guess = np.array(initial_guess, dtype=np.float32)
         forecast_predictor_data = forecast_predictor_data.astype(np.float32)
         forecast_var_data = forecast_var_data.astype(np.float32)
         truth_data = truth_data.astype(np.float32)
         sqrt_pi = np.sqrt(np.pi).astype(np.float32)
-
-        optimised_coeffs = minimize(
-            minimisation_function, initial_guess,
-            args=(forecast_predictor_data, truth_data,
-                  forecast_var_data, sqrt_pi, predictor_of_mean_flag),
-            method="Nelder-Mead",
-            options={"maxiter": self.MAX_ITERATIONS, "return_all": True})
+        minimisation_args = (forecast_predictor_data, truth_data,
+                             forecast_var_data, sqrt_pi,
+                             predictor_of_mean_flag)
+
+        if self.minimisation_method == "l-bfgs-b":
+            optimised_coeffs = minimize(
+                minimisation_function, initial_guess,
+                args=minimisation_args,
+                jac=self.gradient_dict[distribution],
+                method=self.MINIMISATION_METHODS[self.minimisation_method],
+                options={"maxiter": self.MAX_ITERATIONS})
+        else:
+            optimised_coeffs = minimize(
+                minimisation_function, initial_guess,
+                args=minimisation_args,
+                method=self.MINIMISATION_METHODS[self.minimisation_method],
+                options={"maxiter": self.MAX_ITERATIONS, "return_all": True})
         if not optimised_coeffs.success:
             msg = ("Minimisation did not result in convergence after "
                    "{} iterations. \n{}".format(
                        self.MAX_ITERATIONS, optimised_coeffs.message))
             warnings.warn(msg)
-        calculate_percentage_change_in_last_iteration(optimised_coeffs.allvecs)
+        if self.minimisation_method == "nelder-mead":
+            calculate_percentage_change_in_last_iteration(
+                optimised_coeffs.allvecs)
         return optimised_coeffs.x
 
     def normal_crps_minimiser(
@@ -304,6 +421,221 @@ class ContinuousRankedProbabilityScoreMinimisers(object):
             result = self.BAD_VALUE
         return result
 
+    @staticmethod
+    def _crps_gradient_for_coefficients(
+            initial_guess, forecast_predictor, forecast_var, sigma,
+            crps_gradient_mu, crps_gradient_sigma, predictor_of_mean_flag):
+        """
+        Convert the gradient of the CRPS at each point with respect to the
+        location (mu) and scale (sigma) of the distribution into the
+        gradient of the summed CRPS with respect to the coefficients.
+
+        Args:
+            initial_guess (List):
+                List of coefficients.
+                Order of coefficients is [c, d, a, b].
+            forecast_predictor (Numpy array):
+                Data to be used as the predictor,
+                either the ensemble mean or the ensemble members.
+            forecast_var (Numpy array):
+                Ensemble variance data.
+            sigma (Numpy array):
+                Scale of the distribution at each point.
+            crps_gradient_mu (Numpy array):
+                Gradient of the CRPS at each point with respect to mu.
+            crps_gradient_sigma (Numpy array):
+                Gradient of the CRPS at each point with respect to sigma.
+            predictor_of_mean_flag (String):
+                String to specify the input to calculate the calibrated mean.
+                Currently the ensemble mean ("mean") and the ensemble members
+                ("members") are supported as the predictors.
+
+        Returns:
+            gradient (Numpy array):
+                Gradient of the CRPS with respect to each coefficient.
+
+        """
+        # sigma = sqrt(c^2 + d^2 * var), so dsigma/dc = c / sigma and
+        # dsigma/dd = d * var / sigma.
+        gradient_c = np.nansum(crps_gradient_sigma * initial_guess[0] / sigma)
+        gradient_d = np.nansum(
+            crps_gradient_sigma * initial_guess[1] * forecast_var / sigma)
+        # mu = a + sum(b * X), so dmu/da = 1 and dmu/db = X, or
+        # dmu/db = 2 * b * X, if b^2 is used to weight the ensemble members.
+        gradient_a = np.nansum(crps_gradient_mu)
+        predictors = forecast_predictor.reshape(len(crps_gradient_mu), -1)
+        gradient_b = np.nansum(
+            crps_gradient_mu[:, np.newaxis] * predictors, axis=0)
+        if predictor_of_mean_flag.lower() in ["members"]:
+            gradient_b = 2 * np.asarray(initial_guess[3:]) * gradient_b
+        return np.concatenate(
+            [[gradient_c, gradient_d, gradient_a], gradient_b]).astype(
+                np.float64)
+
+    def normal_crps_gradient(
+            self, initial_guess, forecast_predictor, truth, forecast_var,
+            sqrt_pi, predictor_of_mean_flag):
+        """
+        Calculate the gradient of the CRPS for a normal distribution, as
+        calculated by normal_crps_minimiser, with respect to each of the
+        coefficients.
+
+        For a normal distribution, the gradient of the CRPS with respect to
+        mu is 1 - 2*cdf(z) and the gradient with respect to sigma is
+        2*pdf(z) - 1/sqrt(pi), where z = (truth - mu) / sigma.
+
+        Args:
+            initial_guess : List
+                List of coefficients.
+                Order of coefficients is [c, d, a, b].
+            forecast_predictor : Numpy array
+                Data to be used as the predictor,
+                either the ensemble mean or the ensemble members.
+            truth : Numpy array
+                Data to be used as truth.
+            forecast_var : Numpy array
+                Ensemble variance data.
+            sqrt_pi : Numpy array
+                Square root of Pi
+            predictor_of_mean_flag : String
+                String to specify the input to calculate the calibrated mean.
+                Currently the ensemble mean ("mean") and the ensemble members
+                ("members") are supported as the predictors.
+
+        Returns:
+            gradient (Numpy array):
+                Gradient of the CRPS with respect to each coefficient.
+                If the CRPS is set to BAD_VALUE, the gradient is zero.
+
+        """
+        if predictor_of_mean_flag.lower() in ["mean"]:
+            beta = initial_guess[2:]
+        elif predictor_of_mean_flag.lower() in ["members"]:
+            beta = np.array([initial_guess[2]]+(initial_guess[3:]**2).tolist())
+
+        new_col = np.ones(truth.shape)
+        all_data = np.column_stack((new_col, forecast_predictor))
+        mu = np.dot(all_data, beta)
+        sigma = np.sqrt(
+            initial_guess[0]**2 + initial_guess[1]**2 * forecast_var)
+        if not np.isfinite(np.min(mu/sigma)):
+            return np.zeros(len(initial_guess))
+        xz = (truth - mu) / sigma
+        crps_gradient_mu = 1 - 2 * norm.cdf(xz)
+        crps_gradient_sigma = 2 * norm.pdf(xz) - 1 / sqrt_pi
+        return self._crps_gradient_for_coefficients(
+            initial_guess, forecast_predictor, forecast_var, sigma,
+            crps_gradient_mu, crps_gradient_sigma, predictor_of_mean_flag)
+
+    def truncated_normal_crps_gradient(
+            self, initial_guess, forecast_predictor, truth, forecast_var,
+            sqrt_pi, predictor_of_mean_flag):
+        """
+        Calculate the gradient of the CRPS for a truncated normal
+        distribution, as calculated by truncated_normal_crps_minimiser, with
+        respect to each of the coefficients.
+
+        Args:
+            initial_guess (List):
+                List of coefficients.
+                Order of coefficients is [c, d, a, b].
+            forecast_predictor (Numpy array):
+                Data to be used as the predictor,
+                either the ensemble mean or the ensemble members.
+            truth (Numpy array):
+                Data to be used as truth.
+            forecast_var (Numpy array):
+                Ensemble variance data.
+            sqrt_pi (Numpy array):
+                Square root of Pi
+            predictor_of_mean_flag (String):
+                String to specify the input to calculate the calibrated mean.
+                Currently the ensemble mean ("mean") and the ensemble members
+                ("members") are supported as the predictors.
+
+        Returns:
+            gradient (Numpy array):
+                Gradient of the CRPS with respect to each coefficient.
+                If the CRPS is set to BAD_VALUE, the gradient is zero.
+
+        """
+        if predictor_of_mean_flag.lower() in ["mean"]:
+            beta = initial_guess[2:]
+        elif predictor_of_mean_flag.lower() in ["members"]:
+            beta = np.array([initial_guess[2]]+(initial_guess[3:]**2).tolist())
+
+        new_col = np.ones(truth.shape)
+        all_data = np.column_stack((new_col, forecast_predictor))
+        mu = np.dot(all_data, beta)
+        sigma = np.sqrt(
+            initial_guess[0]**2 + initial_guess[1]**2 * forecast_var)
+        if not np.isfinite(np.min(mu/sigma)) or (np.min(mu/sigma) < -3):
+            return np.zeros(len(initial_guess))
+        xz = (truth - mu) / sigma
+        normal_cdf = norm.cdf(xz)
+        normal_pdf = norm.pdf(xz)
+        x0 = mu / sigma
+        normal_cdf_0 = norm.cdf(x0)
+        normal_pdf_0 = norm.pdf(x0)
+        normal_cdf_root_two = norm.cdf(np.sqrt(2) * x0)
+        normal_pdf_root_two = norm.pdf(np.sqrt(2) * x0)
+
+        # The CRPS at each point is sigma * inner / cdf(x0)**2, where inner
+        # is a function of z = (truth - mu) / sigma and x0 = mu / sigma.
+        inner = (
+            xz * normal_cdf_0 * (2 * normal_cdf + normal_cdf_0 - 2) +
+            2 * normal_pdf * normal_cdf_0 - normal_cdf_root_two / sqrt_pi)
+        inner_gradient_z = normal_cdf_0 * (2 * normal_cdf + normal_cdf_0 - 2)
+        inner_gradient_x0 = (
+            xz * normal_pdf_0 * (2 * normal_cdf + 2 * normal_cdf_0 - 2) +
+            2 * normal_pdf * normal_pdf_0 -
+            np.sqrt(2) * normal_pdf_root_two / sqrt_pi)
+
+        # dz/dmu = -1/sigma, dx0/dmu = 1/sigma,
+        # dz/dsigma = -z/sigma and dx0/dsigma = -x0/sigma.
+        crps_gradient_mu = (
+            (inner_gradient_x0 - inner_gradient_z) / normal_cdf_0**2 -
+            2 * inner * normal_pdf_0 / normal_cdf_0**3)
+        crps_gradient_sigma = (
+            (inner - xz * inner_gradient_z - x0 * inner_gradient_x0) /
+            normal_cdf_0**2 +
+            2 * inner * x0 * normal_pdf_0 / normal_cdf_0**3)
+        return self._crps_gradient_for_coefficients(
+            initial_guess, forecast_predictor, forecast_var, sigma,
+            crps_gradient_mu, crps_gradient_sigma, predictor_of_mean_flag)
+
+
+def _minimise_crps_for_partition(
+        minimisation_method, predictor_of_mean_flag, distribution,
+        training_data):
+    """
+    Estimate the coefficients for a single partition of the training data.
+    This is defined at module level so that it can be dispatched to the
+    processes of a multiprocessing pool.
+
+    Args:
+        minimisation_method (String):
+            Name of the scipy minimisation method.
+        predictor_of_mean_flag (String):
+            String to specify the input to calculate the calibrated mean.
+        distribution (String):
+            Name of the distribution used for the minimisation.
+        training_data (tuple):
+            Tuple of the initial guess, forecast predictor, truth and
+            forecast variance arrays for the partition.
+
+    Returns:
+        optimised_coeffs (Numpy array):
+            Optimised coefficients for the partition.
+
+    """
+    initial_guess, forecast_predictor, truth, forecast_var = training_data
+    minimiser = ContinuousRankedProbabilityScoreMinimisers(
+        minimisation_method=minimisation_method)
+    return minimiser.minimise_crps(
+        initial_guess, forecast_predictor, truth, forecast_var,
+        predictor_of_mean_flag, distribution)
+
 
 class EstimateCoefficientsForEnsembleCalibration(object):
     """
@@ -318,7 +650,10 @@ class EstimateCoefficientsForEnsembleCalibration(object):
     ESTIMATE_COEFFICIENTS_FROM_LINEAR_MODEL_FLAG = True
 
     def __init__(self, distribution, desired_units,
-                 predictor_of_mean_flag="mean"):
+                 predictor_of_mean_flag="mean", partitions=None,
+                 num_processes=1, minimisation_method="nelder-mead",
+                 coefficient_store_dir=None, max_coefficient_age=None,
+                 training_data_dir=None, training_window=None):
         """
         Create an ensemble calibration plugin that, for Nonhomogeneous Gaussian
         Regression, calculates coefficients based on historical forecasts and
@@ -336,12 +671,67 @@ class EstimateCoefficientsForEnsembleCalibration(object):
                 String to specify the input to calculate the calibrated mean.
                 Currently the ensemble mean ("mean") and the ensemble members
                 ("members") are supported as the predictors.
+            partitions (Numpy array or None):
+                Integer array of partition labels matching the trailing
+                (spatial) dimensions of the truth, e.g. a region mask, or the
+                output of create_tile_partitions. If provided, a separate
+                set of coefficients is estimated for each unique label.
+                Default is None, which estimates a single set of coefficients
+                for the whole domain.
+            num_processes (Int):
+                Number of processes used to estimate the coefficients for
+                the partitions in parallel. Default is 1, which estimates the
+                coefficients for each partition in turn.
+            minimisation_method (String):
+                Name of the scipy minimisation method used to minimise the
+                CRPS. Either "nelder-mead" or "l-bfgs-b", which uses the
+                analytic gradient of the CRPS. Default is "nelder-mead".
+            coefficient_store_dir (String or None):
+                Path to a directory in which the optimised coefficients are
+                stored. If provided, the minimisation for each forecast
+                period is started from the stored coefficients of the
+                previous cycle, and the new coefficients are stored.
+                Default is None, which does not use a coefficient store.
+            max_coefficient_age (Float or None):
+                Maximum age in hours, relative to the validity time of the
+                current forecast, for which stored coefficients are reused
+                without performing the minimisation. Default is None, which
+                always performs the minimisation.
+            training_data_dir (String or None):
+                Path to a directory in which rolling training data are
+                accumulated. If provided, the historic forecasts and truths
+                are appended to the training data for each forecast period,
+                and the coefficients are estimated from the accumulated
+                training data, so that only forecasts that have not already
+                been accumulated need to be provided. Default is None.
+            training_window (Int or None):
+                Number of historic forecasts held in the rolling training
+                data. Required if training_data_dir is provided.
+
+        Raises:
+            ValueError: If training_data_dir is provided without
+                training_window.
 
         """
         self.distribution = distribution
         self.desired_units = desired_units
         self.predictor_of_mean_flag = predictor_of_mean_flag
-        self.minimiser = ContinuousRankedProbabilityScoreMinimisers()
+        if partitions is not None:
+            partitions = np.asarray(partitions)
+        self.partitions = partitions
+        self.num_processes = num_processes
+        self.coefficient_store = None
+        if coefficient_store_dir is not None:
+            self.coefficient_store = CoefficientStore(coefficient_store_dir)
+        self.max_coefficient_age = max_coefficient_age
+        if training_data_dir is not None and not training_window:
+            msg = ("A training_window is required to accumulate training "
+                   "data in {}".format(training_data_dir))
+            raise ValueError(msg)
+        self.training_data_dir = training_data_dir
+        self.training_window = training_window
+        self.minimiser = ContinuousRankedProbabilityScoreMinimisers(
+            minimisation_method=minimisation_method)
 
         import imp
         try:
@@ -366,10 +756,16 @@ class EstimateCoefficientsForEnsembleCalibration(object):
                   'distribution: {};' +
                   'desired_units: {}>' +
                   'predictor_of_mean_flag: {}>' +
-                  'minimiser: {}')
+                  'minimiser: {}; ' +
+                  'partitioned: {}; num_processes: {}; ' +
+                  'coefficient_store: {}; max_coefficient_age: {}; ' +
+                  'training_data_dir: {}; training_window: {}')
         return result.format(
             self.distribution, self.desired_units,
-            self.predictor_of_mean_flag, self.minimiser)
+            self.predictor_of_mean_flag, self.minimiser,
+            self.partitions is not None, self.num_processes,
+            self.coefficient_store, self.max_coefficient_age,
+            self.training_data_dir, self.training_window)
 
     def compute_initial_guess(
             self, truth, forecast_predictor, predictor_of_mean_flag,
@@ -459,6 +855,301 @@ class EstimateCoefficientsForEnsembleCalibration(object):
                         [1, 1, 0] + np.repeat(1, no_of_members).tolist())
         return initial_guess
 
+    def estimate_coefficients_for_partitions(
+            self, initial_guess, forecast_predictor, truth, forecast_var):
+        """
+        Estimate a separate set of coefficients for each partition defined by
+        self.partitions. The minimisations for the partitions are independent
+        of each other, so they are distributed across a pool of
+        self.num_processes processes, if more than one process is requested.
+
+        Args:
+            initial_guess (List or Numpy array):
+                Initial guess for the coefficients. Either a single list of
+                coefficients used for every partition, or a 2d array with
+                one row of coefficients per partition.
+            forecast_predictor (Iris cube):
+                Cube containing the fields to be used as the predictor,
+                either the ensemble mean or the ensemble members.
+            truth (Iris cube):
+                Cube containing the field, which will be used as truth.
+            forecast_var (Iris cube):
+                Cube containg the field containing the ensemble variance.
+
+        Returns:
+            optimised_coeffs (Numpy array):
+                2d array of optimised coefficients with one row for each
+                partition, ordered by the sorted partition labels.
+                Order of coefficients within each row is [c, d, a, b].
+
+        Raises:
+            ValueError: If the partitions do not match the trailing
+                dimensions of the truth.
+
+        """
+        partitions_ndim = self.partitions.ndim
+        if truth.shape[-partitions_ndim:] != self.partitions.shape:
+            msg = ("The shape of the partitions {} does not match the "
+                   "trailing dimensions of the truth {}.".format(
+                       self.partitions.shape, truth.shape))
+            raise ValueError(msg)
+
+        if self.predictor_of_mean_flag.lower() in ["mean"]:
+            forecast_predictor_data = forecast_predictor.data.flatten()
+        elif self.predictor_of_mean_flag.lower() in ["members"]:
+            forecast_predictor = (
+                enforce_coordinate_ordering(
+                    forecast_predictor, "realization"))
+            forecast_predictor_data = convert_cube_data_to_2d(
+                forecast_predictor)
+        truth_data = truth.data.flatten()
+        forecast_var_data = forecast_var.data.flatten()
+        labels = np.broadcast_to(self.partitions, truth.shape).flatten()
+        return self._minimise_partitions(
+            initial_guess, forecast_predictor_data, truth_data,
+            forecast_var_data, labels)
+
+    def _minimise_partitions(
+            self, initial_guess, forecast_predictor_data, truth_data,
+            forecast_var_data, labels):
+        """
+        Group flattened training data by partition label and estimate the
+        coefficients for each partition, using a pool of processes if more
+        than one process is requested.
+
+        Args:
+            initial_guess (List or Numpy array):
+                Initial guess for the coefficients. Either a single list of
+                coefficients used for every partition, or a 2d array with
+                one row of coefficients per partition.
+            forecast_predictor_data (Numpy array):
+                Flattened forecast predictor, with shape (points,) or
+                (points, members).
+            truth_data (Numpy array):
+                Flattened truth.
+            forecast_var_data (Numpy array):
+                Flattened ensemble variance.
+            labels (Numpy array):
+                Partition label of each point of the flattened data.
+
+        Returns:
+            optimised_coeffs (Numpy array):
+                2d array of optimised coefficients with one row for each
+                partition, ordered by the sorted partition labels.
+
+        """
+        partition_labels = np.unique(labels)
+        order = np.argsort(labels, kind="mergesort")
+        bounds = np.searchsorted(
+            labels[order], np.append(partition_labels, np.inf))
+        initial_guesses = np.broadcast_to(
+            np.asarray(initial_guess, dtype=np.float64),
+            (len(partition_labels), np.shape(initial_guess)[-1]))
+
+        training_data = []
+        for index in range(len(partition_labels)):
+            indices = order[bounds[index]:bounds[index + 1]]
+            training_data.append(
+                (initial_guesses[index], forecast_predictor_data[indices],
+                 truth_data[indices], forecast_var_data[indices]))
+
+        minimise = partial(
+            _minimise_crps_for_partition,
+            self.minimiser.minimisation_method, self.predictor_of_mean_flag,
+            self.distribution.lower())
+        if self.num_processes > 1:
+            pool = mp.Pool(
+                processes=min(self.num_processes, len(training_data)))
+            try:
+                optimised_coeffs = pool.map(minimise, training_data)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            optimised_coeffs = [minimise(data) for data in training_data]
+        return np.array(optimised_coeffs)
+
+    def estimate_coefficients_from_training_data(
+            self, initial_guess, forecast_predictor_data, truth_data,
+            forecast_var_data, no_of_forecasts):
+        """
+        Estimate the coefficients from flattened training data, such as the
+        data returned by TrainingDataAccumulator.training_data. If
+        partitions have been specified, a separate set of coefficients is
+        estimated for each partition.
+
+        Args:
+            initial_guess (List or Numpy array):
+                Initial guess for the coefficients.
+                Order of coefficients is [c, d, a, b].
+            forecast_predictor_data (Numpy array):
+                Flattened forecast predictor, with shape (points,) or
+                (points, members).
+            truth_data (Numpy array):
+                Flattened truth.
+            forecast_var_data (Numpy array):
+                Flattened ensemble variance.
+            no_of_forecasts (Int):
+                Number of forecasts within the training data, each of which
+                covers the full horizontal grid.
+
+        Returns:
+            optimised_coeffs (Numpy array):
+                Optimised coefficients, or a 2d array with a row of
+                coefficients for each partition.
+
+        Raises:
+            ValueError: If the partitions do not match the size of the
+                training data.
+
+        """
+        if self.partitions is None:
+            return self.minimiser.minimise_crps(
+                initial_guess, forecast_predictor_data, truth_data,
+                forecast_var_data, self.predictor_of_mean_flag,
+                self.distribution.lower())
+        if self.partitions.size * no_of_forecasts != len(truth_data):
+            msg = ("The number of points in the partitions {} does not "
+                   "match the number of points in each of the {} forecasts "
+                   "within the training data.".format(
+                       self.partitions.size, no_of_forecasts))
+            raise ValueError(msg)
+        labels = np.tile(self.partitions.flatten(), no_of_forecasts)
+        return self._minimise_partitions(
+            initial_guess, forecast_predictor_data, truth_data,
+            forecast_var_data, labels)
+
+    @staticmethod
+    def _validity_time_in_seconds(cube):
+        """Return the time point of a cube with a single time in seconds
+        since 1970-01-01 00:00:00."""
+        time_coord = cube.coord("time").copy()
+        time_coord.convert_units("seconds since 1970-01-01 00:00:00")
+        return time_coord.points[0]
+
+    def _accumulate_training_data(
+            self, current_forecast, forecast_predictor, forecast_var, truth):
+        """
+        Append the training data for each historic forecast time to the
+        rolling training data for the forecast period of the current
+        forecast, and return all of the accumulated training data.
+
+        Args:
+            current_forecast (Iris cube):
+                Cube containing the current forecast for a single time.
+            forecast_predictor (Iris cube):
+                Cube containing the historic forecast predictor, either the
+                ensemble mean or the ensemble members.
+            forecast_var (Iris cube):
+                Cube containing the historic ensemble variance.
+            truth (Iris cube):
+                Cube containing the truth matching the historic forecasts.
+
+        Returns:
+            (tuple): tuple containing the flattened forecast predictor,
+            truth and forecast variance, and the number of forecasts, as
+            returned by TrainingDataAccumulator.training_data.
+
+        """
+        forecast_period = current_forecast.coord("forecast_period").copy()
+        forecast_period.convert_units("seconds")
+        accumulator_dir = os.path.join(
+            self.training_data_dir, TrainingDataAccumulator.key(
+                current_forecast.name(), self.predictor_of_mean_flag,
+                forecast_period.points[0]))
+        accumulator = TrainingDataAccumulator(
+            accumulator_dir, self.training_window)
+
+        for predictor_slice, var_slice, truth_slice in zip(
+                forecast_predictor.slices_over("time"),
+                forecast_var.slices_over("time"),
+                truth.slices_over("time")):
+            if self.predictor_of_mean_flag.lower() in ["mean"]:
+                predictor_data = predictor_slice.data.flatten()
+            elif self.predictor_of_mean_flag.lower() in ["members"]:
+                predictor_data = convert_cube_data_to_2d(
+                    enforce_coordinate_ordering(
+                        predictor_slice, "realization"))
+            accumulator.append(
+                predictor_data, var_slice.data.flatten(),
+                truth_slice.data.flatten(),
+                self._validity_time_in_seconds(predictor_slice))
+        return accumulator.training_data()
+
+    def _coefficient_store_key(self, current_forecast):
+        """
+        Construct the key and validity time used to store the coefficients
+        for a current forecast.
+
+        Args:
+            current_forecast (Iris cube):
+                Cube containing the current forecast for a single time.
+
+        Returns:
+            (tuple): tuple containing:
+                **store_key** (String):
+                    Key for the coefficients within the coefficient store.
+                **validity_time** (Float):
+                    Validity time of the current forecast in seconds since
+                    1970-01-01 00:00:00.
+
+        """
+        forecast_period = current_forecast.coord("forecast_period").copy()
+        forecast_period.convert_units("seconds")
+        store_key = self.coefficient_store.key(
+            current_forecast.name(), self.distribution,
+            self.predictor_of_mean_flag, forecast_period.points[0])
+        return store_key, self._validity_time_in_seconds(current_forecast)
+
+    def _load_stored_coefficients(
+            self, store_key, validity_time, current_forecast):
+        """
+        Load the stored coefficients for a current forecast, if they exist
+        and have the number of coefficients and partitions required.
+
+        Args:
+            store_key (String):
+                Key for the coefficients within the coefficient store.
+            validity_time (Float):
+                Validity time of the current forecast in seconds since
+                1970-01-01 00:00:00.
+            current_forecast (Iris cube):
+                Cube containing the current forecast for a single time.
+
+        Returns:
+            (tuple): tuple containing:
+                **stored_coeffs** (Numpy array or None):
+                    The stored coefficients, or None if no suitable
+                    coefficients are stored.
+                **reuse_stored_coeffs** (Logical):
+                    True if the stored coefficients are no older than
+                    self.max_coefficient_age, so can be used without
+                    performing the minimisation.
+
+        """
+        stored = self.coefficient_store.load(store_key)
+        if stored is None:
+            return None, False
+        stored_coeffs, stored_validity_time = stored
+
+        if self.predictor_of_mean_flag.lower() in ["members"]:
+            no_of_coeffs = 3 + len(
+                current_forecast.coord("realization").points)
+        else:
+            no_of_coeffs = 4
+        if self.partitions is None:
+            expected_shape = (no_of_coeffs,)
+        else:
+            expected_shape = (len(np.unique(self.partitions)), no_of_coeffs)
+        if stored_coeffs.shape != expected_shape:
+            return None, False
+
+        age = validity_time - stored_validity_time
+        reuse_stored_coeffs = (
+            self.max_coefficient_age is not None and
+            0 <= age <= self.max_coefficient_age * 3600)
+        return stored_coeffs, reuse_stored_coeffs
+
     def estimate_coefficients_for_ngr(
             self, current_forecast, historic_forecast, truth):
         """
@@ -472,17 +1163,24 @@ class EstimateCoefficientsForEnsembleCalibration(object):
            forecast and truth exist in a form that can be processed.
         2. Loop through times within the concatenated current forecast cube:
 
-           1. Extract the desired forecast period from the historic forecasts
+           1. If a coefficient store is in use, load the stored coefficients
+              for the forecast period. If they are recent enough, reuse them
+              and move on to the next time.
+           2. Extract the desired forecast period from the historic forecasts
               to match the current forecasts. Apply unit conversion to ensure
               that historic forecasts have the desired units for calibration.
-           2. Extract the relevant truth to co-incide with the time within
+           3. Extract the relevant truth to co-incide with the time within
               the historic forecasts. Apply unit conversion to ensure
               that the truth has the desired units for calibration.
-           3. Calculate mean and variance.
-           4. Calculate initial guess at coefficient values by performing a
-              linear regression, if requested, otherwise default values are
-              used.
-           5. Perform minimisation.
+           4. Calculate mean and variance. If rolling training data are
+              being accumulated, append them to the training data.
+           5. Calculate initial guess at coefficient values from the stored
+              coefficients, if available, or by performing a linear
+              regression, if requested, otherwise default values are used.
+           6. Perform minimisation. If partitions have been specified, a
+              separate minimisation is performed for each partition.
+           7. Store the optimised coefficients, if a coefficient store is
+              in use.
 
         Args:
             current_forecast (Iris Cube or CubeList):
@@ -497,7 +1195,9 @@ class EstimateCoefficientsForEnsembleCalibration(object):
             (tuple): tuple containing:
                 **optimised_coeffs** (Dictionary):
                     Dictionary containing a list of the optimised coefficients
-                    for each date.
+                    for each date. If partitions have been specified, each
+                    entry is a 2d array containing a row of coefficients for
+                    each partition.
                 **coeff_names** (List):
                     The name of each coefficient.
 
@@ -590,6 +1290,18 @@ class EstimateCoefficientsForEnsembleCalibration(object):
                 current_forecast_cube.coord("time").points,
                 current_forecast_cube.coord("time").units.name,
                 current_forecast_cube.coord("time").units.calendar)[0]
+
+            stored_coeffs = None
+            if self.coefficient_store is not None:
+                store_key, validity_time = self._coefficient_store_key(
+                    current_forecast_cube)
+                stored_coeffs, reuse_stored_coeffs = (
+                    self._load_stored_coefficients(
+                        store_key, validity_time, current_forecast_cube))
+                if reuse_stored_coeffs:
+                    optimised_coeffs[date] = stored_coeffs
+                    continue
+
             # Extract desired forecast_period from historic_forecast_cubes.
             forecast_period_constr = iris.Constraint(
                 forecast_period=current_forecast_cube.coord(
@@ -628,10 +1340,19 @@ class EstimateCoefficientsForEnsembleCalibration(object):
             forecast_var = historic_forecast_cube.collapsed(
                 "realization", iris.analysis.VARIANCE)
 
+            training_data = None
+            if self.training_data_dir is not None:
+                training_data = self._accumulate_training_data(
+                    current_forecast_cube, forecast_predictor, forecast_var,
+                    truth_cube)
+
             # Computing initial guess for EMOS coefficients
-            # If no initial guess from a previous iteration, or if there
+            # Start from the stored coefficients, if available. Otherwise,
+            # if no initial guess from a previous iteration, or if there
             # are NaNs in the initial guess, calculate an initial guess.
-            if "initial_guess" not in locals() or nan_in_initial_guess:
+            if stored_coeffs is not None:
+                initial_guess = stored_coeffs
+            elif "initial_guess" not in locals() or nan_in_initial_guess:
                 initial_guess = self.compute_initial_guess(
                     truth_cube, forecast_predictor,
                     self.predictor_of_mean_flag,
@@ -641,7 +1362,18 @@ class EstimateCoefficientsForEnsembleCalibration(object):
             if np.any(np.isnan(initial_guess)):
                 nan_in_initial_guess = True
 
-            if not nan_in_initial_guess:
+            if not nan_in_initial_guess and training_data is not None:
+                optimised_coeffs[date] = (
+                    self.estimate_coefficients_from_training_data(
+                        initial_guess, *training_data))
+                initial_guess = optimised_coeffs[date]
+            elif not nan_in_initial_guess and self.partitions is not None:
+                optimised_coeffs[date] = (
+                    self.estimate_coefficients_for_partitions(
+                        initial_guess, forecast_predictor, truth_cube,
+                        forecast_var))
+                initial_guess = optimised_coeffs[date]
+            elif not nan_in_initial_guess:
                 # Need to access the x attribute returned by the
                 # minimisation function.
                 optimised_coeffs[date] = (
@@ -651,9 +1383,17 @@ class EstimateCoefficientsForEnsembleCalibration(object):
                         self.predictor_of_mean_flag,
                         self.distribution.lower()))
                 initial_guess = optimised_coeffs[date]
+            elif self.partitions is not None:
+                optimised_coeffs[date] = np.array(np.broadcast_to(
+                    initial_guess, (len(np.unique(self.partitions)),
+                                    np.shape(initial_guess)[-1])))
             else:
                 optimised_coeffs[date] = initial_guess
 
+            if self.coefficient_store is not None and not nan_in_initial_guess:
+                self.coefficient_store.save(
+                    store_key, optimised_coeffs[date], validity_time)
+
         return optimised_coeffs, coeff_names
 
 
@@ -664,7 +1404,7 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
     """
     def __init__(
             self, current_forecast, optimised_coeffs, coeff_names,
-            predictor_of_mean_flag="mean"):
+            predictor_of_mean_flag="mean", partitions=None):
         """
         Create an ensemble calibration plugin that, for Nonhomogeneous Gaussian
         Regression, applies coefficients created using on historical forecasts
@@ -682,12 +1422,19 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
                 String to specify the input to calculate the calibrated mean.
                 Currently the ensemble mean ("mean") and the ensemble members
                 ("members") are supported as the predictors.
+            partitions (Numpy array or None):
+                Integer array of partition labels with shape (y, x), as used
+                to estimate the coefficients. Required if the coefficients
+                for a date contain a row of coefficients for each partition.
 
         """
         self.current_forecast = current_forecast
         self.optimised_coeffs = optimised_coeffs
         self.coeff_names = coeff_names
         self.predictor_of_mean_flag = predictor_of_mean_flag
+        if partitions is not None:
+            partitions = np.asarray(partitions)
+        self.partitions = partitions
 
     def _find_coords_of_length_one(self, cube, add_dimension=True):
         """
@@ -748,7 +1495,8 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
             length_one_coords_for_dim_coords)
 
     def _create_coefficient_cube(
-            self, cube, optimised_coeffs_at_date, coeff_names):
+            self, cube, optimised_coeffs_at_date, coeff_names,
+            partition_labels=None):
         """
         Function to create a cube to store the coefficients used in the
         ensemble calibration.
@@ -760,6 +1508,10 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
                 Optimised coefficients for a particular date.
             coeff_names (List):
                 List of coefficient names.
+            partition_labels (Numpy array or None):
+                Sorted partition labels. If provided, the coefficients are
+                a 2d array with a row for each partition and the resulting
+                cubes have a partition dimension.
 
 
         Returns:
@@ -774,6 +1526,21 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
                 length_one_coords))
 
         coeff_cubes = iris.cube.CubeList([])
+        if partition_labels is not None:
+            partition_coord = iris.coords.DimCoord(
+                partition_labels, long_name="partition", units="1")
+            for coeff, coeff_name in zip(
+                    np.transpose(optimised_coeffs_at_date), coeff_names):
+                coeff_cube = iris.cube.Cube(
+                    [coeff], long_name=coeff_name,
+                    attributes=cube.attributes,
+                    aux_coords_and_dims=length_one_coords_for_aux_coords,
+                    dim_coords_and_dims=(
+                        length_one_coords_for_dim_coords +
+                        [(partition_coord.copy(), 1)]))
+                coeff_cubes.append(coeff_cube)
+            return coeff_cubes
+
         for coeff, coeff_name in zip(optimised_coeffs_at_date, coeff_names):
             cube = iris.cube.Cube(
                 [coeff], long_name=coeff_name, attributes=cube.attributes,
@@ -890,6 +1657,13 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
                 optimised_coeffs[date] = np.full(len(coeff_names), np.nan)
                 coeff_cubes = self._create_coefficient_cube(
                     forecast_predictor_at_date, optimised_coeffs, coeff_names)
+            elif np.ndim(optimised_coeffs[date]) == 2:
+                (calibrated_forecast_predictor_at_date,
+                 calibrated_forecast_var_at_date, coeff_cubes) = (
+                     self._apply_partitioned_params(
+                         forecast_predictor_at_date, forecast_var_at_date,
+                         optimised_coeffs[date], coeff_names,
+                         predictor_of_mean_flag))
             else:
                 optimised_coeffs_at_date = (
                     optimised_coeffs[date])
@@ -985,6 +1759,112 @@ class ApplyCoefficientsFromEnsembleCalibration(object):
                 calibrated_forecast_var_all_dates,
                 calibrated_forecast_coefficients_all_dates)
 
+    def _apply_partitioned_params(
+            self, forecast_predictor, forecast_var, optimised_coeffs,
+            coeff_names, predictor_of_mean_flag):
+        """
+        Function to apply EMOS coefficients that have been estimated
+        separately for each partition to a single date. Each grid point is
+        calibrated using the coefficients of the partition it belongs to.
+
+        Args:
+            forecast_predictor (Iris cube):
+                Cube containing the forecast predictor e.g. ensemble mean
+                or ensemble members for a single date.
+            forecast_var (Iris cube):
+                Cube containing the forecast variance for a single date.
+            optimised_coeffs (Numpy array):
+                2d array of coefficients with a row for each partition,
+                ordered by the sorted partition labels.
+            coeff_names (List):
+                Coefficient names.
+            predictor_of_mean_flag (String):
+                String to specify the input to calculate the calibrated mean.
+                Currently the ensemble mean ("mean") and the ensemble members
+                ("members") are supported as the predictors.
+
+        Returns:
+            (tuple) : tuple containing:
+                **calibrated_forecast_predictor** (Iris cube):
+                    Cube containing the calibrated forecast predictor.
+                **calibrated_forecast_var** (Iris cube):
+                    Cube containing the calibrated forecast variance.
+                **coeff_cubes** (CubeList):
+                    Cubes containing the coefficients for each partition.
+
+        Raises:
+            ValueError: If no partitions have been provided, or they do not
+                match the forecast or the coefficients.
+            ValueError: If there are fewer coefficients than coefficient
+                names.
+
+        """
+        if self.partitions is None:
+            msg = ("Coefficients have been provided for multiple "
+                   "partitions, but no partitions have been specified.")
+            raise ValueError(msg)
+        if self.partitions.shape != forecast_var.shape:
+            msg = ("The shape of the partitions {} does not match the "
+                   "shape of the forecast {}.".format(
+                       self.partitions.shape, forecast_var.shape))
+            raise ValueError(msg)
+        partition_labels = np.unique(self.partitions)
+        optimised_coeffs = np.asarray(optimised_coeffs)
+        if optimised_coeffs.shape[0] != len(partition_labels):
+            msg = ("The number of partitions {} does not match the number "
+                   "of sets of coefficients {}.".format(
+                       len(partition_labels), optimised_coeffs.shape[0]))
+            raise ValueError(msg)
+        if optimised_coeffs.shape[1] < len(coeff_names):
+            msg = ("Number of coefficient names {} with names {} "
+                   "is greater than the number of coefficients {} "
+                   "for each partition. Can not continue if the number of "
+                   "coefficient names out number the number of "
+                   "coefficients".format(
+                       len(coeff_names), coeff_names,
+                       optimised_coeffs.shape[1]))
+            raise ValueError(msg)
+
+        # Look up the coefficients of the partition for each grid point.
+        coeffs_at_points = optimised_coeffs[
+            np.searchsorted(partition_labels, self.partitions.flatten())]
+        gamma, delta, alpha = coeffs_at_points[:, :3].T
+
+        if predictor_of_mean_flag.lower() in ["mean"]:
+            # Calculate predicted mean = a + b*X, where X is the
+            # raw ensemble mean. In this case, b = beta.
+            predicted_mean = (
+                alpha + coeffs_at_points[:, 3] *
+                forecast_predictor.data.flatten())
+            calibrated_forecast_predictor = forecast_predictor
+        elif predictor_of_mean_flag.lower() in ["members"]:
+            # Calculate predicted mean = a + b*X, where X is the
+            # raw ensemble members. In this case, b = beta^2.
+            forecast_predictor = enforce_coordinate_ordering(
+                forecast_predictor, "realization")
+            forecast_predictor_flat = convert_cube_data_to_2d(
+                forecast_predictor)
+            predicted_mean = alpha + np.sum(
+                coeffs_at_points[:, 3:]**2 * forecast_predictor_flat, axis=1)
+            calibrated_forecast_predictor = forecast_predictor.collapsed(
+                "realization", iris.analysis.MEAN)
+        calibrated_forecast_predictor.data = np.reshape(
+            predicted_mean, forecast_var.shape)
+
+        # Calculating the predicted variance, where predicted
+        # variance = c + dS^2, where c = (gamma)^2 and d = (delta)^2
+        predicted_var = (
+            gamma**2 + delta**2 * forecast_var.data.flatten())
+        calibrated_forecast_var = forecast_var
+        calibrated_forecast_var.data = np.reshape(
+            predicted_var, forecast_var.shape)
+
+        coeff_cubes = self._create_coefficient_cube(
+            calibrated_forecast_predictor, optimised_coeffs, coeff_names,
+            partition_labels=partition_labels)
+        return (calibrated_forecast_predictor, calibrated_forecast_var,
+                coeff_cubes)
+
 
 class EnsembleCalibration(object):
     """
@@ -994,7 +1874,10 @@ class EnsembleCalibration(object):
 
     """
     def __init__(self, calibration_method, distribution, desired_units,
-                 predictor_of_mean_flag="mean"):
+                 predictor_of_mean_flag="mean", partitions=None,
+                 num_processes=1, minimisation_method="nelder-mead",
+                 coefficient_store_dir=None, max_coefficient_age=None,
+                 training_data_dir=None, training_window=None):
         """
         Create an ensemble calibration plugin that, for Nonhomogeneous Gaussian
         Regression, calculates coefficients based on historical forecasts and
@@ -1022,21 +1905,57 @@ class EnsembleCalibration(object):
                 String to specify the input to calculate the calibrated mean.
                 Currently the ensemble mean ("mean") and the ensemble members
                 ("members") are supported as the predictors.
+            partitions (Numpy array or None):
+                Integer array of partition labels with shape (y, x). If
+                provided, coefficients are estimated and applied separately
+                for each partition.
+            num_processes (Int):
+                Number of processes used to estimate the coefficients for
+                the partitions in parallel.
+            minimisation_method (String):
+                Name of the scipy minimisation method used to minimise the
+                CRPS. Either "nelder-mead" or "l-bfgs-b".
+            coefficient_store_dir (String or None):
+                Path to a directory in which the optimised coefficients are
+                stored, so that the next cycle can start from them.
+            max_coefficient_age (Float or None):
+                Maximum age in hours for which stored coefficients are reused
+                without performing the minimisation.
+            training_data_dir (String or None):
+                Path to a directory in which rolling training data are
+                accumulated from the historic forecasts and truths.
+            training_window (Int or None):
+                Number of historic forecasts held in the rolling training
+                data.
         """
         self.calibration_method = calibration_method
         self.distribution = distribution
         self.desired_units = desired_units
         self.predictor_of_mean_flag = predictor_of_mean_flag
+        self.partitions = partitions
+        self.num_processes = num_processes
+        self.minimisation_method = minimisation_method
+        self.coefficient_store_dir = coefficient_store_dir
+        self.max_coefficient_age = max_coefficient_age
+        self.training_data_dir = training_data_dir
+        self.training_window = training_window
 
     def __str__(self):
         result = ('<EnsembleCalibration: ' +
                   'calibration_method: {}' +
                   'distribution: {};' +
                   'desired_units: {};' +
-                  'predictor_of_mean_flag: {};')
+                  'predictor_of_mean_flag: {};' +
+                  'partitioned: {}; num_processes: {}; ' +
+                  'minimisation_method: {}; ' +
+                  'coefficient_store_dir: {}; max_coefficient_age: {}; ' +
+                  'training_data_dir: {}; training_window: {}')
         return result.format(
             self.calibration_method, self.distribution, self.desired_units,
-            self.predictor_of_mean_flag)
+            self.predictor_of_mean_flag, self.partitions is not None,
+            self.num_processes, self.minimisation_method,
+            self.coefficient_store_dir, self.max_coefficient_age,
+            self.training_data_dir, self.training_window)
 
     def process(self, current_forecast, historic_forecast, truth):
         """
@@ -1075,7 +1994,14 @@ class EnsembleCalibration(object):
                     ["gaussian", "truncated gaussian"]):
                 ec = EstimateCoefficientsForEnsembleCalibration(
                     self.distribution, self.desired_units,
-                    predictor_of_mean_flag=self.predictor_of_mean_flag)
+                    predictor_of_mean_flag=self.predictor_of_mean_flag,
+                    partitions=self.partitions,
+                    num_processes=self.num_processes,
+                    minimisation_method=self.minimisation_method,
+                    coefficient_store_dir=self.coefficient_store_dir,
+                    max_coefficient_age=self.max_coefficient_age,
+                    training_data_dir=self.training_data_dir,
+                    training_window=self.training_window)
                 optimised_coeffs, coeff_names = (
                     ec.estimate_coefficients_for_ngr(
                         current_forecast, historic_forecast, truth))
@@ -1086,7 +2012,8 @@ class EnsembleCalibration(object):
             raise ValueError(msg)
         ac = ApplyCoefficientsFromEnsembleCalibration(
             current_forecast, optimised_coeffs, coeff_names,
-            predictor_of_mean_flag=self.predictor_of_mean_flag)
+            predictor_of_mean_flag=self.predictor_of_mean_flag,
+            partitions=self.partitions)
         (calibrated_forecast_predictor, calibrated_forecast_variance,
          calibrated_forecast_coefficients) = ac.apply_params_entry()
         calibrated_forecast_predictor_and_variance = iris.cube.CubeList([
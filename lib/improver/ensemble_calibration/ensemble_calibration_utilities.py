@@ -134,3 +134,39 @@ def check_predictor_of_mean_flag(predictor_of_mean_flag):
                "Accepted values are 'mean' or 'members'").format(
                    predictor_of_mean_flag.lower())
         raise ValueError(msg)
+
+
+def create_tile_partitions(cube, tile_size):
+    """
+    Create an array of partition labels that divides the horizontal grid of
+    a cube into square tiles, so that coefficients for ensemble calibration
+    can be estimated separately for each tile. A tile_size of 1 gives a
+    separate partition for each grid point or site.
+
+    Args:
+        cube (iris.cube.Cube):
+            Cube with x and y coordinates defining the grid to be partitioned.
+        tile_size (int):
+            Number of grid points along each edge of a tile. Tiles at the
+            upper edges of the domain may be smaller.
+
+    Returns:
+        partitions (numpy.ndarray):
+            Integer array of shape (y, x) containing the label of the tile
+            that each grid point belongs to.
+
+    Raises:
+        ValueError: If tile_size is less than 1.
+
+    """
+    if tile_size < 1:
+        msg = ("The tile_size must be at least 1 grid point. "
+               "tile_size requested: {}".format(tile_size))
+        raise ValueError(msg)
+    ylen = len(cube.coord(axis="y").points)
+    xlen = len(cube.coord(axis="x").points)
+    y_tiles = np.arange(ylen) // tile_size
+    x_tiles = np.arange(xlen) // tile_size
+    x_tiles_count = -(-xlen // tile_size)
+    partitions = y_tiles[:, np.newaxis] * x_tiles_count + x_tiles
+    return partitions
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Rolling accumulation of the training data used for ensemble calibration,
+so that each cycle only needs to read the most recent historic forecasts
+and truths.
+
+"""
+import json
+import os
+
+import numpy as np
+
+from improver.utilities.save import atomic_write
+
+
+class TrainingDataAccumulator(object):
+    """
+    Accumulate the training data used to estimate the EMOS coefficients in
+    memory-mapped ring buffers on disk, covering a window of a fixed number
+    of forecasts (e.g. days).
+
+    The forecast predictor, forecast variance and truth for each forecast
+    are stored as float32 arrays of the flattened horizontal grid. When the
+    window is full, the oldest forecast is replaced by each new forecast.
+
+    """
+
+    def __init__(self, accumulator_dir, window_length):
+        """
+        Args:
+            accumulator_dir (string):
+                Path to the directory in which the training data are
+                stored. This is created if it does not already exist when
+                training data are first appended.
+            window_length (int):
+                Number of forecasts held in the training window.
+
+        """
+        self.accumulator_dir = accumulator_dir
+        self.window_length = window_length
+
+    def __repr__(self):
+        """Represent the configured plugin instance as a string."""
+        result = ('<TrainingDataAccumulator: accumulator_dir: {}; '
+                  'window_length: {}>')
+        return result.format(self.accumulator_dir, self.window_length)
+
+    @staticmethod
+    def key(diagnostic, predictor_of_mean_flag, forecast_period):
+        """
+        Construct the key identifying the training data for a diagnostic and
+        forecast period.
+
+        Args:
+            diagnostic (string):
+                Name of the diagnostic being calibrated.
+            predictor_of_mean_flag (string):
+                String to specify the input to calculate the calibrated mean.
+            forecast_period (int or float):
+                Forecast period in seconds.
+
+        Returns:
+            string:
+                Key for the training data, which is safe to use as a
+                directory name.
+
+        """
+        key = '{}-{}-PT{}S'.format(
+            diagnostic, predictor_of_mean_flag, int(round(forecast_period)))
+        return key.lower().replace(' ', '_').replace(os.sep, '_')
+
+    def _filepath(self, name):
+        """Return the path to a file within the accumulator directory."""
+        return os.path.join(self.accumulator_dir, name)
+
+    def _load_validity_times(self):
+        """
+        Load the validity times of the forecasts held in each slot of the
+        ring buffers.
+
+        Returns:
+            validity_times (list):
+                Validity time in seconds since 1970-01-01 00:00:00 of the
+                forecast in each slot, or None for empty slots. This is an
+                empty list if no training data have been accumulated.
+
+        Raises:
+            ValueError: If the training data were accumulated with a
+                different window length.
+
+        """
+        filepath = self._filepath('validity_times.json')
+        if not os.path.isfile(filepath):
+            return []
+        with open(filepath, 'r') as times_file:
+            validity_times = json.load(times_file)
+        if len(validity_times) != self.window_length:
+            msg = ('The training data in {} were accumulated with a window '
+                   'length of {}, not {}.'.format(
+                       self.accumulator_dir, len(validity_times),
+                       self.window_length))
+            raise ValueError(msg)
+        return validity_times
+
+    def _open_buffers(self, mode, predictor_shape=None):
+        """
+        Open the memory-mapped ring buffers.
+
+        Args:
+            mode (string):
+                Mode in which to open the buffers, as for numpy.memmap.
+            predictor_shape (tuple or None):
+                Shape of the forecast predictor for a single forecast, used
+                to create the buffers if they do not exist.
+
+        Returns:
+            buffers (dict):
+                Memory-mapped arrays for the forecast predictor, forecast
+                variance and truth, with the slot as the leading dimension.
+
+        """
+        buffers = {}
+        for name in ['predictor', 'variance', 'truth']:
+            filepath = self._filepath('{}.npy'.format(name))
+            if not os.path.isfile(filepath):
+                shape = predictor_shape if name == 'predictor' else (
+                    predictor_shape[:1])
+                buffer_array = np.lib.format.open_memmap(
+                    filepath, mode='w+', dtype=np.float32,
+                    shape=(self.window_length,) + tuple(shape))
+                buffer_array[:] = np.nan
+                buffers[name] = buffer_array
+            else:
+                buffers[name] = np.lib.format.open_memmap(
+                    filepath, mode=mode)
+        return buffers
+
+    @property
+    def validity_times(self):
+        """Sorted validity times of the accumulated forecasts."""
+        return sorted(
+            time for time in self._load_validity_times() if time is not None)
+
+    def append(self, forecast_predictor, forecast_var, truth, validity_time):
+        """
+        Add the training data for a single forecast. If the window is full,
+        the oldest forecast is replaced. If a forecast with the same validity
+        time has already been accumulated, it is replaced.
+
+        Args:
+            forecast_predictor (numpy.ndarray):
+                Forecast predictor for each point, with shape (points,) for
+                the ensemble mean or (points, members) for the ensemble
+                members.
+            forecast_var (numpy.ndarray):
+                Ensemble variance for each point, with shape (points,).
+            truth (numpy.ndarray):
+                Truth for each point, with shape (points,).
+            validity_time (float):
+                Validity time of the forecast in seconds since
+                1970-01-01 00:00:00.
+
+        Raises:
+            ValueError: If the shape of the data does not match the
+                accumulated training data.
+
+        """
+        if not os.path.isdir(self.accumulator_dir):
+            os.makedirs(self.accumulator_dir)
+        validity_times = self._load_validity_times()
+        if not validity_times:
+            validity_times = [None] * self.window_length
+
+        forecast_predictor = np.asarray(forecast_predictor, dtype=np.float32)
+        buffers = self._open_buffers(
+            'r+', predictor_shape=forecast_predictor.shape)
+        if (buffers['predictor'].shape[1:] != forecast_predictor.shape or
+                buffers['truth'].shape[1:] != np.shape(truth) or
+                buffers['variance'].shape[1:] != np.shape(forecast_var)):
+            msg = ('The shape of the training data {} does not match the '
+                   'training data accumulated in {} with shape {}.'.format(
+                       forecast_predictor.shape, self.accumulator_dir,
+                       buffers['predictor'].shape[1:]))
+            raise ValueError(msg)
+
+        validity_time = float(validity_time)
+        if validity_time in validity_times:
+            slot = validity_times.index(validity_time)
+        elif None in validity_times:
+            slot = validity_times.index(None)
+        else:
+            slot = int(np.argmin(validity_times))
+
+        buffers['predictor'][slot] = forecast_predictor
+        buffers['variance'][slot] = forecast_var
+        buffers['truth'][slot] = truth
+        for buffer_array in buffers.values():
+            buffer_array.flush()
+        del buffers
+
+        # Only record the new validity time once the data have been written.
+        validity_times[slot] = validity_time
+        with atomic_write(self._filepath('validity_times.json')) as times_file:
+            json.dump(validity_times, times_file)
+
+    def training_data(self):
+        """
+        Return the accumulated training data, flattened in the same way as
+        ContinuousRankedProbabilityScoreMinimisers.crps_minimiser_wrapper,
+        with the forecasts in chronological order.
+
+        Returns:
+            (tuple): tuple containing:
+                **forecast_predictor** (numpy.ndarray):
+                    Forecast predictor with shape (forecasts * points,) or
+                    (forecasts * points, members).
+                **truth** (numpy.ndarray):
+                    Truth with shape (forecasts * points,).
+                **forecast_var** (numpy.ndarray):
+                    Ensemble variance with shape (forecasts * points,).
+                **no_of_forecasts** (int):
+                    Number of forecasts within the training data.
+
+        Raises:
+            ValueError: If no training data have been accumulated.
+
+        """
+        validity_times = self._load_validity_times()
+        sort_keys = [
+            np.inf if time is None else time for time in validity_times]
+        slots = [slot for slot in np.argsort(sort_keys)
+                 if validity_times[slot] is not None]
+        if not slots:
+            msg = 'No training data have been accumulated in {}.'.format(
+                self.accumulator_dir)
+            raise ValueError(msg)
+
+        buffers = self._open_buffers('r')
+        predictor = buffers['predictor'][slots]
+        forecast_predictor = predictor.reshape(
+            (-1,) + predictor.shape[2:])
+        truth = buffers['truth'][slots].flatten()
+        forecast_var = buffers['variance'][slots].flatten()
+        return forecast_predictor, truth, forecast_var, len(slots)
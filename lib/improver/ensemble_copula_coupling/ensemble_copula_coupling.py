@@ -51,6 +51,9 @@ from improver.ensemble_copula_coupling.ensemble_copula_coupling_utilities \
 from improver.utilities.cube_manipulation import (
     concatenate_cubes, enforce_coordinate_ordering)
 from improver.utilities.cube_checker import find_percentile_coordinate
+from improver.utilities.instrumentation import instrumented
+from improver.utilities.mathematical_operations import (
+    interpolate_multiple_rows)
 
 
 class RebadgePercentilesAsMembers(object):
@@ -201,14 +204,9 @@ class ResamplePercentiles(object):
                 original_percentiles, forecast_at_reshaped_percentiles,
                 bounds_pairing))
 
-        forecast_at_interpolated_percentiles = (
-            np.empty(
-                (len(desired_percentiles),
-                 forecast_at_reshaped_percentiles.shape[0])))
-        for index in range(forecast_at_reshaped_percentiles.shape[0]):
-            forecast_at_interpolated_percentiles[:, index] = np.interp(
-                desired_percentiles, original_percentiles,
-                forecast_at_reshaped_percentiles[index, :])
+        forecast_at_interpolated_percentiles = interpolate_multiple_rows(
+            desired_percentiles, original_percentiles,
+            forecast_at_reshaped_percentiles).T
 
         # Reshape forecast_at_percentiles, so the percentiles dimension is
         # first, and any other dimension coordinates follow.
@@ -419,12 +417,8 @@ class GeneratePercentilesFromProbabilities(object):
         # Convert percentiles into fractions.
         percentiles = [x/100.0 for x in percentiles]
 
-        forecast_at_percentiles = (
-            np.empty((len(percentiles), probabilities_for_cdf.shape[0])))
-        for index in range(probabilities_for_cdf.shape[0]):
-            forecast_at_percentiles[:, index] = np.interp(
-                percentiles, probabilities_for_cdf[index, :],
-                threshold_points)
+        forecast_at_percentiles = interpolate_multiple_rows(
+            percentiles, probabilities_for_cdf, threshold_points).T
 
         # Convert percentiles back into percentages.
         percentiles = [x*100.0 for x in percentiles]
@@ -754,6 +748,7 @@ class EnsembleReordering(object):
         return raw_forecast_members
 
     @staticmethod
+    @instrumented("EnsembleReordering.rank_ecc")
     def rank_ecc(
             post_processed_forecast_percentiles, raw_forecast_members,
             random_ordering=False, random_seed=None):
@@ -38,6 +38,7 @@ import iris
 from improver.constants import DEFAULT_PERCENTILES
 from improver.utilities.cube_checker import (
     check_cube_coordinates, find_dimension_coordinate_mismatch)
+from improver.utilities.instrumentation import instrumented
 from improver.utilities.spatial import (
     check_if_grid_is_equal_area, convert_distance_into_number_of_grid_cells)
 
@@ -45,6 +46,18 @@ from improver.utilities.spatial import (
 # Maximum radius of the neighbourhood width in grid cells.
 MAX_RADIUS_IN_GRID_CELLS = 500
 
+# Engines that can be used to calculate percentiles from a circular
+# neighbourhood. The "roll" engine is the reference implementation, which
+# creates a rolled copy of the whole padded field for each point within the
+# kernel. The "tiled" engine gathers the neighbourhood of each point one tile
+# of rows at a time, so that memory scales with the size of a tile rather than
+# the size of the field multiplied by the size of the kernel.
+PERCENTILE_ENGINES = ["roll", "tiled"]
+
+# Maximum number of neighbourhood values gathered at once by the "tiled"
+# percentile engine.
+MAX_NEIGHBOURHOOD_VALUES_PER_TILE = 10000000
+
 
 def circular_kernel(fullranges, ranges, weighted_mode):
     """
@@ -139,6 +152,7 @@ class CircularNeighbourhood(object):
                   'sum_or_fraction: {}>')
         return result.format(self.weighted_mode, self.sum_or_fraction)
 
+    @instrumented("CircularNeighbourhood.apply_circular_kernel")
     def apply_circular_kernel(self, cube, ranges):
         """
         Method to apply a circular kernel to the data within the input cube in
@@ -222,7 +236,7 @@ class GeneratePercentilesFromACircularNeighbourhood(object):
     A maximum kernel radius of 500 grid cells is imposed in order to
     avoid computational ineffiency and possible memory errors.
     """
-    def __init__(self, percentiles=DEFAULT_PERCENTILES):
+    def __init__(self, percentiles=DEFAULT_PERCENTILES, engine="roll"):
         """
         Initialise class.
 
@@ -230,15 +244,27 @@ class GeneratePercentilesFromACircularNeighbourhood(object):
             percentiles (list):
                 Percentile values at which to calculate; if not provided uses
                 DEFAULT_PERCENTILES.
+            engine (string):
+                The engine used to calculate the percentiles. Valid options
+                are "roll" (the reference implementation, see
+                pad_and_unpad_cube) and "tiled" (see tiled_percentiles).
+
+        Raises:
+            ValueError: If the engine is not one of the valid options.
 
         """
+        if engine not in PERCENTILE_ENGINES:
+            raise ValueError(
+                "Invalid engine: {}. Valid options are: {}".format(
+                    engine, PERCENTILE_ENGINES))
         self.percentiles = tuple(percentiles)
+        self.engine = engine
 
     def __repr__(self):
         """Represent the configured class instance as a string."""
         result = ('<GeneratePercentilesFromACircularNeighbourhood: '
-                  'percentiles: {}>')
-        return result.format(self.percentiles)
+                  'percentiles: {}, engine: {}>')
+        return result.format(self.percentiles, self.engine)
 
     def pad_and_unpad_cube(self, slice_2d, kernel):
         """
@@ -380,6 +406,92 @@ class GeneratePercentilesFromACircularNeighbourhood(object):
                                  ranges_xy[1]:-ranges_xy[1]]
         return pctcube
 
+    def tiled_percentiles(
+            self, slice_2d, kernel,
+            max_values_per_tile=MAX_NEIGHBOURHOOD_VALUES_PER_TILE):
+        """
+        Method to calculate percentiles over a neighbourhood around each
+        point of a two dimensional cube, giving the same result as
+        pad_and_unpad_cube.
+
+        Rather than creating a rolled copy of the whole padded field for each
+        point within the kernel, a strided view of the kernel-sized window
+        around every point is created (without copying the data). The values
+        within the neighbourhood are then gathered, sorted and interpolated to
+        the requested percentiles one tile of rows at a time. The number of
+        rows in each tile is chosen so that at most max_values_per_tile
+        values are gathered at once, so that memory scales with the size of
+        the field plus the size of a tile rather than with the size of the
+        field multiplied by the size of the kernel. As the values at all
+        percentiles are found from one sort of each neighbourhood, this is
+        also faster than calling np.percentile over the rolled copies,
+        particularly for large kernels.
+
+        As with np.percentile, all the percentiles are NaN for any point
+        whose neighbourhood contains a NaN.
+
+        Args:
+            slice_2d (Iris.cube.Cube):
+                2d cube for which the neighbourhood percentiles are
+                calculated.
+            kernel (Numpy array):
+                Kernel used to specify the neighbourhood to consider when
+                calculating the percentiles within a neighbourhood.
+
+        Keyword Args:
+            max_values_per_tile (integer):
+                Maximum number of neighbourhood values gathered at once.
+                At least one row is always processed at a time.
+
+        Returns:
+            pctcube (Iris.cube.Cube):
+                Cube containing the percentile fields, with percentile as the
+                leading dimension.
+        """
+        ranges_xy = np.empty(2, dtype=int)
+        ranges_xy[0] = int(np.floor(kernel.shape[0] / 2.0))
+        ranges_xy[1] = int(np.floor(kernel.shape[1] / 2.0))
+        padded = np.pad(slice_2d.data, ranges_xy, mode='mean',
+                        stat_length=np.max(ranges_xy))
+        # Orientate the kernel to select the same neighbourhood points as
+        # the rolls within pad_and_unpad_cube. This only matters for kernels
+        # that are not symmetric.
+        kernel_mask = kernel[::-1, ::-1].T > 0.
+        n_points = np.count_nonzero(kernel_mask)
+        n_rows, n_columns = slice_2d.data.shape
+
+        # Find the positions within the sorted neighbourhood values that are
+        # required to linearly interpolate to each percentile, as done by
+        # np.percentile.
+        positions = np.array(self.percentiles) / 100. * (n_points - 1)
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, n_points - 1)
+        fraction = positions - lower
+
+        perc_data = np.empty((len(self.percentiles), n_rows, n_columns),
+                             dtype=np.result_type(padded.dtype, np.float64))
+        tile_rows = max(
+            1, max_values_per_tile // (n_columns * n_points))
+        for start in range(0, n_rows, tile_rows):
+            stop = min(start + tile_rows, n_rows)
+            tile = padded[start:stop + kernel_mask.shape[0] - 1]
+            windows = np.lib.stride_tricks.as_strided(
+                tile, shape=(stop - start, n_columns) + kernel_mask.shape,
+                strides=tile.strides * 2)
+            values = np.sort(windows[..., kernel_mask], axis=-1)
+            lower_values = values[..., lower]
+            upper_values = values[..., upper]
+            tile_perc_data = (
+                lower_values + (upper_values - lower_values) * fraction)
+            # NaNs are sorted to the end of each neighbourhood, so propagate
+            # them to every percentile as np.percentile does.
+            tile_perc_data[np.isnan(values[..., -1])] = np.nan
+            perc_data[:, start:stop] = np.moveaxis(tile_perc_data, -1, 0)
+
+        pctcube = self.make_percentile_cube(slice_2d)
+        pctcube.data = perc_data
+        return pctcube
+
     def run(self, cube, radius, mask_cube=None):
         """
         Method to apply a circular kernel to the data within the input cube in
@@ -416,11 +528,14 @@ class GeneratePercentilesFromACircularNeighbourhood(object):
         kernel = circular_kernel(ranges_xy, ranges_tuple, weighted_mode=False)
         # Loop over each 2D slice to reduce memory demand and derive
         # percentiles on the kernel. Will return an extra dimension.
+        if self.engine == "tiled":
+            percentile_method = self.tiled_percentiles
+        else:
+            percentile_method = self.pad_and_unpad_cube
         pctcubelist = iris.cube.CubeList()
         for slice_2d in cube.slices(['projection_y_coordinate',
                                      'projection_x_coordinate']):
-            pctcubelist.append(
-                self.pad_and_unpad_cube(slice_2d, kernel))
+            pctcubelist.append(percentile_method(slice_2d, kernel))
         result = pctcubelist.merge_cube()
         exception_coordinates = (
             find_dimension_coordinate_mismatch(
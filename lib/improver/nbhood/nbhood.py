@@ -30,6 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Module containing neighbourhood processing utilities."""
 
+from collections import OrderedDict
 import math
 
 import iris
@@ -37,12 +38,15 @@ import numpy as np
 
 from improver.nbhood.circular_kernel import (
     CircularNeighbourhood, GeneratePercentilesFromACircularNeighbourhood)
-from improver.nbhood.square_kernel import SquareNeighbourhood
+from improver.nbhood.square_kernel import (
+    MAX_RADIUS_IN_GRID_CELLS, SquareNeighbourhood)
 
 from improver.constants import DEFAULT_PERCENTILES
 from improver.utilities.cube_checker import (
     check_cube_coordinates, find_dimension_coordinate_mismatch)
 from improver.utilities.cube_manipulation import concatenate_cubes
+from improver.utilities.spatial import (
+    convert_distance_into_number_of_grid_cells)
 from improver.utilities.temporal import forecast_period_coord
 
 
@@ -158,6 +162,102 @@ class BaseNeighbourhoodProcessing(object):
                 radii[i] = self.adjust_nsize_for_ens(num_ens, val)
         return radii
 
+    @staticmethod
+    def _group_times_by_cell_width(cube, radii):
+        """
+        Group the times within a cube by the width of the neighbourhood in
+        grid cells that each radius corresponds to. Times with different
+        radii often give the same number of grid cells, and so can be
+        neighbourhood processed together.
+
+        Args:
+            cube (Iris.cube.Cube):
+                Cube containing the x and y coordinates used to convert the
+                radii into numbers of grid cells.
+            radii (np.array of float):
+                Neighbourhood radius in metres for each time in the cube.
+
+        Returns:
+            groups (list of tuples):
+                List containing a (radius, indices) tuple for each group,
+                where the radius is that of the first time in the group and
+                indices are the indices of the times within the group.
+        """
+        groups = OrderedDict()
+        for index, radius in enumerate(radii):
+            try:
+                key = convert_distance_into_number_of_grid_cells(
+                    cube, radius, MAX_RADIUS_IN_GRID_CELLS)
+            except ValueError:
+                # Leave the neighbourhood method to report invalid radii.
+                key = radius
+            groups.setdefault(key, []).append(index)
+        return [(radii[indices[0]], indices) for indices in groups.values()]
+
+    def _process_grouped_by_cell_width(self, cube, radii, mask_cube=None):
+        """
+        Apply the neighbourhood processing method to a cube, where the radius
+        varies with time. Times which give the same neighbourhood width in
+        grid cells are processed together, with a single call to the
+        neighbourhood method.
+
+        Args:
+            cube (Iris.cube.Cube):
+                Cube to apply a neighbourhood processing method to.
+            radii (np.array of float):
+                Neighbourhood radius in metres for each time in the cube.
+
+        Keyword Args:
+            mask_cube (Iris.cube.Cube):
+                Cube containing the array to be used as a mask.
+
+        Returns:
+            cube (Iris.cube.Cube):
+                Cube after applying a neighbourhood processing method.
+        """
+        groups = self._group_times_by_cell_width(cube, radii)
+        if len(groups) == 1:
+            radius, _ = groups[0]
+            return self.neighbourhood_method.run(
+                cube, radius, mask_cube=mask_cube)
+
+        time_dim, = cube.coord_dims("time")
+        data = None
+        for radius, indices in groups:
+            index = [slice(None)] * cube.ndim
+            index[time_dim] = indices
+            result = self.neighbourhood_method.run(
+                cube[tuple(index)], radius, mask_cube=mask_cube)
+            result_time_dim, = result.coord_dims("time")
+            if data is None:
+                # Allocate the output data for all of the times once.
+                shape = list(result.shape)
+                shape[result_time_dim] = len(radii)
+                if np.ma.isMaskedArray(result.data):
+                    data = np.ma.empty(shape, dtype=result.dtype)
+                else:
+                    data = np.empty(shape, dtype=result.dtype)
+                template = result
+            # Put each time back into its original position.
+            index = [slice(None)] * result.ndim
+            index[result_time_dim] = indices
+            data[tuple(index)] = result.data
+
+        # Attach the metadata once, taking the coordinates that vary with
+        # time from the input cube, which covers all of the times.
+        output = iris.cube.Cube(data, **template.metadata._asdict())
+        for coord in template.dim_coords:
+            dims = template.coord_dims(coord)
+            if result_time_dim in dims:
+                coord = cube.coord(coord.name())
+            output.add_dim_coord(coord.copy(), dims)
+        for coord in template.aux_coords:
+            dims = template.coord_dims(coord)
+            if result_time_dim in dims:
+                coord = cube.coord(coord.name())
+            output.add_aux_coord(coord.copy(), dims)
+        return output
+
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
         if callable(self.neighbourhood_method):
@@ -216,6 +316,11 @@ class BaseNeighbourhoodProcessing(object):
                        "should not both be set in input cube")
                 raise ValueError(msg)
 
+        # The square neighbourhood processes all leading dimensions of the
+        # data array at once, so realizations do not need to be separated.
+        if isinstance(self.neighbourhood_method, SquareNeighbourhood):
+            slices_over_realization = [cube]
+
         if np.isnan(cube.data).any():
             raise ValueError("Error: NaN detected in input cube data")
 
@@ -234,21 +339,8 @@ class BaseNeighbourhoodProcessing(object):
                     cube_lead_times=fp_coord.points
                 )
 
-                cubes_time = iris.cube.CubeList([])
-                # Find the number of grid cells required for creating the
-                # neighbourhood, and then apply the neighbourhood
-                # processing method to smooth the field.
-                for cube_slice, radius in (
-                        zip(cube_realization.slices_over("time"),
-                            required_radii)):
-                    cube_slice = self.neighbourhood_method.run(
-                        cube_slice, radius, mask_cube=mask_cube)
-                    cubes_time.append(cube_slice)
-                if len(cubes_time) > 1:
-                    cube_new = concatenate_cubes(
-                        cubes_time, coords_to_slice_over=["time"])
-                else:
-                    cube_new = cubes_time[0]
+                cube_new = self._process_grouped_by_cell_width(
+                    cube_realization, required_radii, mask_cube=mask_cube)
             cubes_real.append(cube_new)
         if len(cubes_real) > 1:
             combined_cube = concatenate_cubes(
@@ -271,7 +363,8 @@ class GeneratePercentilesFromANeighbourhood(BaseNeighbourhoodProcessing):
 
     def __init__(
             self, neighbourhood_method, radii, lead_times=None,
-            ens_factor=1.0, percentiles=DEFAULT_PERCENTILES):
+            ens_factor=1.0, percentiles=DEFAULT_PERCENTILES,
+            percentile_engine="roll"):
         """
         Create a neighbourhood processing subclass that generates percentiles
         from a neighbourhood of points.
@@ -300,6 +393,9 @@ class GeneratePercentilesFromANeighbourhood(BaseNeighbourhoodProcessing):
             percentiles (list):
                 Percentile values at which to calculate; if not provided uses
                 DEFAULT_PERCENTILES.
+            percentile_engine (string):
+                The engine used to calculate the percentiles within the
+                neighbourhood. Options: "roll", "tiled".
         """
         super(GeneratePercentilesFromANeighbourhood, self).__init__(
             neighbourhood_method, radii, lead_times=lead_times,
@@ -309,7 +405,8 @@ class GeneratePercentilesFromANeighbourhood(BaseNeighbourhoodProcessing):
             "circular": GeneratePercentilesFromACircularNeighbourhood}
         try:
             method = methods[neighbourhood_method]
-            self.neighbourhood_method = method(percentiles=percentiles)
+            self.neighbourhood_method = method(percentiles=percentiles,
+                                               engine=percentile_engine)
         except KeyError:
             msg = ("The neighbourhood_method requested: {} is not a "
                    "supported method. Please choose from: {}".format(
@@ -30,11 +30,70 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Module to apply a recursive filter to neighbourhooded data."""
 
+import warnings
+
 import iris
 import numpy as np
 
 from improver.nbhood.square_kernel import SquareNeighbourhood
 from improver.utilities.cube_checker import check_cube_coordinates
+from improver.utilities.instrumentation import instrumented
+
+# Engines that can be used to apply the recursive filter. The "python" engine
+# is the reference implementation, which filters one 2D slice at a time. The
+# "vectorised" engine filters a stack of 2D slices at once using numpy, and
+# the "compiled" engine uses a numba-compiled first-order IIR kernel.
+FILTER_ENGINES = ["python", "vectorised", "compiled"]
+
+# Cache of the numba-compiled recursion kernel, so that it is only compiled
+# once per process.
+_COMPILED_KERNEL = []
+
+
+def _compiled_recursion_kernel():
+    """
+    Compile (on first use) and return a numba kernel that runs the
+    recursive filter over a stack of 2D slices.
+
+    Returns:
+        kernel (function):
+            Compiled function with the signature
+            kernel(data, alphas_x, alphas_y, iterations), where data is a
+            3D C-contiguous array of shape (slices, rows, columns) that is
+            modified in place, and alphas_x and alphas_y are 2D arrays of
+            shape (rows, columns).
+
+    Raises:
+        ImportError: If numba is not available.
+    """
+    if not _COMPILED_KERNEL:
+        import numba
+
+        @numba.njit(cache=True, nogil=True)
+        def kernel(data, alphas_x, alphas_y, iterations):
+            """Apply the recursive filter in all four directions."""
+            n_slices, n_rows, n_columns = data.shape
+            for _ in range(iterations):
+                for k in range(n_slices):
+                    for i in range(1, n_rows):
+                        for j in range(n_columns):
+                            data[k, i, j] += alphas_x[i, j] * (
+                                data[k, i-1, j] - data[k, i, j])
+                    for i in range(n_rows-2, -1, -1):
+                        for j in range(n_columns):
+                            data[k, i, j] += alphas_x[i, j] * (
+                                data[k, i+1, j] - data[k, i, j])
+                    for i in range(n_rows):
+                        for j in range(1, n_columns):
+                            data[k, i, j] += alphas_y[i, j] * (
+                                data[k, i, j-1] - data[k, i, j])
+                        for j in range(n_columns-2, -1, -1):
+                            data[k, i, j] += alphas_y[i, j] * (
+                                data[k, i, j+1] - data[k, i, j])
+            return data
+
+        _COMPILED_KERNEL.append(kernel)
+    return _COMPILED_KERNEL[0]
 
 
 class RecursiveFilter(object):
@@ -44,7 +103,8 @@ class RecursiveFilter(object):
     """
 
     def __init__(self, alpha_x=None, alpha_y=None, iterations=None,
-                 edge_width=1, re_mask=False):
+                 edge_width=1, re_mask=False, engine="python",
+                 batch_size=None):
         """
         Initialise the class.
 
@@ -69,12 +129,31 @@ class RecursiveFilter(object):
                 mask is not applied. Therefore, the recursive filtering
                 may result in values being present in areas that were
                 originally masked.
+            engine (string):
+                The engine used to apply the recursive filter. Valid options
+                are "python" (the reference implementation, which filters
+                one 2D slice at a time), "vectorised" (filters a stack of
+                2D slices at once using numpy) and "compiled" (uses a
+                numba-compiled kernel). If numba is not available, the
+                "compiled" engine falls back to the "vectorised" engine.
+                The "vectorised" and "compiled" engines filter the whole
+                N-D data array in batches, treating every dimension other
+                than y and x as a batch dimension, rather than slicing the
+                input cube into 2D cubes.
+            batch_size (integer or None):
+                The maximum number of 2D slices filtered together by the
+                "vectorised" and "compiled" engines. This bounds the memory
+                used when filtering large cubes. If None, all slices are
+                filtered together in a single batch.
 
         Raises:
             ValueError: If alpha_x is not set such that 0 < alpha_x < 1
             ValueError: If alpha_y is not set such that 0 < alpha_y < 1
             ValueError: If number of iterations is not None and is set such
                         that iterations is not >= 1
+            ValueError: If the engine is not one of the valid options.
+            ValueError: If batch_size is not None and is set such that
+                        batch_size is not >= 1
 
         """
         if alpha_x is not None:
@@ -95,18 +174,57 @@ class RecursiveFilter(object):
                     "Invalid number of iterations: must be >= 1: {}".format(
                         iterations))
 
+        if engine not in FILTER_ENGINES:
+            raise ValueError(
+                "Invalid engine: {}. Valid options are: {}".format(
+                    engine, FILTER_ENGINES))
+
+        if batch_size is not None:
+            if not batch_size >= 1:
+                raise ValueError(
+                    "Invalid batch_size: must be >= 1: {}".format(
+                        batch_size))
+
         self.alpha_x = alpha_x
         self.alpha_y = alpha_y
         self.iterations = iterations
         self.edge_width = edge_width
         self.re_mask = re_mask
+        self.engine = self._check_engine_available(engine)
+        self.batch_size = batch_size
 
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
         result = ('<RecursiveFilter: alpha_x: {}, alpha_y: {}, iterations: {},'
-                  ' edge_width: {}')
+                  ' edge_width: {}, engine: {}, batch_size: {}')
         return result.format(self.alpha_x, self.alpha_y, self.iterations,
-                             self.edge_width)
+                             self.edge_width, self.engine, self.batch_size)
+
+    @staticmethod
+    def _check_engine_available(engine):
+        """
+        Check that the requested engine can be used, falling back to the
+        "vectorised" engine if the "compiled" engine has been requested but
+        numba can not be imported.
+
+        Args:
+            engine (string):
+                The requested engine.
+
+        Returns:
+            engine (string):
+                The engine that will be used.
+        """
+        if engine == "compiled":
+            try:
+                _compiled_recursion_kernel()
+            except ImportError:
+                msg = ("The numba module can not be imported. "
+                       "The vectorised engine will be used instead of the "
+                       "compiled engine.")
+                warnings.warn(msg)
+                engine = "vectorised"
+        return engine
 
     @staticmethod
     def recurse_forward_x(grid, alphas):
@@ -245,7 +363,107 @@ class RecursiveFilter(object):
         return grid
 
     @staticmethod
-    def run_recursion(cube, alphas_x, alphas_y, iterations):
+    def recurse_stack(data, alphas, axis, forward=True):
+        """
+        Method to run the recursive filter in one direction over a stack of
+        2D slices at once. This is equivalent to calling the recurse_forward_x,
+        recurse_backwards_x, recurse_forward_y or recurse_backwards_y method
+        on each 2D slice in turn, but each step of the recursion is applied
+        to every slice in the stack in a single vectorised operation.
+
+        The recursion is written as:
+            Bi = Ai + alpha * (Bi-1 - Ai)
+
+        which is equivalent to Bi = ((1-alpha) * Ai) + (alpha * Bi-1).
+
+        Args:
+            data (numpy array):
+                3D array of shape (slices, rows, columns) containing the
+                input data to which the recursive filter will be applied.
+                This array is modified in place.
+            alphas (numpy array):
+                2D array of shape (rows, columns) containing the alpha values
+                that will be used when applying the recursive filter.
+            axis (integer):
+                The axis of the data array along which the recursion is
+                applied. Either 1 (equivalent to the x methods) or 2
+                (equivalent to the y methods).
+
+        Keyword Args:
+            forward (boolean):
+                If True, the recursion progresses from gridpoint i-1 to i.
+                If False, the recursion progresses from gridpoint i+1 to i.
+
+        Returns:
+            data (numpy array):
+                Array containing the smoothed field after the recursive
+                filter has been applied in the requested direction.
+        """
+        grid = np.moveaxis(data, axis, 0)
+        alphas = np.moveaxis(alphas, axis-1, 0)
+        lim = grid.shape[0]
+        if forward:
+            indices, step = range(1, lim), -1
+        else:
+            indices, step = range(lim-2, -1, -1), 1
+        for i in indices:
+            grid[i] += alphas[i] * (grid[i+step] - grid[i])
+        return data
+
+    @staticmethod
+    @instrumented("RecursiveFilter.run_stacked_recursion")
+    def run_stacked_recursion(data, alphas_x, alphas_y, iterations,
+                              engine="vectorised"):
+        """
+        Method to run the recursive filter over a stack of 2D slices.
+
+        Args:
+            data (numpy array):
+                3D array of shape (slices, rows, columns) containing the
+                input data to which the recursive filter will be applied.
+            alphas_x (numpy array):
+                2D array of alpha values that will be used when applying
+                the recursive filter along the x-axis.
+            alphas_y (numpy array):
+                2D array of alpha values that will be used when applying
+                the recursive filter along the y-axis.
+            iterations (integer):
+                The number of iterations of the recursive filter.
+
+        Keyword Args:
+            engine (string):
+                The engine used to apply the recursive filter. One of
+                "python", "vectorised" or "compiled".
+
+        Returns:
+            data (numpy array):
+                Array containing the smoothed field after the recursive filter
+                has been applied to every slice in the stack.
+        """
+        if engine == "python":
+            for grid in data:
+                for _ in range(iterations):
+                    grid = RecursiveFilter.recurse_forward_x(grid, alphas_x)
+                    grid = RecursiveFilter.recurse_backwards_x(grid, alphas_x)
+                    grid = RecursiveFilter.recurse_forward_y(grid, alphas_y)
+                    grid = RecursiveFilter.recurse_backwards_y(grid, alphas_y)
+        elif engine == "compiled":
+            data = np.ascontiguousarray(data)
+            _compiled_recursion_kernel()(
+                data, np.ascontiguousarray(alphas_x),
+                np.ascontiguousarray(alphas_y), iterations)
+        else:
+            for _ in range(iterations):
+                data = RecursiveFilter.recurse_stack(data, alphas_x, 1)
+                data = RecursiveFilter.recurse_stack(
+                    data, alphas_x, 1, forward=False)
+                data = RecursiveFilter.recurse_stack(data, alphas_y, 2)
+                data = RecursiveFilter.recurse_stack(
+                    data, alphas_y, 2, forward=False)
+        return data
+
+    @staticmethod
+    def run_recursion(cube, alphas_x, alphas_y, iterations, engine="python"):
         """
         Method to run the recursive filter.
 
@@ -262,23 +480,33 @@ class RecursiveFilter(object):
             iterations (integer):
                 The number of iterations of the recursive filter
 
+        Keyword Args:
+            engine (string):
+                The engine used to apply the recursive filter. One of
+                "python", "vectorised" or "compiled".
+
         Returns:
             cube (Iris.cube.Cube):
                 Cube containing the smoothed field after the recursive filter
                 method has been applied to the input cube.
         """
-
-        output = cube.data
-        for _ in range(iterations):
-            output = RecursiveFilter.recurse_forward_x(output,
-                                                       alphas_x.data)
-            output = RecursiveFilter.recurse_backwards_x(output,
-                                                         alphas_x.data)
-            output = RecursiveFilter.recurse_forward_y(output,
-                                                       alphas_y.data)
-            output = RecursiveFilter.recurse_backwards_y(output,
-                                                         alphas_y.data)
-            cube.data = output
+        if engine == "python":
+            output = cube.data
+            for _ in range(iterations):
+                output = RecursiveFilter.recurse_forward_x(output,
+                                                           alphas_x.data)
+                output = RecursiveFilter.recurse_backwards_x(output,
+                                                             alphas_x.data)
+                output = RecursiveFilter.recurse_forward_y(output,
+                                                           alphas_y.data)
+                output = RecursiveFilter.recurse_backwards_y(output,
+                                                             alphas_y.data)
+                cube.data = output
+        else:
+            output = RecursiveFilter.run_stacked_recursion(
+                cube.data[np.newaxis], alphas_x.data, alphas_y.data,
+                iterations, engine=engine)
+            cube.data = output[0]
         return cube
 
     def set_alphas(self, cube, alpha, alphas_cube):
@@ -334,6 +562,75 @@ class RecursiveFilter(object):
             alphas_cube, self.edge_width, self.edge_width)
         return alphas_cube
 
+    def run_batched_recursion(self, cube, alphas_x, alphas_y, mask):
+        """
+        Method to run the recursive filter over the whole N-D data array of
+        a cube, treating every dimension other than y and x as a batch
+        dimension. The 2D slices are filtered together in batches of up to
+        self.batch_size slices, so that no per-slice cubes are constructed.
+
+        Args:
+            cube (Iris.cube.Cube):
+                Cube containing the input data to which the recursive filter
+                will be applied.
+            alphas_x (Iris.cube.Cube):
+                Cube containing a padded array of alpha values that will be
+                used when applying the recursive filter along the x-axis.
+            alphas_y (Iris.cube.Cube):
+                Cube containing a padded array of alpha values that will be
+                used when applying the recursive filter along the y-axis.
+            mask (numpy array):
+                Array used to zero masked areas before filtering. This is
+                either a 2D array matching the y and x dimensions of the cube,
+                or an array with the same number of points as the cube.
+
+        Returns:
+            new_cube (Iris.cube.Cube):
+                Cube containing the smoothed field after the recursive filter
+                method has been applied.
+        """
+        y_dim, = cube.coord_dims(cube.coord(axis='y'))
+        x_dim, = cube.coord_dims(cube.coord(axis='x'))
+        data = np.moveaxis(cube.data, [y_dim, x_dim], [-2, -1])
+        transposed_shape = data.shape
+        grid_shape = transposed_shape[-2:]
+        data = data.reshape((-1,) + grid_shape)
+
+        if mask.ndim > 2:
+            mask = np.moveaxis(
+                mask.reshape(cube.shape), [y_dim, x_dim], [-2, -1]).reshape(
+                    (-1,) + grid_shape)
+        else:
+            mask = mask[np.newaxis]
+
+        n_slices = data.shape[0]
+        batch_size = self.batch_size or n_slices
+        dtype = np.result_type(data.dtype, mask.dtype, np.float32)
+        output = np.empty(data.shape, dtype=dtype)
+        for start in range(0, n_slices, batch_size):
+            stop = min(start + batch_size, n_slices)
+            batch_mask = mask if len(mask) == 1 else mask[start:stop]
+            # Use mask to zero masked areas and zero any remaining NaN values
+            # not covered by mask.
+            batch = np.nan_to_num(np.ma.getdata(data[start:stop]) *
+                                  batch_mask)
+            batch = SquareNeighbourhood.pad_array_with_halo(
+                batch, self.edge_width, self.edge_width)
+            batch = self.run_stacked_recursion(
+                batch, alphas_x.data, alphas_y.data, self.iterations,
+                engine=self.engine)
+            end = -2*self.edge_width if self.edge_width != 0 else None
+            output[start:stop] = batch[:, 2*self.edge_width:end,
+                                       2*self.edge_width:end]
+
+        if self.re_mask:
+            output = np.ma.masked_array(
+                output, mask=np.broadcast_to(np.logical_not(mask),
+                                             output.shape))
+        output = np.moveaxis(output.reshape(transposed_shape), [-2, -1],
+                             [y_dim, x_dim])
+        return cube.copy(data=output)
+
     def process(self, cube, alphas_x=None, alphas_y=None, mask_cube=None):
         """
         Set up the alpha parameters and run the recursive filter.
@@ -355,6 +652,10 @@ class RecursiveFilter(object):
         7. Return the 'new cube' which now contains the recursively filtered
            values for the original input cube.
 
+        If the "vectorised" or "compiled" engine is used, steps 1 to 6 are
+        replaced by filtering the whole data array in batches of 2D slices
+        (see run_batched_recursion).
+
         Args:
             cube (Iris.cube.Cube):
                 Cube containing the input data to which the recursive filter
@@ -389,6 +690,9 @@ class RecursiveFilter(object):
         except ValueError:
             mask = np.ones((cube_format.data.shape))
 
+        if self.engine != "python":
+            return self.run_batched_recursion(cube, alphas_x, alphas_y, mask)
+
         recursed_cube = iris.cube.CubeList()
         for output in cube.slices([cube.coord(axis='y'),
                                    cube.coord(axis='x')]):
@@ -401,7 +705,7 @@ class RecursiveFilter(object):
             padded_cube = SquareNeighbourhood().pad_cube_with_halo(
                 output, self.edge_width, self.edge_width)
             new_cube = self.run_recursion(padded_cube, alphas_x, alphas_y,
-                                          self.iterations)
+                                          self.iterations, engine=self.engine)
             new_cube = SquareNeighbourhood().remove_halo_from_cube(
                 new_cube, self.edge_width, self.edge_width)
             if self.re_mask:
@@ -36,6 +36,7 @@ import numpy as np
 
 from improver.utilities.cube_checker import (
     check_for_x_and_y_axes, check_cube_coordinates)
+from improver.utilities.instrumentation import instrumented
 from improver.utilities.spatial import (
     convert_distance_into_number_of_grid_cells)
 
@@ -229,6 +230,36 @@ class SquareNeighbourhood(object):
             new_cube.add_aux_coord(coord_y)
         return new_cube
 
+    @staticmethod
+    def pad_array_with_halo(data, width_x, width_y):
+        """
+        Method to pad a halo around the last two (y and x) dimensions of a
+        numpy array. The padding is calculated in the same way as in
+        pad_cube_with_halo, using the mean within the neighbourhood width at
+        the edge of the data as the padding value. Any leading dimensions
+        are not padded.
+
+        Args:
+            data (numpy array):
+                Array with y and x as the last two dimensions.
+            width_x, width_y (int):
+                The width in x and y directions of the neighbourhood radius in
+                grid cells. This will be the width of padding to be added to
+                the numpy array.
+
+        Returns:
+            numpy array:
+                Array padded in the y and x dimensions.
+        """
+        leading_dims = data.ndim - 2
+        pad_width = (
+            ((0, 0),) * leading_dims +
+            ((2*width_y, 2*width_y), (2*width_x, 2*width_x)))
+        stat_length = (
+            ((1, 1),) * leading_dims +
+            ((width_y, width_y), (width_x, width_x)))
+        return np.pad(data, pad_width, "mean", stat_length=stat_length)
+
     def pad_cube_with_halo(self, cube, width_x, width_y):
         """
         Method to pad a halo around the data in an iris cube. The padding
@@ -313,6 +344,49 @@ class SquareNeighbourhood(object):
                     slice_2d, trimmed_data, trimmed_x_coord, trimmed_y_coord))
         return cubelist.merge_cube()
 
+    @staticmethod
+    def _sum_over_neighbourhood(flattened, n_columns, cells_x, cells_y):
+        """
+        Calculate the neighbourhood total from cumulated data using the
+        4-point algorithm described in mean_over_neighbourhood.
+
+        Args:
+            flattened (numpy array):
+                Cumulated data with the y and x dimensions flattened into
+                the last dimension. Any leading dimensions are processed
+                together.
+            n_columns (int):
+                The number of points along the x axis of the cumulated data.
+            cells_x, cells_y (int):
+                The radius of the neighbourhood in grid points, in the x and y
+                directions (excluding the central grid point).
+
+        Returns:
+            numpy array:
+                Neighbourhood total at each point, with the same shape as
+                the flattened input.
+        """
+        # Displacements from the point at the centre of the neighbourhood.
+        # Equivalent to point B in the docstring example.
+        ymax_xmax_disp = (cells_y*n_columns) + cells_x
+        # Equivalent to point A in the docstring example.
+        ymax_xmin_disp = (cells_y*n_columns) - cells_x - 1
+
+        # Equivalent to point D in the docstring example.
+        ymin_xmax_disp = (-1*(cells_y+1)*n_columns) + cells_x
+        # Equivalent to point C in the docstring example.
+        ymin_xmin_disp = (-1*(cells_y+1)*n_columns) - cells_x - 1
+
+        # Create 4 copies of the flattened array which are rolled to align
+        # the 4-points which are needed for the calculation.
+        ymax_xmax_array = np.roll(flattened, -ymax_xmax_disp, axis=-1)
+        ymin_xmax_array = np.roll(flattened, -ymin_xmax_disp, axis=-1)
+        ymin_xmin_array = np.roll(flattened, -ymin_xmin_disp, axis=-1)
+        ymax_xmin_array = np.roll(flattened, -ymax_xmin_disp, axis=-1)
+        return (ymax_xmax_array - ymin_xmax_array +
+                ymin_xmin_array - ymax_xmin_array)
+
+    @instrumented("SquareNeighbourhood.mean_over_neighbourhood")
     def mean_over_neighbourhood(self, cube, cells_x, cells_y, nan_masks):
         """
         Method to calculate the average value in a square neighbourhood using
@@ -386,34 +460,13 @@ class SquareNeighbourhood(object):
         yname = cube.coord(axis="y").name()
         xname = cube.coord(axis="x").name()
 
-        # Calculate displacement factors to find 4-points after flattening the
-        # array.
         n_rows = len(cube.coord(axis="y").points)
         n_columns = len(cube.coord(axis="x").points)
 
-        # Displacements from the point at the centre of the neighbourhood.
-        # Equivalent to point B in the docstring example.
-        ymax_xmax_disp = (cells_y*n_columns) + cells_x
-        # Equivalent to point A in the docstring example.
-        ymax_xmin_disp = (cells_y*n_columns) - cells_x - 1
-
-        # Equivalent to point D in the docstring example.
-        ymin_xmax_disp = (-1*(cells_y+1)*n_columns) + cells_x
-        # Equivalent to point C in the docstring example.
-        ymin_xmin_disp = (-1*(cells_y+1)*n_columns) - cells_x - 1
-
         cubelist = iris.cube.CubeList([])
         for slice_2d, nan_mask in zip(cube.slices([yname, xname]), nan_masks):
-            # Flatten the 2d slice and create 4 copies of the flattened
-            # array which are rolled to align the 4-points which are needed
-            # for the calculation.
-            flattened = slice_2d.data.flatten()
-            ymax_xmax_array = np.roll(flattened, -ymax_xmax_disp)
-            ymin_xmax_array = np.roll(flattened, -ymin_xmax_disp)
-            ymin_xmin_array = np.roll(flattened, -ymin_xmin_disp)
-            ymax_xmin_array = np.roll(flattened, -ymax_xmin_disp)
-            neighbourhood_total = (ymax_xmax_array - ymin_xmax_array +
-                                   ymin_xmin_array - ymax_xmin_array)
+            neighbourhood_total = self._sum_over_neighbourhood(
+                slice_2d.data.flatten(), n_columns, cells_x, cells_y)
             neighbourhood_total.resize(n_rows, n_columns)
 
             if self.sum_or_fraction == "fraction":
@@ -430,6 +483,52 @@ class SquareNeighbourhood(object):
             cubelist.append(slice_2d)
         return cubelist.merge_cube()
 
+    @instrumented("SquareNeighbourhood.neighbourhood_array")
+    def neighbourhood_array(self, data, cells_x, cells_y):
+        """
+        Apply the square neighbourhood to a numpy array with y and x as the
+        last two dimensions. All leading dimensions (e.g. realization and
+        time) are processed together, rather than slice by slice. This
+        pads the array with a halo, cumulates it, calculates the
+        neighbourhood sum or fraction using the 4-point algorithm
+        and then removes the halo again.
+
+        Args:
+            data (numpy array):
+                Array with y and x as the last two dimensions.
+            cells_x, cells_y (int):
+                The radius of the neighbourhood in grid points, in the x and y
+                directions (excluding the central grid point).
+
+        Returns:
+            numpy array:
+                Array of the same shape as the input data, to which the
+                square neighbourhood has been applied. Points which were
+                NaN within the padded data are returned as NaN.
+        """
+        padded = self.pad_array_with_halo(data, cells_x, cells_y)
+        nan_mask = np.isnan(padded)
+        padded[nan_mask] = 0
+        summed = np.cumsum(np.cumsum(padded, axis=-2), axis=-1)
+
+        n_columns = summed.shape[-1]
+        flattened = summed.reshape(summed.shape[:-2] + (-1,))
+        neighbourhood_total = self._sum_over_neighbourhood(
+            flattened, n_columns, cells_x, cells_y).reshape(summed.shape)
+
+        if self.sum_or_fraction == "fraction":
+            neighbourhood_area = float((2*cells_x+1) * (2*cells_y+1))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = (
+                    neighbourhood_total.astype(float) / neighbourhood_area)
+        else:
+            result = neighbourhood_total.astype(float)
+        result[nan_mask] = np.NaN
+
+        end_y = -2*cells_y if cells_y != 0 else None
+        end_x = -2*cells_x if cells_x != 0 else None
+        return result[..., 2*cells_y:end_y, 2*cells_x:end_x]
+
     @staticmethod
     def _set_up_cubes_to_be_neighbourhooded(cube, mask_cube=None):
         """
@@ -532,6 +631,77 @@ class SquareNeighbourhood(object):
                 The number of grid cells along the y axis used to create a
                 square neighbourhood.
 
+        Returns:
+            neighbourhood_averaged_cube (Iris.cube.Cube):
+                Cube containing the smoothed field after the square
+                neighbourhood method has been applied.
+        """
+        unpadded_cubes = iris.cube.CubeList([
+            self.remove_halo_from_cube(
+                neighbourhood_averaged_cube, grid_cells_x, grid_cells_y)
+            for neighbourhood_averaged_cube in neighbourhood_averaged_cubes])
+        return self._correct_for_mask(
+            unpadded_cubes, pre_neighbourhood_cubes, cube_name)
+
+    def _calculate_neighbourhood_stacked(
+            self, cubes_to_sum, grid_cells_x, grid_cells_y):
+        """
+        Apply neighbourhood processing to the whole data array of each cube
+        at once, using neighbourhood_array, rather than padding, cumulating
+        and neighbourhooding each 2D slice as a separate cube. The
+        metadata is attached to each result only once at the end.
+
+        Args:
+            cubes_to_sum (Iris.cube.CubeList):
+                CubeList containing either the input cube, or the input cube
+                and a mask cube.
+            grid_cells_x (Float):
+                The number of grid cells along the x axis used to create a
+                square neighbourhood.
+            grid_cells_y (Float):
+                The number of grid cells along the y axis used to create a
+                square neighbourhood.
+
+        Returns:
+            neighbourhood_averaged_cubes (Iris.cube.CubeList):
+                CubeList containing the smoothed field after the square
+                neighbourhood method has been applied to either the input cube,
+                or both the input cube and a mask cube. These cubes are not
+                padded.
+        """
+        neighbourhood_averaged_cubes = iris.cube.CubeList([])
+        for cube_to_process in cubes_to_sum:
+            check_for_x_and_y_axes(cube_to_process)
+            ydim, = cube_to_process.coord_dims(
+                cube_to_process.coord(axis="y"))
+            xdim, = cube_to_process.coord_dims(
+                cube_to_process.coord(axis="x"))
+            data = np.moveaxis(cube_to_process.data, [ydim, xdim], [-2, -1])
+            data = self.neighbourhood_array(data, grid_cells_x, grid_cells_y)
+            data = np.moveaxis(data, [-2, -1], [ydim, xdim])
+            neighbourhood_averaged_cubes.append(
+                cube_to_process.copy(data=data))
+        return neighbourhood_averaged_cubes
+
+    def _correct_for_mask(
+            self, neighbourhood_averaged_cubes, pre_neighbourhood_cubes,
+            cube_name):
+        """
+        Correct the neighbourhood processed data using the neighbourhood
+        processed mask, and re-apply the original mask, if required.
+
+        Args:
+            neighbourhood_averaged_cubes (Iris.cube.CubeList):
+                CubeList containing the unpadded smoothed field after the
+                square neighbourhood method has been applied to either the
+                input cube, or both the input cube and a mask cube.
+            pre_neighbourhood_cubes (Iris.cube.CubeList):
+                CubeList containing the fields prior to applying neighbourhood
+                processing. This is required to be able to know the original
+                mask cube.
+            cube_name (String):
+                Name of the variable that has been neighbourhooded.
+
         Returns:
             neighbourhood_averaged_cube (Iris.cube.Cube):
                 Cube containing the smoothed field after the square
@@ -542,23 +712,22 @@ class SquareNeighbourhood(object):
         # reality.
         neighbourhood_averaged_cube, = neighbourhood_averaged_cubes.extract(
             cube_name)
-        neighbourhood_averaged_cube = self.remove_halo_from_cube(
-            neighbourhood_averaged_cube, grid_cells_x, grid_cells_y)
         if len(neighbourhood_averaged_cubes) > 1:
             mask_cube, = neighbourhood_averaged_cubes.extract('mask_data')
-            mask_cube = self.remove_halo_from_cube(
-                mask_cube, grid_cells_x, grid_cells_y)
             with np.errstate(invalid='ignore', divide='ignore'):
                 divided_data = np.true_divide(
-                    neighbourhood_averaged_cube.data, mask_cube.data)
+                    neighbourhood_averaged_cube.data, mask_cube.data.squeeze())
                 divided_data[~np.isfinite(divided_data)] = np.nan
                 neighbourhood_averaged_cube.data = divided_data
             if self.re_mask:
                 original_mask_cube, = (
                     pre_neighbourhood_cubes.extract('mask_data'))
+                # A single mask may apply to many realizations or times.
+                mask = np.broadcast_to(
+                    np.logical_not(original_mask_cube.data.squeeze()),
+                    neighbourhood_averaged_cube.shape)
                 neighbourhood_averaged_cube.data = np.ma.masked_array(
-                    neighbourhood_averaged_cube.data,
-                    mask=np.logical_not(original_mask_cube.data.squeeze()))
+                    neighbourhood_averaged_cube.data, mask=mask.copy())
         return neighbourhood_averaged_cube
 
     def run(self, cube, radius, mask_cube=None):
@@ -569,10 +738,10 @@ class SquareNeighbourhood(object):
         The steps undertaken are:
 
         1. Set up cubes by determining, if the arrays are masked.
-        2. Pad the input array with a halo and then calculate the neighbourhood
-           of the haloed array.
-        3. Remove the halo from the neighbourhooded array and deal with a mask,
-           if required.
+        2. Pad the input array with a halo, calculate the neighbourhood
+           of the haloed array and remove the halo again. All slices of
+           the data array are processed together.
+        3. Deal with a mask, if required.
 
         Args:
             cube (Iris.cube.Cube):
@@ -601,12 +770,10 @@ class SquareNeighbourhood(object):
         cubes_to_sum = (
             self._set_up_cubes_to_be_neighbourhooded(cube, mask_cube))
         neighbourhood_averaged_cubes = (
-            self._pad_and_calculate_neighbourhood(
+            self._calculate_neighbourhood_stacked(
                 cubes_to_sum, grid_cells_x, grid_cells_y))
-        neighbourhood_averaged_cube = (
-            self._remove_padding_and_mask(
-                neighbourhood_averaged_cubes, cubes_to_sum, cube.name(),
-                grid_cells_x, grid_cells_y))
+        neighbourhood_averaged_cube = self._correct_for_mask(
+            neighbourhood_averaged_cubes, cubes_to_sum, cube.name())
 
         neighbourhood_averaged_cube.cell_methods = original_methods
         neighbourhood_averaged_cube.attributes = original_attributes
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Module for running a chain of improver plugins within one process."""
+
+from collections import OrderedDict
+import importlib
+import json
+
+import iris
+
+from improver.utilities import instrumentation
+from improver.utilities.load import load_cube
+from improver.utilities.save import save_cube
+
+
+# Plugins that can be referred to by name within a recipe. Any other
+# improver plugin can be referred to by its full dotted path.
+PIPELINE_PLUGINS = {
+    "blend-adjacent-points": (
+        "improver.blending.blend_across_adjacent_points."
+        "TriangularWeightedBlendAcrossAdjacentPoints"),
+    "combine": "improver.cube_combiner.CubeCombiner",
+    "ecc-percentiles-from-probabilities": (
+        "improver.ensemble_copula_coupling.ensemble_copula_coupling."
+        "GeneratePercentilesFromProbabilities"),
+    "ecc-rebadge-percentiles": (
+        "improver.ensemble_copula_coupling.ensemble_copula_coupling."
+        "RebadgePercentilesAsMembers"),
+    "ecc-reordering": (
+        "improver.ensemble_copula_coupling.ensemble_copula_coupling."
+        "EnsembleReordering"),
+    "ecc-resample-percentiles": (
+        "improver.ensemble_copula_coupling.ensemble_copula_coupling."
+        "ResamplePercentiles"),
+    "nbhood": "improver.nbhood.nbhood.NeighbourhoodProcessing",
+    "nbhood-iterate-with-mask": (
+        "improver.nbhood.use_nbhood.ApplyNeighbourhoodProcessingWithAMask"),
+    "nbhood-percentiles": (
+        "improver.nbhood.nbhood.GeneratePercentilesFromANeighbourhood"),
+    "nbhood-vicinity": "improver.nbhood.vicinity.ProbabilityOfOccurrence",
+    "percentile": "improver.percentile.PercentileConverter",
+    "recursive-filter": "improver.nbhood.recursive_filter.RecursiveFilter",
+    "snow-falling-level": (
+        "improver.psychrometric_calculations.psychrometric_calculations."
+        "FallingSnowLevel"),
+    "threshold": "improver.threshold.BasicThreshold",
+    "weighted-blending": (
+        "improver.blending.weighted_blend.WeightedBlendAcrossWholeDimension"),
+    "wet-bulb-temperature": (
+        "improver.psychrometric_calculations.psychrometric_calculations."
+        "WetBulbTemperature"),
+    "wind-gust-diagnostic": (
+        "improver.wind_gust_diagnostic.WindGustDiagnostic"),
+    "wxcode": "improver.wxcode.weather_symbols.WeatherSymbols",
+}
+
+
+def get_plugin_class(plugin):
+    """
+    Find the class for a plugin named within a recipe.
+
+    Args:
+        plugin (str):
+            Either the name of a plugin within PIPELINE_PLUGINS, or the full
+            dotted path to a class within the improver package, e.g.
+            "improver.threshold.BasicThreshold".
+
+    Returns:
+        plugin_class (class):
+            The plugin class.
+
+    Raises:
+        ValueError: If the plugin is not known.
+    """
+    path = PIPELINE_PLUGINS.get(plugin, plugin)
+    module_name, _, class_name = path.rpartition(".")
+    if module_name.split(".")[0] != "improver":
+        msg = ("Unknown plugin: {}. Either use one of {} or the full path to "
+               "an improver class.".format(
+                   plugin, sorted(PIPELINE_PLUGINS.keys())))
+        raise ValueError(msg)
+    module = importlib.import_module(module_name)
+    instrumentation.instrument_plugins()
+    try:
+        return getattr(module, class_name)
+    except AttributeError:
+        raise ValueError("Unknown plugin: {}".format(plugin))
+
+
+class Pipeline(object):
+
+    """
+    Run a chain of improver plugins within one process, passing the cubes
+    between the steps in memory rather than saving and loading them.
+
+    A recipe is a dictionary with the structure::
+
+        {
+            "inputs": {
+                "precip": "input.nc",
+                "mask": {"filepath": "mask.nc", "constraints": "land_mask"}
+            },
+            "steps": [
+                {
+                    "name": "probabilities",
+                    "plugin": "threshold",
+                    "args": {"thresholds": [0.1, 1.0]},
+                    "inputs": ["precip"]
+                },
+                {
+                    "name": "smoothed",
+                    "plugin": "nbhood",
+                    "args": {"neighbourhood_method": "square",
+                             "radii": 20000},
+                    "inputs": ["probabilities"],
+                    "keyword_inputs": {"mask_cube": "mask"},
+                    "output": "smoothed.nc"
+                }
+            ]
+        }
+
+    Each input is loaded using load_cube. For each step, the plugin is
+    created using "args" as keyword arguments, and its process method is
+    called with the cubes named in "inputs" as positional arguments, the
+    cubes named in "keyword_inputs" as keyword arguments and any other
+    keyword arguments in "process_args". An entry within "inputs" or
+    "keyword_inputs" may be a list of names, which is passed to the plugin
+    as an iris.cube.CubeList. The result of each step can be used by later
+    steps by its name. Only steps with an "output" filepath are saved.
+    """
+
+    def __init__(self, recipe):
+        """
+        Set up the pipeline and check that the recipe is valid.
+
+        Args:
+            recipe (dict):
+                The recipe describing the inputs and steps of the pipeline.
+
+        Raises:
+            ValueError: If the recipe contains no steps.
+            ValueError: If a step name is repeated or is the name of an
+                        input.
+            ValueError: If a step uses a cube that is neither an input
+                        nor the result of an earlier step.
+            ValueError: If a step uses an unknown plugin.
+        """
+        self.inputs = OrderedDict(recipe.get("inputs", {}))
+        self.steps = recipe.get("steps", [])
+        if not self.steps:
+            raise ValueError("The recipe contains no steps.")
+
+        available = set(self.inputs.keys())
+        self.plugin_classes = []
+        for step in self.steps:
+            if step["name"] in available:
+                msg = ("The step name {} has already been used for an input "
+                       "or an earlier step.".format(step["name"]))
+                raise ValueError(msg)
+            missing = set(self._input_names(step)) - available
+            if missing:
+                msg = ("Step {} uses {}, which are not inputs or the results "
+                       "of earlier steps.".format(
+                           step["name"], sorted(missing)))
+                raise ValueError(msg)
+            self.plugin_classes.append(get_plugin_class(step["plugin"]))
+            available.add(step["name"])
+
+        # The index of the last step that uses each cube, so that cubes can
+        # be released once they are no longer needed.
+        self.last_use = {}
+        for index, step in enumerate(self.steps):
+            for name in self._input_names(step):
+                self.last_use[name] = index
+
+    @classmethod
+    def from_file(cls, filepath):
+        """
+        Set up the pipeline from a JSON recipe file.
+
+        Args:
+            filepath (str):
+                Path to the JSON recipe file.
+
+        Returns:
+            Pipeline:
+                The pipeline described by the recipe.
+        """
+        with open(filepath, "r") as recipe_file:
+            recipe = json.load(recipe_file, object_pairs_hook=OrderedDict)
+        return cls(recipe)
+
+    def __repr__(self):
+        """Represent the configured plugin instance as a string."""
+        result = '<Pipeline: inputs: {}; steps: {}>'
+        return result.format(
+            list(self.inputs.keys()), [step["name"] for step in self.steps])
+
+    @staticmethod
+    def _input_names(step):
+        """
+        List the names of all the cubes used by a step.
+
+        Args:
+            step (dict):
+                The step within the recipe.
+
+        Returns:
+            names (list):
+                The names of the cubes used by the step.
+        """
+        names = []
+        entries = (list(step.get("inputs", [])) +
+                   list(step.get("keyword_inputs", {}).values()))
+        for entry in entries:
+            if isinstance(entry, list):
+                names.extend(entry)
+            else:
+                names.append(entry)
+        return names
+
+    @staticmethod
+    def _get_cubes(entry, cubes):
+        """
+        Find the cube, or cubes, for an entry within the inputs of a step.
+
+        Args:
+            entry (str or list):
+                The name of a cube, or a list of names.
+            cubes (dict):
+                Dictionary of the cubes available, keyed by name.
+
+        Returns:
+            iris.cube.Cube or iris.cube.CubeList:
+                The cube for a name, or a CubeList for a list of names.
+        """
+        if isinstance(entry, list):
+            return iris.cube.CubeList([cubes[name] for name in entry])
+        return cubes[entry]
+
+    def load_inputs(self):
+        """
+        Load the inputs to the pipeline.
+
+        Returns:
+            cubes (dict):
+                Dictionary of the loaded cubes, keyed by name.
+        """
+        cubes = {}
+        for name, source in self.inputs.items():
+            if isinstance(source, dict):
+                cubes[name] = load_cube(
+                    source["filepath"], constraints=source.get("constraints"))
+            else:
+                cubes[name] = load_cube(source)
+        return cubes
+
+    def process(self, cubes=None):
+        """
+        Run each step of the pipeline in turn, saving the results of the
+        steps that have an output filepath.
+
+        Keyword Args:
+            cubes (dict):
+                Dictionary of cubes keyed by name to use in place of the
+                inputs within the recipe. If None, the inputs are loaded.
+
+        Returns:
+            results (OrderedDict):
+                The results of the steps that have an output filepath, keyed
+                by step name.
+        """
+        if cubes is None:
+            cubes = self.load_inputs()
+        else:
+            cubes = dict(cubes)
+
+        results = OrderedDict()
+        for index, (step, plugin_class) in enumerate(
+                zip(self.steps, self.plugin_classes)):
+            plugin = plugin_class(**step.get("args", {}))
+            args = [self._get_cubes(entry, cubes)
+                    for entry in step.get("inputs", [])]
+            kwargs = dict(step.get("process_args", {}))
+            for keyword, entry in step.get("keyword_inputs", {}).items():
+                kwargs[keyword] = self._get_cubes(entry, cubes)
+            result = plugin.process(*args, **kwargs)
+
+            if "output" in step:
+                save_cube(result, step["output"], unlimited_dimensions=[])
+                results[step["name"]] = result
+            cubes[step["name"]] = result
+
+            # Release the cubes that no later step uses.
+            for name in list(cubes.keys()):
+                if (self.last_use.get(name, -1) <= index and
+                        name not in results):
+                    del cubes[name]
+        return results
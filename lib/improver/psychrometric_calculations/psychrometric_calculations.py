@@ -34,12 +34,13 @@ import warnings
 
 import numpy as np
 import iris
+import scipy.ndimage
 from stratify import interpolate
 from scipy.interpolate import griddata
 from cf_units import Unit
 
 from improver.psychrometric_calculations import svp_table
-from improver.utilities.cube_checker import check_cube_coordinates
+from improver.utilities.instrumentation import instrumented
 from improver.utilities.mathematical_operations import Integration
 import improver.constants as cc
 
@@ -231,6 +232,161 @@ class Utilities(object):
         return svp
 
 
+class SaturatedVapourPressureLookup(object):
+
+    """
+    Look up the saturated vapour pressure of a pure water vapour system, and
+    its gradient with respect to temperature, by linear interpolation within
+    a table of values.
+
+    The slope and offset of the line through each interval of the table are
+    precomputed, so that each lookup is a single multiply and add. By
+    default the svp_table (see top of file) is used. Tables at other
+    resolutions are generated using the Goff-Gratch method, and are kept so
+    that they are only generated once for each range and resolution.
+
+    Temperatures beyond the range of the table are given the saturated
+    vapour pressure at the nearest end of the table, and a gradient of zero.
+    """
+
+    # The slopes and offsets of the tables used so far, keyed by the
+    # minimum and maximum temperatures and the increment of the table.
+    _coefficients_cache = {}
+
+    def __init__(self, t_increment=None, t_min=svp_table.T_MIN,
+                 t_max=svp_table.T_MAX):
+        """
+        Initialise class.
+
+        Keyword Args:
+            t_increment (float or None):
+                The temperature increment (K) between the values in the
+                table. If None, the svp_table is used, and t_min and t_max
+                are ignored.
+            t_min (float):
+                The minimum temperature (K) in the table.
+            t_max (float):
+                The maximum temperature (K) in the table.
+        """
+        if t_increment is None:
+            t_min = svp_table.T_MIN
+            t_max = svp_table.T_MAX
+        self.t_increment = t_increment
+        self.t_min = t_min
+        self.t_max = t_max
+        self.slopes, self.offsets = self._coefficients()
+
+    def __repr__(self):
+        """Represent the configured plugin instance as a string."""
+        result = ('<SaturatedVapourPressureLookup: t_min: {}; t_max: {}; '
+                  't_increment: {}>'.format(self.t_min, self.t_max,
+                                            self.t_increment))
+        return result
+
+    def _table(self):
+        """
+        Return the saturated vapour pressures at each temperature in the
+        table, generating them using the Goff-Gratch method unless the
+        svp_table is being used.
+
+        Returns:
+            (tuple): tuple containing:
+                **temperatures** (numpy.ndarray):
+                    The temperatures of the table (K).
+                **svps** (numpy.ndarray):
+                    The saturated vapour pressures at those temperatures (Pa).
+        """
+        if self.t_increment is None:
+            temperatures = svp_table.T_MIN + svp_table.T_INCREMENT * np.arange(
+                svp_table.DATA.size)
+            return temperatures, svp_table.DATA
+        temperatures = np.arange(self.t_min,
+                                 self.t_max + 0.5*self.t_increment,
+                                 self.t_increment)
+        svp = Utilities.saturation_vapour_pressure_goff_gratch(
+            iris.cube.Cube(temperatures, 'air_temperature', units='K'))
+        return temperatures, svp.data
+
+    def _coefficients(self):
+        """
+        Return the slope and offset of the line through each interval of the
+        table, from the cache if the table has been used before.
+
+        Returns:
+            (tuple): tuple containing:
+                **slopes** (numpy.ndarray):
+                    The gradient of the saturated vapour pressure with
+                    respect to temperature within each interval (Pa K-1).
+                **offsets** (numpy.ndarray):
+                    The offset of the line through each interval (Pa), so
+                    that the saturated vapour pressure is
+                    offset + slope * temperature.
+        """
+        key = (self.t_min, self.t_max, self.t_increment)
+        if key not in self._coefficients_cache:
+            temperatures, svps = self._table()
+            slopes = np.diff(svps) / np.diff(temperatures)
+            offsets = svps[:-1] - slopes * temperatures[:-1]
+            self._coefficients_cache[key] = (slopes, offsets)
+        return self._coefficients_cache[key]
+
+    def _interval(self, temperature):
+        """
+        Find the interval of the table containing each temperature.
+
+        Args:
+            temperature (numpy.ndarray):
+                Array of temperatures (K).
+
+        Returns:
+            (tuple): tuple containing:
+                **index** (numpy.ndarray):
+                    The index of the interval containing each temperature.
+                **clipped** (numpy.ndarray):
+                    The temperatures, limited to the range of the table.
+        """
+        increment = (self.t_increment if self.t_increment is not None
+                     else svp_table.T_INCREMENT)
+        clipped = np.clip(temperature, self.t_min, self.t_max)
+        # Rounding can place t_max at the end of the table, so limit the
+        # index to that of the last interval.
+        index = np.minimum(((clipped - self.t_min) / increment).astype(int),
+                           self.slopes.size - 1)
+        return index, clipped
+
+    def svp(self, temperature):
+        """
+        Look up the saturated vapour pressure at each temperature.
+
+        Args:
+            temperature (numpy.ndarray):
+                Array of temperatures (K).
+
+        Returns:
+            svp (numpy.ndarray):
+                Array of saturated vapour pressures (Pa).
+        """
+        index, clipped = self._interval(temperature)
+        return self.offsets[index] + self.slopes[index] * clipped
+
+    def svp_gradient(self, temperature):
+        """
+        Look up the gradient of the saturated vapour pressure with respect to
+        temperature at each temperature.
+
+        Args:
+            temperature (numpy.ndarray):
+                Array of temperatures (K).
+
+        Returns:
+            gradient (numpy.ndarray):
+                Array of gradients (Pa K-1), which are zero beyond the range
+                of the table.
+        """
+        index, clipped = self._interval(temperature)
+        return np.where(clipped == temperature, self.slopes[index], 0.)
+
+
 class WetBulbTemperature(object):
 
     """
@@ -245,7 +401,7 @@ class WetBulbTemperature(object):
     temperatures covered by the table and the increments in the table.
 
     """
-    def __init__(self, precision=0.005):
+    def __init__(self, precision=0.005, svp_increment=None):
         """
         Initialise class.
 
@@ -253,8 +409,13 @@ class WetBulbTemperature(object):
             precision (float):
                 The precision to which the Newton iterator must converge before
                 returning wet bulb temperatures.
+            svp_increment (float or None):
+                The temperature increment (K) of the saturated vapour
+                pressure lookup table. If None, the svp_table is used.
         """
         self.precision = precision
+        self.svp_lookup = SaturatedVapourPressureLookup(
+            t_increment=svp_increment)
 
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
@@ -267,8 +428,8 @@ class WetBulbTemperature(object):
         too low or high for a method to use safely.
 
         Args:
-            cube (iris.cube.Cube):
-                A cube of temperature.
+            cube (iris.cube.Cube or numpy.ndarray):
+                A cube or array of temperature.
 
             low (int or float):
                 Lowest allowable temperature for check
@@ -280,13 +441,13 @@ class WetBulbTemperature(object):
             UserWarning : If any of the values in cube.data are outside the
                           bounds set by the low and high variables.
         """
-        if cube.data.max() > high or cube.data.min() < low:
+        data = cube.data if isinstance(cube, iris.cube.Cube) else cube
+        if data.max() > high or data.min() < low:
             emsg = ("Wet bulb temperatures are being calculated for conditions"
                     " beyond the valid range of the saturated vapour pressure"
                     " lookup table (< {}K or > {}K). Input cube has\n"
                     "Lowest temperature = {}\nHighest temperature = {}")
-            warnings.warn(emsg.format(low, high, cube.data.min(),
-                                      cube.data.max()))
+            warnings.warn(emsg.format(low, high, data.min(), data.max()))
 
     def _lookup_svp(self, temperature):
         """
@@ -302,26 +463,31 @@ class WetBulbTemperature(object):
             svp (iris.cube.Cube):
                 A cube of saturated vapour pressures (Pa).
         """
-        T_min = svp_table.T_MIN
-        T_max = svp_table.T_MAX
-        delta_T = svp_table.T_INCREMENT
-        self.check_range(temperature, T_min, T_max)
-        temperatures = temperature.data
-        T_clipped = np.clip(temperatures, T_min, T_max)
-
-        # Note the indexing below differs by -1 compared with the UM due to
-        # Python vs. Fortran indexing.
-        table_position = (T_clipped - T_min + delta_T)/delta_T - 1.
-        table_index = table_position.astype(int)
-        interpolation_factor = table_position - table_index
-        svps = ((1.0 - interpolation_factor) * svp_table.DATA[table_index] +
-                interpolation_factor * svp_table.DATA[table_index + 1])
+        self.check_range(temperature, self.svp_lookup.t_min,
+                         self.svp_lookup.t_max)
+        svps = self._lookup_svp_array(temperature.data)
 
         svp = temperature.copy(data=svps)
         svp.units = Unit('Pa')
         svp.rename("saturated_vapour_pressure")
         return svp
 
+    def _lookup_svp_array(self, temperatures):
+        """
+        Look up the saturation vapour pressure of water vapour at each of an
+        array of temperatures, without checking that the temperatures lie
+        within the range of the table. Temperatures beyond the table are
+        given the saturation vapour pressure at the end of the table.
+
+        Args:
+            temperatures (numpy.ndarray):
+                Array of air temperatures (K).
+        Returns:
+            svps (numpy.ndarray):
+                Array of saturated vapour pressures (Pa).
+        """
+        return self.svp_lookup.svp(temperatures)
+
     @staticmethod
     def _pressure_correct_svp(svp, temperature, pressure):
         """
@@ -350,11 +516,33 @@ class WetBulbTemperature(object):
         temp = temperature.copy()
         temp.convert_units('celsius')
 
-        correction = (1. + 1.0E-8 * pressure.data *
-                      (4.5 + 6.0E-4 * temp.data ** 2))
-        svp.data = svp.data*correction
+        svp.data = WetBulbTemperature._pressure_correct_svp_array(
+            svp.data, temp.data, pressure.data)
         return svp
 
+    @staticmethod
+    def _pressure_correct_svp_array(svp, temperature, pressure):
+        """
+        Convert an array of saturated vapour pressures in a pure water vapour
+        system into saturated vapour pressures in air, as in
+        _pressure_correct_svp.
+
+        Args:
+            svp (numpy.ndarray):
+                Array of saturated vapour pressures (Pa).
+            temperature (numpy.ndarray):
+                Array of air temperatures (Celsius).
+            pressure (numpy.ndarray):
+                Array of pressures (Pa).
+
+        Returns:
+            svp (numpy.ndarray):
+                Array of saturated vapour pressures in air (Pa).
+        """
+        correction = (1. + 1.0E-8 * pressure *
+                      (4.5 + 6.0E-4 * temperature ** 2))
+        return svp * correction
+
     def _calculate_mixing_ratio(self, temperature, pressure):
         """Function to compute the mixing ratio given temperature and pressure.
 
@@ -376,100 +564,246 @@ class WetBulbTemperature(object):
         """
         svp = self._lookup_svp(temperature)
         svp = self._pressure_correct_svp(svp, temperature, pressure)
-
-        # Calculation
-        result_numer = (cc.EARTH_REPSILON * svp.data)
-        max_pressure_term = np.maximum(svp.data, pressure.data)
-        result_denom = (max_pressure_term - ((1. - cc.EARTH_REPSILON) *
-                                             svp.data))
-        mixing_ratio = temperature.copy(data=result_numer / result_denom)
+        mixing_ratio = temperature.copy(
+            data=self._mixing_ratio_from_svp(svp.data, pressure.data))
 
         # Tidying up cube
         mixing_ratio.rename("humidity_mixing_ratio")
         mixing_ratio.units = Unit("1")
         return mixing_ratio
 
-    def calculate_wet_bulb_temperature(self, temperature, relative_humidity,
-                                       pressure):
+    @staticmethod
+    def _mixing_ratio_from_svp(svp, pressure):
         """
-        Perform the calculation of wet bulb temperatures. A Newton iterator is
-        used to minimise the gradient of enthalpy against temperature.
+        Calculate mixing ratios from arrays of saturated vapour pressure in
+        air and pressure, as in _calculate_mixing_ratio.
 
         Args:
-            temperature (iris.cube.Cube):
-                Cube of air temperatures (K).
-            relative_humidity (iris.cube.Cube):
-                Cube of relative humidities (%, converted to fractional).
-            pressure (iris.cube.Cube):
-                Cube of air pressures (Pa).
+            svp (numpy.ndarray):
+                Array of saturated vapour pressures in air (Pa).
+            pressure (numpy.ndarray):
+                Array of air pressures (Pa).
 
         Returns:
-            wbt (iris.cube.Cube):
-                Cube of wet bulb temperature (K).
+            mixing_ratio (numpy.ndarray):
+                Array of mixing ratios.
+        """
+        result_numer = (cc.EARTH_REPSILON * svp)
+        max_pressure_term = np.maximum(svp, pressure)
+        result_denom = (max_pressure_term - ((1. - cc.EARTH_REPSILON) * svp))
+        return result_numer / result_denom
 
+    def _saturation_mixing_ratio_array(self, temperature, pressure):
         """
-        precision = np.full(temperature.data.shape, self.precision)
+        Calculate the saturation mixing ratio from arrays of temperature and
+        pressure, as in _calculate_mixing_ratio.
 
-        # Set units of input diagnostics.
-        relative_humidity.convert_units(1)
-        pressure.convert_units('Pa')
-        temperature.convert_units('K')
+        Args:
+            temperature (numpy.ndarray):
+                Array of air temperatures (K).
+            pressure (numpy.ndarray):
+                Array of air pressures (Pa).
+
+        Returns:
+            mixing_ratio (numpy.ndarray):
+                Array of saturation mixing ratios.
+        """
+        svp = self._lookup_svp_array(temperature).astype(temperature.dtype)
+        svp = self._pressure_correct_svp_array(
+            svp, temperature + cc.ABSOLUTE_ZERO, pressure)
+        return self._mixing_ratio_from_svp(svp, pressure)
+
+    @staticmethod
+    def _dimension_names(cube):
+        """
+        Name each dimension of a cube after its dimension coordinate.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube whose dimensions are to be named.
+
+        Returns:
+            names (list):
+                Name of the dimension coordinate of each dimension, or None
+                for anonymous dimensions.
+        """
+        names = [None] * cube.ndim
+        for coord in cube.dim_coords:
+            names[cube.coord_dims(coord)[0]] = coord.name()
+        return names
+
+    def calculate_wet_bulb_temperature_array(self, temperature,
+                                             relative_humidity, pressure):
+        """
+        Calculate wet bulb temperatures from arrays, using a Newton iterator
+        to minimise the gradient of enthalpy against temperature.
+
+        Each point is only iterated until it has converged to within the
+        precision, so that the working arrays shrink to the points that are
+        yet to converge with each iteration. Converged points are left
+        unchanged, which also avoids oscillating solutions.
+
+        The calculation is carried out at the precision of the inputs, and
+        at least single precision.
+
+        Args:
+            temperature (numpy.ndarray):
+                Array of air temperatures (K).
+            relative_humidity (numpy.ndarray):
+                Array of relative humidities (fractional).
+            pressure (numpy.ndarray):
+                Array of air pressures (Pa).
+
+        Returns:
+            wbt (numpy.ndarray):
+                Array of wet bulb temperatures (K), with the shape of the
+                input arrays broadcast against each other.
+
+        Raises:
+            ValueError: If the shapes of the input arrays cannot be
+                broadcast against each other.
+
+        Warns:
+            UserWarning:
+                If the iteration stops refining the wet bulb temperatures
+                before all points have converged.
+        """
+        dtype = np.result_type(temperature, relative_humidity, pressure,
+                               np.float32)
+        try:
+            temperature, relative_humidity, pressure = np.broadcast_arrays(
+                temperature, relative_humidity, pressure)
+        except ValueError:
+            raise ValueError(
+                'WetBulbTemperature: Input arrays of shapes {}, {} and {} '
+                'cannot be broadcast together.'.format(
+                    np.shape(temperature), np.shape(relative_humidity),
+                    np.shape(pressure)))
+        shape = np.shape(temperature)
+        temperature = np.asarray(temperature, dtype=dtype).ravel()
+        pressure = np.asarray(pressure, dtype=dtype).ravel()
+        relative_humidity = np.asarray(relative_humidity, dtype=dtype).ravel()
+        self.check_range(temperature, self.svp_lookup.t_min,
+                         self.svp_lookup.t_max)
 
         # Calculate mixing ratios.
-        saturation_mixing_ratio = self._calculate_mixing_ratio(temperature,
-                                                               pressure)
+        saturation_mixing_ratio = self._saturation_mixing_ratio_array(
+            temperature, pressure)
         mixing_ratio = relative_humidity * saturation_mixing_ratio
         # Calculate specific and latent heats.
-        specific_heat = Utilities.specific_heat_of_moist_air(mixing_ratio)
-        latent_heat = Utilities.latent_heat_of_condensation(temperature)
+        specific_heat = ((1. - mixing_ratio) * cc.CP_DRY_AIR +
+                         mixing_ratio * cc.CP_WATER_VAPOUR)
+        latent_heat = (cc.LH_CONDENSATION_WATER - cc.LATENT_HEAT_T_DEPENDENCE *
+                       (temperature + cc.ABSOLUTE_ZERO))
 
         # Calculate enthalpy.
-        g_tw = Utilities.calculate_enthalpy(mixing_ratio, specific_heat,
-                                            latent_heat, temperature)
+        g_tw = latent_heat * mixing_ratio + specific_heat * temperature
         # Use air temperature as a first guess for wet bulb temperature.
         wbt = temperature.copy()
-        wbt.rename('wet_bulb_temperature')
-        delta_wbt = temperature.copy(data=(10. * precision))
-        delta_wbt_history = temperature.copy(data=(5. * precision))
+        # Indices of the points yet to converge.
+        active = np.arange(wbt.size)
+        delta_wbt_history = np.full(wbt.size, 5. * self.precision,
+                                    dtype=dtype)
         max_iterations = 20
         iteration = 0
 
         # Iterate to find the wet bulb temperature
-        while (np.abs(delta_wbt.data) > precision).any():
-            g_tw_new = Utilities.calculate_enthalpy(
-                saturation_mixing_ratio, specific_heat, latent_heat, wbt)
-            dg_dt = Utilities.calculate_d_enthalpy_dt(
-                saturation_mixing_ratio, specific_heat, latent_heat, wbt)
+        while active.size > 0:
+            wbt_active = wbt[active]
+            g_tw_new = (latent_heat * saturation_mixing_ratio +
+                        specific_heat * wbt_active)
+            dg_dt = (saturation_mixing_ratio * latent_heat ** 2 /
+                     (cc.R_WATER_VAPOUR * wbt_active ** 2) + specific_heat)
             delta_wbt = (g_tw - g_tw_new) / dg_dt
 
-            # Only change values at those points yet to converge to avoid
-            # oscillating solutions (the now fixed points are still calculated
-            # unfortunately).
-            unfinished = np.where(np.abs(delta_wbt.data) > precision)
-            wbt.data[unfinished] = (wbt.data[unfinished] +
-                                    delta_wbt.data[unfinished])
+            unfinished = np.abs(delta_wbt) > self.precision
+            wbt[active[unfinished]] = (wbt_active[unfinished] +
+                                       delta_wbt[unfinished])
 
             # If the errors are identical between two iterations, stop.
-            if (np.array_equal(delta_wbt.data, delta_wbt_history.data) or
+            if (np.array_equal(delta_wbt, delta_wbt_history) or
                     iteration > max_iterations):
                 warnings.warn('No further refinement occuring; breaking out '
                               'of Newton iterator and returning result.')
                 break
-            delta_wbt_history = delta_wbt
             iteration += 1
 
+            # Drop the converged points from the working arrays.
+            active = active[unfinished]
+            delta_wbt_history = delta_wbt[unfinished]
+            g_tw = g_tw[unfinished]
+            specific_heat = specific_heat[unfinished]
+            latent_heat = latent_heat[unfinished]
+
             # Recalculate the saturation mixing ratio
-            saturation_mixing_ratio = self._calculate_mixing_ratio(
-                wbt, pressure)
+            saturation_mixing_ratio = self._saturation_mixing_ratio_array(
+                wbt[active], pressure[active])
+
+        return wbt.reshape(shape)
+
+    @instrumented("WetBulbTemperature.calculate_wet_bulb_temperature")
+    def calculate_wet_bulb_temperature(self, temperature, relative_humidity,
+                                       pressure):
+        """
+        Perform the calculation of wet bulb temperatures. A Newton iterator is
+        used to minimise the gradient of enthalpy against temperature; see
+        calculate_wet_bulb_temperature_array.
+
+        Args:
+            temperature (iris.cube.Cube):
+                Cube of air temperatures (K).
+            relative_humidity (iris.cube.Cube):
+                Cube of relative humidities (%, converted to fractional).
+            pressure (iris.cube.Cube):
+                Cube of air pressures (Pa).
+
+        Returns:
+            wbt (iris.cube.Cube):
+                Cube of wet bulb temperature (K).
 
+        Raises:
+            ValueError: If the dimensions of the relative humidity or
+                pressure cubes do not match the trailing dimensions of the
+                temperature cube, in the same order.
+
+        """
+        # Each dimension must be of length one or match the corresponding
+        # dimension of the temperature cube, so that the flattened arrays
+        # line up point by point.
+        temperature_dims = self._dimension_names(temperature)
+        for cube in [relative_humidity, pressure]:
+            cube_dims = self._dimension_names(cube)
+            trailing = list(zip(temperature_dims[-len(cube_dims):],
+                                temperature.shape[-len(cube_dims):]))
+            if (len(cube_dims) > len(temperature_dims) or any(
+                    length != 1 and (name, length) != trailing_dim
+                    for name, length, trailing_dim in zip(
+                        cube_dims, cube.shape, trailing))):
+                raise ValueError(
+                    'WetBulbTemperature: The dimensions of the {} cube {} '
+                    'do not match those of the temperature cube {}.'.format(
+                        cube.name(), list(zip(cube_dims, cube.shape)),
+                        list(zip(temperature_dims, temperature.shape))))
+
+        # Set units of input diagnostics.
+        relative_humidity.convert_units(1)
+        pressure.convert_units('Pa')
+        temperature.convert_units('K')
+
+        wbt = temperature.copy(
+            data=self.calculate_wet_bulb_temperature_array(
+                temperature.data, relative_humidity.data, pressure.data))
+        wbt.rename('wet_bulb_temperature')
         return wbt
 
     def process(self, temperature, relative_humidity, pressure):
         """
         Call the calculate_wet_bulb_temperature function to calculate wet bulb
-        temperatures. This process function splits input cubes over vertical
-        levels to mitigate memory issues when trying to operate on multi-level
-        data.
+        temperatures. All vertical levels, realizations and times are
+        calculated together as one array, so the relative humidity and
+        pressure cubes must have the same dimensions as the temperature cube
+        in the same order, although dimensions may be missing from the
+        front or be of length one.
 
         Args:
             temperature (iris.cube.Cube):
@@ -482,6 +816,10 @@ class WetBulbTemperature(object):
         Returns:
             wet_bulb_temperature (iris.cube.Cube):
                 Cube of wet bulb temperature (K).
+
+        Raises:
+            ValueError: If the cubes have differing vertical coordinates.
+            ValueError: If the dimensions of the cubes do not match.
         """
         try:
             vertical_coords = [cube.coord(axis='z').name() for cube in
@@ -490,29 +828,12 @@ class WetBulbTemperature(object):
         except iris.exceptions.CoordinateNotFoundError:
             vertical_coords = []
 
-        if len(vertical_coords) == 3 and len(set(vertical_coords)) == 1:
-            level_coord, = set(vertical_coords)
-            temperature_over_levels = temperature.slices_over(level_coord)
-            relative_humidity_over_levels = relative_humidity.slices_over(
-                level_coord)
-            pressure_over_levels = pressure.slices_over(level_coord)
-            slices = zip(temperature_over_levels,
-                         relative_humidity_over_levels, pressure_over_levels)
-        elif len(vertical_coords) > 0 and len(set(vertical_coords)) != 1:
+        if len(set(vertical_coords)) > 1:
             raise ValueError('WetBulbTemperature: Cubes have differing '
                              'vertical coordinates.')
-        else:
-            slices = [(temperature, relative_humidity, pressure)]
 
-        cubelist = iris.cube.CubeList([])
-        for t_slice, rh_slice, p_slice in slices:
-            cubelist.append(self.calculate_wet_bulb_temperature(
-                t_slice, rh_slice, p_slice))
-
-        wet_bulb_temperature = cubelist.merge_cube()
-        wet_bulb_temperature = check_cube_coordinates(temperature,
-                                                      wet_bulb_temperature)
-        return wet_bulb_temperature
+        return self.calculate_wet_bulb_temperature(
+            temperature, relative_humidity, pressure)
 
 
 class WetBulbTemperatureIntegral(object):
@@ -566,6 +887,8 @@ class WetBulbTemperatureIntegral(object):
         Calculate the wet bulb temperature integral by firstly calculating
         the wet bulb temperature from the inputs provided, and then
         calculating the vertical integral of the wet bulb temperature.
+        The wet bulb temperatures on all levels are calculated together, and
+        the integral is accumulated over all layers at once.
 
         Args:
             temperature (iris.cube.Cube):
@@ -637,9 +960,14 @@ class FallingSnowLevel(object):
         threshold may lie outside the Wet-bulb integral data and the value
         at that point will be set to np.nan.
 
+        The falling snow level is found for every column at once, so the
+        wet-bulb integral data may have any number of dimensions between the
+        leading height dimension and the trailing y and x dimensions.
+
         Args:
             wb_int_data (np.array):
-                Wet bulb integral data on heights
+                Wet bulb integral data on heights, with height as the leading
+                dimension and y and x as the trailing dimensions.
             orog_data (np.array):
                 Orographic data
             heights (np.array):
@@ -650,11 +978,12 @@ class FallingSnowLevel(object):
                 Falling snow level data asl.
 
         """
-        # Create cube of heights above sea level for each height in
-        # the wet bulb integral cube.
-        asl = wb_int_data.copy()
-        for i, height in enumerate(height_points):
-            asl[i, ::] = orog_data + height
+        # Create array of heights above sea level for each height in
+        # the wet bulb integral data.
+        height_shape = (len(height_points),) + (1,) * (wb_int_data.ndim - 1)
+        asl = np.broadcast_to(
+            orog_data + np.reshape(height_points, height_shape),
+            wb_int_data.shape).astype(wb_int_data.dtype)
 
         # Calculate falling snow level above sea level by
         # finding the level corresponding to the falling_level_threshold.
@@ -678,7 +1007,12 @@ class FallingSnowLevel(object):
         the falling_level_threshold to the highest_height.
         Any remaining missing sea_points are set to 0.
 
-        The data are then interpolated linearly across the grid.
+        The data are then interpolated linearly across the grid. Each
+        connected region of missing points is interpolated from the points
+        within one grid point of that region, so that the cost scales with
+        the number of missing points rather than the size of the grid.
+        Points that cannot be enclosed by the points around them remain
+        missing.
 
         For any remaining missing points we check to see if they
         are already above the falling_level_threshold. If they are
@@ -716,13 +1050,25 @@ class FallingSnowLevel(object):
         sea_points = np.where(np.isnan(snow_level_data) &
                               (orog_data == 0.0))
         snow_level_data[sea_points] = 0.0
-        # Interpolate linearly across the remaining points
-        points = np.where(np.isfinite(snow_level_data))
-        values = snow_level_data[points]
-        ynum, xnum = snow_level_data.shape
-        (y_points, x_points) = np.mgrid[0:ynum, 0:xnum]
-        snow_level_updated = griddata(points, values, (y_points, x_points),
-                                      method='linear')
+        # Interpolate linearly across the remaining points, using a window
+        # around each connected region of missing points.
+        snow_level_updated = snow_level_data.copy()
+        missing_regions, _ = scipy.ndimage.label(np.isnan(snow_level_data))
+        for region_number, region in enumerate(
+                scipy.ndimage.find_objects(missing_regions), 1):
+            window = tuple(slice(max(region_slice.start - 1, 0),
+                                 region_slice.stop + 1)
+                           for region_slice in region)
+            window_data = snow_level_data[window]
+            points = np.where(np.isfinite(window_data))
+            missing = np.where(missing_regions[window] == region_number)
+            try:
+                snow_level_updated[window][missing] = griddata(
+                    points, window_data[points], missing, method='linear')
+            except (RuntimeError, ValueError):
+                # There are too few points around the region to triangulate,
+                # so the region is left missing.
+                continue
         # For any remaining missing points check to see if they
         # are already above the falling_level_threshold. If they are
         # set them to orography + highest_height
@@ -745,8 +1091,11 @@ class FallingSnowLevel(object):
         Calculate the wet bulb temperature integral by firstly calculating
         the wet bulb temperature from the inputs provided, and then
         calculating the vertical integral of the wet bulb temperature.
+        The wet bulb temperatures on all levels are calculated together, and
+        the integral is accumulated over all layers at once.
         Find the falling_snow_level by finding the height above sea level
-        correspoinding to the falling_level_threshold in the integral data.
+        correspoinding to the falling_level_threshold in the integral data,
+        for all columns at once.
         Fill in missing data appropriately.
 
         Args:
@@ -777,33 +1126,42 @@ class FallingSnowLevel(object):
         else:
             highest_height = height_bounds[0][-1]
 
-        # Firstly we need to slice over height, x and y
+        # Order the dimensions as height, any others, then y and x.
         x_coord = wet_bulb_integral.coord(axis='x').name()
         y_coord = wet_bulb_integral.coord(axis='y').name()
         for orog_cube in orog.slices([y_coord, x_coord]):
             orog_data = orog_cube.data
 
-        snow = iris.cube.CubeList([])
-        slice_list = ['height', y_coord, x_coord]
-        for wb_integral in wet_bulb_integral.slices(slice_list):
-
-            height_points = wb_integral.coord('height').points
-            # Calculate falling snow level above sea level.
-            snow_cube = wb_integral[0]
-            snow_cube.rename('falling_snow_level_asl')
-            snow_cube.units = 'm'
-            snow_cube.remove_coord('height')
-
-            snow_cube.data = self.find_falling_level(wb_integral.data,
-                                                     orog_data,
-                                                     height_points)
-            # Interpolate missing data
-            snow_cube.data = self.fill_in_missing_data(snow_cube.data,
-                                                       orog_data,
-                                                       wb_integral.data[0, ::],
-                                                       highest_height)
-
-            snow.append(snow_cube)
-
-        falling_snow_level = snow.merge_cube()
+        height_dim, = wet_bulb_integral.coord_dims('height')
+        y_dim, = wet_bulb_integral.coord_dims(y_coord)
+        x_dim, = wet_bulb_integral.coord_dims(x_coord)
+        other_dims = [dim for dim in range(len(wet_bulb_integral.shape))
+                      if dim not in (height_dim, y_dim, x_dim)]
+        wet_bulb_integral.transpose([height_dim] + other_dims +
+                                    [y_dim, x_dim])
+
+        height_points = wet_bulb_integral.coord('height').points
+        falling_snow_level = wet_bulb_integral[0]
+        falling_snow_level.rename('falling_snow_level_asl')
+        falling_snow_level.units = 'm'
+        falling_snow_level.remove_coord('height')
+
+        # Calculate falling snow level above sea level.
+        snow_level_data = self.find_falling_level(wet_bulb_integral.data,
+                                                  orog_data,
+                                                  height_points)
+        # Interpolate missing data in each field.
+        highest_wb_int_data = wet_bulb_integral.data[0]
+        for index in np.ndindex(*snow_level_data.shape[:-2]):
+            snow_level_data[index] = self.fill_in_missing_data(
+                snow_level_data[index], orog_data,
+                highest_wb_int_data[index], highest_height)
+
+        falling_snow_level.data = snow_level_data
+        # Make any other dimensions of length one scalar, as they would be
+        # after merging the fields.
+        falling_snow_level = falling_snow_level[
+            tuple(0 if length == 1 else slice(None)
+                  for length in falling_snow_level.shape[:-2]) +
+            (slice(None), slice(None))]
         return falling_snow_level
@@ -71,8 +71,9 @@ class ExtractData(object):
                 dz_max_adjustment=70.):
         """
         Call the correct function to enact the method of data extraction
-        specified. This function also handles multiple timesteps, consolidating
-        the resulting data cubes into an Iris.CubeList.
+        specified. The data at all times, realizations, etc. are extracted
+        together, so the cube may have any leading dimensions in addition to
+        the spatial dimensions.
 
         Args:
             cube (iris.cube.Cube):
@@ -87,7 +88,8 @@ class ExtractData(object):
 
             additional_data (dict):
                 A dictionary containing any supplmentary time varying
-                diagnostics that are needed for the selected extraction method.
+                diagnostics that are needed for the selected extraction method,
+                at the same times as the cube.
 
             ancillary_data (dict):
                 A dictionary containing additional model data that is needed.
@@ -141,16 +143,20 @@ class ExtractData(object):
             # Ensure that pressure units are in Pa.
             pressure_on_height_levels.convert_units('Pa')
 
-            lower_pressure = pressure_on_height_levels[lower_level, ...]
-            upper_pressure = pressure_on_height_levels[upper_level, ...]
+            lower_pressure = self._extract_level(pressure_on_height_levels,
+                                                 lower_level)
+            upper_pressure = self._extract_level(pressure_on_height_levels,
+                                                 upper_level)
 
             surface_pressure = additional_data['surface_pressure']
             surface_pressure.convert_units('Pa')
 
             temperature_on_height_levels = (
                 additional_data['temperature_on_height_levels'])
-            lower_temperature = temperature_on_height_levels[lower_level, ...]
-            upper_temperature = temperature_on_height_levels[upper_level, ...]
+            lower_temperature = self._extract_level(
+                temperature_on_height_levels, lower_level)
+            upper_temperature = self._extract_level(
+                temperature_on_height_levels, upper_level)
 
             return self.model_level_temperature_lapse_rate(
                 cube, sites, neighbours, surface_pressure, lower_pressure,
@@ -160,6 +166,29 @@ class ExtractData(object):
         raise AttributeError('Unknown method "{}" passed to {}.'.format(
             self.method, self.__class__.__name__))
 
+    @staticmethod
+    def _extract_level(cube, level):
+        """
+        Extract a single height level from a cube of data on height levels,
+        whichever dimension the height levels lie along.
+
+        Args:
+            cube (iris.cube.Cube):
+                Cube with a height dimension.
+
+            level (int):
+                Index of the height level to extract.
+
+        Returns:
+            iris.cube.Cube:
+                Cube of the data on the requested height level.
+
+        """
+        height_dim, = cube.coord_dims('height')
+        index = [slice(None)] * cube.ndim
+        index[height_dim] = level
+        return cube[tuple(index)]
+
     @staticmethod
     def _aux_coords_to_make():
         """
@@ -236,7 +265,9 @@ class ExtractData(object):
                 extracted.
 
             data (numpy.array):
-                Array of diagnostic values extracted for the defined sites.
+                Array of diagnostic values extracted for the defined sites,
+                with the non-spatial dimensions of the cube followed by a
+                site dimension.
 
             sites (OrderedDict):
                 A dictionary containing the properties of spotdata sites.
@@ -248,10 +279,13 @@ class ExtractData(object):
 
         """
 
-        # Ensure time is a dimension coordinate and convert to seconds.
+        # Ensure time is a dimension coordinate and convert to seconds. If
+        # time is not already a dimension, add a leading time dimension to
+        # the data array to match.
         cube_coords = [coord.name() for coord in cube.dim_coords]
         if 'time' not in cube_coords:
             cube = iris.util.new_axis(cube, 'time')
+            data = np.expand_dims(data, axis=0)
         cube.coord('time').convert_units('seconds since 1970-01-01 00:00:00')
 
         cube_coords = [coord.name() for coord in cube.coords()]
@@ -303,8 +337,6 @@ class ExtractData(object):
         # Copy other cube metadata.
         metadata_dict = copy.deepcopy(cube.metadata._asdict())
 
-        # Add leading dimension for time to the data array.
-        data = np.expand_dims(data, axis=0)
         result_cube = Cube(data,
                            dim_coords_and_dims=dim_coords,
                            aux_coords_and_dims=aux_coords,
@@ -356,7 +388,8 @@ class ExtractData(object):
 
         Args:
             cube (iris.cube.Cube):
-                A cube of screen level temperatures at a single time.
+                A cube of screen level temperatures. Any leading dimensions,
+                e.g. time and realization, are fitted together at each site.
 
             sites/neighbours/no_neighbours : See process() above.
 
@@ -375,16 +408,19 @@ class ExtractData(object):
         def _local_lapse_rate(cube, orography, node_list):
             """
             Least-squares fit to local temperature and altitude data for grid
-            points defined by node_list to calculate a local lapse rate.
+            points defined by node_list to calculate a local lapse rate, for
+            all the leading dimensions of the cube at once.
 
             """
-            y_data = cube.data[node_list]
-            x_data = orography[node_list]
+            y_data = cube.data[(Ellipsis,) + tuple(node_list)]
+            x_data = orography[tuple(node_list)]
             matrix = np.stack([x_data, np.ones(len(x_data))], axis=0).T
-            gradient, intercept = lstsq(matrix, y_data)[0]
+            fit = lstsq(matrix, np.reshape(np.moveaxis(y_data, -1, 0),
+                                           (len(x_data), -1)))[0]
+            gradient, intercept = fit.reshape((2,) + y_data.shape[:-1])
             return [gradient, intercept]
 
-        data = np.empty(shape=(len(sites)), dtype=float)
+        data = np.empty(shape=cube.shape[:-2] + (len(sites),), dtype=float)
 
         for i_site, site in enumerate(sites.itervalues()):
             i, j = neighbours['i'][i_site], neighbours['j'][i_site]
@@ -395,7 +431,7 @@ class ExtractData(object):
                        'requires site to have an altitude. Leaving value '
                        'unchanged.')
                 warnings.warn(msg)
-                data[i_site] = cube.data[i, j]
+                data[..., i_site] = cube.data[..., i, j]
                 continue
 
             edgepoint = neighbours['edgepoint'][i_site]
@@ -404,7 +440,7 @@ class ExtractData(object):
                 node_list = node_edge_check(node_list, cube)
 
             llr = _local_lapse_rate(cube, orography, node_list)
-            data[i_site] = llr[0]*altitude + llr[1]
+            data[..., i_site] = llr[0]*altitude + llr[1]
 
         return self.make_cube(cube, data, sites)
 
@@ -416,23 +452,28 @@ class ExtractData(object):
         """
         Args:
             cube (iris.cube.Cube):
-                A cube of screen level temperatures at a single time.
+                A cube of screen level temperatures. Any leading dimensions,
+                e.g. realization, are processed together, with the values
+                for all sites gathered and adjusted in a single array
+                operation.
 
             sites/neighbours : See process() above.
 
             surface_pressure (iris.cube.Cube):
-                Cube of surface pressures at an equivalent time to the cube of
-                screen level temperatures.
+                Cube of surface pressures at equivalent times to the cube of
+                screen level temperatures. Any leading dimensions must also be
+                dimensions of the cube of screen level temperatures, and are
+                matched to them by name.
 
             lower/upper_pressure (iris.cube.Cube):
                 Cubes of pressure data at the defined lower and upper model
-                levels, each at an equivalent time to the cube of screen level
-                temperatures.
+                levels, each at equivalent times to the cube of screen level
+                temperatures, with leading dimensions as for surface_pressure.
 
             lower/upper_temperature (iris.cube.Cube):
                 Cubes of temperature data at the defined lower and upper model
-                levels, each at an equivalent time to the cube of screen level
-                temperatures.
+                levels, each at equivalent times to the cube of screen level
+                temperatures, with leading dimensions as for surface_pressure.
 
             dz_tolerance/dthetadz_threshold/dz_max_adjustment :
                 See process docstring.
@@ -565,20 +606,6 @@ class ExtractData(object):
         # Reference pressure of 1000hPa (1.0E5 Pa).
         p_ref = 1.0E5
 
-        def _adjust_temperature(theta_base, dthetadz, dz, p_site, kappa):
-            """
-            Perform calculation of temperature at SpotData site.
-
-            """
-            if dz < 0 or dthetadz > 0:
-                # Case for extrapolating downwards or a stable atmosphere.
-                theta_site = theta_base + dz*dthetadz
-                return theta_site*(p_site/p_ref)**kappa
-            else:
-                # Case for a well mixed atmosphere when calculating temperature
-                # at a site above the neighbouring grid point.
-                return theta_base*(p_site/p_ref)**kappa
-
         if not cube.name() == 'air_temperature':
             raise ValueError('{} should only be used for adjusting '
                              'temperatures. Cube of type {} is not '
@@ -590,60 +617,82 @@ class ExtractData(object):
         z_upper, = upper_pressure.coord('height').points
         dz_model_levels = z_upper - z_lower
 
-        data = np.empty(shape=(len(sites)), dtype=float)
-        for i_site in range(len(sites)):
-            i, j, dz = (neighbours['i'][i_site], neighbours['j'][i_site],
-                        neighbours['dz'][i_site])
+        # Gather the values at the neighbouring grid point of every site,
+        # for all leading dimensions (e.g. realizations and times) at once.
+        i_sites, j_sites, dz = (neighbours['i'], neighbours['j'],
+                                neighbours['dz'])
 
-            # Use neighbour grid point value if dz < dz_tolerance.
-            if abs(dz) < dz_tolerance:
-                data[i_site] = cube.data[i, j]
-                continue
+        def _site_values(field):
+            """
+            Extract the values at the site neighbours from a cube, with the
+            leading dimensions arranged to broadcast against the matching
+            dimensions of the screen level temperature cube.
 
-            # Temperatures at surface, lower model level and upper model level.
-            t_surface = cube.data[i, j]
-            t_lower = lower_temperature.data[i, j]
-            t_upper = upper_temperature.data[i, j]
-
-            # Pressures at surface, lower model level and upper model level.
-            p_surface = surface_pressure.data[i, j]
-            p_lower = lower_pressure.data[i, j]
-            p_upper = upper_pressure.data[i, j]
-
-            # Potential temperature at surface, lower model level and upper
-            # model level.
-            theta_surface = t_surface*(p_ref/p_surface)**kappa
-            theta_lower = t_lower*(p_ref/p_lower)**kappa
-            theta_upper = t_upper*(p_ref/p_upper)**kappa
-
-            # Enforce a maximum vertical displacement to which temperatures
-            # will be adjusted using a lapse rate. This is to prevent excessive
-            # changes based on what is unlikely to be a constant gradient
-            # in potential temperature.
-            dz = min(abs(dz), dz_max_adjustment)*np.sign(dz)
-
-            # Calculate potential temperature gradient using levels away from
-            # surface.
-            dthetadz = (theta_upper - theta_lower)/dz_model_levels
-            if dthetadz <= dthetadz_threshold:
-                # If the potential temperature gradient is below the defined
-                # dthetadz_threshold, use the non-surface levels.
-                dz_from_model_level = dz - z_lower
-                p_grad = (p_upper - p_lower)/dz_model_levels
-                p_site = p_lower + p_grad*dz_from_model_level
-                theta_base = theta_lower
-            else:
-                # A potential temperature gradient in excess of the threshold
-                # value indicative of a lapse rate calculated across an
-                # inversion. Recalulate using the surface and lower level to
-                # better capture the inversion.
-                dthetadz = (theta_lower-theta_surface)/z_lower
-                dz_from_model_level = dz
-                p_grad = (p_lower - p_surface)/z_lower
-                p_site = p_surface + p_grad*dz_from_model_level
-                theta_base = theta_surface
-
-            data[i_site] = _adjust_temperature(
-                theta_base, dthetadz, dz_from_model_level, p_site, kappa)
+            """
+            values = field.data[..., i_sites, j_sites].astype(np.float64)
+            cube_dims = [
+                cube.coord_dims(field.coord(dimensions=dim,
+                                            dim_coords=True).name())[0]
+                for dim in range(field.ndim - 2)]
+            values = np.transpose(
+                values, list(np.argsort(cube_dims)) + [values.ndim - 1])
+            shape = [1] * (cube.ndim - 2) + [len(i_sites)]
+            for cube_dim in cube_dims:
+                shape[cube_dim] = cube.shape[cube_dim]
+            return values.reshape(shape)
+
+        # Temperatures at surface, lower model level and upper model level.
+        t_surface = _site_values(cube)
+        t_lower = _site_values(lower_temperature)
+        t_upper = _site_values(upper_temperature)
+
+        # Pressures at surface, lower model level and upper model level.
+        p_surface = _site_values(surface_pressure)
+        p_lower = _site_values(lower_pressure)
+        p_upper = _site_values(upper_pressure)
+
+        # Potential temperature at surface, lower model level and upper
+        # model level.
+        theta_surface = t_surface*(p_ref/p_surface)**kappa
+        theta_lower = t_lower*(p_ref/p_lower)**kappa
+        theta_upper = t_upper*(p_ref/p_upper)**kappa
+
+        # Enforce a maximum vertical displacement to which temperatures
+        # will be adjusted using a lapse rate. This is to prevent excessive
+        # changes based on what is unlikely to be a constant gradient
+        # in potential temperature.
+        dz_adjust = np.minimum(np.abs(dz), dz_max_adjustment)*np.sign(dz)
+
+        # Calculate potential temperature gradient using levels away from
+        # surface. Where the gradient is below the defined
+        # dthetadz_threshold, use the non-surface levels. A potential
+        # temperature gradient in excess of the threshold value is
+        # indicative of a lapse rate calculated across an inversion; here
+        # recalculate using the surface and lower level to better capture
+        # the inversion.
+        dthetadz = (theta_upper - theta_lower)/dz_model_levels
+        no_inversion = dthetadz <= dthetadz_threshold
+
+        dthetadz = np.where(no_inversion, dthetadz,
+                            (theta_lower - theta_surface)/z_lower)
+        dz_from_model_level = np.where(no_inversion, dz_adjust - z_lower,
+                                       dz_adjust)
+        p_site = np.where(
+            no_inversion,
+            p_lower + (p_upper - p_lower)/dz_model_levels*dz_from_model_level,
+            p_surface + (p_lower - p_surface)/z_lower*dz_from_model_level)
+        theta_base = np.where(no_inversion, theta_lower, theta_surface)
+
+        # Extrapolate the potential temperature when extrapolating downwards
+        # or for a stable atmosphere. For a well mixed atmosphere when
+        # calculating temperature at a site above the neighbouring grid
+        # point, use the potential temperature at the base level.
+        theta_site = np.where(
+            (dz_from_model_level < 0) | (dthetadz > 0),
+            theta_base + dz_from_model_level*dthetadz, theta_base)
+        data = theta_site*(p_site/p_ref)**kappa
+
+        # Use neighbour grid point value if dz < dz_tolerance.
+        data = np.where(np.abs(dz) < dz_tolerance, t_surface, data)
 
         return self.make_cube(cube, data, sites)
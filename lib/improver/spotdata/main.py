@@ -35,6 +35,7 @@ import multiprocessing as mp
 
 from iris.cube import CubeList
 
+from improver.spotdata.neighbour_cache import NeighbourCache
 from improver.spotdata.neighbour_finding import PointSelection
 from improver.spotdata.extract_data import ExtractData
 from improver.spotdata.extrema import ExtractExtrema
@@ -45,7 +46,8 @@ from improver.utilities.temporal import (datetime_constraint,
 
 
 def run_spotdata(diagnostics, ancillary_data, sites, config_constants,
-                 use_multiprocessing=False):
+                 use_multiprocessing=False, neighbour_cache_dir=None,
+                 rebuild_neighbour_cache=False):
     """
     A routine that calls the components of the spotdata code. This includes
     building site data into a suitable format, finding grid neighbours to
@@ -113,6 +115,17 @@ def run_spotdata(diagnostics, ancillary_data, sites, config_constants,
             A switch determining whether to use multiprocessing in the data
             extraction step.
 
+        neighbour_cache_dir (string or None):
+            Path to a directory in which to cache the site-grid point
+            neighbours. If set, neighbours previously found for the same
+            sites, ancillary data and neighbour finding method are loaded
+            rather than recomputed, and any newly found neighbours are added
+            to the cache.
+
+        rebuild_neighbour_cache (boolean):
+            If True, ignore any existing cached neighbours, recomputing them
+            and replacing the cache contents.
+
     Returns:
         (tuple): tuple containing:
             **resulting_cube** (iris.cube.Cube or None):
@@ -140,13 +153,23 @@ def run_spotdata(diagnostics, ancillary_data, sites, config_constants,
     # methods will use this as a starting point so it must always be done.
     # Assumes orography file is on the same grid as the diagnostic data.
     neighbours = {}
+    if neighbour_cache_dir is not None:
+        neighbour_cache = NeighbourCache(neighbour_cache_dir)
+        fingerprint = neighbour_cache.fingerprint(sites, ancillary_data,
+                                                  neighbour_kwargs)
+        if not rebuild_neighbour_cache:
+            neighbours = neighbour_cache.load(fingerprint)
+    cached_hashes = set(neighbours.keys())
+
     default_neighbours = {'method': 'fast_nearest_neighbour',
                           'vertical_bias': None,
                           'land_constraint': False}
     default_hash = construct_neighbour_hash(default_neighbours)
-    neighbours[default_hash] = PointSelection(**default_neighbours).process(
-        ancillary_data['orography'], sites,
-        ancillary_data=ancillary_data, **neighbour_kwargs)
+    if default_hash not in neighbours.keys():
+        neighbours[default_hash] = (
+            PointSelection(**default_neighbours).process(
+                ancillary_data['orography'], sites,
+                ancillary_data=ancillary_data, **neighbour_kwargs))
 
     # Set up site-grid point neighbour lists for all IGPS methods being used.
     for key in diagnostics.keys():
@@ -163,6 +186,11 @@ def run_spotdata(diagnostics, ancillary_data, sites, config_constants,
                     **neighbour_kwargs)
                 )
 
+    # Add any newly found neighbours to the cache.
+    if (neighbour_cache_dir is not None and
+            set(neighbours.keys()) != cached_hashes):
+        neighbour_cache.save(fingerprint, neighbours)
+
     if use_multiprocessing:
         # Process diagnostics on separate threads if multiprocessing is
         # selected. Determine number of diagnostics to establish
@@ -283,10 +311,10 @@ def process_diagnostic(diagnostics, neighbours, sites,
         time = cube.coord("time")
         forecast_times.extend(time.units.num2date(time.points))
 
-    # Create empty iris.cube.CubeList to hold extracted data cubes.
-    resulting_cubes = CubeList()
-
-    # Loop over forecast times.
+    # Gather the data at each forecast time, so that the data at all times
+    # can be extracted together.
+    time_cubes = CubeList()
+    time_ad = {}
     for a_time in forecast_times:
         # Extract Cube from CubeList at current time.
         time_extract = datetime_constraint(a_time)
@@ -295,25 +323,25 @@ def process_diagnostic(diagnostics, neighbours, sites,
         if cube is None:
             # If no cube is available at given time, try the next time.
             continue
+        time_cubes.append(cube)
 
-        ad = {}
         if diagnostic_dict["additional_data"] is not None:
             # Extract additional diagnostics at current time.
             ad = extract_ad_at_time(diagnostic_dict["additional_data"], a_time,
                                     time_extract)
-
+            for key, ad_cube in ad.items():
+                time_ad.setdefault(key, CubeList()).append(ad_cube)
+
+    if time_cubes:
+        # Merge the cubes at each forecast time into a cube with a time
+        # dimension, and extract the diagnostic data at all times at once
+        # using the defined method.
+        cube = time_cubes.merge_cube()
+        ad = {key: ad_cubes.merge_cube()
+              for key, ad_cubes in time_ad.items()}
         args = (cube, sites, neighbour_list, ancillary_data, ad)
-
-        # Extract diagnostic data using defined method.
-        resulting_cubes.append(
-            ExtractData(
-                diagnostic_dict['interpolation_method']).process(
-                    *args, **kwargs))
-
-    if resulting_cubes:
-        # Concatenate CubeList into Cube for cubes with different
-        # forecast times.
-        resulting_cube = resulting_cubes.concatenate_cube()
+        resulting_cube = ExtractData(
+            diagnostic_dict['interpolation_method']).process(*args, **kwargs)
     else:
         resulting_cube = None
 
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""On-disk caching of site-grid point neighbours for site specific
+processing."""
+
+import hashlib
+import os
+
+import numpy as np
+
+from improver.utilities.save import atomic_write
+
+
+class NeighbourCache(object):
+    """
+    Store and retrieve the neighbour arrays produced by PointSelection in a
+    cache directory, so that they need not be recomputed when the sites and
+    ancillary grids are unchanged between runs.
+
+    Each cache file holds the neighbour arrays for all the neighbour finding
+    methods used with one set of sites and ancillary data, keyed by the
+    neighbour hash from construct_neighbour_hash. The file is named using a
+    fingerprint of the sites, ancillary data and neighbour finding options.
+
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir (string):
+                Path to the directory in which cache files are stored. This
+                is created if it does not already exist when the cache is
+                first saved.
+
+        """
+        self.cache_dir = cache_dir
+
+    def __repr__(self):
+        """Represent the configured plugin instance as a string."""
+        return '<NeighbourCache: cache_dir: {}>'.format(self.cache_dir)
+
+    @staticmethod
+    def fingerprint(sites, ancillary_data, neighbour_kwargs=None):
+        """
+        Construct a fingerprint of everything the neighbour arrays depend on
+        other than the neighbour finding method itself.
+
+        Args:
+            sites (dict):
+                A dictionary containing the properties of spotdata sites.
+            ancillary_data (dict):
+                Dictionary containing named ancillary data; the orography and
+                land_mask cubes, if present, are included in the fingerprint.
+            neighbour_kwargs (dict or None):
+                Additional keyword arguments passed to PointSelection.process,
+                e.g. no_neighbours.
+
+        Returns:
+            string:
+                A hexadecimal digest identifying the inputs.
+
+        """
+        fingerprint = hashlib.sha1()
+        for site_id, site in sites.items():
+            fingerprint.update('{}:{!r},{!r},{!r};'.format(
+                site_id, site['latitude'], site['longitude'],
+                site['altitude']).encode('utf-8'))
+
+        for name in ['orography', 'land_mask']:
+            cube = ancillary_data.get(name)
+            if cube is None:
+                continue
+            fingerprint.update(name.encode('utf-8'))
+            for axis in ['y', 'x']:
+                coord = cube.coord(axis=axis)
+                fingerprint.update('{}{}{}'.format(
+                    coord.name(), coord.units,
+                    coord.coord_system).encode('utf-8'))
+                fingerprint.update(
+                    np.ascontiguousarray(coord.points).tobytes())
+            data = np.ascontiguousarray(np.ma.getdata(cube.data))
+            fingerprint.update(str(data.shape).encode('utf-8'))
+            fingerprint.update(data.tobytes())
+
+        if neighbour_kwargs:
+            fingerprint.update('{!r}'.format(
+                sorted(neighbour_kwargs.items())).encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    def filepath(self, fingerprint):
+        """
+        Args:
+            fingerprint (string):
+                Fingerprint from the fingerprint method.
+
+        Returns:
+            string:
+                Path to the cache file for the given fingerprint.
+
+        """
+        return os.path.join(self.cache_dir,
+                            'neighbours_{}.npz'.format(fingerprint))
+
+    def load(self, fingerprint):
+        """
+        Load the cached neighbour arrays for the given fingerprint.
+
+        Args:
+            fingerprint (string):
+                Fingerprint from the fingerprint method.
+
+        Returns:
+            neighbours (dict):
+                Dictionary of neighbour arrays keyed by neighbour hash. This
+                is empty if there is no cache file for the fingerprint.
+
+        """
+        filepath = self.filepath(fingerprint)
+        if not os.path.isfile(filepath):
+            return {}
+        with np.load(filepath) as cache:
+            neighbours = {key: cache[key] for key in cache.files}
+        return neighbours
+
+    def save(self, fingerprint, neighbours):
+        """
+        Save the neighbour arrays for the given fingerprint, replacing any
+        existing cache file.
+
+        Args:
+            fingerprint (string):
+                Fingerprint from the fingerprint method.
+            neighbours (dict):
+                Dictionary of neighbour arrays keyed by neighbour hash.
+
+        """
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        filepath = self.filepath(fingerprint)
+        with atomic_write(filepath, mode='wb') as cache_file:
+            np.savez(cache_file, **neighbours)
@@ -33,11 +33,9 @@
 
 import numpy as np
 from improver.utilities.spatial import (
-    get_nearest_coords, lat_lon_determine, lat_lon_transform)
-from improver.spotdata.common_functions import (
-    ConditionalListExtract, nearest_n_neighbours,
-    index_of_minimum_difference, list_entry_from_index, node_edge_check,
-    apply_bias)
+    get_nearest_coords_vectorised, lat_lon_determine,
+    lat_lon_transform_points)
+from improver.spotdata.common_functions import nearest_n_neighbours
 
 
 class PointSelection(object):
@@ -182,29 +180,30 @@ class PointSelection(object):
         iname = cube.coord(axis='y').name()
         jname = cube.coord(axis='x').name()
 
-        for i_site, site in enumerate(sites.itervalues()):
-            latitude, longitude, altitude = (site['latitude'],
-                                             site['longitude'],
-                                             site['altitude'])
-
-            longitude, latitude = lat_lon_transform(trg_crs,
-                                                    latitude, longitude)
-            i_latitude, j_longitude = get_nearest_coords(
-                cube, latitude, longitude, iname, jname)
+        latitudes, longitudes, altitudes = [
+            np.array([site[key] for site in sites.itervalues()],
+                     dtype=np.float64)
+            for key in ['latitude', 'longitude', 'altitude']]
+
+        # Transform and find the nearest grid points for all sites at once.
+        longitudes, latitudes = lat_lon_transform_points(trg_crs, latitudes,
+                                                         longitudes)
+        i_latitudes, j_longitudes = get_nearest_coords_vectorised(
+            cube, latitudes, longitudes, iname, jname)
+
+        # Calculate SpotData site vertical displacement from model
+        # orography. If orography data is unavailable, assume site is at
+        # equivalent altitude to nearest neighbour.
+        if orography is not None:
+            dz_site_grid = altitudes - orography[i_latitudes, j_longitudes]
+        else:
             dz_site_grid = 0.
 
-            # Calculate SpotData site vertical displacement from model
-            # orography. If site altitude set with np.nan or orography data
-            # is unavailable, assume site is at equivalent altitude to nearest
-            # neighbour.
-            if orography is not None and altitude != np.nan:
-                dz_site_grid = altitude - orography[i_latitude, j_longitude]
-            else:
-                dz_site_grid = 0.
-
-            neighbours[i_site] = (int(i_latitude), int(j_longitude),
-                                  dz_site_grid,
-                                  (i_latitude == imax or j_longitude == jmax))
+        neighbours['i'] = i_latitudes
+        neighbours['j'] = j_longitudes
+        neighbours['dz'] = dz_site_grid
+        neighbours['edgepoint'] = ((i_latitudes == imax) |
+                                   (j_longitudes == jmax))
 
         return neighbours
 
@@ -269,51 +268,73 @@ class PointSelection(object):
         else:
             neighbours = default_neighbours
 
-        for i_site, site in enumerate(sites.itervalues()):
-
-            altitude = site['altitude']
-
-            # If site altitude is set with np.nan this method cannot be used.
-            if altitude == np.nan:
-                continue
-
-            i, j, dz_nearest = (neighbours['i'][i_site],
-                                neighbours['j'][i_site],
-                                neighbours['dz'][i_site])
-            edgepoint = neighbours['edgepoint'][i_site]
-
-            node_list = nearest_n_neighbours(i, j, no_neighbours)
-            if edgepoint:
-                node_list = node_edge_check(node_list, cube)
-
-            if self.land_constraint:
-                # Check that we are considering a land point and that at least
-                # one neighbouring point is also land. If not no modification
-                # is made to the nearest neighbour coordinates.
-
-                neighbour_nodes = nearest_n_neighbours(i, j, no_neighbours,
-                                                       exclude_self=True)
-                if edgepoint:
-                    neighbour_nodes = node_edge_check(neighbour_nodes, cube)
-                if not land_mask[i, j] or not any(land_mask[neighbour_nodes]):
-                    continue
-
-                # Filter the node_list to keep only land points
-                # (land_mask == 1).
-                node_list = ConditionalListExtract('not_equal_to').process(
-                    land_mask, node_list, 0)
-
-            dzs = altitude - orography[node_list]
-            dz_subset = apply_bias(self.vertical_bias, dzs)
-
-            ij_min = index_of_minimum_difference(dzs, subset_list=dz_subset)
-            i_min, j_min = list_entry_from_index(node_list, ij_min)
-            dz_min = abs(altitude - orography[i_min, j_min])
-
-            # Test to ensure that if multiple vertical displacements are the
-            # same we don't select a more distant point because of array
-            # ordering.
-            if not np.isclose(dz_min, abs(dz_nearest)):
-                neighbours[i_site] = i_min, j_min, dzs[ij_min], edgepoint
+        altitudes = np.array(
+            [site['altitude'] for site in sites.itervalues()],
+            dtype=np.float64)
+        i_nearest, j_nearest, dz_nearest, edgepoint = [
+            neighbours[field] for field in ['i', 'j', 'dz', 'edgepoint']]
+
+        # Construct the grid coordinates of the nodes about every site, with
+        # one row per site. The offsets are ordered as in
+        # nearest_n_neighbours, which also checks no_neighbours is valid.
+        offsets = np.array(nearest_n_neighbours(0, 0, no_neighbours))
+        node_i = i_nearest[:, np.newaxis] + offsets[0]
+        node_j = j_nearest[:, np.newaxis] + offsets[1]
+
+        # For edgepoints, nodes beyond the cube boundary are wrapped for
+        # circular coordinates and otherwise discarded, as in node_edge_check.
+        valid = np.ones(node_i.shape, dtype=bool)
+        for node_index, axis in zip([node_i, node_j], ['y', 'x']):
+            coord_max = cube.coord(axis=axis).shape[0]
+            beyond = (edgepoint[:, np.newaxis] &
+                      ((node_index < 0) | (node_index >= coord_max)))
+            if cube.coord(axis=axis).circular:
+                node_index[beyond] = node_index[beyond] % coord_max
+            else:
+                valid &= ~beyond
+                node_index[beyond] = 0
+
+        # Sites to be modified; only restricted by the land constraint.
+        modify = np.ones(len(altitudes), dtype=bool)
+        if self.land_constraint:
+            # Check that we are considering a land point and that at least
+            # one neighbouring point is also land. If not no modification
+            # is made to the nearest neighbour coordinates.
+            land_nodes = valid & (land_mask[node_i, node_j] != 0)
+            neighbour_land_nodes = land_nodes.copy()
+            neighbour_land_nodes[:, no_neighbours // 2] = False
+            modify = (land_mask[i_nearest, j_nearest].astype(bool) &
+                      neighbour_land_nodes.any(axis=1))
+
+            # Keep only land points (land_mask == 1) where the sites are to
+            # be modified.
+            valid = np.where(modify[:, np.newaxis], land_nodes, valid)
+
+        dzs = altitudes[:, np.newaxis] - orography[node_i, node_j]
+
+        # Bias the selection to look for grid points above or below the site
+        # where any are available, as in apply_bias.
+        subset = valid
+        if self.vertical_bias == 'above':
+            subset = valid & (dzs <= 0)
+        elif self.vertical_bias == 'below':
+            subset = valid & (dzs >= 0)
+        subset = np.where(subset.any(axis=1)[:, np.newaxis], subset, valid)
+
+        # argmin returns the first minimum in each row, as in
+        # index_of_minimum_difference.
+        ij_min = np.argmin(np.where(subset, np.abs(dzs), np.inf), axis=1)
+        sites_index = np.arange(len(altitudes))
+        i_min = node_i[sites_index, ij_min]
+        j_min = node_j[sites_index, ij_min]
+        dz_min = dzs[sites_index, ij_min]
+
+        # Test to ensure that if multiple vertical displacements are the
+        # same we don't select a more distant point because of array
+        # ordering.
+        modify &= ~np.isclose(np.abs(dz_min), np.abs(dz_nearest))
+        neighbours['i'][modify] = i_min[modify]
+        neighbours['j'][modify] = j_min[modify]
+        neighbours['dz'][modify] = dz_min[modify]
 
         return neighbours
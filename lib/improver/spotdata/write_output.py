@@ -31,9 +31,10 @@
 """Plugins written for the Improver site specific process chain."""
 
 import os
-import iris
 from iris import FUTURE
 
+from improver.utilities.save import save_cube
+
 FUTURE.netcdf_no_unlimited = True
 
 
@@ -88,5 +89,5 @@ class WriteOutput(object):
         """
         if self.filename is None:
             self.filename = cube.name()
-        iris.save(
+        save_cube(
             cube, '{}.nc'.format(os.path.join(self.dir_path, self.filename)))
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the plugin benchmarks."""
+
+from collections import OrderedDict
+import json
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+import warnings
+
+from iris.tests import IrisTest
+
+from improver.benchmarks.plugins import SIZES, compare_results, main
+
+
+def set_up_results(seconds, peak_memory_mb, sizes=None):
+    """Set up benchmark results for a single benchmark."""
+    return OrderedDict([
+        ("sizes", OrderedDict(sizes or SIZES["small"])),
+        ("benchmarks", [OrderedDict([
+            ("name", "BasicThreshold"),
+            ("seconds", seconds),
+            ("setup_peak_memory_mb", 50.),
+            ("peak_memory_mb", peak_memory_mb)])])])
+
+
+class Test_compare_results(IrisTest):
+
+    """Test the compare_results function."""
+
+    def setUp(self):
+        """Set up the reference results."""
+        self.reference = set_up_results(1., 100.)
+
+    def test_regression(self):
+        """Test that increases beyond the tolerance are reported."""
+        results = set_up_results(1.5, 130.)
+        regressions = compare_results(results, self.reference)
+        self.assertEqual(regressions, [
+            "BasicThreshold: seconds increased from 1.000 to 1.500",
+            "BasicThreshold: peak_memory_mb increased from 100.000 to "
+            "130.000"])
+
+    def test_within_tolerance(self):
+        """Test that increases within the tolerance are not reported."""
+        results = set_up_results(1.1, 110.)
+        regressions = compare_results(results, self.reference)
+        self.assertEqual(regressions, [])
+
+    def test_tolerance(self):
+        """Test that a smaller tolerance reports smaller increases."""
+        results = set_up_results(1.1, 100.)
+        regressions = compare_results(results, self.reference,
+                                      tolerance=0.05)
+        self.assertEqual(regressions, [
+            "BasicThreshold: seconds increased from 1.000 to 1.100"])
+
+    def test_benchmark_not_in_reference(self):
+        """Test that benchmarks that are not in the reference results are
+        not compared."""
+        results = set_up_results(2., 200.)
+        results["benchmarks"][0]["name"] = "RecursiveFilter"
+        regressions = compare_results(results, self.reference)
+        self.assertEqual(regressions, [])
+
+    def test_size_mismatch(self):
+        """Test that results run with different sizes are not compared, and
+        that a warning is raised."""
+        results = set_up_results(2., 200., sizes=SIZES["full"])
+        msg = "which differ from the sizes"
+        with warnings.catch_warnings(record=True) as warning_list:
+            warnings.simplefilter("always")
+            regressions = compare_results(results, self.reference)
+        self.assertIsNone(regressions)
+        self.assertTrue(any(msg in str(item.message)
+                            for item in warning_list))
+
+
+class Test_main(IrisTest):
+
+    """Test the size options and return status of the main function, using
+    a small, fast benchmark."""
+
+    def setUp(self):
+        """Set up the paths of the output and reference files."""
+        self.directory = mkdtemp()
+        self.output = os.path.join(self.directory, "results.json")
+        self.reference = os.path.join(self.directory, "reference.json")
+        self.args = ["RecursiveFilter", "--grid_size", "10",
+                     "--realizations", "2", "--output", self.output]
+
+    def tearDown(self):
+        """Remove the temporary directory created for testing."""
+        shutil.rmtree(self.directory)
+
+    def _saved_sizes(self):
+        """Return the sizes saved in the output file."""
+        with open(self.output) as output_file:
+            return json.load(output_file)["sizes"]
+
+    def test_size_overrides(self):
+        """Test that the size options override those of the default preset
+        size, and that the other sizes are kept."""
+        status = main(self.args)
+        expected = OrderedDict(SIZES["small"])
+        expected.update([("grid_size", 10), ("realizations", 2)])
+        self.assertEqual(status, 0)
+        self.assertEqual(self._saved_sizes(), expected)
+
+    def test_preset_size(self):
+        """Test that the size options override those of the requested
+        preset size."""
+        main(self.args + ["--size", "full"])
+        expected = OrderedDict(SIZES["full"])
+        expected.update([("grid_size", 10), ("realizations", 2)])
+        self.assertEqual(self._saved_sizes(), expected)
+
+    def test_compare_size_mismatch(self):
+        """Test that a non-zero status is returned if the results cannot be
+        compared with the reference results because the sizes differ."""
+        with open(self.reference, "w") as reference_file:
+            json.dump(set_up_results(1., 100.), reference_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            status = main(self.args + ["--compare", self.reference])
+        self.assertEqual(status, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -215,6 +215,19 @@ class Test_aggregate(IrisTest):
         self.assertArrayAlmostEqual(result, expected_result)
         self.assertEqual(result.shape, expected_result_shape)
 
+    def test_chunk_size(self):
+        """Test that blending the grid points in chunks smaller than the
+           number of points gives the same result."""
+        weights = np.array([0.8, 0.2])
+        percentiles = np.array([0, 20, 40, 60, 80, 100])
+        result = PercentileBlendingAggregator.aggregate(
+            np.reshape(PERCENTILE_DATA, (6, 2, 2, 2)), 1,
+            percentiles,
+            weights, 0, chunk_size=3)
+        expected_result_array = np.reshape(BLENDED_PERCENTILE_DATA2,
+                                           (6, 2, 2))
+        self.assertArrayAlmostEqual(result, expected_result_array)
+
 
 class Test_blend_percentiles(IrisTest):
     """Test the blend_percentiles method"""
@@ -266,5 +279,50 @@ class Test_blend_percentiles(IrisTest):
         expected_result = np.array([5.0, 6.0, 7.0])
         self.assertArrayAlmostEqual(result, expected_result)
 
+
+class Test_blend_percentiles_vectorised(IrisTest):
+    """Test the blend_percentiles_vectorised method"""
+    def test_basic(self):
+        """Test that the result for each grid point matches the result from
+           blend_percentiles."""
+        weights = np.array([0.38872692, 0.33041788, 0.2808552])
+        percentiles = np.array([0., 10., 20., 30., 40., 50.,
+                                60., 70., 80., 90., 100.])
+        perc_values = np.array([PERCENTILE_VALUES, PERCENTILE_VALUES + 1.0])
+        result = PercentileBlendingAggregator.blend_percentiles_vectorised(
+            perc_values, percentiles, weights)
+        for point, values in enumerate(perc_values):
+            expected = PercentileBlendingAggregator.blend_percentiles(
+                values, percentiles, weights)
+            self.assertArrayAlmostEqual(result[point], expected)
+
+    def test_repeated_values(self):
+        """Test that the result matches blend_percentiles when there are
+           repeated values within and across the percentiles being
+           blended."""
+        weights = np.array([0.5, 0.5])
+        percentiles = np.array([20.0, 50.0, 80.0])
+        perc_values = np.array([[[5.0, 6.0, 7.0], [5.0, 6.5, 7.0]],
+                                [[5.0, 5.0, 5.0], [5.0, 5.0, 6.0]],
+                                [[4.0, 6.0, 6.0], [6.0, 6.0, 8.0]]])
+        result = PercentileBlendingAggregator.blend_percentiles_vectorised(
+            perc_values, percentiles, weights)
+        for point, values in enumerate(perc_values):
+            expected = PercentileBlendingAggregator.blend_percentiles(
+                values, percentiles, weights)
+            self.assertArrayAlmostEqual(result[point], expected)
+
+    def test_only_one_point_to_blend(self):
+        """Test case where there is only one point in the coordinate we are
+           blending over."""
+        weights = np.array([1.0])
+        percentiles = np.array([20.0, 50.0, 80.0])
+        perc_values = np.array([[[5.0, 6.0, 7.0]]])
+        result = PercentileBlendingAggregator.blend_percentiles_vectorised(
+            perc_values, percentiles, weights)
+        expected_result = np.array([[5.0, 6.0, 7.0]])
+        self.assertArrayAlmostEqual(result, expected_result)
+
+
 if __name__ == '__main__':
     unittest.main()
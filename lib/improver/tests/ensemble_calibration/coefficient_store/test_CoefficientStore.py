@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the ensemble_calibration.CoefficientStore plugin."""
+
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+
+from iris.tests import IrisTest
+import numpy as np
+
+from improver.ensemble_calibration.coefficient_store import (
+    CoefficientStore as Plugin)
+
+
+class Test_CoefficientStore(IrisTest):
+
+    """Test the storing of optimised coefficients."""
+
+    def setUp(self):
+        """Create a temporary store directory and coefficients."""
+        self.store_dir = os.path.join(mkdtemp(), 'coefficients')
+        self.key = Plugin.key(
+            'air_temperature', 'truncated gaussian', 'mean', 10800.)
+        self.coefficients = np.array([0.5, 1.1, -0.2, 1.01])
+
+    def tearDown(self):
+        """Remove temporary directories created for testing."""
+        shutil.rmtree(os.path.dirname(self.store_dir))
+
+    def test_repr(self):
+        """Test that the __repr__ returns the expected string."""
+        result = str(Plugin('/path/to/store'))
+        self.assertEqual(
+            result, '<CoefficientStore: store_dir: /path/to/store>')
+
+    def test_key(self):
+        """Test that the key is constructed as expected and contains no
+        spaces."""
+        self.assertEqual(
+            self.key, 'air_temperature-truncated_gaussian-mean-pt10800s')
+
+    def test_key_differs_by_forecast_period(self):
+        """Test that different forecast periods have different keys."""
+        result = Plugin.key(
+            'air_temperature', 'truncated gaussian', 'mean', 14400.)
+        self.assertNotEqual(result, self.key)
+
+    def test_load_missing(self):
+        """Test that None is returned if no coefficients are stored."""
+        result = Plugin(self.store_dir).load(self.key)
+        self.assertIsNone(result)
+
+    def test_save_and_load(self):
+        """Test that saved coefficients and validity time are loaded, and
+        that the store directory is created."""
+        plugin = Plugin(self.store_dir)
+        plugin.save(self.key, self.coefficients, 1448262000.)
+        coefficients, validity_time = plugin.load(self.key)
+        self.assertArrayAlmostEqual(coefficients, self.coefficients)
+        self.assertEqual(validity_time, 1448262000.)
+        self.assertEqual(os.listdir(self.store_dir),
+                         [os.path.basename(plugin.filepath(self.key))])
+
+    def test_save_replaces(self):
+        """Test that saving coefficients replaces those already stored."""
+        plugin = Plugin(self.store_dir)
+        plugin.save(self.key, self.coefficients, 1448262000.)
+        plugin.save(self.key, self.coefficients * 2, 1448348400.)
+        coefficients, validity_time = plugin.load(self.key)
+        self.assertArrayAlmostEqual(coefficients, self.coefficients * 2)
+        self.assertEqual(validity_time, 1448348400.)
+
+    def test_save_and_load_partitions(self):
+        """Test that a 2d array of coefficients for partitions is saved and
+        loaded."""
+        coefficients = np.array([self.coefficients, self.coefficients + 1])
+        plugin = Plugin(self.store_dir)
+        plugin.save(self.key, coefficients, 1448262000.)
+        result, _ = plugin.load(self.key)
+        self.assertArrayAlmostEqual(result, coefficients)
+
+
+if __name__ == '__main__':
+    unittest.main()
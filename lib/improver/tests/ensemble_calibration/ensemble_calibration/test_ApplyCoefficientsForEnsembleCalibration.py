@@ -832,5 +832,126 @@ class Test__apply_params(IrisTest):
                             in str(warning_list[0]))
 
 
+class Test__apply_partitioned_params(IrisTest):
+
+    """Test the _apply_partitioned_params method."""
+
+    def setUp(self):
+        """Use temperature cube to test with."""
+        cube = add_forecast_reference_time_and_forecast_period(
+            set_up_temperature_cube())
+        self.cube = next(cube.slices_over("time"))
+        self.coeff_names = ["gamma", "delta", "a", "beta"]
+        self.partitions = np.array([[0, 0, 1],
+                                    [0, 0, 1],
+                                    [2, 2, 3]])
+        self.optimised_coeffs = np.array([[0.5, 1., 0., 1.],
+                                          [0.5, 1., 1., 1.],
+                                          [1., 2., 2., 0.5],
+                                          [1., 2., 3., 0.5]])
+
+    def test_basic(self):
+        """Test that the plugin returns a tuple containing the calibrated
+        predictor, the calibrated variance and the coefficient cubes."""
+        plugin = Plugin(
+            self.cube, {}, self.coeff_names, partitions=self.partitions)
+        result = plugin._apply_partitioned_params(
+            self.cube.collapsed("realization", iris.analysis.MEAN),
+            self.cube.collapsed("realization", iris.analysis.VARIANCE),
+            self.optimised_coeffs, self.coeff_names, "mean")
+        self.assertIsInstance(result, tuple)
+        self.assertEqual(len(result), 3)
+        self.assertIsInstance(result[2], CubeList)
+
+    def test_calibrated_predictor(self):
+        """Test that each grid point is calibrated using the coefficients
+        of its partition."""
+        predictor_cube = self.cube.collapsed(
+            "realization", iris.analysis.MEAN)
+        alpha = self.optimised_coeffs[self.partitions, 2]
+        beta = self.optimised_coeffs[self.partitions, 3]
+        expected = alpha + beta * predictor_cube.data
+        plugin = Plugin(
+            self.cube, {}, self.coeff_names, partitions=self.partitions)
+        result, _, _ = plugin._apply_partitioned_params(
+            predictor_cube,
+            self.cube.collapsed("realization", iris.analysis.VARIANCE),
+            self.optimised_coeffs, self.coeff_names, "mean")
+        self.assertArrayAlmostEqual(result.data, expected)
+
+    def test_calibrated_variance(self):
+        """Test that the variance at each grid point is calibrated using the
+        coefficients of its partition."""
+        variance_cube = self.cube.collapsed(
+            "realization", iris.analysis.VARIANCE)
+        gamma = self.optimised_coeffs[self.partitions, 0]
+        delta = self.optimised_coeffs[self.partitions, 1]
+        expected = gamma**2 + delta**2 * variance_cube.data
+        plugin = Plugin(
+            self.cube, {}, self.coeff_names, partitions=self.partitions)
+        _, result, _ = plugin._apply_partitioned_params(
+            self.cube.collapsed("realization", iris.analysis.MEAN),
+            variance_cube, self.optimised_coeffs, self.coeff_names, "mean")
+        self.assertArrayAlmostEqual(result.data, expected)
+
+    def test_calibrated_predictor_members(self):
+        """Test that the calibrated mean is calculated from the ensemble
+        members using the coefficients of each partition."""
+        optimised_coeffs = np.array([[0.5, 1., 0., 1., 1., 1.],
+                                     [0.5, 1., 1., 0.5, 0.5, 0.5],
+                                     [1., 2., 2., 0., 0., 1.],
+                                     [1., 2., 3., 1., 0., 0.]])
+        coeffs = optimised_coeffs[self.partitions]
+        expected = coeffs[..., 2] + np.sum(
+            np.rollaxis(coeffs[..., 3:]**2, -1) * self.cube.data, axis=0)
+        plugin = Plugin(
+            self.cube, {}, self.coeff_names, partitions=self.partitions)
+        result, _, _ = plugin._apply_partitioned_params(
+            self.cube.copy(),
+            self.cube.collapsed("realization", iris.analysis.VARIANCE),
+            optimised_coeffs, self.coeff_names, "members")
+        self.assertArrayAlmostEqual(result.data, expected, decimal=4)
+
+    def test_coefficient_cubes(self):
+        """Test that the coefficient cubes have a partition dimension."""
+        plugin = Plugin(
+            self.cube, {}, self.coeff_names, partitions=self.partitions)
+        _, _, result = plugin._apply_partitioned_params(
+            self.cube.collapsed("realization", iris.analysis.MEAN),
+            self.cube.collapsed("realization", iris.analysis.VARIANCE),
+            self.optimised_coeffs, self.coeff_names, "mean")
+        self.assertEqual(len(result), 4)
+        for index, coeff_cube in enumerate(result):
+            self.assertEqual(coeff_cube.name(), self.coeff_names[index])
+            self.assertArrayEqual(
+                coeff_cube.coord("partition").points, [0, 1, 2, 3])
+            self.assertArrayAlmostEqual(
+                coeff_cube.data.flatten(), self.optimised_coeffs[:, index])
+
+    def test_no_partitions(self):
+        """Test that an error is raised if coefficients for multiple
+        partitions are provided without the partitions."""
+        plugin = Plugin(self.cube, {}, self.coeff_names)
+        msg = "no partitions have been specified"
+        with self.assertRaisesRegexp(ValueError, msg):
+            plugin._apply_partitioned_params(
+                self.cube.collapsed("realization", iris.analysis.MEAN),
+                self.cube.collapsed("realization", iris.analysis.VARIANCE),
+                self.optimised_coeffs, self.coeff_names, "mean")
+
+    def test_mismatched_partitions(self):
+        """Test that an error is raised if the number of partitions does not
+        match the number of sets of coefficients."""
+        plugin = Plugin(
+            self.cube, {}, self.coeff_names,
+            partitions=np.zeros((3, 3), dtype=int))
+        msg = "does not match the number of sets of coefficients"
+        with self.assertRaisesRegexp(ValueError, msg):
+            plugin._apply_partitioned_params(
+                self.cube.collapsed("realization", iris.analysis.MEAN),
+                self.cube.collapsed("realization", iris.analysis.VARIANCE),
+                self.optimised_coeffs, self.coeff_names, "mean")
+
+
 if __name__ == '__main__':
     unittest.main()
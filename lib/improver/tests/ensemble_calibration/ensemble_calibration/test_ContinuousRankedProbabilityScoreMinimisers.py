@@ -39,6 +39,7 @@ import unittest
 import iris
 from iris.tests import IrisTest
 import numpy as np
+from scipy.optimize import approx_fprime
 import warnings
 
 from improver.ensemble_calibration.ensemble_calibration import (
@@ -267,6 +268,128 @@ class Test_truncated_normal_crps_minimiser(IrisTest):
         self.assertAlmostEqual(result, plugin.BAD_VALUE)
 
 
+class Test__init__(IrisTest):
+
+    """Test the initialisation of the class."""
+
+    def test_default_method(self):
+        """Test that Nelder-Mead is the default minimisation method."""
+        plugin = Plugin()
+        self.assertEqual(plugin.minimisation_method, "nelder-mead")
+
+    def test_method_case_insensitive(self):
+        """Test that the minimisation method is not case sensitive."""
+        plugin = Plugin(minimisation_method="L-BFGS-B")
+        self.assertEqual(plugin.minimisation_method, "l-bfgs-b")
+
+    def test_unsupported_method(self):
+        """Test that an unsupported minimisation method raises an error."""
+        msg = "Minimisation method requested foo is not supported"
+        with self.assertRaisesRegexp(ValueError, msg):
+            Plugin(minimisation_method="foo")
+
+
+def _set_up_gradient_test_data(cube, predictor_of_mean_flag):
+    """
+    Set up float64 training data from a cube for comparing the analytic
+    gradients against finite differences.
+    """
+    forecast_variance = cube.collapsed("realization", iris.analysis.VARIANCE)
+    truth = cube.collapsed("realization", iris.analysis.MAX)
+    if predictor_of_mean_flag == "mean":
+        forecast_predictor_data = cube.collapsed(
+            "realization", iris.analysis.MEAN).data.flatten()
+    else:
+        forecast_predictor_data = convert_cube_data_to_2d(cube)
+    return (forecast_predictor_data.astype(np.float64),
+            truth.data.flatten().astype(np.float64),
+            forecast_variance.data.flatten().astype(np.float64),
+            np.sqrt(np.pi), predictor_of_mean_flag)
+
+
+class Test_normal_crps_gradient(IrisTest):
+
+    """Test the gradient of the CRPS for a normal distribution."""
+
+    def setUp(self):
+        """Set up temperature cube and plugin for testing."""
+        self.cube = set_up_temperature_cube()
+        self.plugin = Plugin()
+
+    def test_mean_predictor(self):
+        """Test that the analytic gradient matches a finite difference
+        estimate, when the ensemble mean is the predictor."""
+        initial_guess = np.array([5, 1, 0.5, 1.01])
+        args = _set_up_gradient_test_data(self.cube, "mean")
+        expected = approx_fprime(
+            initial_guess, self.plugin.normal_crps_minimiser, 1e-6, *args)
+        result = self.plugin.normal_crps_gradient(initial_guess, *args)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayAllClose(result, expected, rtol=1e-3)
+
+    def test_members_predictor(self):
+        """Test that the analytic gradient matches a finite difference
+        estimate, when the ensemble members are the predictor."""
+        initial_guess = np.array([5, 1, 0.5, 0.6, 0.5, 0.6])
+        args = _set_up_gradient_test_data(self.cube, "members")
+        expected = approx_fprime(
+            initial_guess, self.plugin.normal_crps_minimiser, 1e-6, *args)
+        result = self.plugin.normal_crps_gradient(initial_guess, *args)
+        self.assertArrayAllClose(result, expected, rtol=1e-3)
+
+    def test_bad_value(self):
+        """Test that the gradient is zero when the CRPS is set to
+        BAD_VALUE."""
+        initial_guess = np.array([0, 0, 1, 1], dtype=np.float32)
+        args = _set_up_gradient_test_data(self.cube, "mean")
+        result = self.plugin.normal_crps_gradient(initial_guess, *args)
+        self.assertArrayEqual(result, np.zeros(4))
+
+
+class Test_truncated_normal_crps_gradient(IrisTest):
+
+    """Test the gradient of the CRPS for a truncated normal distribution."""
+
+    def setUp(self):
+        """Set up wind speed cube and plugin for testing."""
+        self.cube = set_up_wind_speed_cube()
+        self.plugin = Plugin()
+
+    def test_mean_predictor(self):
+        """Test that the analytic gradient matches a finite difference
+        estimate, when the ensemble mean is the predictor."""
+        initial_guess = np.array([1, 0.5, 0.5, 1.01])
+        args = _set_up_gradient_test_data(self.cube, "mean")
+        expected = approx_fprime(
+            initial_guess, self.plugin.truncated_normal_crps_minimiser,
+            1e-6, *args)
+        result = self.plugin.truncated_normal_crps_gradient(
+            initial_guess, *args)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayAllClose(result, expected, rtol=1e-3)
+
+    def test_members_predictor(self):
+        """Test that the analytic gradient matches a finite difference
+        estimate, when the ensemble members are the predictor."""
+        initial_guess = np.array([1, 0.5, 0.5, 0.6, 0.5, 0.6])
+        args = _set_up_gradient_test_data(self.cube, "members")
+        expected = approx_fprime(
+            initial_guess, self.plugin.truncated_normal_crps_minimiser,
+            1e-6, *args)
+        result = self.plugin.truncated_normal_crps_gradient(
+            initial_guess, *args)
+        self.assertArrayAllClose(result, expected, rtol=1e-3)
+
+    def test_bad_value(self):
+        """Test that the gradient is zero when the CRPS is set to
+        BAD_VALUE."""
+        initial_guess = np.array([1, 1, -1000, 1])
+        args = _set_up_gradient_test_data(self.cube, "mean")
+        result = self.plugin.truncated_normal_crps_gradient(
+            initial_guess, *args)
+        self.assertArrayEqual(result, np.zeros(4))
+
+
 class Test_crps_minimiser_wrapper(IrisTest):
 
     """
@@ -713,6 +836,39 @@ class Test_crps_minimiser_wrapper(IrisTest):
             self.assertTrue("The final iteration resulted in a percentage "
                             "change" in str(warning_list[1]))
 
+    def test_normal_mean_predictor_lbfgsb(self):
+        """
+        Test that the L-BFGS-B method, using the analytic gradient, achieves
+        a CRPS at least as low as the Nelder-Mead method.
+        The ensemble mean is the predictor.
+        """
+        initial_guess = np.array([5, 1, 0, 1], dtype=np.float32)
+        cube = set_up_temperature_cube()
+
+        forecast_predictor = cube.collapsed("realization", iris.analysis.MEAN)
+        forecast_variance = cube.collapsed(
+            "realization", iris.analysis.VARIANCE)
+        truth = cube.collapsed("realization", iris.analysis.MAX)
+        args = (forecast_predictor.data.flatten().astype(np.float32),
+                truth.data.flatten().astype(np.float32),
+                forecast_variance.data.flatten().astype(np.float32),
+                np.sqrt(np.pi).astype(np.float32), "mean")
+
+        plugin = Plugin(minimisation_method="l-bfgs-b")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = plugin.crps_minimiser_wrapper(
+                initial_guess, forecast_predictor, truth, forecast_variance,
+                "mean", "gaussian")
+            nelder_mead_result = Plugin().crps_minimiser_wrapper(
+                initial_guess, forecast_predictor, truth, forecast_variance,
+                "mean", "gaussian")
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(len(result), 4)
+        self.assertLessEqual(
+            plugin.normal_crps_minimiser(result, *args),
+            plugin.normal_crps_minimiser(nelder_mead_result, *args) + 1e-3)
+
 
 if __name__ == '__main__':
     unittest.main()
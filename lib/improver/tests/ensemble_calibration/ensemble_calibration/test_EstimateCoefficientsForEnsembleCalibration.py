@@ -34,6 +34,9 @@ Unit tests for the
 class.
 
 """
+import os
+import shutil
+from tempfile import mkdtemp
 import unittest
 
 import iris
@@ -42,6 +45,8 @@ from iris.tests import IrisTest
 import numpy as np
 import warnings
 
+from improver.ensemble_calibration.coefficient_store import (
+    CoefficientStore)
 from improver.ensemble_calibration.ensemble_calibration import (
     EstimateCoefficientsForEnsembleCalibration as Plugin)
 from improver.tests.ensemble_calibration.ensemble_calibration.\
@@ -332,6 +337,103 @@ class Test_compute_initial_guess(IrisTest):
         self.assertArrayAlmostEqual(result, data)
 
 
+class Test_estimate_coefficients_for_partitions(IrisTest):
+
+    """Test the estimate_coefficients_for_partitions method."""
+
+    def setUp(self):
+        """Set up training data for testing."""
+        current_forecast = (
+            add_forecast_reference_time_and_forecast_period(
+                set_up_temperature_cube()))
+        self.historic_forecast = _create_historic_forecasts(current_forecast)
+        self.truth = _create_truth(current_forecast)
+        self.truth.data = self.truth.data + np.linspace(
+            -1, 1, self.truth.data.size).reshape(self.truth.shape)
+        self.forecast_predictor = self.historic_forecast.collapsed(
+            "realization", iris.analysis.MEAN)
+        self.forecast_var = self.historic_forecast.collapsed(
+            "realization", iris.analysis.VARIANCE)
+        self.initial_guess = [1, 1, 0, 1]
+        self.partitions = np.array([[0, 0, 1],
+                                    [0, 0, 1],
+                                    [2, 2, 3]])
+
+    def test_basic(self):
+        """Test that a row of coefficients is returned for each
+        partition."""
+        plugin = Plugin("gaussian", "K", partitions=self.partitions)
+        result = plugin.estimate_coefficients_for_partitions(
+            self.initial_guess, self.forecast_predictor, self.truth,
+            self.forecast_var)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.shape, (4, 4))
+
+    def test_single_partition(self):
+        """Test that a single partition covering the whole domain gives the
+        same coefficients as a minimisation over the whole domain."""
+        plugin = Plugin(
+            "gaussian", "K", partitions=np.zeros((3, 3), dtype=int))
+        expected = plugin.minimiser.crps_minimiser_wrapper(
+            self.initial_guess, self.forecast_predictor, self.truth,
+            self.forecast_var, "mean", "gaussian")
+        result = plugin.estimate_coefficients_for_partitions(
+            self.initial_guess, self.forecast_predictor, self.truth,
+            self.forecast_var)
+        self.assertArrayAlmostEqual(result[0], expected)
+
+    def test_partition_values(self):
+        """Test that the coefficients for a partition match a minimisation
+        using only the points within that partition."""
+        plugin = Plugin("gaussian", "K", partitions=self.partitions)
+        mask = self.partitions == 3
+        expected = plugin.minimiser.minimise_crps(
+            self.initial_guess, self.forecast_predictor.data[..., mask],
+            self.truth.data[..., mask], self.forecast_var.data[..., mask],
+            "mean", "gaussian")
+        result = plugin.estimate_coefficients_for_partitions(
+            self.initial_guess, self.forecast_predictor, self.truth,
+            self.forecast_var)
+        self.assertArrayAlmostEqual(result[3], expected)
+
+    def test_members_predictor(self):
+        """Test that a row of coefficients is returned for each partition
+        when the ensemble members are the predictor."""
+        plugin = Plugin(
+            "gaussian", "K", predictor_of_mean_flag="members",
+            partitions=self.partitions)
+        result = plugin.estimate_coefficients_for_partitions(
+            [1, 1, 0, 1, 1, 1], self.historic_forecast, self.truth,
+            self.forecast_var)
+        self.assertEqual(result.shape, (4, 6))
+
+    def test_multiprocessing(self):
+        """Test that using a pool of processes gives the same coefficients
+        as estimating the coefficients for each partition in turn."""
+        expected = Plugin(
+            "gaussian", "K", partitions=self.partitions
+            ).estimate_coefficients_for_partitions(
+                self.initial_guess, self.forecast_predictor, self.truth,
+                self.forecast_var)
+        result = Plugin(
+            "gaussian", "K", partitions=self.partitions, num_processes=2
+            ).estimate_coefficients_for_partitions(
+                self.initial_guess, self.forecast_predictor, self.truth,
+                self.forecast_var)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_partitions_wrong_shape(self):
+        """Test that an error is raised if the partitions do not match the
+        grid of the truth."""
+        plugin = Plugin(
+            "gaussian", "K", partitions=np.zeros((2, 2), dtype=int))
+        msg = "The shape of the partitions"
+        with self.assertRaisesRegexp(ValueError, msg):
+            plugin.estimate_coefficients_for_partitions(
+                self.initial_guess, self.forecast_predictor, self.truth,
+                self.forecast_var)
+
+
 class Test_estimate_coefficients_for_ngr(IrisTest):
 
     """Test the estimate_coefficients_for_ngr plugin."""
@@ -844,5 +946,215 @@ class Test_estimate_coefficients_for_ngr(IrisTest):
                             in str(warning_list[0]))
 
 
+class Test_estimate_coefficients_with_coefficient_store(IrisTest):
+
+    """Test the estimate_coefficients_for_ngr plugin with a coefficient
+    store."""
+
+    def setUp(self):
+        """Set up cubes and a temporary coefficient store for testing."""
+        self.current_forecast = (
+            add_forecast_reference_time_and_forecast_period(
+                set_up_temperature_cube()))
+        self.historic_forecasts = (
+            _create_historic_forecasts(self.current_forecast))
+        self.truth = _create_truth(self.current_forecast)
+        self.store_dir = mkdtemp()
+        self.store = CoefficientStore(self.store_dir)
+        self.key = self.store.key(
+            "air_temperature", "gaussian", "mean", 4 * 3600)
+        time_coord = self.current_forecast.coord("time").copy()
+        time_coord.convert_units("seconds since 1970-01-01 00:00:00")
+        self.validity_time = time_coord.points[0]
+        self.stored_coeffs = np.array([0.5, 1.1, 1.6, 0.99])
+
+    def tearDown(self):
+        """Remove the temporary coefficient store."""
+        shutil.rmtree(self.store_dir)
+
+    def test_reuse_stored_coefficients(self):
+        """Test that coefficients stored within the maximum age are returned
+        without performing the minimisation."""
+        self.store.save(
+            self.key, self.stored_coeffs, self.validity_time - 12 * 3600)
+        plugin = Plugin("gaussian", "degreesC",
+                        coefficient_store_dir=self.store_dir,
+                        max_coefficient_age=24)
+        optimised_coeffs, _ = plugin.estimate_coefficients_for_ngr(
+            self.current_forecast, self.historic_forecasts, self.truth)
+        self.assertEqual(len(optimised_coeffs), 1)
+        for key in optimised_coeffs.keys():
+            self.assertArrayAlmostEqual(
+                optimised_coeffs[key], self.stored_coeffs)
+
+    def test_stored_coefficients_too_old(self):
+        """Test that coefficients older than the maximum age are not reused,
+        and are replaced by the newly optimised coefficients."""
+        self.store.save(
+            self.key, self.stored_coeffs, self.validity_time - 48 * 3600)
+        plugin = Plugin("gaussian", "degreesC",
+                        coefficient_store_dir=self.store_dir,
+                        max_coefficient_age=24)
+        optimised_coeffs, _ = plugin.estimate_coefficients_for_ngr(
+            self.current_forecast, self.historic_forecasts, self.truth)
+        stored_coeffs, validity_time = self.store.load(self.key)
+        self.assertEqual(validity_time, self.validity_time)
+        for key in optimised_coeffs.keys():
+            self.assertArrayAlmostEqual(
+                optimised_coeffs[key], stored_coeffs)
+
+    def test_coefficients_stored(self):
+        """Test that the optimised coefficients are stored, when no
+        coefficients have previously been stored."""
+        plugin = Plugin("gaussian", "degreesC",
+                        coefficient_store_dir=self.store_dir)
+        optimised_coeffs, _ = plugin.estimate_coefficients_for_ngr(
+            self.current_forecast, self.historic_forecasts, self.truth)
+        stored_coeffs, validity_time = self.store.load(self.key)
+        self.assertEqual(validity_time, self.validity_time)
+        for key in optimised_coeffs.keys():
+            self.assertArrayAlmostEqual(
+                optimised_coeffs[key], stored_coeffs)
+
+    def test_load_stored_coefficients_wrong_shape(self):
+        """Test that stored coefficients with the wrong number of
+        coefficients are ignored."""
+        self.store.save(self.key, [1, 1, 0, 1, 1], self.validity_time)
+        plugin = Plugin("gaussian", "degreesC",
+                        coefficient_store_dir=self.store_dir,
+                        max_coefficient_age=24)
+        result = plugin._load_stored_coefficients(
+            self.key, self.validity_time, self.current_forecast)
+        self.assertEqual(result, (None, False))
+
+    def test_load_stored_coefficients_without_max_age(self):
+        """Test that stored coefficients are loaded to use as the initial
+        guess, but not reused, when no maximum age is set."""
+        self.store.save(self.key, self.stored_coeffs, self.validity_time)
+        plugin = Plugin("gaussian", "degreesC",
+                        coefficient_store_dir=self.store_dir)
+        stored_coeffs, reuse_stored_coeffs = (
+            plugin._load_stored_coefficients(
+                self.key, self.validity_time, self.current_forecast))
+        self.assertArrayAlmostEqual(stored_coeffs, self.stored_coeffs)
+        self.assertFalse(reuse_stored_coeffs)
+
+
+class Test_estimate_coefficients_with_training_data(IrisTest):
+
+    """Test the estimation of coefficients from rolling training data."""
+
+    def setUp(self):
+        """Set up training data and a temporary training data directory."""
+        self.current_forecast = (
+            add_forecast_reference_time_and_forecast_period(
+                set_up_temperature_cube()))
+        self.historic_forecast = (
+            _create_historic_forecasts(self.current_forecast))
+        self.truth = _create_truth(self.current_forecast)
+        self.truth.data = self.truth.data + np.linspace(
+            -1, 1, self.truth.data.size).reshape(self.truth.shape)
+        self.forecast_predictor = self.historic_forecast.collapsed(
+            "realization", iris.analysis.MEAN)
+        self.forecast_var = self.historic_forecast.collapsed(
+            "realization", iris.analysis.VARIANCE)
+        self.initial_guess = [1, 1, 0, 1]
+        self.training_data_dir = mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary training data directory."""
+        shutil.rmtree(self.training_data_dir)
+
+    def test_training_window_required(self):
+        """Test that an exception is raised if a training data directory is
+        given without a training window."""
+        msg = "A training_window is required"
+        with self.assertRaisesRegexp(ValueError, msg):
+            Plugin("gaussian", "K", training_data_dir=self.training_data_dir)
+
+    def test_accumulate_training_data(self):
+        """Test that the historic forecasts are accumulated for the forecast
+        period, with the oldest forecasts dropped to fit the window."""
+        no_of_times = len(self.truth.coord("time").points)
+        plugin = Plugin("gaussian", "K",
+                        training_data_dir=self.training_data_dir,
+                        training_window=no_of_times - 1)
+        forecast_predictor_data, truth_data, forecast_var_data, \
+            no_of_forecasts = plugin._accumulate_training_data(
+                self.current_forecast, self.forecast_predictor,
+                self.forecast_var, self.truth)
+        self.assertEqual(no_of_forecasts, no_of_times - 1)
+        self.assertEqual(os.listdir(self.training_data_dir),
+                         ["air_temperature-mean-pt14400s"])
+        self.assertArrayAlmostEqual(
+            truth_data, self.truth.data[1:].flatten(), decimal=4)
+        self.assertArrayAlmostEqual(
+            forecast_predictor_data,
+            self.forecast_predictor.data[1:].flatten(), decimal=4)
+        self.assertEqual(forecast_var_data.shape, truth_data.shape)
+
+    def test_accumulate_training_data_members(self):
+        """Test that the ensemble members are accumulated as a 2d
+        predictor."""
+        plugin = Plugin("gaussian", "K", predictor_of_mean_flag="members",
+                        training_data_dir=self.training_data_dir,
+                        training_window=10)
+        forecast_predictor_data, truth_data, _, _ = (
+            plugin._accumulate_training_data(
+                self.current_forecast, self.historic_forecast,
+                self.forecast_var, self.truth))
+        self.assertEqual(
+            forecast_predictor_data.shape,
+            (len(truth_data), len(
+                self.historic_forecast.coord("realization").points)))
+
+    def test_training_data_matches_cubes(self):
+        """Test that coefficients estimated from the accumulated training
+        data match those estimated directly from the cubes."""
+        plugin = Plugin("gaussian", "K",
+                        training_data_dir=self.training_data_dir,
+                        training_window=10)
+        training_data = plugin._accumulate_training_data(
+            self.current_forecast, self.forecast_predictor,
+            self.forecast_var, self.truth)
+        expected = plugin.minimiser.crps_minimiser_wrapper(
+            self.initial_guess, self.forecast_predictor, self.truth,
+            self.forecast_var, "mean", "gaussian")
+        result = plugin.estimate_coefficients_from_training_data(
+            self.initial_guess, *training_data)
+        self.assertArrayAlmostEqual(result, expected, decimal=3)
+
+    def test_partitions(self):
+        """Test that a row of coefficients is returned for each partition
+        from the accumulated training data."""
+        plugin = Plugin("gaussian", "K",
+                        partitions=np.array([[0, 0, 1],
+                                             [0, 0, 1],
+                                             [2, 2, 3]]),
+                        training_data_dir=self.training_data_dir,
+                        training_window=10)
+        training_data = plugin._accumulate_training_data(
+            self.current_forecast, self.forecast_predictor,
+            self.forecast_var, self.truth)
+        result = plugin.estimate_coefficients_from_training_data(
+            self.initial_guess, *training_data)
+        self.assertEqual(result.shape, (4, 4))
+
+    def test_partitions_wrong_size(self):
+        """Test that an exception is raised if the partitions do not match
+        the accumulated training data."""
+        plugin = Plugin("gaussian", "K",
+                        partitions=np.zeros((2, 2), dtype=int),
+                        training_data_dir=self.training_data_dir,
+                        training_window=10)
+        training_data = plugin._accumulate_training_data(
+            self.current_forecast, self.forecast_predictor,
+            self.forecast_var, self.truth)
+        msg = "does not match the number of points"
+        with self.assertRaisesRegexp(ValueError, msg):
+            plugin.estimate_coefficients_from_training_data(
+                self.initial_guess, *training_data)
+
+
 if __name__ == '__main__':
     unittest.main()
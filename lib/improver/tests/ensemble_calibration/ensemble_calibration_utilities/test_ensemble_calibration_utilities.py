@@ -41,7 +41,7 @@ import numpy as np
 
 from improver.ensemble_calibration.ensemble_calibration_utilities import (
     convert_cube_data_to_2d, rename_coordinate, _renamer,
-    check_predictor_of_mean_flag)
+    check_predictor_of_mean_flag, create_tile_partitions)
 from improver.tests.ensemble_calibration.ensemble_calibration.\
     helper_functions import set_up_temperature_cube
 
@@ -297,5 +297,43 @@ class Test_check_predictor_of_mean_flag(IrisTest):
             check_predictor_of_mean_flag(predictor_of_mean_flag)
 
 
+class Test_create_tile_partitions(IrisTest):
+
+    """Test the create_tile_partitions utility."""
+
+    def setUp(self):
+        """Use temperature cube to test with."""
+        self.cube = set_up_temperature_cube()
+
+    def test_basic(self):
+        """Test that the utility returns labels for 2x2 tiles, with smaller
+        tiles along the upper edges of the domain."""
+        expected = np.array([[0, 0, 1],
+                             [0, 0, 1],
+                             [2, 2, 3]])
+        result = create_tile_partitions(self.cube, 2)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayEqual(result, expected)
+
+    def test_single_point_tiles(self):
+        """Test that a tile_size of 1 gives each grid point its own
+        partition."""
+        expected = np.arange(9).reshape(3, 3)
+        result = create_tile_partitions(self.cube, 1)
+        self.assertArrayEqual(result, expected)
+
+    def test_tile_larger_than_domain(self):
+        """Test that a tile larger than the domain gives a single
+        partition."""
+        result = create_tile_partitions(self.cube, 10)
+        self.assertArrayEqual(result, np.zeros((3, 3)))
+
+    def test_invalid_tile_size(self):
+        """Test that the utility raises an error for a tile_size of 0."""
+        msg = "The tile_size must be at least 1 grid point"
+        with self.assertRaisesRegexp(ValueError, msg):
+            create_tile_partitions(self.cube, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the ensemble_calibration.TrainingDataAccumulator plugin."""
+
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+
+from iris.tests import IrisTest
+import numpy as np
+
+from improver.ensemble_calibration.training_accumulator import (
+    TrainingDataAccumulator as Plugin)
+
+
+class Test_TrainingDataAccumulator(IrisTest):
+
+    """Test the rolling accumulation of training data."""
+
+    def setUp(self):
+        """Create a temporary accumulator directory and training data for
+        three points."""
+        self.accumulator_dir = os.path.join(mkdtemp(), 'training')
+        self.predictor = np.array([272., 273., 274.])
+        self.variance = np.array([0.5, 1., 1.5])
+        self.truth = np.array([272.5, 273.5, 274.5])
+        self.times = [1448262000., 1448348400., 1448434800.]
+
+    def tearDown(self):
+        """Remove temporary directories created for testing."""
+        shutil.rmtree(os.path.dirname(self.accumulator_dir))
+
+    def append_forecasts(self, plugin, times):
+        """Append training data for each time, offset by the index of the
+        time within the list."""
+        for index, time in enumerate(times):
+            plugin.append(self.predictor + index, self.variance + index,
+                          self.truth + index, time)
+
+    def test_repr(self):
+        """Test that the __repr__ returns the expected string."""
+        result = str(Plugin('/path/to/training', 30))
+        self.assertEqual(
+            result, '<TrainingDataAccumulator: accumulator_dir: '
+            '/path/to/training; window_length: 30>')
+
+    def test_key(self):
+        """Test that the key is constructed as expected and contains no
+        spaces."""
+        result = Plugin.key('air temperature', 'mean', 10800.)
+        self.assertEqual(result, 'air_temperature-mean-pt10800s')
+
+    def test_append_and_training_data(self):
+        """Test that the appended training data are returned flattened and
+        as float32."""
+        plugin = Plugin(self.accumulator_dir, 3)
+        self.append_forecasts(plugin, self.times[:2])
+        predictor, truth, variance, no_of_forecasts = plugin.training_data()
+        self.assertEqual(no_of_forecasts, 2)
+        self.assertEqual(predictor.dtype, np.float32)
+        self.assertArrayAlmostEqual(
+            predictor, np.concatenate([self.predictor, self.predictor + 1]))
+        self.assertArrayAlmostEqual(
+            truth, np.concatenate([self.truth, self.truth + 1]))
+        self.assertArrayAlmostEqual(
+            variance, np.concatenate([self.variance, self.variance + 1]))
+        self.assertEqual(plugin.validity_times, self.times[:2])
+
+    def test_oldest_replaced(self):
+        """Test that the oldest forecast is dropped when the window is full,
+        and that the training data are returned in chronological order."""
+        plugin = Plugin(self.accumulator_dir, 2)
+        self.append_forecasts(plugin, self.times)
+        predictor, _, _, no_of_forecasts = plugin.training_data()
+        self.assertEqual(no_of_forecasts, 2)
+        self.assertEqual(plugin.validity_times, self.times[1:])
+        self.assertArrayAlmostEqual(
+            predictor,
+            np.concatenate([self.predictor + 1, self.predictor + 2]))
+
+    def test_same_time_replaced(self):
+        """Test that a forecast with the same validity time as an
+        accumulated forecast replaces it."""
+        plugin = Plugin(self.accumulator_dir, 3)
+        self.append_forecasts(plugin, [self.times[0], self.times[0]])
+        predictor, _, _, no_of_forecasts = plugin.training_data()
+        self.assertEqual(no_of_forecasts, 1)
+        self.assertArrayAlmostEqual(predictor, self.predictor + 1)
+
+    def test_persists_between_instances(self):
+        """Test that training data accumulated by one instance are
+        available to a new instance."""
+        self.append_forecasts(Plugin(self.accumulator_dir, 3), self.times)
+        _, _, _, no_of_forecasts = Plugin(
+            self.accumulator_dir, 3).training_data()
+        self.assertEqual(no_of_forecasts, 3)
+
+    def test_members(self):
+        """Test that ensemble members are accumulated as a 2d predictor."""
+        members = np.stack([self.predictor, self.predictor + 1], axis=1)
+        plugin = Plugin(self.accumulator_dir, 3)
+        for time in self.times[:2]:
+            plugin.append(members, self.variance, self.truth, time)
+        predictor, truth, _, _ = plugin.training_data()
+        self.assertEqual(predictor.shape, (6, 2))
+        self.assertEqual(truth.shape, (6,))
+
+    def test_shape_mismatch(self):
+        """Test that an exception is raised if the shape of the training
+        data does not match the accumulated training data."""
+        plugin = Plugin(self.accumulator_dir, 3)
+        self.append_forecasts(plugin, self.times[:1])
+        msg = 'does not match the training data accumulated'
+        with self.assertRaisesRegexp(ValueError, msg):
+            plugin.append(self.predictor[:2], self.variance[:2],
+                          self.truth[:2], self.times[1])
+
+    def test_window_length_mismatch(self):
+        """Test that an exception is raised if the window length differs
+        from that of the accumulated training data."""
+        self.append_forecasts(Plugin(self.accumulator_dir, 3), self.times)
+        msg = 'accumulated with a window length of 3, not 2'
+        with self.assertRaisesRegexp(ValueError, msg):
+            Plugin(self.accumulator_dir, 2).training_data()
+
+    def test_no_training_data(self):
+        """Test that an exception is raised if no training data have been
+        accumulated."""
+        msg = 'No training data have been accumulated'
+        with self.assertRaisesRegexp(ValueError, msg):
+            Plugin(self.accumulator_dir, 3).training_data()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -55,10 +55,22 @@ class Test__repr__(IrisTest):
         """Test that the __repr__ returns the expected string."""
         result = str(GeneratePercentilesFromACircularNeighbourhood())
         msg = ('<GeneratePercentilesFromACircularNeighbourhood: '
-               'percentiles: {}>'.format(DEFAULT_PERCENTILES))
+               'percentiles: {}, engine: roll>'.format(DEFAULT_PERCENTILES))
         self.assertEqual(str(result), msg)
 
 
+class Test__init__(IrisTest):
+
+    """Test the init method."""
+
+    def test_invalid_engine(self):
+        """Test that a ValueError is raised if an invalid engine is
+        requested."""
+        msg = "Invalid engine: nonsense"
+        with self.assertRaisesRegexp(ValueError, msg):
+            GeneratePercentilesFromACircularNeighbourhood(engine="nonsense")
+
+
 class Test_make_percentile_cube(IrisTest):
 
     """Test the make_percentile_cube method from
@@ -280,6 +292,76 @@ class Test_pad_and_unpad_cube(IrisTest):
         self.assertArrayAlmostEqual(result.data, expected)
 
 
+class Test_tiled_percentiles(IrisTest):
+
+    """Test the tiled calculation of neighbourhood percentiles."""
+
+    def setUp(self):
+        """Set up a cube."""
+        self.cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 0, 4, 0), (0, 0, 1, 3)),
+            num_grid_points=7)
+        self.cube.data[0, 0, 5, 5] = 0.5
+        self.plugin = GeneratePercentilesFromACircularNeighbourhood(
+            engine="tiled")
+        self.plugin.percentiles = np.array([10, 33, 50, 90])
+
+    def test_matches_pad_and_unpad_cube(self):
+        """Test that the result matches pad_and_unpad_cube for a circular
+        kernel."""
+        kernel = np.array(
+            [[0., 0., 1., 0., 0.],
+             [0., 1., 1., 1., 0.],
+             [1., 1., 1., 1., 1.],
+             [0., 1., 1., 1., 0.],
+             [0., 0., 1., 0., 0.]])
+        cube = self.cube[0, 0, :, :]
+        expected = self.plugin.pad_and_unpad_cube(cube, kernel)
+        result = self.plugin.tiled_percentiles(cube, kernel)
+        self.assertIsInstance(result, Cube)
+        self.assertEqual(result.shape, (4, 7, 7))
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+    def test_irregular_kernel(self):
+        """Test that the result matches pad_and_unpad_cube for a kernel that
+        is not symmetric."""
+        kernel = np.array(
+            [[0., 1., 0.],
+             [1., 0., 1.],
+             [0., 0., 1.]])
+        cube = self.cube[0, 0, :, :]
+        expected = self.plugin.pad_and_unpad_cube(cube, kernel)
+        result = self.plugin.tiled_percentiles(cube, kernel)
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+    def test_single_row_tiles(self):
+        """Test that the result does not depend on the size of the tiles."""
+        kernel = np.array(
+            [[0., 1., 0.],
+             [1., 1., 1.],
+             [0., 1., 0.]])
+        cube = self.cube[0, 0, :, :]
+        expected = self.plugin.tiled_percentiles(cube, kernel)
+        result = self.plugin.tiled_percentiles(
+            cube, kernel, max_values_per_tile=1)
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+    def test_nan(self):
+        """Test that, as for pad_and_unpad_cube, all the percentiles are NaN
+        for points whose neighbourhood contains a NaN."""
+        kernel = np.array(
+            [[0., 1., 0.],
+             [1., 1., 1.],
+             [0., 1., 0.]])
+        cube = self.cube[0, 0, :, :]
+        cube.data[3, 3] = np.nan
+        expected = self.plugin.pad_and_unpad_cube(cube, kernel)
+        result = self.plugin.tiled_percentiles(cube, kernel)
+        self.assertTrue(np.isnan(result.data[:, 3, 3]).all())
+        self.assertArrayEqual(np.isnan(result.data), np.isnan(expected.data))
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+
 class Test_run(IrisTest):
 
     """Test the run method within the plugin to calculate percentile values
@@ -369,6 +451,23 @@ class Test_run(IrisTest):
                     cube, radius))
         self.assertArrayAlmostEqual(result.data, expected)
 
+    def test_multi_point_multitimes_tiled(self):
+        """Test that the tiled engine gives the same result as the roll
+        engine for points over multiple times."""
+        cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 1, 2, 1)), num_time_points=2,
+            num_grid_points=5)
+        percentiles = np.array([10, 50, 90])
+        radius = 2000.
+        expected = (
+            GeneratePercentilesFromACircularNeighbourhood(
+                percentiles=percentiles).run(cube.copy(), radius))
+        result = (
+            GeneratePercentilesFromACircularNeighbourhood(
+                percentiles=percentiles, engine="tiled").run(cube, radius))
+        self.assertEqual(result.shape, expected.shape)
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
     def test_single_point_lat_long(self):
         """Test behaviour for a single grid cell on lat long grid."""
         cube = set_up_cube_lat_long()
@@ -396,6 +396,27 @@ class Test__find_radii(IrisTest):
         self.assertArrayAlmostEqual(result, expected_result)
 
 
+class Test__group_times_by_cell_width(IrisTest):
+
+    """Test the grouping of times by neighbourhood width in grid cells."""
+
+    def test_basic(self):
+        """Test that times giving the same number of grid cells are grouped
+        together, keeping the radius of the first time in each group."""
+        cube = set_up_cube(num_time_points=4)
+        radii = np.array([4000., 5000., 9000., 4500.])
+        result = NBHood._group_times_by_cell_width(cube, radii)
+        self.assertEqual(result, [(4000., [0, 1, 3]), (9000., [2])])
+
+    def test_invalid_radius(self):
+        """Test that a radius which cannot be converted into a number of grid
+        cells is kept in a group of its own."""
+        cube = set_up_cube(num_time_points=3)
+        radii = np.array([4000., 1000., 5000.])
+        result = NBHood._group_times_by_cell_width(cube, radii)
+        self.assertEqual(result, [(4000., [0, 2]), (1000., [1])])
+
+
 class Test_process(IrisTest):
 
     """Tests for the process method of NeighbourhoodProcessing."""
@@ -480,6 +501,24 @@ class Test_process(IrisTest):
             [0.91666667, 0.875, 0.91666667])
         self.assertArrayAlmostEqual(result.data, expected)
 
+    def test_multiple_realizations_and_times_square(self):
+        """Test that a square neighbourhood applied to all realizations and
+        times at once matches applying it to each slice separately."""
+        cube = set_up_cube(
+            zero_point_indices=((0, 0, 7, 7), (1, 1, 3, 4), (2, 0, 9, 2)),
+            num_time_points=2, num_realization_points=3)
+        radii = 4000
+        result = NBHood(SquareNeighbourhood(), radii).process(cube)
+        self.assertIsInstance(result, Cube)
+        self.assertEqual(result.shape, cube.shape)
+        self.assertEqual(result.coord_dims("realization"), (0,))
+        # Radius adjusted for the number of realizations.
+        radius = NBHood(SquareNeighbourhood(), radii).adjust_nsize_for_ens(
+            3, radii)
+        for index in np.ndindex(3, 2):
+            expected = SquareNeighbourhood().run(cube[index], radius)
+            self.assertArrayAlmostEqual(result.data[index], expected.data)
+
     def test_no_realizations(self):
         """Test when the array has no realization coord."""
         cube = set_up_cube_with_no_realizations()
@@ -531,6 +570,36 @@ class Test_process(IrisTest):
         self.assertIsInstance(result, Cube)
         self.assertEqual(cube.coord("forecast_period").units, "hours")
 
+    def test_radii_varying_with_lead_time_grouped(self):
+        """
+        Test that processing times with the same neighbourhood width in grid
+        cells together gives the same result as processing each time
+        separately.
+        """
+        cube = set_up_cube(
+            zero_point_indices=((0, 0, 7, 7), (0, 1, 3, 4), (0, 2, 9, 2),
+                                (0, 3, 12, 12)),
+            num_time_points=4)
+        iris.util.promote_aux_coord_to_dim_coord(cube, "time")
+        time_points = cube.coord("time").points
+        fp_points = [2, 3, 4, 5]
+        cube = add_forecast_reference_time_and_forecast_period(
+            cube, time_point=time_points, fp_point=fp_points)
+        radii = [4000, 5000, 9000, 4500]
+        lead_times = [2, 3, 4, 5]
+        plugin = NBHood(SquareNeighbourhood(), radii, lead_times)
+        result = plugin.process(cube)
+        self.assertEqual(result.shape, cube.shape)
+        self.assertArrayEqual(
+            result.coord("time").points, cube.coord("time").points)
+        self.assertArrayEqual(
+            result.coord("forecast_period").points,
+            cube.coord("forecast_period").points)
+        for index, radius in enumerate(radii):
+            expected = SquareNeighbourhood().run(cube[0, index], radius)
+            self.assertEqual(result.metadata, expected.metadata)
+            self.assertArrayAlmostEqual(result.data[0, index], expected.data)
+
     def test_radii_varying_with_lead_time_fp_seconds(self):
         """
         Test that a cube fp coord is unchanged by the lead time calculation.
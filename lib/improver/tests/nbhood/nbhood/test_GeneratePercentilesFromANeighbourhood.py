@@ -55,9 +55,21 @@ class Test__init__(IrisTest):
         radii = 10000
         result = NBHood(neighbourhood_method, radii)
         msg = ('<GeneratePercentilesFromACircularNeighbourhood: percentiles: '
-               '(0, 5, 10, 20, 25, 30, 40, 50, 60, 70, 75, 80, 90, 95, 100)>')
+               '(0, 5, 10, 20, 25, 30, 40, 50, 60, 70, 75, 80, 90, 95, 100), '
+               'engine: roll>')
         self.assertEqual(str(result.neighbourhood_method), msg)
 
+    def test_percentile_engine(self):
+        """
+        Test that the requested percentile engine is passed to the
+        neighbourhood method.
+        """
+        neighbourhood_method = 'circular'
+        radii = 10000
+        result = NBHood(neighbourhood_method, radii,
+                        percentile_engine="tiled")
+        self.assertEqual(result.neighbourhood_method.engine, "tiled")
+
     def test_neighbourhood_method_does_not_exist(self):
         """
         Test that desired error message is raised, if the neighbourhood method
@@ -79,8 +91,9 @@ class Test__repr__(IrisTest):
         result = str(NBHood("circular", 10000))
         msg = ('<BaseNeighbourhoodProcessing: neighbourhood_method: '
                '<GeneratePercentilesFromACircularNeighbourhood: percentiles: '
-               '(0, 5, 10, 20, 25, 30, 40, 50, 60, 70, 75, 80, 90, 95, 100)>; '
-               'radii: 10000.0; lead_times: None; ens_factor: 1.0>')
+               '(0, 5, 10, 20, 25, 30, 40, 50, 60, 70, 75, 80, 90, 95, 100), '
+               'engine: roll>; radii: 10000.0; lead_times: None; '
+               'ens_factor: 1.0>')
         self.assertEqual(result, msg)
 
 
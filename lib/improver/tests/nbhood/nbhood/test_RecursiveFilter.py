@@ -26,7 +26,7 @@
 """Unit tests for the nbhood.RecursiveFilter plugin."""
 
 import unittest
-from iris.cube import Cube
+from iris.cube import Cube, CubeList
 from iris.tests import IrisTest
 from iris.coords import DimCoord
 from cf_units import Unit
@@ -45,10 +45,14 @@ class Test__repr__(IrisTest):
         alpha_y = None
         iterations = None
         edge_width = 1
-        result = str(RecursiveFilter(alpha_x, alpha_y, iterations, edge_width))
+        engine = "python"
+        batch_size = None
+        result = str(RecursiveFilter(alpha_x, alpha_y, iterations, edge_width,
+                                     engine=engine, batch_size=batch_size))
         msg = ('<RecursiveFilter: alpha_x: {}, alpha_y: {}, iterations: {},'
-               ' edge_width: {}'.format(alpha_x, alpha_y,
-                                        iterations, edge_width))
+               ' edge_width: {}, engine: {}, batch_size: {}'.format(
+                   alpha_x, alpha_y, iterations, edge_width, engine,
+                   batch_size))
         self.assertEqual(result, msg)
 
 
@@ -151,6 +155,18 @@ class Test__init__(Test_RecursiveFilter):
             RecursiveFilter(alpha_x=None, alpha_y=None,
                             iterations=iterations, edge_width=1)
 
+    def test_invalid_engine(self):
+        """Test when an unknown engine is given (invalid)."""
+        msg = "Invalid engine: fortran"
+        with self.assertRaisesRegexp(ValueError, msg):
+            RecursiveFilter(engine="fortran")
+
+    def test_batch_size(self):
+        """Test when a batch_size less than unity is given (invalid)."""
+        msg = "Invalid batch_size: must be >= 1: 0"
+        with self.assertRaisesRegexp(ValueError, msg):
+            RecursiveFilter(engine="vectorised", batch_size=0)
+
 
 class Test_set_alphas(Test_RecursiveFilter):
 
@@ -260,6 +276,73 @@ class Test_recurse_backwards_y(Test_RecursiveFilter):
         self.assertAlmostEqual(result[0][0], expected_result)
 
 
+class Test_recurse_stack(Test_RecursiveFilter):
+
+    """Test the recurse_stack method"""
+
+    def test_forward_x(self):
+        """Test that recurse_stack along axis 1 in the forward direction
+           matches recurse_forward_x applied to each slice."""
+        data = np.stack([self.cube.data[0], 2.*self.cube.data[0]])
+        expected = np.stack([
+            RecursiveFilter.recurse_forward_x(
+                grid.copy(), self.alphas_cube1.data) for grid in data])
+        result = RecursiveFilter.recurse_stack(
+            data, self.alphas_cube1.data, 1)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_backwards_y(self):
+        """Test that recurse_stack along axis 2 in the backwards direction
+           matches recurse_backwards_y applied to each slice."""
+        data = np.stack([self.cube.data[0], 2.*self.cube.data[0]])
+        expected = np.stack([
+            RecursiveFilter.recurse_backwards_y(
+                grid.copy(), self.alphas_cube1.data) for grid in data])
+        result = RecursiveFilter.recurse_stack(
+            data, self.alphas_cube1.data, 2, forward=False)
+        self.assertArrayAlmostEqual(result, expected)
+
+
+class Test_run_stacked_recursion(Test_RecursiveFilter):
+
+    """Test the run_stacked_recursion method"""
+
+    def setUp(self):
+        """Set up a stack of 2D slices and non-uniform alphas."""
+        super(Test_run_stacked_recursion, self).setUp()
+        self.data = np.stack([self.cube.data[0], 2.*self.cube.data[0]])
+        self.alphas_x = np.linspace(0.1, 0.9, 25).reshape(5, 5)
+        self.alphas_y = self.alphas_x.T.copy()
+
+    def test_vectorised_matches_python(self):
+        """Test that the vectorised engine gives the same result as the
+           reference python engine."""
+        expected = RecursiveFilter.run_stacked_recursion(
+            self.data.copy(), self.alphas_x, self.alphas_y, 2,
+            engine="python")
+        result = RecursiveFilter.run_stacked_recursion(
+            self.data.copy(), self.alphas_x, self.alphas_y, 2,
+            engine="vectorised")
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_compiled_matches_python(self):
+        """Test that the compiled engine gives the same result as the
+           reference python engine."""
+        import imp
+        try:
+            imp.find_module('numba')
+        except ImportError:
+            self.skipTest("numba is not available")
+        expected = RecursiveFilter.run_stacked_recursion(
+            self.data.copy(), self.alphas_x, self.alphas_y, 2,
+            engine="python")
+        result = RecursiveFilter.run_stacked_recursion(
+            self.data.copy(), self.alphas_x, self.alphas_y, 2,
+            engine="compiled")
+        self.assertArrayAlmostEqual(result, expected)
+
+
 class Test_run_recursion(Test_RecursiveFilter):
 
     """Test the run_recursion method"""
@@ -287,6 +370,93 @@ class Test_run_recursion(Test_RecursiveFilter):
         expected_result = 0.13382206
         self.assertAlmostEqual(result.data[4][4], expected_result)
 
+    def test_vectorised_engine(self):
+        """Test that the run_recursion method returns the expected value
+           when using the vectorised engine."""
+        edge_width = 1
+        alphas_x = RecursiveFilter().set_alphas(self.cube, self.alpha_x, None)
+        alphas_y = RecursiveFilter().set_alphas(self.cube, self.alpha_y, None)
+        padded_cube = SquareNeighbourhood().pad_cube_with_halo(
+            self.cube, edge_width, edge_width)
+        result = RecursiveFilter().run_recursion(
+            padded_cube, alphas_x, alphas_y, self.iterations,
+            engine="vectorised")
+        expected_result = 0.13382206
+        self.assertIsInstance(result, Cube)
+        self.assertAlmostEqual(result.data[4][4], expected_result)
+
+
+class Test_run_batched_recursion(Test_RecursiveFilter):
+
+    """Test the run_batched_recursion method"""
+
+    def setUp(self):
+        """Set up a cube with multiple times and the padded alphas."""
+        super(Test_run_batched_recursion, self).setUp()
+        cube = self.cube.copy()
+        cube.coord("time").points = cube.coord("time").points + 1
+        cube.data = 2. * cube.data
+        cube.data[0][3][1] = 0.5
+        self.multi_cube = CubeList([self.cube, cube]).concatenate_cube()
+        self.alphas_x = RecursiveFilter().set_alphas(
+            self.cube[0], self.alpha_x, None)
+        self.alphas_y = RecursiveFilter().set_alphas(
+            self.cube[0], self.alpha_y, None)
+        self.mask = np.ones((5, 5))
+
+    def test_basic(self):
+        """Test that the batched recursion returns a cube with the same
+        data as filtering each slice with the reference engine."""
+        expected = RecursiveFilter(
+            alpha_x=self.alpha_x, alpha_y=self.alpha_y,
+            iterations=self.iterations).process(self.multi_cube.copy())
+        plugin = RecursiveFilter(iterations=self.iterations,
+                                 engine="vectorised")
+        result = plugin.run_batched_recursion(
+            self.multi_cube, self.alphas_x, self.alphas_y, self.mask)
+        self.assertIsInstance(result, Cube)
+        self.assertEqual(result.shape, (2, 5, 5))
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+    def test_batch_size(self):
+        """Test that the result does not depend on the batch size."""
+        plugin = RecursiveFilter(iterations=self.iterations,
+                                 engine="vectorised")
+        expected = plugin.run_batched_recursion(
+            self.multi_cube, self.alphas_x, self.alphas_y, self.mask)
+        plugin = RecursiveFilter(iterations=self.iterations,
+                                 engine="vectorised", batch_size=1)
+        result = plugin.run_batched_recursion(
+            self.multi_cube, self.alphas_x, self.alphas_y, self.mask)
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
+    def test_transposed_cube(self):
+        """Test that a cube with y and x as the leading dimensions gives
+        the same result as the untransposed cube."""
+        plugin = RecursiveFilter(iterations=self.iterations,
+                                 engine="vectorised")
+        expected = plugin.run_batched_recursion(
+            self.multi_cube, self.alphas_x, self.alphas_y, self.mask)
+        self.multi_cube.transpose([1, 2, 0])
+        result = plugin.run_batched_recursion(
+            self.multi_cube, self.alphas_x, self.alphas_y, self.mask)
+        self.assertEqual(result.shape, (5, 5, 2))
+        self.assertArrayAlmostEqual(result.data,
+                                    expected.data.transpose([1, 2, 0]))
+
+    def test_re_mask(self):
+        """Test that the mask is reapplied to every slice when re_mask is
+        True."""
+        self.mask[0][3] = 0
+        plugin = RecursiveFilter(iterations=self.iterations,
+                                 engine="vectorised", re_mask=True)
+        result = plugin.run_batched_recursion(
+            self.multi_cube, self.alphas_x, self.alphas_y, self.mask)
+        self.assertIsInstance(result.data, np.ma.MaskedArray)
+        self.assertTrue(result.data.mask[0][0][3])
+        self.assertTrue(result.data.mask[1][0][3])
+        self.assertFalse(result.data.mask[1][2][2])
+
 
 class Test_process(Test_RecursiveFilter):
 
@@ -356,6 +526,16 @@ class Test_process(Test_RecursiveFilter):
         expected = 0.11979733
         self.assertAlmostEqual(result.data[0][2][2], expected)
 
+    def test_vectorised_engine(self):
+        """Test that the RecursiveFilter plugin returns the correct data
+        when using the vectorised engine."""
+        plugin = RecursiveFilter(alpha_x=self.alpha_x, alpha_y=self.alpha_y,
+                                 iterations=self.iterations,
+                                 engine="vectorised")
+        result = plugin.process(self.cube, alphas_x=None, alphas_y=None)
+        expected = 0.13382206
+        self.assertAlmostEqual(result.data[0][2][2], expected)
+
     def test_dimensions_of_output_array_is_as_expected(self):
         """Test that the RecursiveFilter plugin returns a data array with
            the correct dimensions"""
@@ -506,6 +506,39 @@ class Test_pad_cube_with_halo(IrisTest):
         self.assertArrayAlmostEqual(padded_cube.data, expected)
 
 
+class Test_pad_array_with_halo(IrisTest):
+
+    """Test for padding a numpy array with a halo."""
+
+    def setUp(self):
+        """Set up a cube."""
+        self.cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 1, 1, 3)),
+            num_time_points=2, num_grid_points=5)
+
+    def test_matches_pad_cube_with_halo(self):
+        """Test that padding a multi-dimensional array matches padding each
+        2D slice of the cube with pad_cube_with_halo."""
+        width_x = 1
+        width_y = 2
+        expected = SquareNeighbourhood().pad_cube_with_halo(
+            self.cube, width_x, width_y).data
+        result = SquareNeighbourhood.pad_array_with_halo(
+            self.cube.data, width_x, width_y)
+        self.assertEqual(result.shape, (1, 2, 13, 9))
+        self.assertArrayAlmostEqual(result[0], expected)
+
+    def test_zero_width(self):
+        """Test that padding an array with a width of zero in x has
+        worked as intended."""
+        width_x = 0
+        width_y = 2
+        result = SquareNeighbourhood.pad_array_with_halo(
+            self.cube.data, width_x, width_y)
+        self.assertEqual(result.shape, (1, 2, 13, 5))
+        self.assertArrayAlmostEqual(result[0, 0, 6], [1., 1., 0., 1., 1.])
+
+
 class Test_remove_halo_from_cube(IrisTest):
 
     """Test a halo is removed from the cube data."""
@@ -688,6 +721,91 @@ class Test_mean_over_neighbourhood(IrisTest):
         self.assertArrayAlmostEqual(result.data[2:-2, 2:-2], expected_data)
 
 
+class Test_neighbourhood_array(IrisTest):
+
+    """Test applying the square neighbourhood to a numpy array."""
+
+    def setUp(self):
+        """Set up a cube with multiple realizations and times."""
+        self.cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 1, 1, 2), (1, 0, 3, 3)),
+            num_time_points=2, num_grid_points=5, num_realization_points=2)
+        self.expected = np.array(
+            [[1., 1., 1., 1., 1.],
+             [1., 0.88888889, 0.88888889, 0.88888889, 1.],
+             [1., 0.88888889, 0.88888889, 0.88888889, 1.],
+             [1., 0.88888889, 0.88888889, 0.88888889, 1.],
+             [1., 1., 1., 1., 1.]])
+
+    def test_basic(self):
+        """Test the neighbourhood fraction for a 2D array."""
+        result = SquareNeighbourhood().neighbourhood_array(
+            self.cube.data[0, 0], 1, 1)
+        self.assertEqual(result.shape, (5, 5))
+        self.assertArrayAlmostEqual(result, self.expected)
+
+    def test_sum(self):
+        """Test the neighbourhood sum for a 2D array."""
+        plugin = SquareNeighbourhood(sum_or_fraction="sum")
+        result = plugin.neighbourhood_array(self.cube.data[0, 0], 1, 1)
+        self.assertArrayAlmostEqual(result, self.expected * 9.)
+
+    def test_multiple_slices(self):
+        """Test that processing all leading dimensions at once matches
+        processing each 2D slice separately."""
+        plugin = SquareNeighbourhood()
+        result = plugin.neighbourhood_array(self.cube.data, 1, 2)
+        self.assertEqual(result.shape, (2, 2, 5, 5))
+        for index in np.ndindex(2, 2):
+            expected = plugin.neighbourhood_array(self.cube.data[index], 1, 2)
+            self.assertArrayAlmostEqual(result[index], expected)
+
+    def test_nan(self):
+        """Test that NaNs are only returned where the input was NaN."""
+        data = self.cube.data.copy()
+        data[0, 1, 0, 0] = np.nan
+        result = SquareNeighbourhood().neighbourhood_array(data, 1, 1)
+        self.assertTrue(np.isnan(result[0, 1, 0, 0]))
+        self.assertEqual(np.isnan(result).sum(), 1)
+        self.assertArrayAlmostEqual(result[0, 0], self.expected)
+
+
+class Test__calculate_neighbourhood_stacked(IrisTest):
+
+    """Test the neighbourhood processing of whole cubes at once."""
+
+    def setUp(self):
+        """Set up a cube with the x and y dimensions not last."""
+        self.cube = set_up_cube(
+            zero_point_indices=((0, 0, 2, 2), (0, 1, 1, 2)),
+            num_time_points=2, num_grid_points=5)
+        self.cube.transpose([2, 0, 3, 1])
+
+    def test_matches_slice_by_slice(self):
+        """Test that the result matches padding, cumulating and
+        neighbourhooding each 2D slice as a cube, and that the metadata of
+        the input cube is retained."""
+        plugin = SquareNeighbourhood()
+        nbcubes = plugin._calculate_neighbourhood_stacked(
+            CubeList([self.cube]), 1, 1)
+        self.assertIsInstance(nbcubes, CubeList)
+        self.assertEqual(len(nbcubes), 1)
+        result, = nbcubes
+        self.assertEqual(result.coords(), self.cube.coords())
+        self.assertEqual(result.metadata, self.cube.metadata)
+        expected = plugin._remove_padding_and_mask(
+            plugin._pad_and_calculate_neighbourhood(
+                CubeList([self.cube.copy()]), 1, 1),
+            CubeList([self.cube]), self.cube.name(), 1, 1)
+        yname = "projection_y_coordinate"
+        xname = "projection_x_coordinate"
+        for result_slice, expected_slice in zip(
+                result.slices([yname, xname]),
+                expected.slices([yname, xname])):
+            self.assertArrayAlmostEqual(
+                result_slice.data, expected_slice.data)
+
+
 class Test__set_up_cubes_to_be_neighbourhooded(IrisTest):
 
     """Test the set up of cubes prior to neighbourhooding."""
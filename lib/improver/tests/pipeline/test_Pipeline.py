@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the pipeline.Pipeline plugin."""
+
+import json
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+
+import iris
+from iris.cube import Cube
+from iris.tests import IrisTest
+
+from improver.nbhood.nbhood import NeighbourhoodProcessing
+from improver.pipeline import Pipeline
+from improver.tests.nbhood.nbhood.test_NeighbourhoodProcessing import (
+    set_up_cube)
+from improver.threshold import BasicThreshold
+
+
+class Test__init__(IrisTest):
+
+    """Test the checks on the recipe when setting up the pipeline."""
+
+    def setUp(self):
+        """Set up a valid recipe."""
+        self.recipe = {
+            "inputs": {"precip": "input.nc"},
+            "steps": [
+                {"name": "probabilities", "plugin": "threshold",
+                 "args": {"thresholds": 0.5}, "inputs": ["precip"]},
+                {"name": "smoothed", "plugin": "nbhood",
+                 "args": {"neighbourhood_method": "square", "radii": 4000},
+                 "inputs": ["probabilities"], "output": "output.nc"}]}
+
+    def test_basic(self):
+        """Test that the plugin classes and last uses are found."""
+        plugin = Pipeline(self.recipe)
+        self.assertEqual(
+            plugin.plugin_classes, [BasicThreshold, NeighbourhoodProcessing])
+        self.assertEqual(plugin.last_use, {"precip": 0, "probabilities": 1})
+
+    def test_no_steps(self):
+        """Test that an error is raised if the recipe contains no steps."""
+        self.recipe["steps"] = []
+        msg = "The recipe contains no steps"
+        with self.assertRaisesRegexp(ValueError, msg):
+            Pipeline(self.recipe)
+
+    def test_repeated_name(self):
+        """Test that an error is raised if a step reuses the name of an
+        input."""
+        self.recipe["steps"][1]["name"] = "precip"
+        msg = "The step name precip has already been used"
+        with self.assertRaisesRegexp(ValueError, msg):
+            Pipeline(self.recipe)
+
+    def test_unknown_input(self):
+        """Test that an error is raised if a step uses a cube that is not
+        available before that step."""
+        self.recipe["steps"][0]["inputs"] = ["smoothed"]
+        msg = "Step probabilities uses \\['smoothed'\\]"
+        with self.assertRaisesRegexp(ValueError, msg):
+            Pipeline(self.recipe)
+
+    def test_unknown_keyword_input(self):
+        """Test that an error is raised if a keyword input is not
+        available."""
+        self.recipe["steps"][1]["keyword_inputs"] = {"mask_cube": "mask"}
+        msg = "Step smoothed uses \\['mask'\\]"
+        with self.assertRaisesRegexp(ValueError, msg):
+            Pipeline(self.recipe)
+
+
+class Test__repr__(IrisTest):
+
+    """Test the repr method."""
+
+    def test_basic(self):
+        """Test that the __repr__ returns the expected string."""
+        recipe = {
+            "inputs": {"precip": "input.nc"},
+            "steps": [{"name": "probabilities", "plugin": "threshold",
+                       "args": {"thresholds": 0.5}, "inputs": ["precip"]}]}
+        result = str(Pipeline(recipe))
+        msg = "<Pipeline: inputs: ['precip']; steps: ['probabilities']>"
+        self.assertEqual(result, msg)
+
+
+class Test_process(IrisTest):
+
+    """Test running the steps of the pipeline."""
+
+    def setUp(self):
+        """Set up a cube, a recipe and a temporary directory."""
+        self.cube = set_up_cube(
+            zero_point_indices=((0, 0, 7, 7), (0, 0, 3, 9)))
+        self.directory = mkdtemp()
+        self.threshold_path = os.path.join(self.directory, "threshold.nc")
+        self.output_path = os.path.join(self.directory, "output.nc")
+        self.recipe = {
+            "inputs": {"precip": "input.nc"},
+            "steps": [
+                {"name": "probabilities", "plugin": "threshold",
+                 "args": {"thresholds": 0.5}, "inputs": ["precip"]},
+                {"name": "smoothed", "plugin": "nbhood",
+                 "args": {"neighbourhood_method": "square", "radii": 4000},
+                 "inputs": ["probabilities"], "output": self.output_path}]}
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def test_basic(self):
+        """Test that the result matches running the plugins in turn, and
+        that only the marked output is saved and returned."""
+        expected = NeighbourhoodProcessing("square", 4000).process(
+            BasicThreshold(0.5).process(self.cube.copy()))
+        result = Pipeline(self.recipe).process({"precip": self.cube})
+        self.assertEqual(list(result.keys()), ["smoothed"])
+        self.assertIsInstance(result["smoothed"], Cube)
+        self.assertArrayAlmostEqual(result["smoothed"].data, expected.data)
+        self.assertTrue(os.path.exists(self.output_path))
+        self.assertFalse(os.path.exists(self.threshold_path))
+
+    def test_multiple_outputs(self):
+        """Test that intermediate results marked as outputs are saved and
+        returned."""
+        self.recipe["steps"][0]["output"] = self.threshold_path
+        result = Pipeline(self.recipe).process({"precip": self.cube})
+        self.assertEqual(list(result.keys()), ["probabilities", "smoothed"])
+        self.assertTrue(os.path.exists(self.threshold_path))
+        self.assertTrue(os.path.exists(self.output_path))
+
+    def test_from_file(self):
+        """Test that a recipe can be read from a JSON file and its inputs
+        loaded from file."""
+        input_path = os.path.join(self.directory, "input.nc")
+        iris.save(self.cube, input_path)
+        self.recipe["inputs"]["precip"] = input_path
+        recipe_path = os.path.join(self.directory, "recipe.json")
+        with open(recipe_path, "w") as recipe_file:
+            json.dump(self.recipe, recipe_file)
+        result = Pipeline.from_file(recipe_path).process()
+        self.assertIn("smoothed", result)
+        self.assertTrue(os.path.exists(self.output_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the pipeline.get_plugin_class function."""
+
+import unittest
+
+from iris.tests import IrisTest
+
+from improver.nbhood.nbhood import NeighbourhoodProcessing
+from improver.pipeline import get_plugin_class
+from improver.threshold import BasicThreshold
+
+
+class Test_get_plugin_class(IrisTest):
+
+    """Test finding the plugin class for a step within a recipe."""
+
+    def test_named_plugin(self):
+        """Test that a plugin can be found by its name."""
+        self.assertIs(get_plugin_class("threshold"), BasicThreshold)
+
+    def test_dotted_path(self):
+        """Test that a plugin can be found by its full dotted path."""
+        result = get_plugin_class(
+            "improver.nbhood.nbhood.NeighbourhoodProcessing")
+        self.assertIs(result, NeighbourhoodProcessing)
+
+    def test_unknown_plugin(self):
+        """Test that an error is raised for an unknown plugin name."""
+        msg = "Unknown plugin: nonsense"
+        with self.assertRaisesRegexp(ValueError, msg):
+            get_plugin_class("nonsense")
+
+    def test_non_improver_path(self):
+        """Test that an error is raised for a class outside improver."""
+        msg = "Unknown plugin: os.path.join"
+        with self.assertRaisesRegexp(ValueError, msg):
+            get_plugin_class("os.path.join")
+
+    def test_unknown_class(self):
+        """Test that an error is raised for an unknown class within an
+        improver module."""
+        msg = "Unknown plugin: improver.threshold.Nonsense"
+        with self.assertRaisesRegexp(ValueError, msg):
+            get_plugin_class("improver.threshold.Nonsense")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -89,6 +89,18 @@ class Test_find_falling_level(IrisTest):
             wb_int_data, self.orog_data, self.height_points)
         self.assertTrue(np.isnan(result[1, 1]))
 
+    def test_multiple_fields(self):
+        """Test method finds the falling level for every column of data with
+        dimensions between height and the y and x dimensions."""
+        plugin = FallingSnowLevel()
+        wb_int_data = np.stack([self.wb_int_data, self.wb_int_data + 5.0],
+                               axis=1)
+        expected = np.array([[[10.0, 7.5], [25.0, 20.5]],
+                             [[7.5, 6.25], [20.0, 19.25]]])
+        result = plugin.find_falling_level(
+            wb_int_data, self.orog_data, self.height_points)
+        self.assertArrayEqual(result, expected)
+
 
 class Test_fill_in_missing_data(IrisTest):
 
@@ -118,6 +130,20 @@ class Test_fill_in_missing_data(IrisTest):
         self.assertIsInstance(result, np.ndarray)
         self.assertArrayEqual(result, expected)
 
+    def test_separate_regions(self):
+        """Test that separate regions of missing data are each interpolated
+        from the points around them."""
+        plugin = FallingSnowLevel()
+        snow_level_data = np.tile(np.arange(6.0), (6, 1))
+        snow_level_data[1, 1] = np.nan
+        snow_level_data[3:5, 3:5] = np.nan
+        expected = np.tile(np.arange(6.0), (6, 1))
+        result = plugin.fill_in_missing_data(snow_level_data,
+                                             np.ones((6, 6)),
+                                             np.ones((6, 6)),
+                                             self.highest_height)
+        self.assertArrayAlmostEqual(result, expected)
+
     def test_freezing_sealevel_point(self):
         """Test sea point with integral below threshold sets snow level to 0"""
         plugin = FallingSnowLevel()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for psychrometric_calculations SaturatedVapourPressureLookup"""
+
+import unittest
+from iris.cube import Cube
+from iris.tests import IrisTest
+import numpy as np
+
+from improver.psychrometric_calculations.psychrometric_calculations import (
+    SaturatedVapourPressureLookup, Utilities)
+from improver.psychrometric_calculations import svp_table
+
+
+class Test__repr__(IrisTest):
+
+    """Test the repr method."""
+
+    def test_basic(self):
+        """Test that the __repr__ returns the expected string."""
+        result = str(SaturatedVapourPressureLookup())
+        msg = ('<SaturatedVapourPressureLookup: t_min: 183.15; '
+               't_max: 338.15; t_increment: None>')
+        self.assertEqual(result, msg)
+
+    def test_increment(self):
+        """Test that the __repr__ returns the expected string when a table
+        is generated."""
+        result = str(SaturatedVapourPressureLookup(
+            t_increment=0.5, t_min=250., t_max=300.))
+        msg = ('<SaturatedVapourPressureLookup: t_min: 250.0; '
+               't_max: 300.0; t_increment: 0.5>')
+        self.assertEqual(result, msg)
+
+
+class Test__coefficients(IrisTest):
+
+    """Test the precomputed slopes and offsets of the table intervals."""
+
+    def test_svp_table(self):
+        """Test that there is one slope and offset for each interval of the
+        svp_table, and that they reproduce the table values at either end of
+        each interval."""
+        plugin = SaturatedVapourPressureLookup()
+        temperatures = svp_table.T_MIN + svp_table.T_INCREMENT * np.arange(
+            svp_table.DATA.size)
+        self.assertEqual(plugin.slopes.shape, (svp_table.DATA.size - 1,))
+        self.assertArrayAllClose(
+            plugin.offsets + plugin.slopes * temperatures[:-1],
+            svp_table.DATA[:-1], rtol=1.E-10)
+        self.assertArrayAllClose(
+            plugin.offsets + plugin.slopes * temperatures[1:],
+            svp_table.DATA[1:], rtol=1.E-10)
+
+    def test_memoised(self):
+        """Test that tables with the same range and increment are only
+        generated once, and that other tables are generated separately."""
+        first = SaturatedVapourPressureLookup(
+            t_increment=0.5, t_min=250., t_max=300.)
+        second = SaturatedVapourPressureLookup(
+            t_increment=0.5, t_min=250., t_max=300.)
+        other = SaturatedVapourPressureLookup(
+            t_increment=0.25, t_min=250., t_max=300.)
+        self.assertIs(first.slopes, second.slopes)
+        self.assertIs(first.offsets, second.offsets)
+        self.assertEqual(other.slopes.shape, (200,))
+
+
+class Test_svp(IrisTest):
+
+    """Test the lookup of saturated vapour pressures."""
+
+    def test_table_values(self):
+        """Test that the svp_table values are returned at the temperatures of
+        the table."""
+        temperatures = np.array([183.15, 273.15, 338.15])
+        expected = svp_table.DATA[[0, 900, -1]]
+        result = SaturatedVapourPressureLookup().svp(temperatures)
+        self.assertArrayAllClose(result, expected, rtol=1.E-10)
+
+    def test_interpolation(self):
+        """Test that values between the temperatures of the table are
+        linearly interpolated."""
+        temperatures = np.array([183.175, 273.2])
+        expected = [0.75 * svp_table.DATA[0] + 0.25 * svp_table.DATA[1],
+                    0.5 * svp_table.DATA[900] + 0.5 * svp_table.DATA[901]]
+        result = SaturatedVapourPressureLookup().svp(temperatures)
+        self.assertArrayAllClose(result, expected, rtol=1.E-10)
+
+    def test_beyond_table_bounds(self):
+        """Test that temperatures beyond the table are given the values at
+        the ends of the table."""
+        temperatures = np.array([150., 400.])
+        expected = svp_table.DATA[[0, -1]]
+        result = SaturatedVapourPressureLookup().svp(temperatures)
+        self.assertArrayAllClose(result, expected, rtol=1.E-10)
+
+    def test_shape(self):
+        """Test that the shape of the input array is preserved."""
+        temperatures = np.full((2, 3, 4), 260.)
+        result = SaturatedVapourPressureLookup().svp(temperatures)
+        self.assertEqual(result.shape, (2, 3, 4))
+
+    def test_generated_table(self):
+        """Test that a generated table gives the Goff-Gratch values at the
+        temperatures of the table."""
+        temperatures = np.array([250., 273., 299.5])
+        expected = Utilities.saturation_vapour_pressure_goff_gratch(
+            Cube(temperatures, 'air_temperature', units='K')).data
+        result = SaturatedVapourPressureLookup(
+            t_increment=0.5, t_min=250., t_max=300.).svp(temperatures)
+        self.assertArrayAllClose(result, expected, rtol=1.E-10)
+
+
+class Test_svp_gradient(IrisTest):
+
+    """Test the lookup of the gradient of saturated vapour pressure with
+    respect to temperature."""
+
+    def test_values(self):
+        """Test that the gradient is that of the table interval containing
+        each temperature."""
+        temperatures = np.array([183.175, 273.2])
+        expected = [(svp_table.DATA[1] - svp_table.DATA[0]) / 0.1,
+                    (svp_table.DATA[901] - svp_table.DATA[900]) / 0.1]
+        result = SaturatedVapourPressureLookup().svp_gradient(temperatures)
+        self.assertArrayAllClose(result, expected, rtol=1.E-6)
+
+    def test_beyond_table_bounds(self):
+        """Test that the gradient is zero beyond the table."""
+        temperatures = np.array([150., 260., 400.])
+        result = SaturatedVapourPressureLookup().svp_gradient(temperatures)
+        self.assertEqual(result[0], 0.)
+        self.assertGreater(result[1], 0.)
+        self.assertEqual(result[2], 0.)
+
+
+if __name__ == '__main__':
+    unittest.main()
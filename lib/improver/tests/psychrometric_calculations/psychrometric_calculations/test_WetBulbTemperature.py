@@ -37,6 +37,7 @@ from iris.cube import Cube
 from iris.tests import IrisTest
 from iris.coords import DimCoord
 from cf_units import Unit
+import numpy as np
 
 from improver.psychrometric_calculations.psychrometric_calculations import (
     WetBulbTemperature)
@@ -132,6 +133,13 @@ class Test__lookup_svp(Test_WetBulbTemperature):
         self.assertArrayAlmostEqual(result.data, expected)
         self.assertEqual(result.units, Unit('Pa'))
 
+    def test_float32_end_of_table(self):
+        """Test that a single precision temperature at the end of the table
+        gives the last value in the table."""
+        temperatures = np.array([338.15], dtype=np.float32)
+        result = WetBulbTemperature()._lookup_svp_array(temperatures)
+        self.assertArrayAlmostEqual(result, [2.501530e+04], decimal=2)
+
 
 class Test__pressure_correct_svp(Test_WetBulbTemperature):
 
@@ -207,6 +215,87 @@ class Test_calculate_wet_bulb_temperature(Test_WetBulbTemperature):
         self.assertEqual(result.units, Unit('K'))
 
 
+class Test_calculate_wet_bulb_temperature_array(Test_WetBulbTemperature):
+
+    """Test the calculation of wet bulb temperatures from arrays."""
+
+    def setUp(self):
+        """Set up arrays of temperature, relative humidity and pressure."""
+        super(Test_calculate_wet_bulb_temperature_array, self).setUp()
+        self.temperature = self.temperature.data
+        self.relative_humidity = self.relative_humidity.data / 100.
+        self.pressure = self.pressure.data
+
+    def test_values(self):
+        """Basic wet bulb temperature calculation."""
+        expected = [183.15, 259.883055, 333.960651]
+        result = WetBulbTemperature().calculate_wet_bulb_temperature_array(
+            self.temperature, self.relative_humidity, self.pressure)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_shape(self):
+        """Test that the shape of multi-dimensional arrays is kept."""
+        expected = np.array([[183.15, 259.883055, 333.960651]] * 2)
+        result = WetBulbTemperature().calculate_wet_bulb_temperature_array(
+            np.stack([self.temperature] * 2),
+            np.stack([self.relative_humidity] * 2),
+            np.stack([self.pressure] * 2))
+        self.assertEqual(result.shape, (2, 3))
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_broadcast(self):
+        """Test that arrays that can be broadcast against each other are
+        calculated with the broadcast shape."""
+        expected = np.array([[183.15, 259.883055, 333.960651]] * 2)
+        result = WetBulbTemperature().calculate_wet_bulb_temperature_array(
+            np.stack([self.temperature] * 2),
+            np.stack([self.relative_humidity] * 2),
+            self.pressure)
+        self.assertEqual(result.shape, (2, 3))
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_incompatible_shapes(self):
+        """Test that an exception is raised if the arrays cannot be
+        broadcast against each other."""
+        msg = 'WetBulbTemperature: Input arrays of shapes'
+        with self.assertRaisesRegexp(ValueError, msg):
+            WetBulbTemperature().calculate_wet_bulb_temperature_array(
+                self.temperature, self.relative_humidity, self.pressure[:2])
+
+    def test_float32(self):
+        """Test that single precision inputs are calculated and returned in
+        single precision, to within the precision of the iterator."""
+        precision = 0.005
+        expected = [183.15, 259.883055, 333.960651]
+        result = WetBulbTemperature(
+            precision=precision).calculate_wet_bulb_temperature_array(
+                self.temperature.astype(np.float32),
+                self.relative_humidity.astype(np.float32),
+                self.pressure.astype(np.float32))
+        self.assertEqual(result.dtype, np.float32)
+        self.assertTrue(np.allclose(result, expected, rtol=0.,
+                                    atol=precision))
+
+    def test_svp_increment(self):
+        """Test that a finer saturated vapour pressure table gives the same
+        wet bulb temperatures to within the precision of the iterator."""
+        precision = 0.005
+        expected = [183.15, 259.883055, 333.960651]
+        result = WetBulbTemperature(
+            precision=precision,
+            svp_increment=0.01).calculate_wet_bulb_temperature_array(
+                self.temperature, self.relative_humidity, self.pressure)
+        self.assertTrue(np.allclose(result, expected, rtol=0.,
+                                    atol=precision))
+
+    def test_inputs_unchanged(self):
+        """Test that the input arrays are not modified."""
+        temperature = self.temperature.copy()
+        WetBulbTemperature().calculate_wet_bulb_temperature_array(
+            self.temperature, self.relative_humidity, self.pressure)
+        self.assertArrayEqual(self.temperature, temperature)
+
+
 class Test_process(Test_WetBulbTemperature):
 
     """Test the calculation of wet bulb temperatures from temperature,
@@ -290,6 +379,35 @@ class Test_process(Test_WetBulbTemperature):
             WetBulbTemperature().process(
                 temperature, relative_humidity, pressure)
 
+    def test_broadcast_single_level_pressure(self):
+        """Check that a pressure cube without the height dimension is
+        broadcast across the height levels of the other cubes."""
+
+        temperature = self._make_multi_level(self.temperature)
+        relative_humidity = self._make_multi_level(self.relative_humidity)
+        expected = [183.15, 259.883055, 333.960651]
+
+        result = WetBulbTemperature().process(
+            temperature, relative_humidity, self.pressure)
+
+        self.assertArrayAlmostEqual(result.data[0], expected)
+        self.assertArrayAlmostEqual(result.data[1], expected)
+        self.assertArrayEqual(result.coord('height').points, [10, 20])
+
+    def test_different_dimension_order(self):
+        """Check an exception is raised if the dimensions of the cubes are
+        in a different order."""
+
+        temperature = self._make_multi_level(self.temperature)
+        relative_humidity = self._make_multi_level(self.relative_humidity)
+        pressure = self._make_multi_level(self.pressure)
+        pressure.transpose([1, 0])
+
+        msg = 'WetBulbTemperature: The dimensions of the air_pressure cube'
+        with self.assertRaisesRegexp(ValueError, msg):
+            WetBulbTemperature().process(
+                temperature, relative_humidity, pressure)
+
     def test_cube_multi_level(self):
         """Check the cube is returned with expected formatting after the data
         has been sliced and reconstructed."""
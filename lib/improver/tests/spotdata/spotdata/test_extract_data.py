@@ -382,7 +382,7 @@ class Test_make_cube(Test_setup):
     def test_make_spotdata_cube(self):
         """Test the make_cube function."""
         plugin = Plugin().make_cube
-        data = np.array([123])
+        data = np.array([[123]])
         result = plugin(self.cube, data, self.sites)
         self.assertIsInstance(result, Cube)
         self.assertEqual(result.data, data)
@@ -392,7 +392,7 @@ class Test_make_cube(Test_setup):
         """Ensure an error is raised if a source cube is missing a forecast
         reference time."""
         plugin = Plugin().make_cube
-        data = np.array([123])
+        data = np.array([[123]])
         self.cube.remove_coord('forecast_reference_time')
         msg = 'No forecast reference time found on source cube.'
         with self.assertRaisesRegexp(CoordinateNotFoundError, msg):
@@ -402,12 +402,38 @@ class Test_make_cube(Test_setup):
         """Test that the plugin returns cubes with expected metadata and
         coordinates."""
         plugin = Plugin().make_cube
-        data = np.array([123])
+        data = np.array([[123]])
         result = plugin(self.cube, data, self.sites)
         self.assertEqual(result.coord('forecast_reference_time'),
                          self.cube.coord('forecast_reference_time'))
         self.assertEqual(result.metadata, self.cube.metadata)
 
+    def test_scalar_time(self):
+        """Test that a leading time dimension is added to the data if time
+        is a scalar coordinate of the source cube."""
+        plugin = Plugin().make_cube
+        with iris.FUTURE.context(cell_datetime_objects=True):
+            cube = self.cube.extract(self.time_extract)
+        data = np.array([123])
+        result = plugin(cube, data, self.sites)
+        self.assertEqual(result.shape, (1, 1))
+        self.assertEqual(result.coord_dims('time'), (0,))
+        self.assertArrayEqual(result.data, [[123]])
+
+    def test_multiple_times(self):
+        """Test that data extracted from a cube with a time dimension of
+        several times keeps that time dimension."""
+        plugin = Plugin().make_cube
+        cubes = iris.cube.CubeList([self.cube, self.cube.copy()])
+        cubes[1].coord('time').points = [1487314800]
+        cube = cubes.concatenate_cube()
+        data = np.array([[123], [124]])
+        result = plugin(cube, data, self.sites)
+        self.assertEqual(result.shape, (2, 1))
+        self.assertEqual(result.coord_dims('time'), (0,))
+        self.assertEqual(result.coord_dims('forecast_period'), (0,))
+        self.assertArrayEqual(result.data, data)
+
 
 class Test_use_nearest(Test_setup):
     """Test the use_nearest grid point method."""
@@ -636,6 +662,97 @@ class Test_model_level_temperature_lapse_rate(Test_setup):
         self.extracted_value(self.method, self.ancillary_data, self.ad,
                              expected, **self.kwargs)
 
+    def test_multiple_sites_and_realizations(self):
+        """Test that the plugin returns the correct values for several sites
+        and realizations at once.
+
+        The first site is the 'unresolved valley' case, with a temperature of
+        22C, and the second the 'unresolved hill' case in a well mixed
+        atmosphere, with a temperature of 10C. The site within dz_tolerance
+        of its neighbour takes the neighbour grid point temperature.
+        The same values are expected for every realization."""
+
+        with iris.FUTURE.context(cell_datetime_objects=True):
+            cube = self.cube.extract(self.time_extract)
+        cubes = iris.cube.CubeList()
+        for realization in [0, 1]:
+            realization_cube = cube.copy()
+            realization_cube.add_aux_coord(
+                AuxCoord(realization, standard_name='realization', units='1'))
+            cubes.append(realization_cube)
+        cube = cubes.merge_cube()
+
+        self.sites['100']['altitude'] = 3.6446955
+        self.sites['200'] = self.sites['100'].copy()
+        self.sites['200']['altitude'] = 60.
+        self.sites['300'] = self.sites['100'].copy()
+        self.sites['300']['altitude'] = 11.
+        neighbour_list = np.empty(3, dtype=self.neighbour_list.dtype)
+        neighbour_list[:] = 10, 10, 0, False
+        neighbour_list['dz'] = [-6.3553045, 50., 1.]
+
+        plugin = Plugin(self.method)
+        result = plugin.process(cube, self.sites, neighbour_list,
+                                self.ancillary_data, self.ad, **self.kwargs)
+
+        expected = np.array([22., 10., cube.data[0, 10, 10]])
+        self.assertEqual(result.coord_dims('realization'), (0,))
+        for realization_data in result.data:
+            self.assertArrayAlmostEqual(realization_data.flatten(), expected)
+
+    def test_multiple_times_and_realizations(self):
+        """Test that a cube with (time, realization, y, x) dimensions is
+        processed in a single call, giving the same values at each time as
+        processing that time alone. The temperatures differ between the
+        times, and the additional data have a leading time dimension."""
+
+        with iris.FUTURE.context(cell_datetime_objects=True):
+            cube = self.cube.extract(self.time_extract)
+        cubes = iris.cube.CubeList()
+        for realization in [0, 1]:
+            realization_cube = cube.copy()
+            realization_cube.add_aux_coord(
+                AuxCoord(realization, standard_name='realization', units='1'))
+            cubes.append(realization_cube)
+        cube = cubes.merge_cube()
+
+        # Add a second time, an hour later, with warmer temperatures.
+        time_cubes = [cube.copy(data=cube.data.astype(np.float64)),
+                      cube.copy(data=cube.data + 2.)]
+        time_ad = [self.ad, {key: value.copy()
+                             for key, value in self.ad.items()}]
+        time_ad[1]['temperature_on_height_levels'].data = (
+            time_ad[1]['temperature_on_height_levels'].data + 3.)
+        time_cubes[1].coord('time').points = [1487314800]
+        for value in time_ad[1].values():
+            value.coord('time').points = [1487314800]
+        multi_time_cube = iris.cube.CubeList(time_cubes).merge_cube()
+        multi_time_ad = {
+            key: iris.cube.CubeList([ad[key] for ad in time_ad]).merge_cube()
+            for key in self.ad}
+        self.assertEqual(multi_time_cube.coord_dims('time'), (0,))
+        self.assertEqual(multi_time_cube.coord_dims('realization'), (1,))
+
+        self.sites['100']['altitude'] = 3.6446955
+        self.sites['200'] = self.sites['100'].copy()
+        self.sites['200']['altitude'] = 60.
+        neighbour_list = np.empty(2, dtype=self.neighbour_list.dtype)
+        neighbour_list[:] = 10, 10, 0, False
+        neighbour_list['dz'] = [-6.3553045, 50.]
+
+        plugin = Plugin(self.method)
+        result = plugin.process(multi_time_cube, self.sites, neighbour_list,
+                                self.ancillary_data, multi_time_ad,
+                                **self.kwargs)
+
+        self.assertEqual(result.coord_dims('realization'), (0,))
+        self.assertEqual(result.coord_dims('time'), (1,))
+        for index, (time_cube, ad) in enumerate(zip(time_cubes, time_ad)):
+            expected = plugin.process(time_cube, self.sites, neighbour_list,
+                                      self.ancillary_data, ad, **self.kwargs)
+            self.assertArrayAlmostEqual(result.data[:, index],
+                                        expected.data[:, 0])
+
     def test_different_projection(self):
         """Test that the plugin copes with non-lat/lon grids.
 
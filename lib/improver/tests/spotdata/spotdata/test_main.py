@@ -32,6 +32,9 @@
 
 from collections import OrderedDict
 import numpy as np
+import os
+import shutil
+from tempfile import mkdtemp
 import unittest
 
 import cf_units
@@ -161,6 +164,23 @@ class Test_run_spotdata(Test_main):
         self.assertEqual(result[0][0].name(), 'air_temperature')
         self.assertEqual(result[1][0], None)
 
+    def test_run_with_neighbour_cache(self):
+        """Test that the neighbours are cached on the first run and that a
+        second run using the cached neighbours gives the same result."""
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        kwargs = {'neighbour_cache_dir': cache_dir}
+        expected = Function(*self.args, **kwargs)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        result = Function(*self.args, **kwargs)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        self.assertEqual(result[0][0], expected[0][0])
+
+        kwargs['rebuild_neighbour_cache'] = True
+        result = Function(*self.args, **kwargs)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        self.assertEqual(result[0][0], expected[0][0])
+
 
 class Test_process_diagnostic(Test_main):
     """Test the process_diagnostic function."""
@@ -179,6 +199,23 @@ class Test_process_diagnostic(Test_main):
         self.assertIsInstance(result[0], Cube)
         self.assertEqual(result[1], None)
 
+    def test_multiple_times(self):
+        """Test that the data at all the forecast times are extracted
+        together into a cube with a time dimension."""
+        neighbours = {
+            'fast_nearest_neighbour-None-False':
+                np.array([(15, 10, 9.0, False)],
+                         dtype=[('i', '<i8'), ('j', '<i8'),
+                                ('dz', '<f8'), ('edgepoint', '?')])}
+        cube = self.diagnostic_recipe["temperature"]["data"][0]
+        expected = cube.data[:, 15, 10:11]
+        result, _ = process_diagnostic(
+            self.diagnostic_recipe, neighbours, self.sites,
+            self.ancillary_data, "temperature")
+        self.assertEqual(result.coord_dims('time'), (0,))
+        self.assertEqual(len(result.coord('time').points), 2)
+        self.assertArrayEqual(result.data, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the spotdata.NeighbourCache plugin."""
+
+from collections import OrderedDict
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+
+from iris.coords import DimCoord
+from iris.cube import Cube
+from iris.tests import IrisTest
+import numpy as np
+
+from improver.spotdata.neighbour_cache import NeighbourCache as Plugin
+
+
+class Test_NeighbourCache(IrisTest):
+
+    """Test the caching of site-grid point neighbours."""
+
+    def setUp(self):
+        """Create sites, ancillary data and neighbours for testing."""
+        self.cache_dir = os.path.join(mkdtemp(), 'neighbours')
+        latitude = DimCoord(np.linspace(-90, 90, 20),
+                            standard_name='latitude', units='degrees')
+        longitude = DimCoord(np.linspace(-180, 180, 20),
+                             standard_name='longitude', units='degrees')
+        orography = Cube(np.zeros((20, 20)), long_name='surface_altitude',
+                         dim_coords_and_dims=[(latitude, 0), (longitude, 1)],
+                         units='m')
+        self.ancillary_data = {'orography': orography}
+
+        self.sites = OrderedDict()
+        self.sites['100'] = {'latitude': 50, 'longitude': 0, 'altitude': 10}
+        self.sites['200'] = {'latitude': -20, 'longitude': 30,
+                             'altitude': 0}
+
+        neighbour_list = np.zeros(2, dtype=[('i', 'i8'),
+                                            ('j', 'i8'),
+                                            ('dz', 'f8'),
+                                            ('edgepoint', 'bool_')])
+        neighbour_list['i'] = [15, 7]
+        neighbour_list['j'] = [10, 11]
+        neighbour_list['dz'] = [10., 0.]
+        self.neighbours = {'fast_nearest_neighbour-None-False': neighbour_list}
+
+    def tearDown(self):
+        """Remove temporary directories created for testing."""
+        shutil.rmtree(os.path.dirname(self.cache_dir))
+
+    def test_repr(self):
+        """Test that the __repr__ returns the expected string."""
+        result = str(Plugin('/path/to/cache'))
+        self.assertEqual(result, '<NeighbourCache: cache_dir: /path/to/cache>')
+
+    def test_fingerprint_repeatable(self):
+        """Test that the fingerprint is the same for the same inputs."""
+        result = Plugin.fingerprint(self.sites, self.ancillary_data,
+                                    {'no_neighbours': 9})
+        expected = Plugin.fingerprint(self.sites.copy(),
+                                      self.ancillary_data.copy(),
+                                      {'no_neighbours': 9})
+        self.assertIsInstance(result, str)
+        self.assertEqual(result, expected)
+
+    def test_fingerprint_changes(self):
+        """Test that the fingerprint changes if the sites, ancillary data or
+        neighbour finding options change."""
+        fingerprint = Plugin.fingerprint(self.sites, self.ancillary_data)
+        other_results = [
+            Plugin.fingerprint(self.sites, self.ancillary_data,
+                               {'no_neighbours': 25})]
+        self.sites['200']['altitude'] = 5
+        other_results.append(
+            Plugin.fingerprint(self.sites, self.ancillary_data))
+        self.ancillary_data['orography'].data[0, 0] = 1.
+        other_results.append(
+            Plugin.fingerprint(self.sites, self.ancillary_data))
+        self.assertNotIn(fingerprint, other_results)
+        self.assertEqual(len(set(other_results)), len(other_results))
+
+    def test_load_missing(self):
+        """Test that an empty dictionary is returned if nothing is cached."""
+        result = Plugin(self.cache_dir).load('abc123')
+        self.assertEqual(result, {})
+
+    def test_save_and_load(self):
+        """Test that saved neighbours are loaded unchanged, and only for the
+        fingerprint they were saved with."""
+        plugin = Plugin(self.cache_dir)
+        plugin.save('abc123', self.neighbours)
+        result = plugin.load('abc123')
+        self.assertEqual(list(result.keys()), list(self.neighbours.keys()))
+        for key, neighbour_list in self.neighbours.items():
+            self.assertEqual(result[key].dtype, neighbour_list.dtype)
+            self.assertArrayEqual(result[key], neighbour_list)
+        self.assertEqual(plugin.load('def456'), {})
+        self.assertEqual(os.listdir(self.cache_dir),
+                         ['neighbours_abc123.npz'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -158,6 +158,33 @@ class Test_miscellaneous(Test_PointSelection):
             plugin.process(self.cube, self.sites, self.ancillary_data,
                            no_neighbours=20)
 
+    def test_multiple_sites(self):
+        """
+        Test that the neighbours found for several sites at once match those
+        found for each site individually.
+
+        """
+        self.ancillary_data['orography'].data[13, 10] = 10.
+        self.ancillary_data['orography'].data[5, 4] = -5.
+        self.ancillary_data['land_mask'].data[14, 10] = 0.
+        self.sites.update({'200': {'latitude': -40,
+                                   'longitude': -100,
+                                   'altitude': -10,
+                                   'gmtoffset': 0}})
+        self.sites.update({'300': {'latitude': 60,
+                                   'longitude': 20,
+                                   'altitude': 0,
+                                   'gmtoffset': 0}})
+        plugin = Plugin(method='minimum_height_error_neighbour',
+                        vertical_bias='below',
+                        land_constraint=True)
+        result = plugin.process(self.cube, self.sites, self.ancillary_data,
+                                no_neighbours=25)
+        for index, (site_id, site) in enumerate(self.sites.items()):
+            expected = plugin.process(self.cube, {site_id: site},
+                                      self.ancillary_data, no_neighbours=25)
+            self.assertEqual(result[index], expected[0])
+
 
 class Test_fast_nearest_neighbour(Test_PointSelection):
     """
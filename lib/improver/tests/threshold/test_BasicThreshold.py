@@ -55,7 +55,8 @@ class Test__repr__(IrisTest):
                                below_thresh_ok=below_thresh_ok))
         msg = ('<BasicThreshold: thresholds {}, '
                'fuzzy_bounds {}, '
-               'below_thresh_ok: {}>'.format(
+               'below_thresh_ok: {}, '
+               'threshold_chunk_size: None>'.format(
                    threshold, fuzzy_bounds, below_thresh_ok))
         self.assertEqual(result, msg)
 
@@ -68,7 +69,8 @@ class Test__repr__(IrisTest):
                                below_thresh_ok=below_thresh_ok))
         msg = ('<BasicThreshold: thresholds {}, '
                'fuzzy_bounds {}, '
-               'below_thresh_ok: {}>'.format(
+               'below_thresh_ok: {}, '
+               'threshold_chunk_size: None>'.format(
                    threshold, fuzzy_bounds, below_thresh_ok))
         self.assertEqual(result, msg)
 
@@ -83,7 +85,8 @@ class Test__repr__(IrisTest):
                                below_thresh_ok=below_thresh_ok))
         msg = ('<BasicThreshold: thresholds [{}], '
                'fuzzy_bounds {}, '
-               'below_thresh_ok: {}>'.format(
+               'below_thresh_ok: {}, '
+               'threshold_chunk_size: None>'.format(
                    threshold, fuzzy_bounds, below_thresh_ok))
         self.assertEqual(result, msg)
 
@@ -97,7 +100,8 @@ class Test__repr__(IrisTest):
                                below_thresh_ok=below_thresh_ok))
         msg = ('<BasicThreshold: thresholds [{}], '
                'fuzzy_bounds [{}], '
-               'below_thresh_ok: {}>'.format(
+               'below_thresh_ok: {}, '
+               'threshold_chunk_size: None>'.format(
                    threshold, fuzzy_bounds, below_thresh_ok))
         self.assertEqual(result, msg)
 
@@ -111,10 +115,22 @@ class Test__repr__(IrisTest):
                                below_thresh_ok=below_thresh_ok))
         msg = ('<BasicThreshold: thresholds {}, '
                'fuzzy_bounds {}, '
-               'below_thresh_ok: {}>'.format(
+               'below_thresh_ok: {}, '
+               'threshold_chunk_size: None>'.format(
                    threshold, fuzzy_bounds, below_thresh_ok))
         self.assertEqual(result, msg)
 
+    def test_threshold_chunk_size(self):
+        """Test that the __repr__ returns the expected string."""
+        threshold = [0.6, 0.8]
+        fuzzy_bounds = [(0.6, 0.6), (0.8, 0.8)]
+        result = str(Threshold(threshold, threshold_chunk_size=1))
+        msg = ('<BasicThreshold: thresholds {}, '
+               'fuzzy_bounds {}, '
+               'below_thresh_ok: False, '
+               'threshold_chunk_size: 1>'.format(threshold, fuzzy_bounds))
+        self.assertEqual(result, msg)
+
 
 class Test_process(IrisTest):
 
@@ -376,6 +392,46 @@ class Test_process(IrisTest):
         self.assertIsInstance(result, Cube)
         self.assertArrayAlmostEqual(result.data, expected_result_array)
 
+    def test_multiple_thresholds_chunked(self):
+        """Test that evaluating the thresholds in chunks gives the same
+        result as evaluating them all at once."""
+        thresholds = [0.2, 0.4, 0.6]
+        bounds = [(0.1, 0.3), (0.3, 0.6), (0.6, 0.6)]
+        expected = Threshold(thresholds, fuzzy_bounds=bounds).process(
+            self.cube)
+        result = Threshold(thresholds, fuzzy_bounds=bounds,
+                           threshold_chunk_size=2).process(self.cube)
+        self.assertArrayAlmostEqual(result.data, expected.data)
+        self.assertEqual(result.coord("threshold"),
+                         expected.coord("threshold"))
+
+    def test_unsorted_thresholds(self):
+        """Test that the threshold coordinate is in ascending order, with
+        the data and fuzzy bounds reordered to match."""
+        thresholds = [0.6, 0.2, 0.4]
+        bounds = [(0.6, 0.6), (0.1, 0.3), (0.3, 0.6)]
+        result = Threshold(thresholds, fuzzy_bounds=bounds).process(self.cube)
+        self.assertArrayAlmostEqual(
+            result.coord("threshold").points, [0.2, 0.4, 0.6])
+        self.assertArrayAlmostEqual(
+            result.data[:, 0, 2, 2], [1., 0.75, 0.])
+
+    def test_float32_output(self):
+        """Test that the truth values are returned as float32."""
+        result = Threshold([0.2, 0.4]).process(self.cube)
+        self.assertEqual(result.dtype, np.float32)
+
+    def test_masked_data(self):
+        """Test that the mask of the input data is applied to every
+        threshold."""
+        mask = np.zeros(self.cube.shape, dtype=bool)
+        mask[0, 0, 0] = True
+        self.cube.data = np.ma.masked_array(self.cube.data, mask=mask)
+        result = Threshold([0.2, 0.4], fuzzy_factor=0.5).process(self.cube)
+        self.assertIsInstance(result.data, np.ma.MaskedArray)
+        expected_mask = np.broadcast_to(mask, (2,) + mask.shape)
+        self.assertArrayEqual(result.data.mask, expected_mask)
+
     def test_threshold_below_fuzzy_miss(self):
         """Test not meeting the threshold in fuzzy below-threshold-mode."""
         plugin = Threshold(
@@ -441,6 +497,27 @@ class Test_process(IrisTest):
             Threshold(0.6, fuzzy_factor=fuzzy_factor,
                       fuzzy_bounds=fuzzy_bounds)
 
+    def test_invalid_threshold_chunk_size_negative(self):
+        """Test when threshold_chunk_size is negative (invalid)."""
+        msg = ("Invalid threshold_chunk_size: must be a positive integer "
+               "or None: -1")
+        with self.assertRaisesRegexp(ValueError, msg):
+            Threshold([0.6, 0.8], threshold_chunk_size=-1)
+
+    def test_invalid_threshold_chunk_size_zero(self):
+        """Test when threshold_chunk_size is zero (invalid)."""
+        msg = ("Invalid threshold_chunk_size: must be a positive integer "
+               "or None: 0")
+        with self.assertRaisesRegexp(ValueError, msg):
+            Threshold([0.6, 0.8], threshold_chunk_size=0)
+
+    def test_invalid_threshold_chunk_size_float(self):
+        """Test when threshold_chunk_size is not an integer (invalid)."""
+        msg = ("Invalid threshold_chunk_size: must be a positive integer "
+               "or None: 1.5")
+        with self.assertRaisesRegexp(ValueError, msg):
+            Threshold([0.6, 0.8], threshold_chunk_size=1.5)
+
     def test_invalid_bounds_toofew(self):
         """Test when fuzzy_bounds contains one value (invalid)."""
         threshold = 0.6
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for the instrumentation of time and memory."""
+
+import argparse
+import json
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+
+import iris
+from iris.tests import IrisTest
+
+from improver.threshold import BasicThreshold
+from improver.utilities import instrumentation
+from improver.utilities.instrumentation import instrumented
+
+
+@instrumented("stage")
+def stage(value, fail=False):
+    """Return the value, or raise an error if fail is True."""
+    if fail:
+        raise ValueError("Stage failed")
+    return value
+
+
+@instrumented("recursive_stage")
+def recursive_stage(depth):
+    """Call itself until the depth reaches zero."""
+    if depth > 0:
+        return recursive_stage(depth - 1)
+    return depth
+
+
+class DummyPlugin(object):
+    """A plugin with a process method."""
+
+    def process(self, value):
+        """Return the value."""
+        return value
+
+
+class DummyStaticPlugin(object):
+    """A plugin with a static process method."""
+
+    @staticmethod
+    def process(value):
+        """Return the value."""
+        return value
+
+
+class Test_instrumented(IrisTest):
+
+    """Test the recording of stages marked with the decorator."""
+
+    def tearDown(self):
+        """Disable instrumentation."""
+        instrumentation.disable()
+
+    def test_disabled(self):
+        """Test that a stage is called directly and nothing is recorded when
+        instrumentation is not enabled."""
+        self.assertEqual(stage(3), 3)
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIsNone(instrumentation.report())
+
+    def test_enabled(self):
+        """Test that the number of calls and the resources used are
+        recorded."""
+        instrumentation.enable()
+        self.assertEqual(stage(3), 3)
+        self.assertEqual(stage(4), 4)
+        result, = instrumentation.report()["stages"]
+        self.assertEqual(result["name"], "stage")
+        self.assertEqual(result["calls"], 2)
+        self.assertGreaterEqual(result["wall_seconds"], 0.)
+        self.assertGreaterEqual(result["cpu_seconds"], 0.)
+        self.assertGreater(result["peak_rss_mb"], 0.)
+        self.assertGreaterEqual(result["peak_rss_increase_mb"], 0.)
+
+    def test_error(self):
+        """Test that a call that raises an error is still recorded."""
+        instrumentation.enable()
+        with self.assertRaisesRegexp(ValueError, "Stage failed"):
+            stage(3, fail=True)
+        result, = instrumentation.report()["stages"]
+        self.assertEqual(result["calls"], 1)
+
+    def test_recursive(self):
+        """Test that only the outermost of recursive calls is recorded."""
+        instrumentation.enable()
+        self.assertEqual(recursive_stage(3), 0)
+        result, = instrumentation.report()["stages"]
+        self.assertEqual(result["calls"], 1)
+
+    def test_disable(self):
+        """Test that results are discarded when disabled."""
+        instrumentation.enable()
+        stage(3)
+        instrumentation.disable()
+        self.assertIsNone(instrumentation.report())
+
+
+class Test_instrument_plugins(IrisTest):
+
+    """Test the instrumentation of the process methods of plugins."""
+
+    def tearDown(self):
+        """Disable instrumentation."""
+        instrumentation.disable()
+
+    def test_disabled(self):
+        """Test that plugins are not changed when instrumentation is not
+        enabled."""
+        process = DummyPlugin.__dict__["process"]
+        instrumentation.instrument_plugins()
+        self.assertIs(DummyPlugin.__dict__["process"], process)
+
+    def test_improver_plugin(self):
+        """Test that the plugins of the improver package are instrumented
+        when instrumentation is enabled."""
+        instrumentation.enable()
+        self.assertTrue(BasicThreshold.process.instrumented)
+
+    def test_process(self):
+        """Test that calls to a process method are recorded."""
+        instrumentation.enable()
+        instrumentation._instrument_process(DummyPlugin)
+        instrumentation._instrument_process(DummyPlugin)
+        self.assertEqual(DummyPlugin().process(5), 5)
+        result, = instrumentation.report()["stages"]
+        self.assertEqual(result["name"], "DummyPlugin.process")
+        self.assertEqual(result["calls"], 1)
+
+    def test_static_process(self):
+        """Test that calls to a static process method are recorded."""
+        instrumentation.enable()
+        instrumentation._instrument_process(DummyStaticPlugin)
+        self.assertEqual(DummyStaticPlugin.process(5), 5)
+        self.assertEqual(DummyStaticPlugin().process(6), 6)
+        result, = instrumentation.report()["stages"]
+        self.assertEqual(result["name"], "DummyStaticPlugin.process")
+        self.assertEqual(result["calls"], 2)
+
+
+class Test_enable_from_environment(IrisTest):
+
+    """Test enabling instrumentation from the environment."""
+
+    def setUp(self):
+        """Remember the environment variable."""
+        self.original = os.environ.pop(
+            instrumentation.ENVIRONMENT_VARIABLE, None)
+
+    def tearDown(self):
+        """Disable instrumentation and restore the environment variable."""
+        instrumentation.disable()
+        os.environ.pop(instrumentation.ENVIRONMENT_VARIABLE, None)
+        if self.original is not None:
+            os.environ[instrumentation.ENVIRONMENT_VARIABLE] = self.original
+
+    def test_unset(self):
+        """Test that instrumentation is not enabled if the variable is not
+        set."""
+        instrumentation.enable_from_environment()
+        self.assertFalse(instrumentation.is_enabled())
+
+    def test_set(self):
+        """Test that instrumentation is enabled if the variable is set."""
+        os.environ[instrumentation.ENVIRONMENT_VARIABLE] = "report.json"
+        instrumentation.enable_from_environment()
+        self.assertTrue(instrumentation.is_enabled())
+
+    def test_imported_plugins(self):
+        """Test that plugins already imported are instrumented."""
+        os.environ[instrumentation.ENVIRONMENT_VARIABLE] = "report.json"
+        instrumentation.enable_from_environment()
+        self.assertTrue(BasicThreshold.process.instrumented)
+
+    def test_nothing_else_patched(self):
+        """Test that argument parsing and saving by iris are left alone."""
+        os.environ[instrumentation.ENVIRONMENT_VARIABLE] = "report.json"
+        instrumentation.enable_from_environment()
+        self.assertFalse(
+            getattr(argparse.ArgumentParser.parse_args, "instrumented",
+                    False))
+        self.assertFalse(getattr(iris.save, "instrumented", False))
+
+
+class Test_write_report(IrisTest):
+
+    """Test writing the report as JSON."""
+
+    def setUp(self):
+        """Create a directory for the report."""
+        self.directory = mkdtemp()
+        self.report_path = os.path.join(self.directory, "report.json")
+
+    def tearDown(self):
+        """Disable instrumentation and remove the directory."""
+        instrumentation.disable()
+        shutil.rmtree(self.directory)
+
+    def test_basic(self):
+        """Test that the report contains the totals and each stage."""
+        instrumentation.enable()
+        stage(1)
+        recursive_stage(1)
+        instrumentation.write_report(self.report_path)
+        with open(self.report_path) as report_file:
+            result = json.load(report_file)
+        self.assertEqual(
+            sorted(result.keys()),
+            ["command", "cpu_seconds", "peak_rss_mb", "stages",
+             "wall_seconds"])
+        self.assertEqual([item["name"] for item in result["stages"]],
+                         ["stage", "recursive_stage"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -150,6 +150,25 @@ class Test_load_cube(IrisTest):
         self.assertArrayAlmostEqual(result.coord_dims("latitude")[0], 2)
         self.assertArrayAlmostEqual(result.coord_dims("longitude")[0], 3)
 
+    def test_lazy_load(self):
+        """Test that the data remains lazy when the cube is loaded and
+        reordered, and that it matches the saved data once accessed."""
+        filepath = self.directory+"temp.nc"
+        cube = set_up_temperature_cube()
+        cube.transpose([3, 2, 1, 0])
+        iris.save(cube, filepath)
+        result = load_cube(filepath)
+        self.assertTrue(result.has_lazy_data())
+        self.assertEqual(result.coord_dims("realization")[0], 0)
+        self.assertArrayAlmostEqual(result.data, self.cube.data)
+
+    def test_no_lazy_load(self):
+        """Test that the data is read into memory when the cube is loaded,
+        if no_lazy_load is True."""
+        result = load_cube(self.filepath, no_lazy_load=True)
+        self.assertFalse(result.has_lazy_data())
+        self.assertArrayAlmostEqual(result.data, self.cube.data)
+
 
 class Test_load_cubelist(IrisTest):
 
@@ -184,6 +203,14 @@ class Test_load_cubelist(IrisTest):
         self.assertArrayAlmostEqual(
             result[0].coord("longitude").points, self.longitude_points)
 
+    def test_no_lazy_load(self):
+        """Test that the data of each cube is read into memory when the
+        cubes are loaded, if no_lazy_load is True."""
+        result = load_cubelist(
+            [self.filepath, self.filepath], no_lazy_load=True)
+        for cube in result:
+            self.assertFalse(cube.has_lazy_data())
+
     def test_wildcard_files(self):
         """Test that the loading works correctly, if a wildcarded filepath is
         provided."""
@@ -38,7 +38,8 @@ import numpy as np
 import iris
 from iris.tests import IrisTest
 
-from improver.utilities.mathematical_operations import Integration
+from improver.utilities.mathematical_operations import (
+    Integration, interpolate_multiple_rows)
 from improver.tests.ensemble_calibration.ensemble_calibration.\
     helper_functions import set_up_temperature_cube
 
@@ -64,6 +65,94 @@ def set_up_height_cube(height_points, cube=set_up_temperature_cube()):
     return cubelist.concatenate_cube()
 
 
+class Test_interpolate_multiple_rows(IrisTest):
+
+    """Test the interpolate_multiple_rows function."""
+
+    def test_shared_xp(self):
+        """
+        Test that the result matches np.interp for each row when the xp
+        values are shared by all the rows.
+        """
+        x_values = np.array([-10., 10., 25., 50., 90., 110.])
+        xp_values = np.array([0., 20., 50., 80., 100.])
+        fp_values = np.array([[1., 2., 3., 4., 5.],
+                              [2., 2., 6., 8., 10.]])
+        expected = np.array(
+            [np.interp(x_values, xp_values, row) for row in fp_values])
+        result = interpolate_multiple_rows(x_values, xp_values, fp_values)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_shared_fp(self):
+        """
+        Test that the result matches np.interp for each row when the fp
+        values are shared by all the rows, including where there are
+        repeated xp values within a row.
+        """
+        x_values = np.array([0., 0.2, 0.5, 0.8, 1.])
+        xp_values = np.array([[0., 0.1, 0.4, 0.9, 1.],
+                              [0., 0.5, 0.5, 0.5, 1.],
+                              [0.2, 0.2, 0.8, 0.8, 0.8]])
+        fp_values = np.array([270., 275., 280., 285., 290.])
+        expected = np.array(
+            [np.interp(x_values, row, fp_values) for row in xp_values])
+        result = interpolate_multiple_rows(x_values, xp_values, fp_values)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_2d_xp_and_fp(self):
+        """
+        Test that the result matches np.interp for each row when both the
+        xp and fp values vary between rows.
+        """
+        x_values = np.array([0.25, 0.5, 0.75])
+        xp_values = np.array([[0., 0.5, 1.], [0., 0.8, 1.]])
+        fp_values = np.array([[10., 20., 30.], [5., 6., 7.]])
+        expected = np.array([[15., 20., 25.], [5.3125, 5.625, 5.9375]])
+        result = interpolate_multiple_rows(x_values, xp_values, fp_values)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_single_data_point(self):
+        """
+        Test that a single data point in each row gives that value for all
+        the x values, as for np.interp.
+        """
+        x_values = np.array([0.25, 0.5, 0.75])
+        xp_values = np.array([[0.5], [0.6]])
+        fp_values = np.array([1.])
+        expected = np.ones((2, 3))
+        result = interpolate_multiple_rows(x_values, xp_values, fp_values)
+        self.assertArrayAlmostEqual(result, expected)
+
+    def test_2d_x(self):
+        """
+        Test that the result matches np.interp for each row when the x
+        values vary between rows, with the xp values either shared by all
+        the rows or varying between them.
+        """
+        x_values = np.array([[-1., 0.25, 0.5], [0.5, 0.9, 2.]])
+        fp_values = np.array([10., 20., 30.])
+        for xp_values in [np.array([0., 0.5, 1.]),
+                          np.array([[0., 0.5, 1.], [0., 0.8, 1.]])]:
+            expected = np.array(
+                [np.interp(x_row, xp_row, fp_values) for x_row, xp_row in
+                 zip(x_values, np.broadcast_to(xp_values, (2, 3)))])
+            result = interpolate_multiple_rows(x_values, xp_values, fp_values)
+            self.assertArrayAlmostEqual(result, expected)
+
+    def test_single_shared_data_point(self):
+        """
+        Test that a single data point shared by all the rows gives that
+        value for all the x values, as for np.interp.
+        """
+        x_values = np.array([[0.25, 0.5], [0.75, 1.]])
+        xp_values = np.array([0.5])
+        fp_values = np.array([[1.], [2.]])
+        expected = np.array([[1., 1.], [2., 2.]])
+        result = interpolate_multiple_rows(x_values, xp_values, fp_values)
+        self.assertArrayAlmostEqual(result, expected)
+
+
 class Test__init__(IrisTest):
 
     """Test the init method."""
@@ -307,6 +396,33 @@ class Test_perform_integration(IrisTest):
             result.coord("height").points, np.array([5., 10.]))
         self.assertArrayAlmostEqual(result.data, expected)
 
+    def test_data_coord_not_leading(self):
+        """Test that the integrated coordinate is returned as the leading
+        dimension, with the expected data, when it is not the leading
+        dimension of the input cubes."""
+        expected = np.array(
+            [[[[45.00, 32.50, 32.50],
+               [32.50, 32.50, 32.50],
+               [32.50, 32.50, 32.50]]],
+             [[[25.00, 25.00, 25.00],
+               [25.00, 25.00, 25.00],
+               [25.00, 25.00, 25.00]]]])
+        for cube in [self.negative_upper_bounds_cube,
+                     self.negative_lower_bounds_cube,
+                     self.negative_integrated_cube]:
+            cube.transpose([1, 2, 0, 3])
+        result = (
+            Integration(
+                "height", direction_of_integration="negative"
+                ).perform_integration(
+                    self.negative_upper_bounds_cube,
+                    self.negative_lower_bounds_cube,
+                    self.negative_integrated_cube))
+        self.assertEqual(result.coord_dims("height"), (0,))
+        self.assertArrayAlmostEqual(
+            result.coord("height").points, np.array([5., 10.]))
+        self.assertArrayAlmostEqual(result.data, expected)
+
     def test_start_point_positive(self):
         """Test that the resulting cube contains the expected data when a
         start_point is specified, so that only part of the column is
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit tests for saving functionality."""
+
+import json
+import os
+import shutil
+from tempfile import mkdtemp
+import unittest
+
+import iris
+from iris.tests import IrisTest
+import numpy as np
+
+from improver.tests.ensemble_calibration.ensemble_calibration.\
+    helper_functions import set_up_temperature_cube
+from improver.utilities import instrumentation
+from improver.utilities.save import atomic_write, save_cube
+
+
+class Test_atomic_write(IrisTest):
+
+    """Test the atomic_write function."""
+
+    def setUp(self):
+        """Set up the path of a file in a temporary directory."""
+        self.directory = mkdtemp()
+        self.filepath = os.path.join(self.directory, 'data.json')
+
+    def tearDown(self):
+        """Remove the temporary directory created for testing."""
+        shutil.rmtree(self.directory)
+
+    def test_text(self):
+        """Test that text is written to the file, and that no temporary
+        file is left behind."""
+        with atomic_write(self.filepath) as output_file:
+            json.dump([1, 2], output_file)
+        with open(self.filepath) as input_file:
+            self.assertEqual(json.load(input_file), [1, 2])
+        self.assertEqual(os.listdir(self.directory), ['data.json'])
+
+    def test_binary(self):
+        """Test that numpy arrays can be saved to a file of any name."""
+        filepath = os.path.join(self.directory, 'data.cache')
+        with atomic_write(filepath, mode='wb') as output_file:
+            np.savez(output_file, values=np.arange(3))
+        with np.load(filepath) as saved:
+            self.assertArrayEqual(saved['values'], np.arange(3))
+        self.assertEqual(os.listdir(self.directory), ['data.cache'])
+
+    def test_replaces_existing_file(self):
+        """Test that an existing file is replaced."""
+        with open(self.filepath, 'w') as output_file:
+            json.dump([1], output_file)
+        with atomic_write(self.filepath) as output_file:
+            json.dump([2], output_file)
+        with open(self.filepath) as input_file:
+            self.assertEqual(json.load(input_file), [2])
+
+    def test_failed_write(self):
+        """Test that an existing file is left unchanged, and the temporary
+        file is removed, if an exception is raised while writing."""
+        with open(self.filepath, 'w') as output_file:
+            json.dump([1], output_file)
+        msg = 'Failed to write'
+        with self.assertRaisesRegexp(ValueError, msg):
+            with atomic_write(self.filepath) as output_file:
+                output_file.write('[2')
+                raise ValueError(msg)
+        with open(self.filepath) as input_file:
+            self.assertEqual(json.load(input_file), [1])
+        self.assertEqual(os.listdir(self.directory), ['data.json'])
+
+
+class Test_save_cube(IrisTest):
+
+    """Test the save_cube function."""
+
+    def setUp(self):
+        """Set up a cube and the path of a file in a temporary directory."""
+        self.cube = set_up_temperature_cube()
+        self.directory = mkdtemp()
+        self.filepath = os.path.join(self.directory, 'temperature.nc')
+
+    def tearDown(self):
+        """Disable instrumentation and remove the temporary directory."""
+        instrumentation.disable()
+        shutil.rmtree(self.directory)
+
+    def test_basic(self):
+        """Test that the cube is saved to the file."""
+        save_cube(self.cube, self.filepath)
+        result = iris.load_cube(self.filepath)
+        self.assertArrayAlmostEqual(result.data, self.cube.data)
+
+    def test_instrumented(self):
+        """Test that the save is recorded when instrumentation is
+        enabled."""
+        instrumentation.enable()
+        save_cube(self.cube, self.filepath, unlimited_dimensions=[])
+        result, = instrumentation.report()["stages"]
+        self.assertEqual(result["name"], "save_cube")
+        self.assertEqual(result["calls"], 1)
+        self.assertTrue(os.path.exists(self.filepath))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -35,7 +35,7 @@ import unittest
 import numpy as np
 
 from iris.tests import IrisTest
-from iris.coords import AuxCoord
+from iris.coords import AuxCoord, DimCoord
 from iris import coord_systems
 from iris.cube import Cube
 import cartopy.crs as ccrs
@@ -44,7 +44,9 @@ from improver.tests.nbhood.nbhood.test_BaseNeighbourhoodProcessing import (
     set_up_cube, set_up_cube_lat_long)
 from improver.utilities.spatial import (
     check_if_grid_is_equal_area, convert_distance_into_number_of_grid_cells,
-    lat_lon_determine, lat_lon_transform, get_nearest_coords)
+    lat_lon_determine, lat_lon_transform, get_nearest_coords,
+    lat_lon_transform_points, nearest_neighbour_indices,
+    get_nearest_coords_vectorised)
 from improver.tests.spotdata.spotdata.test_common_functions import (
     Test_common_functions)
 
@@ -238,5 +240,89 @@ class Test_get_nearest_coords(Test_common_functions):
                         'latitude', 'longitude')
         self.assertEqual(expected, result)
 
+
+class Test_lat_lon_transform_points(Test_common_functions):
+    """
+    Test function that transforms arrays of lookup latitudes and longitudes
+    into the projection used in a diagnostic cube.
+
+    """
+    def test_projection_transform(self):
+        """
+        Test transformation of lookup coordinates matches the
+        transformation of each coordinate pair in turn.
+
+        """
+        trg_crs = ccrs.LambertConformal(central_longitude=50,
+                                        central_latitude=10)
+        latitudes = np.array([10., 20., -5.])
+        longitudes = np.array([50., 40., 60.])
+        result_x, result_y = lat_lon_transform_points(trg_crs, latitudes,
+                                                      longitudes)
+        for index, (latitude, longitude) in enumerate(
+                zip(latitudes, longitudes)):
+            expected_x, expected_y = lat_lon_transform(trg_crs, latitude,
+                                                       longitude)
+            self.assertAlmostEqual(expected_x, result_x[index])
+            self.assertAlmostEqual(expected_y, result_y[index])
+
+    def test_no_transform(self):
+        """Test the coordinates are returned unchanged on a lat/lon grid."""
+        latitudes = np.array([10., 20.])
+        longitudes = np.array([50., 40.])
+        result_x, result_y = lat_lon_transform_points(None, latitudes,
+                                                      longitudes)
+        self.assertArrayEqual(result_x, longitudes)
+        self.assertArrayEqual(result_y, latitudes)
+
+
+class Test_nearest_neighbour_indices(IrisTest):
+    """Test the vectorised equivalent of coord.nearest_neighbour_index."""
+
+    def setUp(self):
+        """Set up values to find the nearest cells to."""
+        self.values = np.arange(-200., 400., 7.5)
+
+    def check_against_iris(self, coord):
+        """Check the indices match those from iris for each value."""
+        expected = [coord.nearest_neighbour_index(value)
+                    for value in self.values]
+        result = nearest_neighbour_indices(coord, self.values, chunk_size=7)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayEqual(result, expected)
+
+    def test_points(self):
+        """Test for a coordinate without bounds, including ties."""
+        coord = DimCoord(np.arange(0., 360., 15.), 'longitude',
+                         units='degrees')
+        self.check_against_iris(coord)
+
+    def test_circular_descending(self):
+        """Test for a descending circular coordinate."""
+        coord = DimCoord(np.arange(0., 360., 15.)[::-1], 'longitude',
+                         units='degrees', circular=True)
+        self.check_against_iris(coord)
+
+    def test_bounds(self):
+        """Test for a coordinate with bounds."""
+        coord = DimCoord(np.arange(0., 360., 15.), 'longitude',
+                         units='degrees', circular=True)
+        coord.guess_bounds()
+        self.check_against_iris(coord)
+
+
+class Test_get_nearest_coords_vectorised(Test_common_functions):
+    """Test the vectorised equivalent of get_nearest_coords."""
+
+    def test_nearest_coords(self):
+        """Test correct indices are returned."""
+        longitudes = np.array([80., -100.])
+        latitudes = np.array([-25., 60.])
+        result_i, result_j = get_nearest_coords_vectorised(
+            self.cube, latitudes, longitudes, 'latitude', 'longitude')
+        self.assertArrayEqual(result_i, [4, 9])
+        self.assertArrayEqual(result_j, [8, 2])
+
+
 if __name__ == '__main__':
     unittest.main()
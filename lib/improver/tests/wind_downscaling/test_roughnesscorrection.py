@@ -31,6 +31,9 @@
 """Unit tests for plugin wind_downscaling.RoughnessCorrection."""
 
 
+import os
+import shutil
+from tempfile import mkdtemp
 import unittest
 
 from cf_units import Unit
@@ -42,7 +45,8 @@ from iris.tests import IrisTest
 
 from improver.grids import STANDARD_GRID_CCRS
 from improver.constants import RMDI
-from improver.wind_downscaling import RoughnessCorrection
+from improver.wind_downscaling import (
+    RoughnessCorrection, RoughnessCorrectionUtilities)
 
 
 def _make_ukvx_grid():
@@ -781,5 +785,97 @@ class Test2D(IrisTest):
             _ = landpointtests_rc.run_hc_rc(self.uin)
 
 
+class Test_prepare(IrisTest):
+
+    """Test preparing the state derived from the ancillary fields once, and
+    storing it in a file for reuse."""
+
+    def setUp(self):
+        """Set up ancillaries with a mix of sea and land points, the
+        corrected wind from a plugin that is not prepared in advance, and a
+        directory for the state file."""
+        self.multip_hc_rc = TestMultiPoint(
+            nx_ny=[3, 1], AoS=[0, 0.2, 0.2], pporog=[0, 250, 250],
+            modelorog=[0, 250, 230])
+        uin = np.ones(10)*20
+        heights = ((np.arange(10)+1)**2.)*12
+        self.expected = self.multip_hc_rc.run_hc_rc(uin, dtime=2,
+                                                    height=heights)
+        self.directory = mkdtemp()
+        self.filepath = os.path.join(self.directory, "ancillary_state.npz")
+
+    def tearDown(self):
+        """Remove the directory for the state file."""
+        shutil.rmtree(self.directory)
+
+    def make_plugin(self):
+        """Create a plugin from the ancillaries."""
+        return RoughnessCorrection(
+            self.multip_hc_rc.aos_cube, self.multip_hc_rc.s_cube,
+            self.multip_hc_rc.poro_cube, self.multip_hc_rc.moro_cube, 1500.,
+            self.multip_hc_rc.z0_cube)
+
+    def test_reused_by_process(self):
+        """Test that the prepared state is used for every wind field
+        processed, giving the same result as an unprepared plugin."""
+        plugin = self.make_plugin()
+        state = plugin.prepare()
+        self.assertIsInstance(state, RoughnessCorrectionUtilities)
+        for _ in range(2):
+            result = plugin.process(self.multip_hc_rc.w_cube)
+            self.assertIs(plugin.ancillary_state, state)
+            self.assertArrayAlmostEqual(result.data, self.expected.data)
+
+    def test_save_and_load(self):
+        """Test that the state is saved to the file, and that a later
+        plugin with the same ancillaries loads it without rewriting it and
+        gives the same result."""
+        saved_state = self.make_plugin().prepare(self.filepath)
+        self.assertTrue(os.path.isfile(self.filepath))
+        inode = os.stat(self.filepath).st_ino
+        plugin = self.make_plugin()
+        state = plugin.prepare(self.filepath)
+        self.assertEqual(os.stat(self.filepath).st_ino, inode)
+        for name in RoughnessCorrectionUtilities.state_names:
+            self.assertArrayEqual(getattr(state, name),
+                                  getattr(saved_state, name))
+        self.assertEqual(state.dx_min, saved_state.dx_min)
+        self.assertEqual(state.dx_max, saved_state.dx_max)
+        result = plugin.process(self.multip_hc_rc.w_cube)
+        self.assertArrayAlmostEqual(result.data, self.expected.data)
+
+    def test_prepared_twice(self):
+        """Test that preparing the same plugin twice loads the saved state
+        the second time, leaving the roughness ancillary unchanged even
+        where it has sea points with no roughness."""
+        ancillaries = TestMultiPoint(
+            nx_ny=[3, 1], AoS=[0, 0.2, 0.2], z_0=[0., 0.2, 0.2],
+            pporog=[0, 250, 250], modelorog=[0, 250, 230])
+        z0_data = ancillaries.z0_cube.data.copy()
+        plugin = RoughnessCorrection(
+            ancillaries.aos_cube, ancillaries.s_cube, ancillaries.poro_cube,
+            ancillaries.moro_cube, 1500., ancillaries.z0_cube)
+        saved_state = plugin.prepare(self.filepath)
+        self.assertArrayEqual(ancillaries.z0_cube.data, z0_data)
+        inode = os.stat(self.filepath).st_ino
+        state = plugin.prepare(self.filepath)
+        self.assertEqual(os.stat(self.filepath).st_ino, inode)
+        self.assertIsNot(state, saved_state)
+        self.assertArrayEqual(state.z_0, saved_state.z_0)
+
+    def test_different_ancillaries(self):
+        """Test that a file saved from different ancillaries is replaced
+        by the state derived from the current ancillaries."""
+        self.make_plugin().prepare(self.filepath)
+        self.multip_hc_rc.moro_cube.data = (
+            self.multip_hc_rc.moro_cube.data - 10.)
+        plugin = self.make_plugin()
+        state = plugin.prepare(self.filepath)
+        _, fingerprint = RoughnessCorrectionUtilities.load(self.filepath)
+        self.assertEqual(fingerprint, plugin.ancillary_fingerprint())
+        self.assertArrayEqual(state.modoro,
+                              self.multip_hc_rc.moro_cube.data)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -424,6 +424,126 @@ class Test_find_all_routes(IrisTest):
         self.assertListEqual(result, expected_nodes)
 
 
+class Test_compile_decision_tree(IrisTest):
+
+    """Test the compile_decision_tree method ."""
+
+    def setUp(self):
+        """ Setup testing queries """
+        graph = {'start_node': ['success_1', 'fail_0'],
+                 'success_1': ['success_1_1', 'fail_1_0'],
+                 'fail_0': ['success_0_1', 3],
+                 'success_1_1': [1, 2],
+                 'fail_1_0': [2, 4],
+                 'success_0_1': [5, 'fail_1_0']}
+        self.queries = {
+            key: {'succeed': value[0], 'fail': value[1]}
+            for key, value in graph.items()}
+
+    def test_basic(self):
+        """Test compile_decision_tree returns every node with its succeed
+           and fail nodes, in an order where each node follows all the
+           nodes that lead to it."""
+        plugin = WeatherSymbols()
+        result = plugin.compile_decision_tree(self.queries, 'start_node')
+        self.assertIsInstance(result, list)
+        self.assertEqual(len(result), len(self.queries))
+        nodes = [item[0] for item in result]
+        for node, succeed, fail in result:
+            self.assertEqual(succeed, self.queries[node]['succeed'])
+            self.assertEqual(fail, self.queries[node]['fail'])
+            for next_node in [succeed, fail]:
+                if next_node in nodes:
+                    self.assertLess(nodes.index(node),
+                                    nodes.index(next_node))
+
+    def test_unreachable_nodes(self):
+        """Test compile_decision_tree only includes the nodes that can be
+           reached from the start node."""
+        plugin = WeatherSymbols()
+        result = plugin.compile_decision_tree(self.queries, 'fail_0')
+        expected = [('fail_0', 'success_0_1', 3),
+                    ('success_0_1', 5, 'fail_1_0'),
+                    ('fail_1_0', 2, 4)]
+        self.assertListEqual(result, expected)
+
+    def test_raises_error_loop(self):
+        """Test compile_decision_tree raises an error if the tree contains
+           a loop."""
+        plugin = WeatherSymbols()
+        self.queries['fail_1_0']['fail'] = 'start_node'
+        msg = 'decision tree contains a loop'
+        with self.assertRaisesRegexp(ValueError, msg):
+            plugin.compile_decision_tree(self.queries, 'start_node')
+
+
+class Test_evaluate_condition_chain(IrisTest):
+
+    """Test the evaluate_condition_chain method ."""
+
+    def setUp(self):
+        """ Set up cubes and queries for testing"""
+        self.cubes = set_up_wxcubes()
+        self.query = {
+            'succeed': 'heavy_precipitation',
+            'fail': 'any_precipitation',
+            'probability_thresholds': [0.5, 0.5],
+            'threshold_condition': '>=',
+            'condition_combination': 'OR',
+            'diagnostic_fields': ['probability_of_rainfall_rate',
+                                  'probability_of_lwe_snowfall_rate'],
+            'diagnostic_thresholds': [AuxCoord(8.33333333e-09, units='m s-1'),
+                                      AuxCoord(8.33333333e-09, units='m s-1')],
+            'diagnostic_conditions': ['above', 'above']}
+
+    def test_basic(self):
+        """Test evaluate_condition_chain returns the expected boolean array
+           and stores the extracted data in the cache."""
+        plugin = WeatherSymbols()
+        data_cache = {}
+        result = plugin.evaluate_condition_chain(
+            self.cubes, self.query, data_cache)
+        expected = np.array([[[False, False, False],
+                              [False, False, False],
+                              [True, True, True]]])
+        self.assertIsInstance(result, np.ndarray)
+        self.assertArrayEqual(result, expected)
+        self.assertEqual(len(data_cache), 2)
+
+    def test_inverted_query(self):
+        """Test evaluate_condition_chain for the inverted query returns the
+           opposite result."""
+        plugin = WeatherSymbols()
+        (self.query['threshold_condition'],
+         self.query['condition_combination']) = (
+             plugin.invert_condition(self.query))
+        result = plugin.evaluate_condition_chain(self.cubes, self.query, {})
+        expected = np.array([[[True, True, True],
+                              [True, True, True],
+                              [False, False, False]]])
+        self.assertArrayEqual(result, expected)
+
+    def test_diagnostic_gamma(self):
+        """Test evaluate_condition_chain when fields are subtracted using
+           the gamma factor."""
+        plugin = WeatherSymbols()
+        threshold = AuxCoord(8.33333333e-09, units='m s-1')
+        self.query.update({
+            'probability_thresholds': [0.],
+            'threshold_condition': '<',
+            'condition_combination': '',
+            'diagnostic_fields': [['probability_of_lwe_snowfall_rate',
+                                   'probability_of_rainfall_rate']],
+            'diagnostic_gamma': [0.7],
+            'diagnostic_thresholds': [[threshold, threshold]],
+            'diagnostic_conditions': [['above', 'above']]})
+        result = plugin.evaluate_condition_chain(self.cubes, self.query, {})
+        expected = np.array([[[False, False, False],
+                              [False, False, False],
+                              [True, True, True]]])
+        self.assertArrayEqual(result, expected)
+
+
 class Test_create_symbol_cube(IrisTest):
 
     """Test the create_symbol_cube method ."""
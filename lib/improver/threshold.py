@@ -31,11 +31,13 @@
 """Module containing thresholding classes."""
 
 
+import copy
+import numbers
+
 import numpy as np
 import iris
 from cf_units import Unit
 from improver.spotdata.extract_data import ExtractData
-from improver.utilities.rescale import rescale
 
 
 class BasicThreshold(object):
@@ -51,7 +53,7 @@ class BasicThreshold(object):
 
     def __init__(self, thresholds, fuzzy_factor=None,
                  fuzzy_bounds=None,
-                 below_thresh_ok=False):
+                 below_thresh_ok=False, threshold_chunk_size=None):
         """
         Set up for processing an in-or-out of threshold field.
 
@@ -74,8 +76,14 @@ class BasicThreshold(object):
             below_thresh_ok (boolean):
                 True to count points as significant if *below* the threshold,
                 False to count points as significant if *above* the threshold.
+            threshold_chunk_size (int):
+                The maximum number of thresholds to evaluate at once. This
+                limits the size of the temporary arrays used to calculate the
+                truth values. If None, all thresholds are evaluated at once.
 
         Raises:
+            ValueError: If the threshold_chunk_size is not None or a positive
+                        integer.
             ValueError: If a threshold of 0.0 is requested when using a fuzzy
                         factor.
             ValueError: If the fuzzy_factor is not greater than 0 and less
@@ -128,21 +136,106 @@ class BasicThreshold(object):
             assert bounds[1] >= thr, bounds_msg
 
         self.below_thresh_ok = below_thresh_ok
+        if threshold_chunk_size is not None and (
+                not isinstance(threshold_chunk_size, numbers.Integral) or
+                isinstance(threshold_chunk_size, bool) or
+                threshold_chunk_size < 1):
+            raise ValueError(
+                "Invalid threshold_chunk_size: must be a positive integer "
+                "or None: {}".format(threshold_chunk_size))
+        self.threshold_chunk_size = threshold_chunk_size
 
     def __repr__(self):
         """Represent the configured plugin instance as a string."""
         return (
             '<BasicThreshold: thresholds {}, ' +
             'fuzzy_bounds {}, ' +
-            'below_thresh_ok: {}>'
+            'below_thresh_ok: {}, ' +
+            'threshold_chunk_size: {}>'
         ).format(self.thresholds, self.fuzzy_bounds,
-                 self.below_thresh_ok)
+                 self.below_thresh_ok, self.threshold_chunk_size)
+
+    def _truth_values(self, data, thresholds, bounds, out):
+        """
+        Calculate the truth values of the data for a set of thresholds in a
+        single vectorised operation, by broadcasting the thresholds and
+        their fuzzy bounds along a new leading dimension.
+
+        Args:
+            data (numpy.ndarray):
+                The data to be thresholded.
+            thresholds (numpy.ndarray):
+                1D array of thresholds.
+            bounds (numpy.ndarray):
+                Array of shape (len(thresholds), 2) containing the lower and
+                upper fuzzy bounds for each threshold.
+            out (numpy.ndarray):
+                Array of shape (len(thresholds),) + data.shape into which the
+                truth values are written.
+        """
+        shape = (-1,) + (1,) * data.ndim
+        threshold = thresholds.reshape(shape)
+        lower = bounds[:, 0].reshape(shape)
+        upper = bounds[:, 1].reshape(shape)
+        crisp = lower == upper
+        # Use a dummy width for crisp thresholds, which are set below.
+        lower_width = np.where(crisp, 1., threshold - lower)
+        upper_width = np.where(crisp, 1., upper - threshold)
+
+        truth_value = np.where(
+            data < threshold,
+            np.clip((data - lower) * 0.5 / lower_width, 0., 0.5),
+            np.clip((data - threshold) * 0.5 / upper_width + 0.5, 0.5, 1.))
+        truth_value = np.where(crisp, data > threshold, truth_value)
+        if self.below_thresh_ok:
+            truth_value = 1. - truth_value
+        out[...] = truth_value
+
+    @staticmethod
+    def _create_threshold_cube(input_cube, data, thresholds):
+        """
+        Create a cube with a leading threshold dimension, copying the
+        metadata and coordinates from the input cube.
+
+        Args:
+            input_cube (iris.cube.Cube):
+                The cube that has been thresholded.
+            data (numpy.ndarray):
+                The truth values, with a leading threshold dimension.
+            thresholds (numpy.ndarray):
+                1D array of thresholds.
+
+        Returns:
+            cube (iris.cube.Cube):
+                Cube containing the truth values.
+        """
+        metadata_dict = copy.deepcopy(input_cube.metadata._asdict())
+        cube = iris.cube.Cube(data, **metadata_dict)
+        cube.add_dim_coord(
+            iris.coords.DimCoord(
+                thresholds, long_name="threshold", units=input_cube.units), 0)
+        coord_mapping = {}
+        for coord in input_cube.dim_coords:
+            dim, = input_cube.coord_dims(coord)
+            coord_mapping[id(coord)] = coord.copy()
+            cube.add_dim_coord(coord_mapping[id(coord)], dim + 1)
+        for coord in input_cube.aux_coords:
+            dims = [dim + 1 for dim in input_cube.coord_dims(coord)]
+            coord_mapping[id(coord)] = coord.copy()
+            cube.add_aux_coord(coord_mapping[id(coord)], dims)
+        for factory in input_cube.aux_factories:
+            cube.add_aux_factory(factory.updated(coord_mapping))
+        return cube
 
     def process(self, input_cube):
         """Convert each point to a truth value based on provided threshold
         values. The truth value may or may not be fuzzy depending upon if
         fuzzy_bounds are supplied.
 
+        All thresholds are evaluated against the data together and written
+        into a single float32 array, optionally in chunks of
+        threshold_chunk_size thresholds.
+
         Args:
             input_cube (iris.cube.Cube):
                 Cube to threshold. The code is dimension-agnostic.
@@ -161,41 +254,42 @@ class BasicThreshold(object):
 
         Raises:
             ValueError: if a np.nan value is detected within the input cube.
+            ValueError: if a threshold is equal to only one of its fuzzy
+                        bounds.
 
         """
-        thresholded_cubes = iris.cube.CubeList()
         if np.isnan(input_cube.data).any():
             raise ValueError("Error: NaN detected in input cube data")
 
-        for threshold, bounds in zip(self.thresholds, self.fuzzy_bounds):
-            cube = input_cube.copy()
-            if bounds[0] == bounds[1]:
-                truth_value = cube.data > threshold
-            else:
-                truth_value = np.where(
-                    cube.data < threshold,
-                    rescale(cube.data,
-                            data_range=(bounds[0], threshold),
-                            scale_range=(0., 0.5),
-                            clip=True),
-                    rescale(cube.data,
-                            data_range=(threshold, bounds[1]),
-                            scale_range=(0.5, 1.),
-                            clip=True),
-                )
-            truth_value = truth_value.astype(np.float64)
-            if self.below_thresh_ok:
-                truth_value = 1. - truth_value
-            cube.data = truth_value
-
-            coord = iris.coords.DimCoord(threshold,
-                                         long_name="threshold",
-                                         units=cube.units)
-            cube.add_aux_coord(coord)
-            cube = iris.util.new_axis(cube, 'threshold')
-            thresholded_cubes.append(cube)
-
-        cube, = thresholded_cubes.concatenate()
+        # The threshold coordinate is in ascending order.
+        order = np.argsort(self.thresholds, kind="mergesort")
+        thresholds = np.array(self.thresholds)[order]
+        bounds = np.array(self.fuzzy_bounds, dtype=np.float64)[order]
+        for threshold, (lower, upper) in zip(thresholds, bounds):
+            if lower != upper and (threshold == lower or threshold == upper):
+                raise ValueError(
+                    "Cannot rescale a zero input range ({} -> {})".format(
+                        threshold, threshold))
+
+        data = input_cube.data
+        truth_values = np.empty(
+            (len(thresholds),) + data.shape, dtype=np.float32)
+        chunk_size = self.threshold_chunk_size
+        if chunk_size is None:
+            chunk_size = len(thresholds)
+        for start in range(0, len(thresholds), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            self._truth_values(
+                np.ma.getdata(data), thresholds[chunk], bounds[chunk],
+                truth_values[chunk])
+        if np.ma.is_masked(data):
+            truth_values = np.ma.masked_array(
+                truth_values,
+                mask=np.broadcast_to(np.ma.getmaskarray(data),
+                                     truth_values.shape).copy())
+
+        cube = self._create_threshold_cube(
+            input_cube, truth_values, thresholds)
 
         # TODO: Correct when formal cf-standards exists
         # Force the metadata to temporary conventions
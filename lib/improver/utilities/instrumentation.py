@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Opt-in instrumentation of the time and memory used by IMPROVER.
+
+When enabled, every call to the process method of a plugin, the loading
+and saving of cubes through improver.utilities.load and
+improver.utilities.save and a number of major internal stages (marked with
+:func:`instrumented`) are recorded. For each named stage the number of
+calls, the total wall and CPU times, and the peak resident memory of the
+process are accumulated, and a JSON report is written when the process
+exits.
+
+Instrumentation is enabled for the command line interfaces by setting the
+environment variable IMPROVER_INSTRUMENTATION to the path of the report,
+e.g.::
+
+    IMPROVER_INSTRUMENTATION=report.json improver threshold in.nc out.nc 280
+
+or from python by calling :func:`enable`. Each command line interface
+checks the environment variable by calling :func:`enable_from_environment`
+once it has parsed its arguments.
+
+When it is not enabled, stages marked with :func:`instrumented` are called
+directly and the process methods of plugins are left untouched. Nothing
+outside the improver package is modified in either case.
+
+The peak resident memory is a high-water mark for the whole process, so
+the increase recorded for a stage is the amount by which it raised the
+peak, rather than the memory it allocated. Cubes are loaded lazily, so the
+time taken to read data from file is mostly recorded against the stage
+that first uses it, rather than against loading.
+"""
+
+import atexit
+from collections import OrderedDict
+import functools
+import json
+import os
+import resource
+import sys
+import time
+
+#: Environment variable giving the path of the report, which enables
+#: instrumentation for the command line interfaces.
+ENVIRONMENT_VARIABLE = "IMPROVER_INSTRUMENTATION"
+
+# Accumulated statistics for each stage, or None when not enabled.
+_STAGES = None
+# The number of calls in progress for each stage, so that only the
+# outermost of any recursive calls is counted.
+_ACTIVE = {}
+# Wall time, CPU time and peak memory when instrumentation was enabled.
+_START = None
+# The path to which the report is written at exit.
+_REPORT_PATH = None
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident memory of the current process.
+
+    Returns:
+        peak (float):
+            Peak resident memory in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return peak / 1024. ** 2
+    return peak / 1024.
+
+
+def _cpu_seconds():
+    """Return the user and system CPU time used by the current process."""
+    times = os.times()
+    return times[0] + times[1]
+
+
+def is_enabled():
+    """Return True if instrumentation is enabled."""
+    return _STAGES is not None
+
+
+def enable(report_path=None):
+    """
+    Start recording the time and memory used by each stage, and instrument
+    the plugins that have been imported so far.
+
+    Keyword Args:
+        report_path (str or None):
+            Path to which the JSON report is written when the process exits.
+            If None, no report is written and the results are available
+            from :func:`report`.
+    """
+    global _STAGES, _START, _REPORT_PATH
+    if _STAGES is None:
+        _STAGES = OrderedDict()
+        _ACTIVE.clear()
+        _START = (time.time(), _cpu_seconds())
+    if report_path is not None:
+        if _REPORT_PATH is None:
+            atexit.register(_write_report_at_exit)
+        _REPORT_PATH = report_path
+    instrument_plugins()
+
+
+def disable():
+    """Stop recording and discard any results, without writing a report."""
+    global _STAGES, _START, _REPORT_PATH
+    _STAGES = None
+    _START = None
+    _REPORT_PATH = None
+
+
+def enable_from_environment():
+    """Enable instrumentation if the IMPROVER_INSTRUMENTATION environment
+    variable gives the path of a report. This is called by each command
+    line interface after parsing its arguments, by which time the plugins
+    it uses have been imported and so are instrumented."""
+    report_path = os.environ.get(ENVIRONMENT_VARIABLE)
+    if report_path:
+        enable(report_path=report_path)
+
+
+def _record(name, wall_seconds, cpu_seconds, rss_before, rss_after):
+    """Add the time and memory used by a call to the totals for a stage."""
+    stage = _STAGES.get(name)
+    if stage is None:
+        stage = _STAGES[name] = OrderedDict([
+            ("name", name), ("calls", 0), ("wall_seconds", 0.),
+            ("cpu_seconds", 0.), ("peak_rss_mb", 0.),
+            ("peak_rss_increase_mb", 0.)])
+    stage["calls"] += 1
+    stage["wall_seconds"] += wall_seconds
+    stage["cpu_seconds"] += cpu_seconds
+    stage["peak_rss_mb"] = max(stage["peak_rss_mb"], rss_after)
+    stage["peak_rss_increase_mb"] += rss_after - rss_before
+
+
+def _wrap(function, name):
+    """
+    Wrap a function so that the time and memory used by each call are
+    recorded against the named stage while instrumentation is enabled.
+
+    Args:
+        function (callable):
+            The function to be wrapped.
+        name (str):
+            The name of the stage.
+
+    Returns:
+        wrapper (callable):
+            The wrapped function.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        """Call the function, recording the resources it uses."""
+        if _STAGES is None or _ACTIVE.get(name):
+            return function(*args, **kwargs)
+        _ACTIVE[name] = True
+        rss_before = peak_rss_mb()
+        cpu_start = _cpu_seconds()
+        wall_start = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _ACTIVE[name] = False
+            if _STAGES is not None:
+                _record(name, time.time() - wall_start,
+                        _cpu_seconds() - cpu_start, rss_before,
+                        peak_rss_mb())
+    wrapper.instrumented = True
+    return wrapper
+
+
+def instrumented(name):
+    """
+    Decorator marking a function or method as a stage to be recorded when
+    instrumentation is enabled. Static methods should be decorated with
+    staticmethod outside of this decorator.
+
+    Args:
+        name (str):
+            The name under which the stage is reported, e.g.
+            "SquareNeighbourhood.mean_over_neighbourhood".
+
+    Returns:
+        decorator (callable):
+            Decorator wrapping a function.
+    """
+    return functools.partial(_wrap, name=name)
+
+
+def instrument_plugins():
+    """
+    Instrument the process method of each class, within the modules of the
+    improver package that have been imported, that defines one. This is
+    done when instrumentation is enabled and should be repeated after
+    importing further plugins. It does nothing if instrumentation is not
+    enabled.
+    """
+    if _STAGES is None:
+        return
+    for module_name, module in list(sys.modules.items()):
+        if (module is None or module_name.split(".")[0] != "improver" or
+                module_name.startswith("improver.tests")):
+            continue
+        for item in list(vars(module).values()):
+            if (isinstance(item, type) and
+                    item.__module__ == module_name and
+                    "process" in vars(item)):
+                _instrument_process(item)
+
+
+def _instrument_process(plugin_class):
+    """Wrap the process method of a plugin class, unless already done."""
+    method = vars(plugin_class)["process"]
+    function = getattr(method, "__func__", method)
+    if getattr(function, "instrumented", False):
+        return
+    wrapper = _wrap(function,
+                    "{}.process".format(plugin_class.__name__))
+    if isinstance(method, staticmethod):
+        wrapper = staticmethod(wrapper)
+    elif isinstance(method, classmethod):
+        wrapper = classmethod(wrapper)
+    setattr(plugin_class, "process", wrapper)
+
+
+def report():
+    """
+    Report the time and memory used by each stage since instrumentation
+    was enabled.
+
+    Returns:
+        result (collections.OrderedDict or None):
+            The command being run, its total wall and CPU times and peak
+            resident memory, and a list of the statistics for each stage
+            in the order in which the stages were first called. None is
+            returned if instrumentation is not enabled.
+    """
+    if _STAGES is None:
+        return None
+    return OrderedDict([
+        ("command", sys.argv),
+        ("wall_seconds", time.time() - _START[0]),
+        ("cpu_seconds", _cpu_seconds() - _START[1]),
+        ("peak_rss_mb", peak_rss_mb()),
+        ("stages", [OrderedDict(stage) for stage in _STAGES.values()])])
+
+
+def write_report(report_path):
+    """
+    Write the report as JSON.
+
+    Args:
+        report_path (str):
+            Path of the file to be written.
+    """
+    with open(report_path, "w") as report_file:
+        json.dump(report(), report_file, indent=2)
+
+
+def _write_report_at_exit():
+    """Write the report to the path given when instrumentation was
+    enabled, if it is still enabled."""
+    if _STAGES is not None and _REPORT_PATH is not None:
+        write_report(_REPORT_PATH)
@@ -28,7 +28,23 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
-"""Module for loading cubes."""
+"""Module for loading cubes.
+
+Cubes are loaded lazily by default, so the data is only read from file
+when it is accessed through cube.data. Constraints are applied before any
+data is read, and the reordering of the dimensions of a loaded cube
+transposes the deferred data without reading it.
+
+Slicing, indexing or extracting from a lazily loaded cube also keeps the
+data deferred, so a plugin that works through a cube one slice at a time
+only reads each slice as it is processed. A plugin that accesses the data
+of the whole cube reads all of it into memory. To process a cube that is
+larger than the available memory, such plugins should be applied to
+slices of the cube in turn, e.g. over realization or time.
+
+Setting no_lazy_load reads the data of each cube as it is loaded. This
+can be quicker when the whole cube will be used and fits in memory.
+"""
 
 import glob
 
@@ -36,11 +52,13 @@ import iris
 from iris.exceptions import ConstraintMismatchError
 
 from improver.utilities.cube_manipulation import enforce_coordinate_ordering
+from improver.utilities.instrumentation import instrumented
 
 iris.FUTURE.netcdf_promote = True
 
 
-def load_cube(filepath, constraints=None):
+@instrumented("load_cube")
+def load_cube(filepath, constraints=None, no_lazy_load=False):
     """Load the filepath provided using Iris into a cube.
 
     Args:
@@ -51,6 +69,10 @@ def load_cube(filepath, constraints=None):
             This can be in the form of an iris.Constraint or could be a string
             that is intended to match the name of the cube.
             The default is None.
+        no_lazy_load (bool):
+            If True, read the data into memory when the cube is loaded.
+            If False, the data remains lazy until it is accessed.
+            The default is False.
 
     Returns:
         cube (iris.cube.Cube):
@@ -66,10 +88,14 @@ def load_cube(filepath, constraints=None):
     y_name = cube.coord(axis="y").name()
     x_name = cube.coord(axis="x").name()
     cube = enforce_coordinate_ordering(cube, [y_name, x_name], anchor="end")
+    if no_lazy_load:
+        # Accessing the data reads it into memory.
+        cube.data
     return cube
 
 
-def load_cubelist(filepath, constraints=None):
+@instrumented("load_cubelist")
+def load_cubelist(filepath, constraints=None, no_lazy_load=False):
     """Load the filepath(s) provided using Iris into a cubelist.
 
     Args:
@@ -80,6 +106,10 @@ def load_cubelist(filepath, constraints=None):
             This can be in the form of an iris.Constraint or could be a string
             that is intended to match the name of the cube.
             The default is None.
+        no_lazy_load (bool):
+            If True, read the data into memory when each cube is loaded.
+            If False, the data remains lazy until it is accessed.
+            The default is False.
 
     Returns:
         cubelist (iris.cube.CubeList):
@@ -97,7 +127,8 @@ def load_cubelist(filepath, constraints=None):
     cubelist = iris.cube.CubeList([])
     for filepath in filepaths:
         try:
-            cube = load_cube(filepath, constraints=constraints)
+            cube = load_cube(filepath, constraints=constraints,
+                             no_lazy_load=no_lazy_load)
         except ConstraintMismatchError:
             continue
         cubelist.append(cube)
@@ -37,6 +37,68 @@ import iris
 from improver.utilities.cube_manipulation import sort_coord_in_cube
 
 
+def interpolate_multiple_rows(x_values, xp_values, fp_values):
+    """
+    Perform monotone piecewise-linear interpolation for many rows of data
+    at once. The result for each row is the same as calling np.interp with
+    that row of x_values, xp_values and fp_values, so x values outside the
+    range of xp take the first or last value of fp.
+
+    Each of x_values, xp_values and fp_values may be 2d with one row per
+    interpolation, or 1d if it is shared by all the rows. The xp values
+    within each row must be monotonically increasing.
+
+    Args:
+        x_values (numpy.array):
+            1d or 2d array of the x values at which to evaluate the
+            interpolated values.
+        xp_values (numpy.array):
+            1d or 2d array of the x values of the data points, with the
+            data points along the last dimension.
+        fp_values (numpy.array):
+            1d or 2d array of the y values of the data points, with the
+            data points along the last dimension.
+    Returns:
+        result (numpy.array):
+            2d array of the interpolated values, with shape
+            (number of rows, number of x values).
+    """
+    x_values = np.asarray(x_values, dtype=np.float64)
+    xp_values = np.asarray(xp_values, dtype=np.float64)
+    fp_values = np.asarray(fp_values, dtype=np.float64)
+    num_points = xp_values.shape[-1]
+    num_rows = max(np.atleast_2d(values).shape[0]
+                   for values in [x_values, xp_values, fp_values])
+    all_x = np.broadcast_to(x_values, (num_rows, x_values.shape[-1]))
+    all_xp = np.broadcast_to(xp_values, (num_rows, num_points))
+    all_fp = np.broadcast_to(fp_values, (num_rows, num_points))
+    if num_points == 1:
+        return np.repeat(all_fp, all_x.shape[-1], axis=1)
+
+    # Find the index of the last xp value which is less than or equal to
+    # each x value. This is -1 where all the xp values are greater.
+    if xp_values.ndim == 1:
+        index = np.searchsorted(xp_values, all_x, side="right") - 1
+    else:
+        index = np.full(all_x.shape, -1, dtype=np.int64)
+        for column in range(num_points):
+            index += all_xp[:, column:column+1] <= all_x
+
+    lower = np.clip(index, 0, num_points - 2)
+    rows = np.arange(num_rows)[:, np.newaxis]
+    xp_lower = all_xp[rows, lower]
+    fp_lower = all_fp[rows, lower]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (
+            (all_fp[rows, lower + 1] - fp_lower) /
+            (all_xp[rows, lower + 1] - xp_lower))
+        result = slope * (all_x - xp_lower) + fp_lower
+    result = np.where(all_x == xp_lower, fp_lower, result)
+    result = np.where(index < 0, all_fp[:, :1], result)
+    result = np.where(index >= num_points - 1, all_fp[:, -1:], result)
+    return result
+
+
 class Integration(object):
     """Perform integration along a chosen coordinate."""
 
@@ -174,6 +236,32 @@ class Integration(object):
         integrated_cube.data = np.zeros(lower_bounds_cube.shape)
         return upper_bounds_cube, lower_bounds_cube, integrated_cube
 
+    def _layers_to_integrate(self, upper_bounds, lower_bounds):
+        """Find the layers between the upper and lower bounds that lie
+        within the start_point and end_point, if specified.
+
+        Args:
+            upper_bounds (numpy.ndarray):
+                Upper bound of each layer.
+            lower_bounds (numpy.ndarray):
+                Lower bound of each layer.
+
+        Returns:
+            included (numpy.ndarray):
+                Boolean array that is True for each layer to be integrated.
+
+        """
+        positive = self.direction_of_integration == "positive"
+        if self.start_point:
+            if positive:
+                return lower_bounds >= self.start_point
+            return upper_bounds <= self.start_point
+        if self.end_point:
+            if positive:
+                return upper_bounds <= self.end_point
+            return lower_bounds >= self.end_point
+        return np.ones(upper_bounds.shape, dtype=bool)
+
     def perform_integration(
             self, upper_bounds_cube, lower_bounds_cube, integrated_cube):
         """Perform the integration.
@@ -188,7 +276,9 @@ class Integration(object):
         summed.
 
         As the coordinate is progressively integrated, the contribution of
-        each stride is cumulatively summed.
+        each stride is cumulatively summed. The contributions of all the
+        layers are calculated at once, with the layers along the leading
+        dimension of the integrated cube.
 
         Args:
             upper_bounds_cube (iris.cube.Cube):
@@ -206,53 +296,12 @@ class Integration(object):
                 Cube containing the output from the integration.
 
         """
-        # Create a zip for looping over.
-        levels_tuple = zip(
-            upper_bounds_cube.slices_over(self.coord_name_to_integrate),
-            lower_bounds_cube.slices_over(self.coord_name_to_integrate),
-            integrated_cube.slices_over(self.coord_name_to_integrate))
-
-        # Perform the integration
-        stride_sum = 0
-        integrated_cubelist = iris.cube.CubeList([])
-        for (upper_bounds_slice, lower_bounds_slice,
-             integrated_slice) in levels_tuple:
-            upper_bound = (
-                upper_bounds_slice.coord(
-                    self.coord_name_to_integrate).points.item())
-            lower_bound = (
-                lower_bounds_slice.coord(
-                    self.coord_name_to_integrate).points.item())
-            if not self.start_point and not self.end_point:
-                pass
-            elif self.start_point:
-                if self.direction_of_integration == "positive":
-                    if lower_bound < self.start_point:
-                        continue
-                elif self.direction_of_integration == "negative":
-                    if upper_bound > self.start_point:
-                        continue
-            elif self.end_point:
-                if self.direction_of_integration == "positive":
-                    if upper_bound > self.end_point:
-                        continue
-                elif self.direction_of_integration == "negative":
-                    if lower_bound < self.end_point:
-                        continue
-            stride = np.abs(upper_bound - lower_bound)
-            upper_half_of_stride = upper_bounds_slice.data * 0.0
-            uindex = np.where(upper_bounds_slice.data > 0)
-            upper_half_of_stride[uindex] = (upper_bounds_slice.data[uindex] *
-                                            0.5 * stride)
-            lindex = np.where(lower_bounds_slice.data > 0)
-            lower_half_of_stride = lower_bounds_slice.data * 0.0
-            lower_half_of_stride[lindex] = (lower_bounds_slice.data[lindex] *
-                                            0.5 * stride)
-            stride_sum += lower_half_of_stride + upper_half_of_stride
-            integrated_slice.data = stride_sum
-            integrated_cubelist.append(integrated_slice.copy())
-
-        if len(integrated_cubelist) == 0:
+        coord_name = self.coord_name_to_integrate
+        upper_bounds = upper_bounds_cube.coord(coord_name).points
+        lower_bounds = lower_bounds_cube.coord(coord_name).points
+
+        included = self._layers_to_integrate(upper_bounds, lower_bounds)
+        if not included.any():
             msg = ("No integration could be performed for "
                    "coord_to_integrate: {}, start_point: {}, end_point: {}, "
                    "direction_of_integration: {}. "
@@ -261,8 +310,52 @@ class Integration(object):
                        self.end_point, self.direction_of_integration))
             raise ValueError(msg)
 
-        # Merge resulting cubes back together
-        integrated_cube = integrated_cubelist.merge_cube()
+        # Arrange the data with the layers along the leading dimension.
+        layers = []
+        for cube in [upper_bounds_cube, lower_bounds_cube]:
+            dims = cube.coord_dims(coord_name)
+            if dims:
+                layers.append(np.moveaxis(cube.data, dims[0], 0)[included])
+            else:
+                layers.append(cube.data[np.newaxis])
+        upper_data, lower_data = layers
+        stride = np.abs(upper_bounds - lower_bounds)[included]
+        stride = stride.reshape((-1,) + (1,) * (upper_data.ndim - 1))
+
+        # Only positive values contribute to the integral.
+        half_strides = []
+        for data in [upper_data, lower_data]:
+            no_contribution = data * 0.0
+            half_strides.append(
+                np.where(data > 0, data * 0.5 * stride,
+                         no_contribution).astype(no_contribution.dtype))
+        upper_half_of_stride, lower_half_of_stride = half_strides
+        stride_sum = np.cumsum(lower_half_of_stride + upper_half_of_stride,
+                               axis=0)
+
+        dims = integrated_cube.coord_dims(coord_name)
+        if not dims:
+            return integrated_cube.copy(data=stride_sum[0])
+        if dims[0] != 0:
+            integrated_cube = integrated_cube.copy()
+            integrated_cube.transpose(
+                [dims[0]] + [dim for dim in range(integrated_cube.ndim)
+                             if dim != dims[0]])
+        # Order the layers by increasing coordinate value, as is done when
+        # merging cubes.
+        indices = np.flatnonzero(included)
+        order = np.argsort(
+            integrated_cube.coord(coord_name).points[indices],
+            kind="mergesort")
+        indices = indices[order]
+        stride_sum = stride_sum[order]
+        if len(indices) == 1:
+            # A single layer is returned with a scalar coordinate.
+            integrated_cube = integrated_cube[indices[0]]
+            integrated_cube.data = stride_sum[0]
+        else:
+            integrated_cube = integrated_cube[indices]
+            integrated_cube.data = stride_sum
         return integrated_cube
 
     def process(self, cube):
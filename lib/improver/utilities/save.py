@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Module for saving cubes and files."""
+
+from contextlib import contextmanager
+import os
+
+import iris
+
+from improver.utilities.instrumentation import instrumented
+
+
+@instrumented("save_cube")
+def save_cube(cubes, filepath, **kwargs):
+    """
+    Save a cube or cubes to file with iris.save, recording the time and
+    memory used when instrumentation is enabled.
+
+    Args:
+        cubes (iris.cube.Cube or iris.cube.CubeList):
+            Cube or cubes to be saved.
+        filepath (str):
+            Path of the file to write.
+
+    Keyword Args:
+        kwargs:
+            Keyword arguments passed to iris.save, e.g.
+            unlimited_dimensions.
+
+    """
+    iris.save(cubes, filepath, **kwargs)
+
+
+@contextmanager
+def atomic_write(filepath, mode='w'):
+    """
+    Open a file for writing so that it only replaces filepath once it has
+    been written in full. The file is written to a temporary path in the
+    same directory and then renamed to filepath, so that other processes
+    never read a partially written file. If writing fails, the temporary
+    file is removed and filepath is left unchanged.
+
+    Args:
+        filepath (str):
+            Path of the file to write.
+
+    Keyword Args:
+        mode (str):
+            Mode in which to open the file, e.g. 'w' for text or 'wb' for
+            binary data such as that written by np.savez.
+
+    Yields:
+        output_file (file):
+            The open temporary file to write to.
+
+    """
+    temporary_filepath = '{}.{}.tmp'.format(filepath, os.getpid())
+    try:
+        with open(temporary_filepath, mode) as output_file:
+            yield output_file
+    except BaseException:
+        if os.path.exists(temporary_filepath):
+            os.remove(temporary_filepath)
+        raise
+    os.rename(temporary_filepath, filepath)
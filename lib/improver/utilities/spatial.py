@@ -416,3 +416,138 @@ def get_nearest_coords(cube, latitude, longitude, iname, jname):
     i_latitude = cube.coord(iname).nearest_neighbour_index(latitude)
     j_longitude = cube.coord(jname).nearest_neighbour_index(longitude)
     return i_latitude, j_longitude
+
+
+def lat_lon_transform_points(trg_crs, latitudes, longitudes):
+    """
+    Transforms arrays of latitude/longitude coordinates from a
+    latitude/longitude grid into an alternative projection defined by trg_crs.
+    This is equivalent to calling lat_lon_transform for each coordinate pair,
+    but transforms all the coordinates in a single call.
+
+    Args:
+        trg_crs (cartopy.crs/None):
+            Target coordinate system in cartopy format or None.
+
+        latitudes (numpy.array):
+            Latitude coordinates.
+
+        longitudes (numpy.array):
+            Longitude coordinates.
+
+    Returns:
+        x, y (numpy.arrays):
+            Longitudes and latitudes transformed into the target coordinate
+            system.
+
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if trg_crs is None:
+        return longitudes, latitudes
+    transformed = trg_crs.transform_points(ccrs.PlateCarree(), longitudes,
+                                           latitudes)
+    return transformed[..., 0], transformed[..., 1]
+
+
+def nearest_neighbour_indices(coord, values, chunk_size=1000):
+    """
+    Find the index of the cell of a one-dimensional coordinate nearest to
+    each of an array of values. This gives the same result as calling the
+    iris coord.nearest_neighbour_index method for each value, including the
+    use of bounds and the wrapping of circular coordinates, but compares the
+    values with all the cells in chunks rather than one value at a time.
+
+    Args:
+        coord (iris.coords.Coord):
+            One-dimensional coordinate to be searched.
+
+        values (numpy.array):
+            Values for which the nearest cell is required.
+
+    Keyword Args:
+        chunk_size (int):
+            The maximum number of values compared with the cells at once.
+
+    Returns:
+        indices (numpy.array):
+            Index of the nearest cell to each value.
+
+    """
+    values = np.atleast_1d(np.asarray(values))
+    points = coord.points
+    bounds = coord.bounds if coord.has_bounds() else np.array([])
+    if getattr(coord, 'circular', False):
+        wrap_modulus = coord.units.modulus
+        wrap_origin = np.min(np.hstack((points, bounds.flatten())))
+        values = wrap_origin + (values - wrap_origin) % wrap_modulus
+
+    if coord.has_bounds():
+        # Make the bounds contiguous as iris does, so that each value is
+        # within at least one cell once the end cells have been extended.
+        increasing = coord.bounds[0, 1] > coord.bounds[0, 0]
+        bounds = bounds.astype(np.result_type(bounds, values))
+        sort_inds = np.argsort(np.mean(bounds, axis=1))
+        bounds = bounds[sort_inds]
+        if increasing:
+            mid_bounds = 0.5 * (bounds[:-1, 1] + bounds[1:, 0])
+            bounds[:-1, 1] = mid_bounds
+            bounds[1:, 0] = mid_bounds
+        else:
+            mid_bounds = 0.5 * (bounds[:-1, 0] + bounds[1:, 1])
+            bounds[:-1, 0] = mid_bounds
+            bounds[1:, 1] = mid_bounds
+    else:
+        index_offset = 0
+        if getattr(coord, 'circular', False):
+            if points[-1] >= points[0]:
+                points = np.hstack((points, points[0] + wrap_modulus))
+            else:
+                index_offset = 1
+                points = np.hstack((points[-1] + wrap_modulus, points))
+
+    indices = np.empty(values.shape, dtype=np.int64)
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size, np.newaxis]
+        if coord.has_bounds():
+            lower = np.repeat(bounds[np.newaxis, :, 0], len(chunk), axis=0)
+            upper = np.repeat(bounds[np.newaxis, :, 1], len(chunk), axis=0)
+            lower[:, 0] = np.minimum(chunk[:, 0], lower[:, 0])
+            upper[:, -1] = np.maximum(chunk[:, 0], upper[:, -1])
+            inside_cells = ((chunk >= np.minimum(lower, upper)) &
+                            (chunk <= np.maximum(lower, upper)))
+            # argmax returns the first occurring cell containing the value.
+            indices[start:start + chunk_size] = (
+                sort_inds[np.argmax(inside_cells, axis=1)])
+        else:
+            # argmin returns the first occurring nearest point.
+            indices[start:start + chunk_size] = (
+                (np.argmin(np.abs(points - chunk), axis=1) - index_offset) %
+                coord.shape[0])
+    return indices
+
+
+def get_nearest_coords_vectorised(cube, latitudes, longitudes, iname, jname):
+    """
+    Find the nearest grid points to arrays of latitude-longitude positions.
+    This is equivalent to calling get_nearest_coords for each position.
+
+    Args:
+        cube (iris.cube.Cube):
+            Cube containing a representative grid.
+
+        latitudes/longitudes (numpy.arrays):
+            Latitude/longitude coordinates of spot data sites of interest.
+
+        iname/jname (strings):
+            Strings giving the names of the y/x coordinates to be searched.
+
+    Returns:
+        i_latitudes/j_longitudes (numpy.arrays):
+            Grid coordinates of the nearest grid points to the spot data
+            sites.
+
+    """
+    i_latitudes = nearest_neighbour_indices(cube.coord(iname), latitudes)
+    j_longitudes = nearest_neighbour_indices(cube.coord(jname), longitudes)
+    return i_latitudes, j_longitudes
@@ -32,7 +32,9 @@
 
 
 import copy
+import hashlib
 import itertools
+import os
 
 from cf_units import Unit
 import iris
@@ -40,6 +42,7 @@ from iris.exceptions import CoordinateNotFoundError
 import numpy as np
 
 from improver.constants import RMDI
+from improver.utilities.save import atomic_write
 
 
 # Scale parameter to determine reference height
@@ -130,8 +133,16 @@ class RoughnessCorrectionUtilities(object):
      * height level 3D/ 1D grid
      * windspeed 3D field on height level 3D grid (from above).
 
+    The fields derived from the ancillaries can be saved to a file with
+    save, and an instance recreated from that file with load.
+
     """
 
+    # Ancillary and derived fields stored by save, in addition to dx_min
+    # and dx_max.
+    state_names = ["a_over_s", "z_0", "pporo", "modoro", "h_over_2",
+                   "hcmask", "rcmask", "wavenum", "h_ref", "h_at0"]
+
     def __init__(self, a_over_s, sigma, z_0, pporo, modoro, ppres, modres):
         """Set up roughness and height correction.
 
@@ -176,6 +187,56 @@ class RoughnessCorrectionUtilities(object):
         self._refinemask()  # HC mask needs to be updated for missing orography
         self.h_at0 = self._delta_height()  # pp orography - model orography
 
+    def save(self, filepath, fingerprint=""):
+        """Save the ancillary and derived fields to a file.
+
+        Args:
+            filepath (str):
+                Path of the numpy .npz file to write.
+
+        Keyword Args:
+            fingerprint (str):
+                Identifies the ancillary fields the state was derived from.
+                It is stored in the file and returned by load.
+
+        """
+        state = {}
+        for name in self.state_names:
+            if getattr(self, name) is not None:
+                state[name] = getattr(self, name)
+        with atomic_write(filepath, mode="wb") as output_file:
+            np.savez(output_file, dx_min=self.dx_min, dx_max=self.dx_max,
+                     fingerprint=fingerprint, **state)
+
+    @classmethod
+    def load(cls, filepath):
+        """Create an instance from the fields in a file written by save.
+
+        Args:
+            filepath (str):
+                Path of the numpy .npz file to read.
+
+        Returns:
+            (tuple) : tuple containing:
+                **utilities** (RoughnessCorrectionUtilities):
+                    Instance holding the saved fields.
+                **fingerprint** (str):
+                    Fingerprint of the ancillary fields saved with the
+                    fields.
+
+        """
+        utilities = cls.__new__(cls)
+        with np.load(filepath) as state:
+            for name in cls.state_names:
+                if name in state.files:
+                    setattr(utilities, name, state[name])
+                else:
+                    setattr(utilities, name, None)
+            utilities.dx_min = float(state["dx_min"])
+            utilities.dx_max = float(state["dx_max"])
+            fingerprint = str(state["fingerprint"])
+        return utilities, fingerprint
+
     def _refinemask(self):
         """Remask over RMDI and NaN orography.
 
@@ -651,6 +712,70 @@ class RoughnessCorrection(object):
         self.y_name = None
         self.z_name = None
         self.t_name = None
+        self.ancillary_state = None
+
+    def ancillary_fingerprint(self):
+        """Construct a fingerprint of the ancillary fields and resolutions
+        from which the roughness and height correction state is derived.
+
+        Returns:
+            string:
+                A hexadecimal digest identifying the ancillaries.
+
+        """
+        fingerprint = hashlib.sha1()
+        for cube in [self.a_over_s, self.sigma, self.z_0, self.pp_oro,
+                     self.model_oro]:
+            if cube is None:
+                fingerprint.update(b"None")
+                continue
+            data = np.ascontiguousarray(cube.data)
+            fingerprint.update("{}{}".format(
+                data.dtype, data.shape).encode("utf-8"))
+            fingerprint.update(data.tobytes())
+        fingerprint.update("{!r},{!r}".format(
+            self.ppres, self.modres).encode("utf-8"))
+        return fingerprint.hexdigest()
+
+    def prepare(self, filepath=None):
+        """Derive the state used for the roughness and height corrections
+        from the ancillary fields. This is then used for every wind field
+        processed by this instance, rather than being derived again.
+
+        If a filepath is given, the state is loaded from that file if it
+        was saved from the same ancillary fields and resolutions. Otherwise
+        the state is derived and saved to the file for use by later runs.
+
+        Keyword Args:
+            filepath (str or None):
+                Path of a numpy .npz file in which the state is stored.
+
+        Returns:
+            RoughnessCorrectionUtilities:
+                The state derived from the ancillary fields.
+
+        """
+        if filepath is not None:
+            fingerprint = self.ancillary_fingerprint()
+            if os.path.isfile(filepath):
+                state, saved_fingerprint = RoughnessCorrectionUtilities.load(
+                    filepath)
+                if saved_fingerprint == fingerprint:
+                    self.ancillary_state = state
+                    return state
+        if self.z_0 is None:
+            z0_data = None
+        else:
+            # RoughnessCorrectionUtilities sets the roughness at sea points,
+            # so pass a copy to leave the ancillary and its fingerprint alone.
+            z0_data = self.z_0.data.copy()
+        state = RoughnessCorrectionUtilities(
+            self.a_over_s.data, self.sigma.data, z0_data, self.pp_oro.data,
+            self.model_oro.data, self.ppres, self.modres)
+        if filepath is not None:
+            state.save(filepath, fingerprint)
+        self.ancillary_state = state
+        return state
 
     def find_coord_names(self, cube):
         """Extract x, y, z, and time coordinate names.
@@ -884,6 +1009,9 @@ class RoughnessCorrection(object):
     def process(self, input_cube):
         """Adjust the 4d wind field - cube - (x, y, z including times).
 
+        The state derived from the ancillary fields is prepared on the first
+        call, if prepare has not already been called, and reused thereafter.
+
         Args:
             input_cube (iris.cube.Cube):
                 The wind cube to be operated upon. Should be wind speed on
@@ -910,13 +1038,9 @@ class RoughnessCorrection(object):
         else:
             input_cube.transpose([ywp, xwp, zwp, twp])  # problems with slices
         rchc_list = iris.cube.CubeList()
-        if self.z_0 is None:
-            z0_data = None
-        else:
-            z0_data = self.z_0.data
-        roughness_correction = RoughnessCorrectionUtilities(
-            self.a_over_s.data, self.sigma.data, z0_data, self.pp_oro.data,
-            self.model_oro.data, self.ppres, self.modres)
+        if self.ancillary_state is None:
+            self.prepare()
+        roughness_correction = self.ancillary_state
         self.check_wind_ancil(xwp, ywp)
         hld = self.find_heightgrid(input_cube)
         for time_slice in input_cube.slices_over("time"):
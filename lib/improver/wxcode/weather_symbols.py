@@ -33,12 +33,18 @@
 
 import numpy as np
 import copy
+import operator
 import iris
 
 from improver.wxcode.wxcode_utilities import (add_wxcode_metadata,
                                               expand_nested_lists)
 from improver.wxcode.wxcode_decision_tree import wxcode_decision_tree
 
+# Comparison functions corresponding to the threshold conditions that may
+# be used in the decision tree.
+COMPARISON_OPERATORS = {'<': operator.lt, '<=': operator.le,
+                        '>': operator.gt, '>=': operator.ge}
+
 
 class WeatherSymbols(object):
     """
@@ -351,6 +357,138 @@ class WeatherSymbols(object):
                 routes.extend(newroutes)
         return routes
 
+    @staticmethod
+    def compile_decision_tree(queries, start):
+        """
+        Compile the decision tree into an evaluation plan, in which every
+        node is listed after all of the nodes that lead to it. Following
+        the plan in order, each node only needs to be evaluated once,
+        however many routes pass through it.
+
+        Args:
+            queries (dict):
+                The decision tree queries, keyed by node name.
+            start (string):
+                The node name of the tree root (currently always
+                heavy_precipitation).
+
+        Returns:
+            plan (list):
+                A list of tuples of (node name, succeed, fail) for each node
+                that can be reached from the tree root, where succeed and
+                fail are the next node names or weather symbol codes.
+
+        Raises:
+            ValueError: If the decision tree contains a loop.
+        """
+        visiting = set()
+        visited = set()
+        post_order = []
+
+        def _visit(node):
+            """Add the node and the nodes that follow it to the post order.
+
+            Args:
+                node (string or int): The node name or weather symbol code.
+            """
+            if node in visited or node not in queries:
+                return
+            if node in visiting:
+                msg = ('Weather symbols decision tree contains a loop '
+                       'through node: {}'.format(node))
+                raise ValueError(msg)
+            visiting.add(node)
+            for next_node in [queries[node]['succeed'],
+                              queries[node]['fail']]:
+                _visit(next_node)
+            visiting.remove(node)
+            visited.add(node)
+            post_order.append(node)
+
+        _visit(start)
+        return [(node, queries[node]['succeed'], queries[node]['fail'])
+                for node in reversed(post_order)]
+
+    def extract_threshold_data(self, cubes, diagnostic, threshold,
+                               data_cache):
+        """
+        Extract the data for a diagnostic at a given threshold from the
+        input cubes, reusing data that has already been extracted.
+
+        Args:
+            cubes (iris.cube.CubeList):
+                A cubelist containing the diagnostics required for the
+                weather symbols decision tree.
+            diagnostic (string):
+                The name of the diagnostic to be extracted.
+            threshold (iris.coords.AuxCoord):
+                The threshold within the diagnostic cube that is needed.
+            data_cache (dict):
+                A dictionary of the data already extracted, keyed by
+                diagnostic name and threshold value. This is updated in place.
+
+        Returns:
+            data (numpy.array):
+                The data for the diagnostic at the given threshold.
+        """
+        threshold = threshold.points.item()
+        key = (diagnostic, threshold)
+        if key not in data_cache:
+            constraint = iris.Constraint(
+                name=diagnostic,
+                threshold=lambda cell: (
+                    threshold * (1. - self.float_tolerance) < cell <
+                    threshold * (1. + self.float_tolerance)))
+            data_cache[key] = cubes.extract(constraint)[0].data
+        return data_cache[key]
+
+    def evaluate_condition_chain(self, cubes, test_conditions, data_cache):
+        """
+        Evaluate all the conditions specified in a single query, combining
+        them as for the condition chain from create_condition_chain.
+
+        Args:
+            cubes (iris.cube.CubeList):
+                A cubelist containing the diagnostics required for the
+                weather symbols decision tree.
+            test_conditions (dict):
+                A query from the decision tree.
+            data_cache (dict):
+                A dictionary of the data already extracted, keyed by
+                diagnostic name and threshold value. This is updated in place.
+
+        Returns:
+            result (numpy.array):
+                A boolean array that is True where the query is satisfied.
+                Points that are masked in any of the data are False.
+        """
+        comparison = COMPARISON_OPERATORS[
+            test_conditions['threshold_condition']]
+        gammas = test_conditions.get('diagnostic_gamma')
+        result = None
+        for index, (diagnostic, p_threshold, d_threshold) in enumerate(zip(
+                test_conditions['diagnostic_fields'],
+                test_conditions['probability_thresholds'],
+                test_conditions['diagnostic_thresholds'])):
+            if isinstance(diagnostic, list):
+                data = (
+                    self.extract_threshold_data(
+                        cubes, diagnostic[0], d_threshold[0], data_cache) -
+                    self.extract_threshold_data(
+                        cubes, diagnostic[1], d_threshold[1], data_cache) *
+                    gammas[index])
+            else:
+                data = self.extract_threshold_data(
+                    cubes, diagnostic, d_threshold, data_cache)
+            condition = comparison(data, p_threshold)
+            if result is None:
+                result = condition
+            elif test_conditions['condition_combination'] == 'OR':
+                result = result | condition
+            else:
+                result = result & condition
+        return np.ma.filled(result, False)
+
     @staticmethod
     def create_symbol_cube(cube):
         """
@@ -392,48 +530,40 @@ class WeatherSymbols(object):
         # Check input cubes contain required data
         self.check_input_cubes(cubes)
 
-        # Construct graph nodes dictionary
-        graph = {key: [self.queries[key]['succeed'], self.queries[key]['fail']]
-                 for key in self.queries.keys()}
-
-        # Search through tree for all leaves (weather code end points)
-        defined_symbols = []
-        for item in self.queries.itervalues():
-            for value in item.itervalues():
-                if isinstance(value, int):
-                    defined_symbols.append(value)
+        # Compile the decision tree into an ordered evaluation plan.
+        # In current decision tree start node is heavy_precipitation
+        plan = self.compile_decision_tree(self.queries,
+                                          'heavy_precipitation')
 
         # Create symbol cube
         symbols = self.create_symbol_cube(cubes[0])
 
-        # Loop over possible symbols
-        for symbol_code in defined_symbols:
-            # In current decision tree
-            # start node is heavy_precipitation
-            routes = self.find_all_routes(graph, 'heavy_precipitation',
-                                          symbol_code)
-
-            # Loop over possible routes from root to leaf
-            for route in routes:
-                conditions = []
-                for i_node in range(len(route)-1):
-                    current_node = route[i_node]
-                    current = copy.copy(self.queries[current_node])
-                    try:
-                        next_node = route[i_node+1]
-                    except KeyError:
-                        next_node = symbol_code
-
-                    if current['fail'] == next_node:
-                        (current['threshold_condition'],
-                         current['condition_combination']) = (
-                             self.invert_condition(current))
-
-                    conditions.extend(self.create_condition_chain(current))
-
-                test_chain = self.format_condition_chain(conditions)
-
-                # Set grid locations to suitable weather symbol
-                symbols.data[np.where(eval(test_chain))] = symbol_code
+        # Follow the plan, evaluating each node once and passing on the grid
+        # locations that reach it to the succeed and fail nodes that follow.
+        # The fail case is evaluated using the inverted condition so that
+        # points that satisfy neither condition (e.g. NaN values) do not
+        # reach any weather symbol.
+        data_cache = {}
+        reached = {
+            'heavy_precipitation': np.ones(symbols.data.shape, dtype=bool)}
+        for node, succeed, fail in plan:
+            current = self.queries[node]
+            inverted = copy.copy(current)
+            (inverted['threshold_condition'],
+             inverted['condition_combination']) = (
+                 self.invert_condition(current))
+            route_mask = reached.pop(node)
+            for next_node, test_conditions in [(succeed, current),
+                                               (fail, inverted)]:
+                next_mask = route_mask & self.evaluate_condition_chain(
+                    cubes, test_conditions, data_cache)
+                if next_node in reached:
+                    reached[next_node] = reached[next_node] | next_mask
+                else:
+                    reached[next_node] = next_mask
+
+        # Set grid locations to suitable weather symbol
+        for symbol_code, symbol_mask in reached.items():
+            symbols.data[symbol_mask] = symbol_code
 
         return symbols
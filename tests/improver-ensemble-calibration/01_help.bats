@@ -35,10 +35,18 @@
   read -d '' expected <<'__HELP__' || true
 usage: improver-ensemble-calibration [-h]
                                      [--predictor_of_mean CALIBRATE_MEAN_FLAG]
+                                     [--minimisation_method MINIMISATION_METHOD]
                                      [--save_mean_variance MEAN_VARIANCE_FILE]
                                      [--num_members NUMBER_OF_MEMBERS]
                                      [--random_ordering]
                                      [--random_seed RANDOM_SEED]
+                                     [--partition_tile_size TILE_SIZE]
+                                     [--partition_mask PARTITION_MASK_FILE]
+                                     [--num_processes NUMBER_OF_PROCESSES]
+                                     [--coefficient_store COEFFICIENT_STORE_DIR]
+                                     [--max_coefficient_age HOURS]
+                                     [--training_data TRAINING_DATA_DIR]
+                                     [--training_window NUMBER_OF_FORECASTS]
                                      ENSEMBLE_CALIBRATION_METHOD
                                      UNITS_TO_CALIBRATE_IN DISTRIBUTION
                                      INPUT_FILE HISTORIC_DATA_FILE
@@ -76,6 +84,11 @@ optional arguments:
                         calibrated mean. Currently the ensemble mean ("mean")
                         and the ensemble members ("members") are supported as
                         the predictors. Default: "mean".
+  --minimisation_method MINIMISATION_METHOD
+                        The method used to minimise the CRPS when estimating
+                        the calibration coefficients. Currently "nelder-mead"
+                        and "l-bfgs-b", which uses the analytic gradient of
+                        the CRPS, are supported. Default: "nelder-mead".
   --save_mean_variance MEAN_VARIANCE_FILE
                         Option to save output mean and variance from
                         EnsembleCalibration plugin. If used, a path to save
@@ -97,6 +110,41 @@ optional arguments:
                         ensemble, or for splitting tied values within the raw
                         ensemble, so that the values from the input
                         percentiles can be ordered to match the raw ensemble.
+  --partition_tile_size TILE_SIZE
+                        Option to estimate and apply separate calibration
+                        coefficients for square tiles of TILE_SIZE x TILE_SIZE
+                        grid points. A TILE_SIZE of 1 calibrates each grid
+                        point or site separately.
+  --partition_mask PARTITION_MASK_FILE
+                        Option to estimate and apply separate calibration
+                        coefficients for each region in a NetCDF file
+                        containing an integer region label for each grid
+                        point.
+  --num_processes NUMBER_OF_PROCESSES
+                        Number of processes used to estimate the coefficients
+                        for the partitions in parallel. Default: 1.
+  --coefficient_store COEFFICIENT_STORE_DIR
+                        Option to specify a directory in which the optimised
+                        calibration coefficients are stored. If used, the
+                        estimation of the coefficients starts from the
+                        coefficients stored by the previous cycle.
+  --max_coefficient_age HOURS
+                        Option to reuse stored coefficients without estimating
+                        them again, if they were estimated for a forecast
+                        valid no more than HOURS hours before the current
+                        forecast. Requires --coefficient_store.
+  --training_data TRAINING_DATA_DIR
+                        Option to specify a directory in which a rolling
+                        window of training data is accumulated. If used, the
+                        historic forecasts and truths are added to the
+                        training data, replacing the oldest, and the
+                        coefficients are estimated from all of the accumulated
+                        training data, so the historic data files need only
+                        contain the forecasts and truths that have not yet
+                        been accumulated. Requires --training_window.
+  --training_window NUMBER_OF_FORECASTS
+                        Number of historic forecasts held in the rolling
+                        window of training data.
 __HELP__
   [[ "$output" == "$expected" ]]
 }
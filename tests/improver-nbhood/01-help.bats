@@ -38,6 +38,7 @@ usage: improver-nbhood [-h]
                        [--ens_factor ENS_FACTOR] [--weighted_mode]
                        [--sum_or_fraction {sum,fraction}] [--re_mask]
                        [--percentiles PERCENTILES [PERCENTILES ...]]
+                       [--percentile_engine PERCENTILE_ENGINE]
                        [--input_mask_filepath INPUT_MASK_FILE]
                        [--apply-recursive-filter]
                        [--input_filepath_alphas_x_cube ALPHAS_X_FILE]
@@ -107,6 +108,13 @@ optional arguments:
   --percentiles PERCENTILES [PERCENTILES ...]
                         Calculate values at the specified percentiles from the
                         neighbourhood surrounding each grid point.
+  --percentile_engine PERCENTILE_ENGINE
+                        The engine used to calculate percentiles from a
+                        neighbourhood. "roll" creates a copy of the whole
+                        field for each point in the kernel. "tiled" gathers
+                        the neighbourhood values one tile of rows at a time,
+                        which uses much less memory and is faster for large
+                        radii. Options: "roll", "tiled". Default: "roll".
   --input_mask_filepath INPUT_MASK_FILE
                         A path to an input mask NetCDF file to be used to mask
                         the input file. This is currently only supported for
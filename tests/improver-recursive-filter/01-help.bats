@@ -39,7 +39,8 @@ usage: improver-recursive-filter [-h]
                                  [--alpha_x ALPHA_X] [--alpha_y ALPHA_Y]
                                  [--iterations ITERATIONS]
                                  [--input_mask_filepath INPUT_MASK_FILE]
-                                 [--re_mask]
+                                 [--re_mask] [--engine ENGINE]
+                                 [--batch_size BATCH_SIZE]
                                  INPUT_FILE OUTPUT_FILE
 
 Run a recursive filter to convert a square neighbourhood into a Gaussian-like
@@ -75,6 +76,15 @@ optional arguments:
                         A path to an input mask NetCDF file to be used to mask
                         the input file.
   --re_mask             Re-apply mask to recursively filtered output.
+  --engine ENGINE       Engine used to apply the recursive filter. Options:
+                        'python' (reference implementation), 'vectorised'
+                        (numpy, filters stacks of slices at once) or
+                        'compiled' (numba kernel, falls back to 'vectorised'
+                        if numba is unavailable). Default: 'python'.
+  --batch_size BATCH_SIZE
+                        Maximum number of 2D slices filtered together by the
+                        'vectorised' and 'compiled' engines. Default is to
+                        filter all slices together.
 __HELP__
   [[ "$output" == "$expected" ]]
 }
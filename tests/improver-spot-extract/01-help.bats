@@ -41,6 +41,8 @@ usage: improver-spot-extract [-h]
                              [--longitudes (-180,180) [(-180,180 ...]]
                              [--altitudes ALTITUDES [ALTITUDES ...]]
                              [--multiprocess]
+                             [--neighbour_cache NEIGHBOUR_CACHE]
+                             [--rebuild_neighbour_cache]
                              config_file_path data_path ancillary_path
                              output_path
 
@@ -76,6 +78,14 @@ optional arguments:
   --altitudes ALTITUDES [ALTITUDES ...]
                         List of altitudes of sites of interest.
   --multiprocess        Process diagnostics using multiprocessing.
+  --neighbour_cache NEIGHBOUR_CACHE
+                        Path to a directory in which to cache the grid point
+                        neighbours found for the sites. Cached neighbours are
+                        reused by later runs with the same sites and ancillary
+                        data.
+  --rebuild_neighbour_cache
+                        Recompute the grid point neighbours and replace any
+                        that are cached.
 __HELP__
   [[ "$output" == "$expected" ]]
 }
@@ -44,8 +44,14 @@ Optional arguments:
 
 Arguments:
     SUBTEST         Name(s) of a subtest to run without running the rest.
-                    Valid names are: pep8, pylint, pylintE, doc, unit, cli.
-                    pep8, pylintE, doc, unit, and cli are the default tests.
+                    Valid names are: pep8, pylint, pylintE, doc, unit, cli,
+                    benchmark. pep8, pylintE, doc, unit, and cli are the
+                    default tests. benchmark times the core plugins on
+                    synthetic data and saves the results to the file given
+                    by $IMPROVER_BENCHMARK_OUTPUT (default benchmark.json in
+                    the top level directory), reporting regressions against
+                    the results in the file given by
+                    $IMPROVER_BENCHMARK_REFERENCE, if set.
     SUBCLI          Name(s) of cli subtests to run without running the rest.
                     Valid names are tasks which appear in /improver/tests/
                     without the "improver-" prefix. The default is to run all
@@ -36,6 +36,7 @@
 usage: improver-wind-downscaling [-h]
                                  [--height_levels_filepath HEIGHT_LEVELS_FILE]
                                  [--veg_roughness_filepath VEGETATIVE_ROUGHNESS_LENGTH_FILE]
+                                 [--ancillary_state_filepath ANCILLARY_STATE_FILE]
                                  WIND_SPEED_FILE AOS_FILE SIGMA_FILE
                                  TARGET_OROGRAPHY_FILE STANDARD_OROGRAPHY_FILE
                                  MODEL_RESOLUTION OUTPUT_FILE
@@ -69,6 +70,12 @@ optional arguments:
   --veg_roughness_filepath VEGETATIVE_ROUGHNESS_LENGTH_FILE
                         Location of vegetative roughness length file. Units of
                         field: m
+  --ancillary_state_filepath ANCILLARY_STATE_FILE
+                        Location of a file in which to store the fields
+                        derived from the ancillaries, so that they can be
+                        reused by later runs with the same ancillaries. The
+                        file is written if it does not exist or was derived
+                        from different ancillaries.
 __HELP__
   [[ "$output" == "$expected" ]]
 }
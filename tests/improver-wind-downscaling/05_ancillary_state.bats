@@ -0,0 +1,58 @@
+#!/usr/bin/env bats
+# -----------------------------------------------------------------------------
+# (C) British Crown Copyright 2017 Met Office.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+. $IMPROVER_DIR/tests/lib/utils
+
+@test "wind downscaling wind_speed with ancillary state file" {
+  TEST_DIR=$(mktemp -d)
+  improver_check_skip_acceptance
+  test_path="$IMPROVER_ACC_TEST_DIR/wind_downscaling/veg/"
+
+  # Run wind downscaling processing twice with an ancillary state file, so
+  # that the first run writes the file and the second run reuses it, and
+  # check that both pass.
+  for run_number in 1 2; do
+    run improver wind-downscaling "$test_path/input.nc" \
+        "$test_path/a_over_s.nc" "$test_path/sigma.nc" \
+        "$test_path/highres_orog.nc" "$test_path/standard_orog.nc" \
+        1500 "$TEST_DIR/output.nc" --veg_roughness_filepath "$test_path/veg.nc" \
+        --ancillary_state_filepath "$TEST_DIR/ancillary_state.npz"
+    [[ "$status" -eq 0 ]]
+    [[ -f "$TEST_DIR/ancillary_state.npz" ]]
+
+    # Run nccmp to compare the output and kgo.
+    improver_compare_output "$TEST_DIR/output.nc" \
+        "$test_path/kgo.nc"
+    rm "$TEST_DIR/output.nc"
+  done
+  rm "$TEST_DIR/ancillary_state.npz"
+  rmdir "$TEST_DIR"
+}